@@ -11,7 +11,7 @@ Write-Host ""
 # Configuration
 $STACK_NAME = "allsenses-sms-production"
 $TEMPLATE_FILE = "Gemini3_AllSensesAI/backend/sms/template-function-url.yaml"
-$LAMBDA_CODE = "Gemini3_AllSensesAI/backend/sms/lambda_function_url_handler.py"
+$LAMBDA_CODE = "Gemini3_AllSensesAI/backend/sms/lambda_function.py"
 $REGION = "us-east-1"
 
 Write-Host "[1] Validating files..." -ForegroundColor Yellow
@@ -41,8 +41,9 @@ if (Test-Path $PACKAGE_DIR) {
 }
 New-Item -ItemType Directory -Path $PACKAGE_DIR | Out-Null
 
-# Copy Lambda code
+# Copy Lambda code and its helper modules
 Copy-Item $LAMBDA_CODE "$PACKAGE_DIR/lambda_function.py"
+Copy-Item -Path "Gemini3_AllSensesAI/backend/sms/sms_*.py" -Destination $PACKAGE_DIR
 
 # Create ZIP
 if (Test-Path $PACKAGE_ZIP) {
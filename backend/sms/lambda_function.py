@@ -1,6 +1,10 @@
 """
-Production SMS Lambda Handler V4 - SMS Delivery Enhancement
-Fixes three critical issues:
+Production SMS Lambda Handler - the single SMS entry point
+Serves the Function URL (lambda_function.lambda_handler) and the API
+Gateway stack (lambda_handler.handler); the older handler modules are
+thin aliases of this one.
+
+Contract:
 1. Backend returns HTTP 200 only when SNS publish succeeds with MessageId
 2. Strict API contract with ok:true/false and proper error codes
 3. Always includes requestId from AWS context
@@ -11,44 +15,113 @@ Supports all international numbers via AWS SNS
 import json
 import boto3
 import os
-import re
 from datetime import datetime
 
+from sms_composer import compose_alert, optimize_message
+from sms_e164 import lookup as lookup_number, max_price
+from sms_idempotency import IdempotencyGuard, DynamoDBIdempotencyStore, idempotency_key, COMPLETED
+from sms_logging import SmsLogger, mask_phone
+from sms_outbox import create_outbox_worker, DEAD, SENT
+from sms_rate_limit import SmsRateLimiter
+from sms_receipts import create_receipt_index, decode_cloudwatch_event, public_receipt, PENDING
+from sms_recipients import RecipientSender, parse_recipients, summarize, success, failure
+
 # Initialize SNS client
 sns = boto3.client('sns', region_name='us-east-1')
 
+log = SmsLogger('SMS-LAMBDA')
+
+SMS_ATTRIBUTES = {
+    'AWS.SNS.SMS.SMSType': {
+        'DataType': 'String',
+        'StringValue': 'Transactional'  # High-priority delivery
+    },
+    'AWS.SNS.SMS.MaxPrice': {
+        'DataType': 'String',
+        'StringValue': '0.50'  # Default; overridden per destination's price tier
+    }
+}
+
+# SMS length limits (conservative for international)
+MAX_SMS_LENGTH = 1600  # SNS limit
+SAFE_SMS_LENGTH = 1400  # Recommended for international
+
+ALLOWED_ORIGIN = os.environ.get('CORS_ALLOW_ORIGIN', 'https://dfc8ght8abwqc.cloudfront.net')
+
+# Response headers are built once per container and shared by every response
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': ALLOWED_ORIGIN,
+    'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+    'Access-Control-Allow-Headers': 'content-type, idempotency-key'
+}
+JSON_HEADERS = dict(CORS_HEADERS, **{'Content-Type': 'application/json'})
+PREFLIGHT_HEADERS = dict(CORS_HEADERS, **{'Access-Control-Max-Age': '86400'})
+
+
+def publish_sms(phone_number, message, attributes):
+    """Send one SMS via SNS with international reliability settings; returns the MessageId"""
+    sns_response = sns.publish(
+        PhoneNumber=phone_number,
+        Message=message,
+        MessageAttributes=dict(SMS_ATTRIBUTES, **attributes)
+    )
+    message_id = sns_response.get('MessageId')
+    log.debug('SNS publish returned', messageId=message_id, to=phone_number)
+    return message_id
+
+
+# Failed publishes are retried from a durable outbox instead of being dropped;
+# sends over a country's or origination number's rate are deferred, not failed
+outbox_worker = create_outbox_worker(publish_sms, rate_limiter=SmsRateLimiter.from_env())
+
+# Retries of the same send replay the first response instead of texting twice
+idempotency = IdempotencyGuard(
+    shared=DynamoDBIdempotencyStore(os.environ['IDEMPOTENCY_TABLE']) if os.environ.get('IDEMPOTENCY_TABLE') else None
+)
+
+# Delivery receipts from the SNS delivery-status logs, looked up with GET ?messageId=;
+# stored in the RECEIPTS_TABLE DynamoDB table so every container sees them
+receipts = create_receipt_index()
+
+# recipients: [...] requests publish to all contacts in parallel, bounded per container
+MAX_RECIPIENTS = int(os.environ.get('SMS_MAX_RECIPIENTS', '25'))
+recipient_sender = RecipientSender(max_workers=int(os.environ.get('SMS_RECIPIENT_CONCURRENCY', '8')))
+
 def lambda_handler(event, context):
     """
-    Lambda Function URL handler for emergency SMS delivery
-    V4: Strict success/failure contract with MessageId requirement
-    """
+    Lambda handler for emergency SMS delivery
+    Strict success/failure contract with MessageId requirement
     
-    print('[SMS-LAMBDA-V4] Received request')
-    print('[SMS-LAMBDA-V4] Event:', json.dumps(event))
+    Accepts Function URL events, API Gateway REST events and direct
+    invocations with the request body as the event. A body with
+    recipients: [...] instead of to sends the message to every number.
+    """
     
     # Get AWS request ID for tracking
     request_id = context.aws_request_id if context else 'unknown'
     
-    # Log request details for CORS debugging
-    method = event.get('requestContext', {}).get('http', {}).get('method', 'UNKNOWN')
-    origin = event.get('headers', {}).get('origin', 'NO_ORIGIN')
-    print(f'[SMS-LAMBDA-V4] Method: {method}, Origin: {origin}, RequestId: {request_id}')
+    # Delivery-status records from the subscription filter on the SNS log groups
+    if 'awslogs' in event:
+        count = receipts.ingest(decode_cloudwatch_event(event))
+        log.info('Indexed delivery receipts', count=count, requestId=request_id)
+        return {'ingested': count}
+    
+    # Function URL events carry requestContext.http; API Gateway REST events carry httpMethod
+    http = event.get('requestContext', {}).get('http')
+    method = http.get('method') if http else event.get('httpMethod')
+    headers = event.get('headers') or {}
+    if http is None and headers:
+        headers = {name.lower(): value for name, value in headers.items()}
     
     # Handle CORS preflight (OPTIONS request)
-    if event.get('requestContext', {}).get('http', {}).get('method') == 'OPTIONS':
-        print('[SMS-LAMBDA-V4] Handling OPTIONS preflight request')
-        origin = event.get('headers', {}).get('origin', 'https://dfc8ght8abwqc.cloudfront.net')
-        print(f'[SMS-LAMBDA-V4] Origin header: {origin}')
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Access-Control-Allow-Origin': 'https://dfc8ght8abwqc.cloudfront.net',
-                'Access-Control-Allow-Methods': 'POST, OPTIONS',
-                'Access-Control-Allow-Headers': 'content-type',
-                'Access-Control-Max-Age': '86400'
-            },
-            'body': ''
-        }
+    if method == 'OPTIONS':
+        log.debug('Handling OPTIONS preflight', origin=headers.get('origin'), requestId=request_id)
+        return {'statusCode': 200, 'headers': PREFLIGHT_HEADERS, 'body': ''}
+    
+    log.debug('Received request', method=method, origin=headers.get('origin'), requestId=request_id)
+    
+    if method == 'GET':
+        return receipt_lookup(event.get('queryStringParameters') or {}, request_id)
     
     try:
         # Parse request body
@@ -57,8 +130,6 @@ def lambda_handler(event, context):
         else:
             body = event
         
-        print('[SMS-LAMBDA-V4] Parsed body:', json.dumps(body))
-        
         # Extract fields from new API contract
         phone_number = body.get('to')  # New field name
         message = body.get('message')  # New field name
@@ -72,112 +143,269 @@ def lambda_handler(event, context):
             message = body.get('emergencyMessage')
         
         # Extract metadata
-        victim_name = meta.get('victimName', meta.get('victim', 'Unknown'))
+        victim_name = meta.get('victimName', meta.get('victim', body.get('victimName', 'Unknown')))
         risk_level = meta.get('risk', 'UNKNOWN')
-        lat = meta.get('lat', 0)
-        lng = meta.get('lng', 0)
+        
+        recipients = body.get('recipients')
         
         # Validate required fields
-        if not phone_number:
+        if not phone_number and recipients is None:
             return error_response(400, 'MISSING_PHONE', 'Missing required field: to (phone number)', phone_number, request_id)
         
-        if not message:
+        if not message and not meta:
             return error_response(400, 'MISSING_MESSAGE', 'Missing required field: message', phone_number, request_id)
         
-        # Validate E.164 format (+ followed by 8-15 digits)
-        e164_pattern = r'^\+[1-9]\d{7,14}$'
-        if not re.match(e164_pattern, phone_number):
+        sms = compose_sms(message, meta, victim_name, risk_level)
+        if len(sms['text']) > MAX_SMS_LENGTH:
             return error_response(
-                400, 
-                'INVALID_PHONE_FORMAT', 
-                f'Phone number must be in E.164 format: +[country code][number]. Example: +1234567890 or +12025551234. Received: {phone_number}',
+                400,
+                'MESSAGE_TOO_LONG',
+                f'SMS text too long ({len(sms["text"])} chars). Maximum is {MAX_SMS_LENGTH} characters.',
                 phone_number,
                 request_id
             )
+        if len(sms['text']) > SAFE_SMS_LENGTH:
+            log.warning('Message length exceeds safe limit for international SMS',
+                        chars=len(sms['text']), limit=SAFE_SMS_LENGTH, requestId=request_id)
         
-        print(f'[SMS-LAMBDA-V4] Sending SMS to {phone_number}')
-        print(f'[SMS-LAMBDA-V4] Victim: {victim_name}')
-        print(f'[SMS-LAMBDA-V4] Risk: {risk_level}')
-        print(f'[SMS-LAMBDA-V4] Build ID: {build_id}')
-        print(f'[SMS-LAMBDA-V4] Message length: {len(message)} chars')
-        print(f'[SMS-LAMBDA-V4] Location: {lat}, {lng}')
-        
-        # Send SMS via SNS with international reliability settings
-        try:
-            sns_response = sns.publish(
-                PhoneNumber=phone_number,
-                Message=message,
-                MessageAttributes={
-                    'AWS.SNS.SMS.SMSType': {
-                        'DataType': 'String',
-                        'StringValue': 'Transactional'  # High-priority delivery
-                    },
-                    'AWS.SNS.SMS.MaxPrice': {
-                        'DataType': 'String',
-                        'StringValue': '0.50'  # Reasonable max price for international
-                    }
-                }
+        if recipients is not None:
+            return send_to_recipients(body, recipients, sms, headers, build_id, request_id)
+        
+        # Validate E.164 format and the destination country in one lookup
+        number = lookup_number(phone_number)
+        if not number['valid']:
+            return error_response(
+                400,
+                'INVALID_PHONE_FORMAT',
+                f'Phone number must be in E.164 format: +[country code][number]. Example: +1234567890 or +12025551234. {number["error"]}. Received: {phone_number}',
+                phone_number,
+                request_id
+            )
+        country = number['country']
+        if not country.sms:
+            return error_response(
+                400,
+                'UNSUPPORTED_COUNTRY',
+                f'SMS delivery is not available to {country.name or "+" + country.code}',
+                phone_number,
+                request_id
             )
-            
-            print(f'[SMS-LAMBDA-V4] SNS Response:', json.dumps(sns_response, default=str))
-            
-        except Exception as sns_error:
-            print(f'[SMS-LAMBDA-V4] SNS Publish Exception: {str(sns_error)}')
+        
+        # Dedup retries before doing any work
+        request_key = idempotency_key(body, headers)
+        previous = idempotency.claim(request_key)
+        if previous is not None:
+            if previous.get('status') == COMPLETED:
+                log.info('Duplicate request, replaying response',
+                         messageId=previous['response']['messageId'], requestId=request_id)
+                return success_response(dict(previous['response'], duplicate=True))
             return error_response(
-                502,
-                'SNS_PUBLISH_FAILED',
-                f'SNS publish failed: {str(sns_error)}',
+                409,
+                'DUPLICATE_IN_PROGRESS',
+                'An identical request is still being sent; retry shortly',
                 phone_number,
                 request_id
             )
         
-        # CRITICAL: Validate MessageId exists
-        message_id = sns_response.get('MessageId')
+        log.debug('Sending SMS', to=phone_number, chars=len(sms['text']), requestId=request_id)
         
-        if not message_id:
-            print(f'[SMS-LAMBDA-V4] ERROR: SNS returned success but no MessageId!')
-            print(f'[SMS-LAMBDA-V4] SNS Response: {json.dumps(sns_response, default=str)}')
+        row = deliver(phone_number, sms['text'], country, request_key, request_id)
+        if row['status'] == DEAD:
+            return error_response(
+                400,
+                'SMS_REJECTED',
+                f'SNS rejected the SMS: {row["last_error"]}',
+                phone_number,
+                request_id
+            )
+        if row['status'] != SENT:
             return error_response(
-                502,
-                'NO_MESSAGE_ID',
-                'SNS publish returned success but no MessageId was provided',
+                202,
+                'QUEUED_FOR_RETRY',
+                f'SNS publish failed and the SMS was queued for retry: {row["last_error"] or "rate limited"}',
                 phone_number,
                 request_id
             )
         
-        print(f'[SMS-LAMBDA-V4] ✅ SMS sent successfully')
-        print(f'[SMS-LAMBDA-V4] MessageId: {message_id}')
+        message_id = row['message_id']
+        
+        log.info(
+            'SMS sent',
+            messageId=message_id,
+            to=phone_number,
+            country=country.iso or country.code,
+            priceTier=country.price_tier,
+            risk=risk_level,
+            buildId=build_id,
+            encoding=sms['encoding'],
+            segments=sms['segments'],
+            requestId=request_id
+        )
         
         # Return success response (HTTP 200 with ok:true and messageId)
-        return {
-            'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': 'https://dfc8ght8abwqc.cloudfront.net',
-                'Access-Control-Allow-Methods': 'POST, OPTIONS',
-                'Access-Control-Allow-Headers': 'content-type'
-            },
-            'body': json.dumps({
-                'ok': True,
-                'provider': 'sns',
-                'messageId': message_id,
-                'toMasked': mask_phone(phone_number),
-                'requestId': request_id,
-                'timestamp': datetime.utcnow().isoformat() + 'Z'
-            })
+        response_body = {
+            'ok': True,
+            'provider': 'sns',
+            'messageId': message_id,
+            'toMasked': mask_phone(phone_number),
+            'country': country.iso,
+            'encoding': sms['encoding'],
+            'segments': sms['segments'],
+            'buildId': build_id,
+            'requestId': request_id,
+            'timestamp': datetime.utcnow().isoformat() + 'Z'
         }
-        
+        idempotency.complete(request_key, response_body)
+        return success_response(response_body)
+    
     except json.JSONDecodeError as e:
-        print(f'[SMS-LAMBDA-V4] JSON Parse Error: {str(e)}')
+        log.warning('Invalid JSON in request body', error=str(e), requestId=request_id)
         return error_response(400, 'INVALID_JSON', f'Invalid JSON in request body: {str(e)}', None, request_id)
-        
+    
     except Exception as e:
-        print(f'[SMS-LAMBDA-V4] Unexpected Error: {str(e)}')
-        import traceback
-        traceback.print_exc()
+        log.exception('Unexpected error', error=str(e), requestId=request_id)
         return error_response(500, 'INTERNAL_ERROR', f'Internal server error: {str(e)}', None, request_id)
 
 
+def compose_sms(message, meta, victim_name, risk_level):
+    """
+    Compose from meta when no message is given; otherwise switch the
+    client's message to GSM-7 when that needs fewer segments
+    """
+    if message:
+        return optimize_message(message)
+    return compose_alert({
+        'victim': victim_name,
+        'risk': risk_level,
+        'map': meta.get('map'),
+        'lat': meta.get('lat'),
+        'lng': meta.get('lng'),
+        'location': meta.get('location'),
+        'time': meta.get('time'),
+        'action': meta.get('action'),
+        'recommendation': meta.get('recommendation'),
+        'reasoning': meta.get('reasoning')
+    })
+
+
+def deliver(phone_number, text, country, request_key, request_id):
+    """
+    Durably record the send in the outbox, then try it right away;
+    failures stay queued for the background workers and release the
+    idempotency claim so the client can retry.
+    
+    Returns:
+        The outbox row (status SENT on success, DEAD when SNS rejected it)
+    """
+    row, _ = outbox_worker.outbox.enqueue(
+        phone_number,
+        text,
+        dedup_key=request_key,
+        attributes={'AWS.SNS.SMS.MaxPrice': {'DataType': 'String', 'StringValue': max_price(country)}}
+    )
+    if row['status'] != SENT:
+        row = outbox_worker.send_now(row['id'], max_wait=0.5)
+    
+    if row['status'] == DEAD:
+        idempotency.release(request_key)
+    elif row['status'] != SENT:
+        log.warning('SNS publish failed, queued for retry',
+                    error=row['last_error'] or 'rate limited', to=phone_number, requestId=request_id)
+        outbox_worker.start()
+        outbox_worker.kick()
+        idempotency.release(request_key)
+    return row
+
+
+def send_to_recipients(body, recipients, sms, headers, build_id, request_id):
+    """
+    Send one message to every number in recipients concurrently.
+    
+    Each recipient is deduplicated on its own idempotency key, so a retry
+    of a partially sent request only texts the contacts that were missed.
+    
+    Returns:
+        HTTP 200 when every recipient was sent, 207 when some were not,
+        400 when none were deliverable
+    """
+    try:
+        checked = parse_recipients(recipients, MAX_RECIPIENTS)
+    except ValueError as e:
+        return error_response(400, 'INVALID_RECIPIENTS', str(e), None, request_id)
+    
+    base_key = idempotency_key(body, headers)
+    
+    def send(phone_number, country):
+        request_key = f'{base_key}|{phone_number}'
+        previous = idempotency.claim(request_key)
+        if previous is not None:
+            if previous.get('status') == COMPLETED:
+                return dict(previous['response'], duplicate=True)
+            return failure(phone_number, 'DUPLICATE_IN_PROGRESS',
+                           'An identical request is still being sent; retry shortly', country)
+        
+        row = deliver(phone_number, sms['text'], country, request_key, request_id)
+        if row['status'] == DEAD:
+            return failure(phone_number, 'SMS_REJECTED', f'SNS rejected the SMS: {row["last_error"]}', country)
+        if row['status'] != SENT:
+            return failure(phone_number, 'QUEUED_FOR_RETRY',
+                           f'SNS publish failed and the SMS was queued for retry: {row["last_error"] or "rate limited"}',
+                           country)
+        result = success(phone_number, country, row['message_id'])
+        idempotency.complete(request_key, result)
+        return result
+    
+    results = recipient_sender.send_all(checked, send)
+    summary = summarize(results)
+    log.info('SMS fan-out', **summary, encoding=sms['encoding'], segments=sms['segments'],
+             buildId=build_id, requestId=request_id)
+    
+    if summary['failed'] == 0:
+        status_code = 200
+    elif any(rejection is None for _, _, rejection in checked):
+        status_code = 207
+    else:
+        status_code = 400
+    
+    return success_response({
+        'ok': summary['failed'] == 0,
+        'provider': 'sns',
+        'results': results,
+        **summary,
+        'encoding': sms['encoding'],
+        'segments': sms['segments'],
+        'buildId': build_id,
+        'requestId': request_id,
+        'timestamp': datetime.utcnow().isoformat() + 'Z'
+    }, status_code)
+
+
+def receipt_lookup(query, request_id):
+    """
+    Delivery status by messageId (?messageId=...). A messageId with no
+    receipt yet reports PENDING.
+    
+    There is deliberately no lookup by phone number: the endpoint is
+    unauthenticated, and a messageId is only known to whoever sent it.
+    """
+    message_id = query.get('messageId')
+    if not message_id:
+        return error_response(400, 'MISSING_QUERY', 'Provide a messageId query parameter', None, request_id)
+    
+    receipt = receipts.get(message_id)
+    body = public_receipt(receipt) if receipt else {'messageId': message_id, 'status': PENDING}
+    return success_response(dict(body, ok=True, requestId=request_id))
+
+
+def success_response(body, status_code=200):
+    """Return a JSON response (HTTP 200 unless given) with CORS headers"""
+    return {
+        'statusCode': status_code,
+        'headers': JSON_HEADERS,
+        'body': json.dumps(body)
+    }
+
+
 def error_response(status_code, error_code, error_message, phone_number, request_id):
     """
     Return error response with CORS headers
@@ -185,12 +413,7 @@ def error_response(status_code, error_code, error_message, phone_number, request
     """
     return {
         'statusCode': status_code,  # Must be non-200 for errors
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': 'https://dfc8ght8abwqc.cloudfront.net',
-            'Access-Control-Allow-Methods': 'POST, OPTIONS',
-            'Access-Control-Allow-Headers': 'content-type'
-        },
+        'headers': JSON_HEADERS,
         'body': json.dumps({
             'ok': False,  # Always false for errors
             'provider': 'sns',
@@ -203,10 +426,5 @@ def error_response(status_code, error_code, error_message, phone_number, request
     }
 
 
-def mask_phone(phone):
-    """Mask phone number for privacy (e.g., +1234567890 -> +1***7890)"""
-    if not phone:
-        return 'N/A'
-    if len(phone) > 6:
-        return phone[:3] + '***' + phone[-4:]
-    return phone
+# API Gateway stack entry point (template.yaml: lambda_handler.handler)
+handler = lambda_handler
@@ -0,0 +1,228 @@
+"""
+SMS Composer - encoding-aware emergency message builder
+
+Computes the exact encoding (GSM-7 or UCS-2) and segment count of a
+message, transliterates non-GSM characters when that saves segments,
+and fits the free-text reasoning into a segment budget while keeping
+the critical fields (victim, risk, map link) intact.
+"""
+
+import re
+import unicodedata
+
+# GSM 03.38 basic character set (one septet each; ESC excluded)
+GSM_BASIC = set(
+    "@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ !\"#¤%&'()*+,-./0123456789:;<=>?"
+    "¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà"
+)
+
+# GSM 03.38 extension table (escape + character, two septets each)
+GSM_EXTENDED = set("^{}\\[~]|€\f")
+
+GSM_SINGLE_SEPTETS = 160
+GSM_MULTI_SEPTETS = 153
+UCS2_SINGLE_UNITS = 70
+UCS2_MULTI_UNITS = 67
+
+DEFAULT_MAX_SEGMENTS = 3
+
+# Replacements for common non-GSM characters (punctuation, decorations)
+TRANSLITERATIONS = {
+    "\u201c": '"', "\u201d": '"', "\u201e": '"', "\u00ab": '"', "\u00bb": '"',
+    "\u2018": "'", "\u2019": "'", "\u201a": "'", "\u00b4": "'", "`": "'",
+    "\u2013": "-", "\u2014": "-", "\u2212": "-", "\u2022": "-",
+    "\u2026": "...", "\u00a0": " ", "\t": " ", "\u00b0": " deg",
+    "\u00e7": "c", "\u00ba": "o", "\u00aa": "a",
+    "\u26a0": "!",
+}
+
+# Optional lines, dropped last-to-first when the budget is still exceeded
+OPTIONAL_FIELDS = ["location", "coords", "recommendation", "time", "action"]
+FOOTER = "AllSensesAI Guardian automated alert"
+
+
+def analyze(text):
+    """
+    Compute encoding and segment count of a message.
+    
+    Args:
+        text: Message text
+    
+    Returns:
+        dict with encoding ("GSM-7" or "UCS-2"), units (septets or
+        UTF-16 code units), segments and characters
+    """
+    if all(ch in GSM_BASIC or ch in GSM_EXTENDED for ch in text):
+        costs = [2 if ch in GSM_EXTENDED else 1 for ch in text]
+        encoding, single, multi = 'GSM-7', GSM_SINGLE_SEPTETS, GSM_MULTI_SEPTETS
+    else:
+        costs = [2 if ord(ch) > 0xFFFF else 1 for ch in text]
+        encoding, single, multi = 'UCS-2', UCS2_SINGLE_UNITS, UCS2_MULTI_UNITS
+    
+    units = sum(costs)
+    if units <= single:
+        segments = 1 if units else 0
+    else:
+        # Escape sequences and surrogate pairs never straddle a segment boundary
+        segments, used = 1, 0
+        for cost in costs:
+            if used + cost > multi:
+                segments += 1
+                used = 0
+            used += cost
+    
+    return {
+        'encoding': encoding,
+        'units': units,
+        'segments': segments,
+        'characters': len(text)
+    }
+
+
+def transliterate(text):
+    """
+    Replace non-GSM characters with GSM equivalents.
+    
+    Accents are stripped, typographic punctuation is simplified and
+    emoji are removed. Characters with no sensible equivalent (e.g.
+    non-Latin scripts) make the message untransliterable.
+    
+    Args:
+        text: Message text
+    
+    Returns:
+        GSM-7 text, or None if some character cannot be represented
+    """
+    out = []
+    for ch in text:
+        if ch in GSM_BASIC or ch in GSM_EXTENDED:
+            out.append(ch)
+            continue
+        if ch in TRANSLITERATIONS:
+            out.append(TRANSLITERATIONS[ch])
+            continue
+        
+        base = ''.join(c for c in unicodedata.normalize('NFKD', ch) if not unicodedata.combining(c))
+        if base and all(c in GSM_BASIC for c in base):
+            out.append(base)
+        elif unicodedata.category(ch) in ('So', 'Sk', 'Cf', 'Mn'):
+            # Emoji, pictographs and modifiers carry no alert content
+            continue
+        else:
+            return None
+    
+    # Removed emoji leave stray spaces behind
+    text = re.sub(r' {2,}', ' ', ''.join(out))
+    return '\n'.join(line.strip(' ') for line in text.split('\n'))
+
+
+def optimize_message(text):
+    """
+    Pick the cheaper of the original and transliterated message.
+    
+    The original is kept when transliterating saves no segment, so
+    accents and symbols are only stripped when that lowers the cost.
+    
+    Args:
+        text: Message text
+    
+    Returns:
+        dict from analyze() plus text and transliterated flag
+    """
+    info = analyze(text)
+    if info['encoding'] == 'UCS-2':
+        converted = transliterate(text)
+        if converted is not None:
+            converted_info = analyze(converted)
+            if converted_info['segments'] < info['segments']:
+                return dict(converted_info, text=converted, transliterated=True)
+    return dict(info, text=text, transliterated=False)
+
+
+def compose_alert(fields, max_segments=DEFAULT_MAX_SEGMENTS):
+    """
+    Compose an emergency SMS within a segment budget.
+    
+    The reasoning text is truncated first; if the critical lines alone
+    still exceed the budget, optional lines are dropped. Victim, risk
+    and map link are never shortened.
+    
+    Args:
+        fields: dict with victim, risk, map (or lat/lng), and optional
+            location, coords, recommendation, time, action, reasoning
+        max_segments: Maximum number of SMS segments
+    
+    Returns:
+        dict with text, encoding, segments, units, characters,
+        transliterated, truncated, dropped and within_budget
+    """
+    map_link = fields.get('map')
+    if not map_link and fields.get('lat') is not None and fields.get('lng') is not None:
+        map_link = f"https://maps.google.com/?q={fields['lat']},{fields['lng']}"
+    
+    critical = [
+        "EMERGENCY ALERT",
+        f"Victim: {fields.get('victim') or 'Unknown'}",
+        f"Risk: {fields.get('risk') or 'UNKNOWN'}",
+    ]
+    if map_link:
+        critical.append(f"Map: {map_link}")
+    
+    labels = {
+        'location': 'Location', 'coords': 'Coordinates', 'recommendation': 'Recommendation',
+        'time': 'Time', 'action': 'Action'
+    }
+    optional = [name for name in OPTIONAL_FIELDS if fields.get(name)]
+    reasoning = ' '.join(str(fields.get('reasoning') or fields.get('message') or '').split())
+    
+    def render(reasoning_text, kept, footer):
+        lines = list(critical)
+        lines.extend(f"{labels[name]}: {fields[name]}" for name in kept)
+        if reasoning_text:
+            lines.append(f"Details: {reasoning_text}")
+        if footer:
+            lines.append(FOOTER)
+        return optimize_message('\n'.join(lines))
+    
+    def fits(result):
+        return result['segments'] <= max_segments
+    
+    footer = True
+    kept = list(optional)
+    dropped = []
+    
+    result = render(reasoning, kept, footer)
+    truncated = False
+    
+    if not fits(result):
+        footer = False
+        dropped.append('footer')
+        result = render(reasoning, kept, footer)
+    
+    if not fits(result) and reasoning:
+        # Longest reasoning prefix that still fits
+        low, high = 0, len(reasoning)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if fits(render(reasoning[:mid].rstrip() + '...', kept, footer)):
+                low = mid
+            else:
+                high = mid - 1
+        truncated = True
+        if low > 0:
+            result = render(reasoning[:low].rstrip() + '...', kept, footer)
+        else:
+            reasoning = ''
+            dropped.append('reasoning')
+            result = render(reasoning, kept, footer)
+    
+    while not fits(result) and kept:
+        dropped.append(kept.pop())
+        result = render('', kept, footer)
+    
+    return dict(
+        result,
+        truncated=truncated,
+        dropped=dropped,
+        within_budget=fits(result)
+    )
@@ -0,0 +1,206 @@
+"""
+SMS E.164 - calling-code trie with per-country metadata
+
+Phone numbers are resolved in one pass over their digits: the trie walk
+finds the longest matching calling code, and the country's metadata
+gives the valid national number lengths, whether SNS can deliver SMS
+there, and a price tier for MaxPrice. Validation, rate limiting and
+routing all share this lookup instead of each keeping its own regex.
+"""
+
+from collections import namedtuple
+
+Country = namedtuple('Country', ['code', 'iso', 'name', 'min_length', 'max_length', 'sms', 'price_tier'])
+
+# E.164 allows at most 15 digits including the calling code
+MAX_DIGITS = 15
+
+# MaxPrice (USD per message part) by price tier
+PRICE_TIERS = {
+    'low': '0.10',
+    'standard': '0.50',
+    'high': '1.00',
+}
+DEFAULT_PRICE_TIER = 'standard'
+
+# code: (iso, name, national min length, national max length, SMS deliverable, price tier)
+COUNTRIES = {
+    '1': ('US', 'United States / Canada (NANP)', 10, 10, True, 'low'),
+    '7': ('RU', 'Russia / Kazakhstan', 10, 10, True, 'high'),
+    '20': ('EG', 'Egypt', 9, 10, True, 'high'),
+    '27': ('ZA', 'South Africa', 9, 9, True, 'standard'),
+    '30': ('GR', 'Greece', 10, 10, True, 'standard'),
+    '31': ('NL', 'Netherlands', 9, 9, True, 'standard'),
+    '32': ('BE', 'Belgium', 8, 9, True, 'standard'),
+    '33': ('FR', 'France', 9, 9, True, 'standard'),
+    '34': ('ES', 'Spain', 9, 9, True, 'standard'),
+    '36': ('HU', 'Hungary', 8, 9, True, 'standard'),
+    '39': ('IT', 'Italy', 6, 11, True, 'standard'),
+    '40': ('RO', 'Romania', 9, 9, True, 'standard'),
+    '41': ('CH', 'Switzerland', 9, 9, True, 'standard'),
+    '43': ('AT', 'Austria', 4, 13, True, 'standard'),
+    '44': ('GB', 'United Kingdom', 9, 10, True, 'standard'),
+    '45': ('DK', 'Denmark', 8, 8, True, 'standard'),
+    '46': ('SE', 'Sweden', 7, 13, True, 'standard'),
+    '47': ('NO', 'Norway', 8, 8, True, 'standard'),
+    '48': ('PL', 'Poland', 9, 9, True, 'standard'),
+    '49': ('DE', 'Germany', 6, 13, True, 'standard'),
+    '51': ('PE', 'Peru', 8, 9, True, 'standard'),
+    '52': ('MX', 'Mexico', 10, 10, True, 'low'),
+    '53': ('CU', 'Cuba', 6, 8, False, 'high'),
+    '54': ('AR', 'Argentina', 10, 11, True, 'standard'),
+    '55': ('BR', 'Brazil', 10, 11, True, 'low'),
+    '56': ('CL', 'Chile', 9, 9, True, 'standard'),
+    '57': ('CO', 'Colombia', 10, 10, True, 'standard'),
+    '58': ('VE', 'Venezuela', 10, 10, True, 'standard'),
+    '60': ('MY', 'Malaysia', 8, 10, True, 'standard'),
+    '61': ('AU', 'Australia', 9, 9, True, 'standard'),
+    '62': ('ID', 'Indonesia', 8, 12, True, 'high'),
+    '63': ('PH', 'Philippines', 10, 10, True, 'high'),
+    '64': ('NZ', 'New Zealand', 8, 10, True, 'standard'),
+    '65': ('SG', 'Singapore', 8, 8, True, 'standard'),
+    '66': ('TH', 'Thailand', 8, 9, True, 'standard'),
+    '81': ('JP', 'Japan', 9, 10, True, 'standard'),
+    '82': ('KR', 'South Korea', 8, 10, True, 'standard'),
+    '84': ('VN', 'Vietnam', 9, 10, True, 'high'),
+    '86': ('CN', 'China', 11, 11, True, 'standard'),
+    '90': ('TR', 'Turkey', 10, 10, True, 'high'),
+    '91': ('IN', 'India', 10, 10, True, 'low'),
+    '92': ('PK', 'Pakistan', 9, 10, True, 'high'),
+    '98': ('IR', 'Iran', 10, 10, False, 'high'),
+    '212': ('MA', 'Morocco', 9, 9, True, 'high'),
+    '234': ('NG', 'Nigeria', 8, 10, True, 'high'),
+    '249': ('SD', 'Sudan', 9, 9, False, 'high'),
+    '254': ('KE', 'Kenya', 9, 9, True, 'high'),
+    '351': ('PT', 'Portugal', 9, 9, True, 'standard'),
+    '353': ('IE', 'Ireland', 7, 9, True, 'standard'),
+    '358': ('FI', 'Finland', 5, 12, True, 'standard'),
+    '380': ('UA', 'Ukraine', 9, 9, True, 'high'),
+    '502': ('GT', 'Guatemala', 8, 8, True, 'standard'),
+    '503': ('SV', 'El Salvador', 8, 8, True, 'standard'),
+    '504': ('HN', 'Honduras', 8, 8, True, 'standard'),
+    '505': ('NI', 'Nicaragua', 8, 8, True, 'standard'),
+    '506': ('CR', 'Costa Rica', 8, 8, True, 'standard'),
+    '507': ('PA', 'Panama', 7, 8, True, 'standard'),
+    '591': ('BO', 'Bolivia', 8, 8, True, 'standard'),
+    '593': ('EC', 'Ecuador', 8, 9, True, 'standard'),
+    '595': ('PY', 'Paraguay', 9, 9, True, 'standard'),
+    '598': ('UY', 'Uruguay', 8, 8, True, 'standard'),
+    '850': ('KP', 'North Korea', 6, 10, False, 'high'),
+    '852': ('HK', 'Hong Kong', 8, 8, True, 'standard'),
+    '886': ('TW', 'Taiwan', 9, 9, True, 'standard'),
+    '963': ('SY', 'Syria', 8, 9, False, 'high'),
+    '966': ('SA', 'Saudi Arabia', 9, 9, True, 'high'),
+    '971': ('AE', 'United Arab Emirates', 8, 9, True, 'high'),
+    '972': ('IL', 'Israel', 8, 9, True, 'standard'),
+}
+
+# Every other ITU-assigned calling code (country codes, not global
+# services such as +800 or +881). There is no per-country metadata for
+# these, so numbers get the generic E.164 length check and are priced at
+# the default tier
+OTHER_CALLING_CODES = {
+    '211', '213', '216', '218', '220', '221', '222', '223', '224', '225', '226', '227', '228',
+    '229', '230', '231', '232', '233', '235', '236', '237', '238', '239', '240', '241', '242',
+    '243', '244', '245', '246', '247', '248', '250', '251', '252', '253', '255', '256', '257',
+    '258', '260', '261', '262', '263', '264', '265', '266', '267', '268', '269', '290', '291',
+    '297', '298', '299', '350', '352', '354', '355', '356', '357', '359', '370', '371', '372',
+    '373', '374', '375', '376', '377', '378', '381', '382', '383', '385', '386', '387', '389',
+    '420', '421', '423', '500', '501', '508', '509', '590', '592', '594', '596', '597', '599',
+    '670', '672', '673', '674', '675', '676', '677', '678', '679', '680', '681', '682', '683',
+    '685', '686', '687', '688', '689', '690', '691', '692', '853', '855', '856', '880', '93', '94',
+    '95', '960', '961', '962', '964', '965', '967', '968', '970', '973', '974', '975', '976', '977',
+    '992', '993', '994', '995', '996', '998'
+}
+
+
+def _build_trie():
+    trie = {}
+    entries = {code: Country(code, *meta) for code, meta in COUNTRIES.items()}
+    for code in OTHER_CALLING_CODES:
+        entries[code] = Country(code, None, None, 4, MAX_DIGITS - len(code), True, DEFAULT_PRICE_TIER)
+    for code, country in entries.items():
+        node = trie
+        for digit in code:
+            node = node.setdefault(digit, {})
+        node[None] = country
+    return trie
+
+
+# Precompiled once per container
+TRIE = _build_trie()
+
+
+def lookup(phone_number):
+    """
+    Resolve an E.164 number in one pass.
+    
+    Args:
+        phone_number: Number in +[country code][national number] form
+    
+    Returns:
+        Dict with valid, country (Country or None), national and error
+        (None when valid)
+    """
+    result = {'valid': False, 'country': None, 'national': None, 'error': None}
+    if not isinstance(phone_number, str) or not phone_number.startswith('+'):
+        result['error'] = 'Number must start with +'
+        return result
+    
+    digits = phone_number[1:]
+    if not digits.isdigit() or not digits.isascii():
+        result['error'] = 'Number must contain only digits after +'
+        return result
+    if len(digits) > MAX_DIGITS:
+        result['error'] = f'Number has more than {MAX_DIGITS} digits'
+        return result
+    
+    # Walk the trie, remembering the longest calling code seen
+    node = TRIE
+    for digit in digits:
+        node = node.get(digit)
+        if node is None:
+            break
+        if None in node:
+            result['country'] = node[None]
+    
+    country = result['country']
+    if country is None:
+        result['error'] = 'Unknown country calling code'
+        return result
+    
+    national = digits[len(country.code):]
+    result['national'] = national
+    if not country.min_length <= len(national) <= country.max_length:
+        expected = (str(country.min_length) if country.min_length == country.max_length
+                    else f'{country.min_length}-{country.max_length}')
+        result['error'] = (f'{country.name or "+" + country.code} numbers need {expected} digits '
+                           f'after +{country.code}, got {len(national)}')
+        return result
+    
+    result['valid'] = True
+    return result
+
+
+def calling_code(phone_number):
+    """
+    Longest-prefix calling code of a number.
+    
+    Returns:
+        Calling code string, or None if unknown
+    """
+    digits = phone_number[1:] if phone_number.startswith('+') else phone_number
+    code = None
+    node = TRIE
+    for digit in digits:
+        node = node.get(digit)
+        if node is None:
+            break
+        if None in node:
+            code = node[None].code
+    return code
+
+
+def max_price(country):
+    """MaxPrice attribute value for a country's price tier."""
+    return PRICE_TIERS.get(country.price_tier if country else DEFAULT_PRICE_TIER, PRICE_TIERS[DEFAULT_PRICE_TIER])
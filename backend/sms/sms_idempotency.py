@@ -0,0 +1,236 @@
+"""
+SMS Idempotency - request-key dedup for emergency SMS sends
+
+A send is claimed under its idempotency key before SNS is called. A
+retry with the same key gets the original response (same messageId)
+without a second publish; a retry that arrives while the first send is
+still in flight is told so instead of sending again.
+
+Keys come from the client (Idempotency-Key header or idempotencyKey
+field) or default to a hash of to, message, meta and buildId. A derived
+key only catches resubmits of the same request, so it is replayed for
+DERIVED_TTL_SECONDS instead of the full TTL: a new emergency with the
+same text later on is sent again. Records live in an in-memory TTL store
+per container, optionally backed by a shared store (DynamoDB) so retries
+landing on another container dedup too.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from sms_logging import SmsLogger
+
+PENDING = 'PENDING'
+COMPLETED = 'COMPLETED'
+
+DEFAULT_TTL_SECONDS = 24 * 3600
+DERIVED_TTL_SECONDS = 10 * 60
+PENDING_TTL_SECONDS = 60
+
+CLIENT_KEY_PREFIX = 'key:'
+
+log = SmsLogger('SMS-IDEMPOTENCY')
+
+
+def idempotency_key(body, headers=None):
+    """
+    Derive the idempotency key for a send request.
+    
+    Args:
+        body: Parsed request body
+        headers: Request headers (Function URL headers are lower-case)
+    
+    Returns:
+        Key string
+    """
+    supplied = (headers or {}).get('idempotency-key') or body.get('idempotencyKey')
+    if supplied:
+        return f"{CLIENT_KEY_PREFIX}{supplied}"
+    
+    to = body.get('to') or body.get('phoneNumber') or ''
+    message = body.get('message') or body.get('emergencyMessage') or ''
+    # Alerts composed from meta have no message; their meta is what differs
+    meta = json.dumps(body.get('meta') or {}, sort_keys=True, separators=(',', ':'), default=str)
+    build_id = body.get('buildId', '')
+    digest = hashlib.sha256('\x1f'.join([to, message, meta, build_id]).encode('utf-8')).hexdigest()
+    return f"sha256:{digest}"
+
+
+class MemoryIdempotencyStore:
+    """In-process TTL store, bounded to max_entries (oldest evicted first)."""
+    
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._records = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def put_if_absent(self, key, record, ttl_seconds):
+        """Store record unless a live one exists; return the existing record or None."""
+        now = time.time()
+        with self._lock:
+            existing = self._records.get(key)
+            if existing and existing[0] > now:
+                return existing[1]
+            self._records[key] = (now + ttl_seconds, record)
+            self._records.move_to_end(key)
+            while len(self._records) > self.max_entries:
+                self._records.popitem(last=False)
+            return None
+    
+    def put(self, key, record, ttl_seconds):
+        """Store record unconditionally."""
+        with self._lock:
+            self._records[key] = (time.time() + ttl_seconds, record)
+            self._records.move_to_end(key)
+            while len(self._records) > self.max_entries:
+                self._records.popitem(last=False)
+    
+    def get(self, key):
+        """Return the live record for key, or None."""
+        with self._lock:
+            existing = self._records.get(key)
+            if existing and existing[0] > time.time():
+                return existing[1]
+            return None
+    
+    def delete(self, key):
+        """Forget key."""
+        with self._lock:
+            self._records.pop(key, None)
+
+
+class DynamoDBIdempotencyStore:
+    """
+    Shared store on a DynamoDB table with partition key "pk".
+    
+    Enable the table's TTL on "expires_at" so expired records are purged.
+    """
+    
+    def __init__(self, table_name, client=None):
+        if client is None:
+            import boto3
+            client = boto3.client('dynamodb')
+        self.table_name = table_name
+        self.client = client
+    
+    def put_if_absent(self, key, record, ttl_seconds):
+        now = int(time.time())
+        try:
+            self.client.put_item(
+                TableName=self.table_name,
+                Item=self._item(key, record, now + ttl_seconds),
+                ConditionExpression='attribute_not_exists(pk) OR expires_at < :now',
+                ExpressionAttributeValues={':now': {'N': str(now)}}
+            )
+            return None
+        except Exception as e:
+            code = getattr(e, 'response', {}).get('Error', {}).get('Code')
+            if code != 'ConditionalCheckFailedException':
+                raise
+        return self.get(key) or {'status': PENDING}
+    
+    def put(self, key, record, ttl_seconds):
+        self.client.put_item(
+            TableName=self.table_name,
+            Item=self._item(key, record, int(time.time()) + ttl_seconds)
+        )
+    
+    def get(self, key):
+        response = self.client.get_item(
+            TableName=self.table_name,
+            Key={'pk': {'S': key}},
+            ConsistentRead=True
+        )
+        item = response.get('Item')
+        if not item or int(item['expires_at']['N']) < time.time():
+            return None
+        return json.loads(item['record']['S'])
+    
+    def delete(self, key):
+        self.client.delete_item(TableName=self.table_name, Key={'pk': {'S': key}})
+    
+    @staticmethod
+    def _item(key, record, expires_at):
+        return {
+            'pk': {'S': key},
+            'record': {'S': json.dumps(record)},
+            'expires_at': {'N': str(expires_at)}
+        }
+
+
+class IdempotencyGuard:
+    """
+    Claims, completes and releases send requests across the local and shared stores.
+    """
+    
+    def __init__(self, local=None, shared=None, ttl_seconds=DEFAULT_TTL_SECONDS,
+                 pending_ttl_seconds=PENDING_TTL_SECONDS, derived_ttl_seconds=DERIVED_TTL_SECONDS):
+        """
+        Args:
+            local: In-process store (defaults to MemoryIdempotencyStore)
+            shared: Optional shared store with the same interface
+            ttl_seconds: How long completed responses are replayed for client-supplied keys
+            pending_ttl_seconds: How long an in-flight claim blocks duplicates
+            derived_ttl_seconds: How long completed responses are replayed for derived keys
+        """
+        self.local = local or MemoryIdempotencyStore()
+        self.shared = shared
+        self.ttl_seconds = ttl_seconds
+        self.pending_ttl_seconds = pending_ttl_seconds
+        self.derived_ttl_seconds = derived_ttl_seconds
+    
+    def ttl_for(self, key):
+        """Replay window for a completed key (shorter when the server derived it)."""
+        return self.ttl_seconds if key.startswith(CLIENT_KEY_PREFIX) else min(self.ttl_seconds, self.derived_ttl_seconds)
+    
+    def claim(self, key):
+        """
+        Claim a key before sending.
+        
+        Returns:
+            None if the caller now owns the send; otherwise the existing
+            record: {"status": "COMPLETED", "response": {...}} or
+            {"status": "PENDING"}
+        """
+        claim = {'status': PENDING}
+        existing = self.local.put_if_absent(key, claim, self.pending_ttl_seconds)
+        if existing is not None:
+            return existing
+        
+        if self.shared is not None:
+            try:
+                existing = self.shared.put_if_absent(key, claim, self.pending_ttl_seconds)
+            except Exception as e:
+                # The shared store is best effort; never block an emergency send on it
+                log.warning('Shared store claim failed', error=str(e))
+                existing = None
+            if existing is not None:
+                if existing.get('status') == COMPLETED:
+                    self.local.put(key, existing, self.ttl_for(key))
+                else:
+                    self.local.delete(key)
+                return existing
+        return None
+    
+    def complete(self, key, response):
+        """Record the successful response for replay."""
+        record = {'status': COMPLETED, 'response': response}
+        ttl_seconds = self.ttl_for(key)
+        self.local.put(key, record, ttl_seconds)
+        if self.shared is not None:
+            try:
+                self.shared.put(key, record, ttl_seconds)
+            except Exception as e:
+                log.warning('Shared store write failed', error=str(e))
+    
+    def release(self, key):
+        """Drop a claim after a failed send so the client can retry."""
+        self.local.delete(key)
+        if self.shared is not None:
+            try:
+                self.shared.delete(key)
+            except Exception as e:
+                log.warning('Shared store release failed', error=str(e))
@@ -0,0 +1,101 @@
+"""
+SMS Logging - structured, level-gated logger that masks phone numbers
+
+Records go through the standard logging module (logging.getLogger(name)),
+each formatted as one JSON line (CloudWatch Logs Insights parses the
+fields). Records below SMS_LOG_LEVEL are dropped before anything is
+formatted, so debug logging costs a single comparison when disabled.
+Phone numbers are masked in known phone fields and anywhere a +number
+appears in a message or string field, also when written with spaces,
+dots, dashes or parentheses (+1 (555) 123-4567).
+"""
+
+import json
+import logging
+import os
+import re
+import sys
+import traceback
+
+LEVELS = {'DEBUG': logging.DEBUG, 'INFO': logging.INFO, 'WARNING': logging.WARNING, 'ERROR': logging.ERROR}
+
+PHONE_FIELDS = {'to', 'phone', 'phoneNumber', 'phone_number'}
+# A + and digits, optionally grouped by single separators; checked for
+# 6-15 digits once the separators are removed
+PHONE_PATTERN = re.compile(r'\+\(?\d(?:[ .\-()]{0,2}\d){5,20}')
+SEPARATORS = re.compile(r'[ .\-()]')
+
+# Writes each record's message (already a JSON line) to stdout unchanged
+_HANDLER = logging.StreamHandler(sys.stdout)
+_HANDLER.setFormatter(logging.Formatter('%(message)s'))
+
+
+def mask_phone(phone):
+    """Mask phone number for privacy (e.g., +1234567890 -> +12***7890)"""
+    if not phone:
+        return 'N/A'
+    if len(phone) > 6:
+        return phone[:3] + '***' + phone[-4:]
+    return phone
+
+
+def normalize_phone(phone):
+    """Drop separators, e.g. "+1 (555) 123-4567" -> "+15551234567"."""
+    return SEPARATORS.sub('', phone)
+
+
+def mask_text(text):
+    """Mask every phone number in free text, separators included."""
+    def mask(match):
+        phone = normalize_phone(match.group())
+        return mask_phone(phone) if 7 <= len(phone) <= 16 else match.group()
+    return PHONE_PATTERN.sub(mask, text)
+
+
+class SmsLogger:
+    """JSON-lines wrapper around logging.getLogger(name) for the SMS Lambda."""
+    
+    def __init__(self, name, level=None):
+        """
+        Args:
+            name: Logger name written with every record
+            level: Minimum level name (defaults to SMS_LOG_LEVEL, then INFO)
+        """
+        self.name = name
+        self.level = LEVELS.get((level or os.environ.get('SMS_LOG_LEVEL') or 'INFO').upper(), LEVELS['INFO'])
+        self.logger = logging.getLogger(name)
+        self.logger.setLevel(self.level)
+        # Plain JSON lines, not the Lambda runtime's prefixed root format
+        if _HANDLER not in self.logger.handlers:
+            self.logger.addHandler(_HANDLER)
+        self.logger.propagate = False
+    
+    def debug(self, message, **fields):
+        if self.level <= LEVELS['DEBUG']:
+            self._emit('DEBUG', message, fields)
+    
+    def info(self, message, **fields):
+        if self.level <= LEVELS['INFO']:
+            self._emit('INFO', message, fields)
+    
+    def warning(self, message, **fields):
+        if self.level <= LEVELS['WARNING']:
+            self._emit('WARNING', message, fields)
+    
+    def error(self, message, **fields):
+        self._emit('ERROR', message, fields)
+    
+    def exception(self, message, **fields):
+        """Log at ERROR with the current exception's traceback."""
+        self._emit('ERROR', message, dict(fields, traceback=traceback.format_exc()))
+    
+    def _emit(self, level, message, fields):
+        record = {'logger': self.name, 'level': level, 'msg': mask_text(message) if '+' in message else message}
+        for key, value in fields.items():
+            if isinstance(value, str):
+                if key in PHONE_FIELDS:
+                    value = mask_phone(normalize_phone(value))
+                elif '+' in value:
+                    value = mask_text(value)
+            record[key] = value
+        self.logger.log(LEVELS[level], json.dumps(record, default=str))
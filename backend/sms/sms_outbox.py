@@ -0,0 +1,352 @@
+"""
+SMS Outbox - durable queue for emergency SMS sends
+
+Every send is written to a SQLite (WAL) outbox before SNS is called, so
+an alert survives a failed publish. The request path tries the send
+once right away; anything that fails is retried by a pool of background
+workers with exponential backoff and full jitter, per-destination rate
+limits, and dedup on the request's idempotency key. Errors SNS will
+never accept (invalid or opted-out number, missing permission) are not
+retried: the row is marked dead at once.
+"""
+
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+
+from sms_logging import SmsLogger
+from sms_rate_limit import origination_identity
+
+PENDING = 'PENDING'
+SENDING = 'SENDING'
+SENT = 'SENT'
+DEAD = 'DEAD'
+
+DEFAULT_OUTBOX_PATH = '/tmp/sms-outbox.db'
+DEFAULT_DEDUP_TTL_SECONDS = 10 * 60
+
+# SNS error codes that no retry can fix
+PERMANENT_ERROR_CODES = frozenset({
+    'InvalidParameter',
+    'InvalidParameterValue',
+    'AuthorizationError',
+    'OptedOut',
+    'EndpointDisabled'
+})
+
+log = SmsLogger('SMS-OUTBOX')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dedup_key TEXT UNIQUE,
+    phone TEXT NOT NULL,
+    message TEXT NOT NULL,
+    attributes TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    sent_at REAL,
+    message_id TEXT,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at);
+"""
+
+COLUMNS = ('id', 'dedup_key', 'phone', 'message', 'attributes', 'status', 'attempts',
+           'next_attempt_at', 'created_at', 'sent_at', 'message_id', 'last_error')
+
+
+def is_permanent_error(error):
+    """True for SNS client errors (botocore ClientError) that fail the same way on every retry."""
+    response = getattr(error, 'response', None)
+    if not isinstance(response, dict):
+        return False
+    return response.get('Error', {}).get('Code') in PERMANENT_ERROR_CODES
+
+
+class SmsOutbox:
+    """SQLite-backed outbox; safe to share across threads."""
+    
+    def __init__(self, path=DEFAULT_OUTBOX_PATH, lease_seconds=30.0, dedup_ttl_seconds=DEFAULT_DEDUP_TTL_SECONDS):
+        """
+        Args:
+            path: SQLite database file
+            lease_seconds: How long a claimed row is reserved for one sender
+            dedup_ttl_seconds: How long after a send its dedup_key still blocks a new one
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.dedup_ttl_seconds = dedup_ttl_seconds
+        self._local = threading.local()
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+    
+    def enqueue(self, phone, message, dedup_key=None, attributes=None):
+        """
+        Durably record a send.
+        
+        Returns:
+            (row, created) - the existing row is returned for a duplicate dedup_key
+        """
+        now = time.time()
+        with self._connect() as db:
+            if dedup_key is not None:
+                # Past the dedup window the same key is a new send
+                db.execute(
+                    "UPDATE outbox SET dedup_key = NULL WHERE dedup_key = ? AND status = ? AND sent_at <= ?",
+                    (dedup_key, SENT, now - self.dedup_ttl_seconds)
+                )
+                # A client retry of a send that ran out of attempts starts it over
+                db.execute(
+                    "UPDATE outbox SET status = ?, attempts = 0, next_attempt_at = ? "
+                    "WHERE dedup_key = ? AND status = ?",
+                    (PENDING, now, dedup_key, DEAD)
+                )
+            cursor = db.execute(
+                "INSERT OR IGNORE INTO outbox (dedup_key, phone, message, attributes, status, "
+                "next_attempt_at, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (dedup_key, phone, message, json.dumps(attributes or {}), PENDING, now, now)
+            )
+            created = cursor.rowcount == 1
+            if created:
+                row = db.execute("SELECT * FROM outbox WHERE id = ?", (cursor.lastrowid,)).fetchone()
+            else:
+                row = db.execute("SELECT * FROM outbox WHERE dedup_key = ?", (dedup_key,)).fetchone()
+        return self._to_dict(row), created
+    
+    def claim(self, row_id, now=None):
+        """Lease a single row for sending; returns the row or None if unavailable."""
+        now = time.time() if now is None else now
+        with self._connect() as db:
+            cursor = db.execute(
+                "UPDATE outbox SET status = ?, next_attempt_at = ? WHERE id = ? AND "
+                "(status = ? OR (status = ? AND next_attempt_at <= ?))",
+                (SENDING, now + self.lease_seconds, row_id, PENDING, SENDING, now)
+            )
+            if cursor.rowcount != 1:
+                return None
+            return self._to_dict(db.execute("SELECT * FROM outbox WHERE id = ?", (row_id,)).fetchone())
+    
+    def claim_due(self, limit=10, now=None):
+        """Lease up to limit rows whose next attempt is due (expired leases included)."""
+        now = time.time() if now is None else now
+        db = self._connect()
+        with db:
+            db.execute("BEGIN IMMEDIATE")
+            rows = db.execute(
+                "SELECT * FROM outbox WHERE status IN (?, ?) AND next_attempt_at <= ? "
+                "ORDER BY next_attempt_at LIMIT ?",
+                (PENDING, SENDING, now, limit)
+            ).fetchall()
+            db.executemany(
+                "UPDATE outbox SET status = ?, next_attempt_at = ? WHERE id = ?",
+                [(SENDING, now + self.lease_seconds, row[0]) for row in rows]
+            )
+        return [dict(self._to_dict(row), status=SENDING) for row in rows]
+    
+    def mark_sent(self, row_id, message_id):
+        with self._connect() as db:
+            db.execute(
+                "UPDATE outbox SET status = ?, message_id = ?, sent_at = ?, attempts = attempts + 1, "
+                "last_error = NULL WHERE id = ?",
+                (SENT, message_id, time.time(), row_id)
+            )
+    
+    def mark_failed(self, row_id, error, retry_at=None):
+        """Record a failed attempt; retry_at None marks the row dead."""
+        with self._connect() as db:
+            db.execute(
+                "UPDATE outbox SET status = ?, next_attempt_at = ?, attempts = attempts + 1, "
+                "last_error = ? WHERE id = ?",
+                (PENDING if retry_at is not None else DEAD, retry_at or time.time(), error, row_id)
+            )
+    
+    def defer(self, row_id, retry_at):
+        """Push a row back without counting an attempt (rate limited)."""
+        with self._connect() as db:
+            db.execute(
+                "UPDATE outbox SET status = ?, next_attempt_at = ? WHERE id = ?",
+                (PENDING, retry_at, row_id)
+            )
+    
+    def get(self, row_id):
+        with self._connect() as db:
+            return self._to_dict(db.execute("SELECT * FROM outbox WHERE id = ?", (row_id,)).fetchone())
+    
+    def counts(self):
+        """Number of rows per status."""
+        with self._connect() as db:
+            return dict(db.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+    
+    def _connect(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+    
+    @staticmethod
+    def _to_dict(row):
+        if row is None:
+            return None
+        record = dict(zip(COLUMNS, row))
+        record['attributes'] = json.loads(record['attributes'] or '{}')
+        return record
+
+
+class DestinationRateLimiter:
+    """Minimum spacing between sends to the same destination number."""
+    
+    def __init__(self, per_destination_per_second=1.0):
+        self.interval = 1.0 / per_destination_per_second
+        self._next = {}
+        self._lock = threading.Lock()
+    
+    def acquire(self, phone, identity=None, now=None):
+        """Reserve a send slot; returns seconds to wait (0 means send now)."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            ready = self._next.get(phone, 0.0)
+            if ready > now:
+                return ready - now
+            self._next[phone] = now + self.interval
+            return 0.0
+
+
+class OutboxWorker:
+    """
+    Sends outbox rows, retrying failures with exponential backoff and full jitter.
+    """
+    
+    def __init__(self, outbox, publish, workers=4, max_attempts=8, base_delay=0.5, max_delay=60.0,
+                 rate_limiter=None, poll_interval=0.5):
+        """
+        Args:
+            outbox: SmsOutbox
+            publish: publish(phone, message, attributes) -> SNS MessageId
+            workers: Background sender threads
+            max_attempts: Attempts before a row is marked dead
+            base_delay: Backoff base in seconds
+            max_delay: Backoff ceiling in seconds
+            rate_limiter: Object with acquire(phone, identity) -> wait seconds
+            poll_interval: Idle sleep between polls
+        """
+        self.outbox = outbox
+        self.publish = publish
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rate_limiter = rate_limiter or DestinationRateLimiter()
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._threads = []
+    
+    def send_now(self, row_id, max_wait=0.0):
+        """
+        Attempt one row immediately on the caller's thread.
+        
+        Args:
+            row_id: Outbox row
+            max_wait: Longest rate-limit wait to sit out inline before deferring
+        
+        Returns:
+            The row after the attempt (status SENT, PENDING, SENDING or DEAD)
+        """
+        row = self.outbox.claim(row_id)
+        if row is not None:
+            self._attempt(row, max_wait)
+        return self.outbox.get(row_id)
+    
+    def start(self):
+        """Start background workers (idempotent)."""
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"sms-outbox-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+    
+    def kick(self):
+        """Wake idle workers to look for due rows."""
+        self._wake.set()
+    
+    def stop(self, timeout=5.0):
+        self._stopped.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+    
+    def drain(self, limit=100):
+        """Attempt every due row once on the caller's thread; returns rows attempted."""
+        rows = self.outbox.claim_due(limit)
+        for row in rows:
+            self._attempt(row)
+        return len(rows)
+    
+    def backoff(self, attempts):
+        """Full-jitter exponential delay before the next attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempts)))
+    
+    def _run(self):
+        while not self._stopped.is_set():
+            rows = self.outbox.claim_due(limit=self.workers)
+            if not rows:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+            for row in rows:
+                self._attempt(row)
+    
+    def _attempt(self, row, max_wait=0.0):
+        identity = origination_identity(row['attributes'])
+        deadline = time.monotonic() + max_wait
+        wait = self.rate_limiter.acquire(row['phone'], identity)
+        while 0 < wait <= deadline - time.monotonic():
+            time.sleep(wait)
+            wait = self.rate_limiter.acquire(row['phone'], identity)
+        if wait > 0:
+            self.outbox.defer(row['id'], time.time() + wait)
+            return
+        
+        try:
+            message_id = self.publish(row['phone'], row['message'], row['attributes'])
+            if not message_id:
+                raise RuntimeError('SNS publish returned no MessageId')
+        except Exception as e:
+            attempts = row['attempts'] + 1
+            if is_permanent_error(e):
+                log.warning('SNS rejected outbox row, not retrying', row=row['id'], to=row['phone'], error=str(e))
+                self.outbox.mark_failed(row['id'], str(e))
+            elif attempts >= self.max_attempts:
+                log.error('Giving up on outbox row', row=row['id'], attempts=attempts, to=row['phone'], error=str(e))
+                self.outbox.mark_failed(row['id'], str(e))
+            else:
+                self.outbox.mark_failed(row['id'], str(e), retry_at=time.time() + self.backoff(attempts))
+                self.kick()
+            return
+        
+        self.outbox.mark_sent(row['id'], message_id)
+
+
+def create_outbox_worker(publish, path=None, workers=None, rate_limiter=None):
+    """Build an outbox and worker from the environment."""
+    outbox = SmsOutbox(
+        path or os.environ.get('SMS_OUTBOX_PATH', DEFAULT_OUTBOX_PATH),
+        dedup_ttl_seconds=float(os.environ.get('SMS_OUTBOX_DEDUP_TTL_SECONDS', DEFAULT_DEDUP_TTL_SECONDS))
+    )
+    return OutboxWorker(
+        outbox,
+        publish,
+        workers=workers or int(os.environ.get('SMS_OUTBOX_WORKERS', '4')),
+        rate_limiter=rate_limiter
+    )
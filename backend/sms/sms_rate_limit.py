@@ -0,0 +1,141 @@
+"""
+SMS Rate Limiter - per-country and per-origination token buckets
+
+SNS throughput limits differ by destination country and by originating
+identity (10DLC number, toll-free number, sender ID). Each send needs a
+token from its country bucket, its origination identity bucket and the
+destination's spacing slot; when any is short, the caller is told how
+long to wait so the send is deferred (the outbox re-queues it) instead
+of tripping SNS throttling.
+"""
+
+import json
+import os
+import threading
+import time
+
+from sms_e164 import calling_code
+
+# (messages per second, burst) by calling code
+DEFAULT_COUNTRY_RATES = {
+    '1': (20.0, 20),     # US/Canada, registered 10DLC / toll-free
+    '57': (10.0, 10),    # Colombia
+    '52': (10.0, 10),    # Mexico
+    '58': (5.0, 5),      # Venezuela
+}
+DEFAULT_RATE = (5.0, 10)
+DEFAULT_IDENTITY_RATE = (20.0, 20)
+
+ORIGINATION_ATTRIBUTE = 'AWS.MM.SMS.OriginationNumber'
+
+
+def origination_identity(attributes):
+    """Origination identity from SNS message attributes, or None for the account default."""
+    return (attributes or {}).get(ORIGINATION_ATTRIBUTE, {}).get('StringValue')
+
+
+class TokenBucket:
+    """Token bucket that reports how long until a token is available."""
+    
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = None
+    
+    def refill(self, now):
+        if self.updated is not None:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def wait_time(self):
+        """Seconds until one token is available (call after refill)."""
+        return 0.0 if self.tokens >= 1.0 else (1.0 - self.tokens) / self.rate
+
+
+class SmsRateLimiter:
+    """
+    Token buckets per destination country and per origination identity,
+    plus minimum spacing between sends to the same number.
+    """
+    
+    def __init__(self, country_rates=None, default_rate=DEFAULT_RATE, identity_rates=None,
+                 default_identity_rate=DEFAULT_IDENTITY_RATE, per_destination_per_second=1.0):
+        """
+        Args:
+            country_rates: Calling code -> (per second, burst)
+            default_rate: Rate for countries not listed
+            identity_rates: Origination identity -> (per second, burst)
+            default_identity_rate: Rate for identities not listed
+            per_destination_per_second: Max sends per second to one number
+        """
+        self.country_rates = dict(DEFAULT_COUNTRY_RATES if country_rates is None else country_rates)
+        self.default_rate = default_rate
+        self.identity_rates = dict(identity_rates or {})
+        self.default_identity_rate = default_identity_rate
+        self.destination_interval = 1.0 / per_destination_per_second
+        self._countries = {}
+        self._identities = {}
+        self._destinations = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_env(cls):
+        """
+        Build from SMS_RATE_LIMITS, e.g.
+        {"countries": {"57": [10, 10]}, "default": [5, 10], "identities": {"+18885550100": [3, 3]}}
+        """
+        config = json.loads(os.environ.get('SMS_RATE_LIMITS') or '{}')
+        countries = dict(DEFAULT_COUNTRY_RATES)
+        countries.update({code: tuple(rate) for code, rate in config.get('countries', {}).items()})
+        return cls(
+            country_rates=countries,
+            default_rate=tuple(config.get('default', DEFAULT_RATE)),
+            identity_rates={k: tuple(v) for k, v in config.get('identities', {}).items()},
+            default_identity_rate=tuple(config.get('default_identity', DEFAULT_IDENTITY_RATE))
+        )
+    
+    def acquire(self, phone_number, identity=None, now=None):
+        """
+        Take a token for a send if every limit allows it.
+        
+        Nothing is consumed unless all limits pass, so a deferred send
+        does not burn capacity.
+        
+        Args:
+            phone_number: E.164 destination
+            identity: Origination identity (None for the account default)
+        
+        Returns:
+            Seconds to wait before retrying; 0 means send now
+        """
+        now = time.monotonic() if now is None else now
+        code = calling_code(phone_number) or 'unknown'
+        identity = identity or 'default'
+        
+        with self._lock:
+            country = self._countries.get(code)
+            if country is None:
+                country = self._countries[code] = TokenBucket(*self.country_rates.get(code, self.default_rate))
+            origin = self._identities.get(identity)
+            if origin is None:
+                origin = self._identities[identity] = TokenBucket(
+                    *self.identity_rates.get(identity, self.default_identity_rate)
+                )
+            
+            country.refill(now)
+            origin.refill(now)
+            wait = max(
+                country.wait_time(),
+                origin.wait_time(),
+                self._destinations.get(phone_number, 0.0) - now
+            )
+            if wait > 0:
+                return wait
+            
+            country.tokens -= 1.0
+            origin.tokens -= 1.0
+            self._destinations[phone_number] = now + self.destination_interval
+            if len(self._destinations) > 10000:
+                self._destinations = {p: t for p, t in self._destinations.items() if t > now}
+            return 0.0
@@ -0,0 +1,251 @@
+"""
+SMS Receipts - delivery-status ingestion and a receipt index
+
+SNS writes one delivery-status record per SMS to CloudWatch Logs
+(/aws/sns/<region>/<account>/DirectPublishToPhoneNumber and .../Failure).
+A subscription filter on those groups invokes the SMS Lambda with an
+"awslogs" event; the records are parsed and indexed by messageId so the
+delivery-proof panel can poll a lookup instead of an operator searching
+the logs. A JSON-lines file of the same records works as a local
+stand-in feed.
+
+The index is a DynamoDB table (RECEIPTS_TABLE) shared by every
+container, or a SQLite file for local runs. Only the masked destination
+is stored; the raw number is never written to the index.
+"""
+
+import base64
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from sms_logging import mask_phone
+
+DELIVERED = 'DELIVERED'
+FAILED = 'FAILED'
+PENDING = 'PENDING'
+
+DEFAULT_RECEIPTS_PATH = '/tmp/sms-receipts.db'
+RECEIPT_TTL_SECONDS = 30 * 24 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS receipts (
+    message_id TEXT PRIMARY KEY,
+    to_masked TEXT,
+    status TEXT NOT NULL,
+    provider_response TEXT,
+    carrier TEXT,
+    price_usd REAL,
+    dwell_ms INTEGER,
+    delivered_at TEXT,
+    ingested_at REAL NOT NULL
+);
+"""
+
+COLUMNS = ('message_id', 'to_masked', 'status', 'provider_response', 'carrier',
+           'price_usd', 'dwell_ms', 'delivered_at', 'ingested_at')
+
+
+def parse_delivery_status(record):
+    """
+    Parse one SNS SMS delivery-status log record.
+    
+    Args:
+        record: Parsed JSON, e.g. {"notification": {"messageId": ..., "timestamp": ...},
+                "delivery": {"destination": ..., "providerResponse": ..., ...},
+                "status": "SUCCESS"}
+    
+    Returns:
+        Receipt dict, or None if the record has no messageId
+    """
+    notification = record.get('notification') or {}
+    delivery = record.get('delivery') or {}
+    message_id = notification.get('messageId')
+    if not message_id:
+        return None
+    return {
+        'message_id': message_id,
+        'to_masked': mask_phone(delivery.get('destination') or ''),
+        'status': DELIVERED if record.get('status') == 'SUCCESS' else FAILED,
+        'provider_response': delivery.get('providerResponse'),
+        'carrier': delivery.get('phoneCarrier'),
+        'price_usd': delivery.get('priceInUSD'),
+        'dwell_ms': delivery.get('dwellTimeMsUntilDeviceAck', delivery.get('dwellTimeMs')),
+        'delivered_at': notification.get('timestamp')
+    }
+
+
+def decode_cloudwatch_event(event):
+    """
+    Decode a CloudWatch Logs subscription event.
+    
+    Returns:
+        List of parsed delivery-status records (non-JSON lines are skipped)
+    """
+    payload = json.loads(gzip.decompress(base64.b64decode(event['awslogs']['data'])))
+    records = []
+    for log_event in payload.get('logEvents', []):
+        try:
+            records.append(json.loads(log_event['message']))
+        except (ValueError, KeyError):
+            continue
+    return records
+
+
+def parse_lines(lines):
+    """Parse a JSON-lines delivery-status feed, skipping blank and invalid lines."""
+    records = []
+    for line in lines:
+        line = line.strip()
+        if line:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+class ReceiptIndex:
+    """
+    SQLite index of delivery receipts; safe to share across threads.
+    
+    The file is local to one container, so use it for local runs and
+    tests; deployed Lambdas use DynamoDBReceiptIndex.
+    """
+    
+    def __init__(self, path=DEFAULT_RECEIPTS_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+    
+    def ingest(self, records):
+        """
+        Index delivery-status records; returns the number indexed.
+        
+        A later record for the same messageId replaces the earlier one.
+        """
+        now = time.time()
+        rows = []
+        for record in records:
+            receipt = parse_delivery_status(record)
+            if receipt is not None:
+                rows.append(tuple(receipt[column] for column in COLUMNS[:-1]) + (now,))
+        if rows:
+            with self._connect() as db:
+                db.executemany(
+                    f"INSERT OR REPLACE INTO receipts ({', '.join(COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                    rows
+                )
+        return len(rows)
+    
+    def ingest_lines(self, lines):
+        """Index a JSON-lines delivery-status feed (the local stand-in for CloudWatch)."""
+        return self.ingest(parse_lines(lines))
+    
+    def get(self, message_id):
+        """Receipt for a messageId, or None if none has arrived."""
+        with self._connect() as db:
+            row = db.execute("SELECT * FROM receipts WHERE message_id = ?", (message_id,)).fetchone()
+        return self._to_dict(row)
+    
+    def _connect(self):
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+    
+    @staticmethod
+    def _to_dict(row):
+        if row is None:
+            return None
+        return dict(zip(COLUMNS, row))
+
+
+class DynamoDBReceiptIndex:
+    """
+    Receipt index on a DynamoDB table with partition key "pk" (the messageId).
+    
+    Every container reads and writes the same table, so a receipt ingested
+    by one invocation is visible to lookups in any other. Enable the
+    table's TTL on "expires_at" so old receipts are purged.
+    """
+    
+    def __init__(self, table_name, client=None, ttl_seconds=RECEIPT_TTL_SECONDS):
+        if client is None:
+            import boto3
+            client = boto3.client('dynamodb')
+        self.table_name = table_name
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+    
+    def ingest(self, records):
+        """
+        Index delivery-status records; returns the number indexed.
+        
+        A later record for the same messageId replaces the earlier one.
+        """
+        now = time.time()
+        count = 0
+        for record in records:
+            receipt = parse_delivery_status(record)
+            if receipt is None:
+                continue
+            self.client.put_item(
+                TableName=self.table_name,
+                Item={
+                    'pk': {'S': receipt['message_id']},
+                    'receipt': {'S': json.dumps(dict(receipt, ingested_at=now))},
+                    'expires_at': {'N': str(int(now + self.ttl_seconds))}
+                }
+            )
+            count += 1
+        return count
+    
+    def ingest_lines(self, lines):
+        """Index a JSON-lines delivery-status feed (the local stand-in for CloudWatch)."""
+        return self.ingest(parse_lines(lines))
+    
+    def get(self, message_id):
+        """Receipt for a messageId, or None if none has arrived."""
+        response = self.client.get_item(
+            TableName=self.table_name,
+            Key={'pk': {'S': message_id}},
+            ConsistentRead=True
+        )
+        item = response.get('Item')
+        if not item:
+            return None
+        return json.loads(item['receipt']['S'])
+
+
+def create_receipt_index(table_name=None, path=None):
+    """
+    Build the receipt index from the environment: the DynamoDB table
+    RECEIPTS_TABLE when set, otherwise SQLite at SMS_RECEIPTS_PATH.
+    """
+    table_name = table_name or os.environ.get('RECEIPTS_TABLE')
+    if table_name:
+        return DynamoDBReceiptIndex(table_name)
+    return ReceiptIndex(path or os.environ.get('SMS_RECEIPTS_PATH', DEFAULT_RECEIPTS_PATH))
+
+
+def public_receipt(receipt):
+    """API view of a receipt (camelCase, no index internals)."""
+    return {
+        'messageId': receipt['message_id'],
+        'status': receipt['status'],
+        'toMasked': receipt['to_masked'],
+        'providerResponse': receipt['provider_response'],
+        'carrier': receipt['carrier'],
+        'priceUsd': receipt['price_usd'],
+        'dwellMs': receipt['dwell_ms'],
+        'deliveredAt': receipt['delivered_at']
+    }
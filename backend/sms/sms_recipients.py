@@ -0,0 +1,124 @@
+"""
+SMS Recipients - multi-recipient validation and bounded concurrent sends
+
+A `recipients: [...]` request is validated in one pass (every number
+goes through the E.164 trie once, duplicates are dropped) and the
+deliverable numbers are sent on a shared thread pool, so N emergency
+contacts cost one browser round-trip and are alerted in parallel.
+Results come back in request order with masked numbers only.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from sms_e164 import lookup as lookup_number
+from sms_logging import mask_phone, mask_text
+
+MAX_RECIPIENTS = 25
+DEFAULT_CONCURRENCY = 8
+
+
+def parse_recipients(recipients, max_recipients=MAX_RECIPIENTS):
+    """
+    Validate every recipient number in one pass.
+    
+    Args:
+        recipients: List of E.164 number strings
+        max_recipients: Most numbers accepted in one request
+    
+    Returns:
+        List of (phone, country, rejection) in request order, duplicates
+        dropped; rejection is None for deliverable numbers, otherwise the
+        recipient's error result
+    
+    Raises:
+        ValueError: If recipients is not a non-empty list within the limit
+    """
+    if not isinstance(recipients, list) or not recipients:
+        raise ValueError('recipients must be a non-empty list of phone numbers')
+    if len(recipients) > max_recipients:
+        raise ValueError(f'At most {max_recipients} recipients per request, got {len(recipients)}')
+    
+    checked = []
+    seen = set()
+    for phone in recipients:
+        if not isinstance(phone, str):
+            checked.append((None, None, failure(None, 'INVALID_PHONE_FORMAT', 'Recipient must be an E.164 string')))
+            continue
+        if phone in seen:
+            continue
+        seen.add(phone)
+        number = lookup_number(phone)
+        country = number['country']
+        if not number['valid']:
+            checked.append((phone, country, failure(phone, 'INVALID_PHONE_FORMAT', number['error'], country)))
+        elif not country.sms:
+            checked.append((phone, country, failure(
+                phone,
+                'UNSUPPORTED_COUNTRY',
+                f'SMS delivery is not available to {country.name or "+" + country.code}',
+                country
+            )))
+        else:
+            checked.append((phone, country, None))
+    return checked
+
+
+def success(phone, country, message_id, duplicate=False):
+    """Per-recipient result for a sent SMS."""
+    result = {'toMasked': mask_phone(phone), 'country': country.iso, 'ok': True, 'messageId': message_id}
+    if duplicate:
+        result['duplicate'] = True
+    return result
+
+
+def failure(phone, error_code, error_message, country=None):
+    """Per-recipient result for a number that was not sent (yet)."""
+    return {
+        'toMasked': mask_phone(phone),
+        'country': country.iso if country else None,
+        'ok': False,
+        'errorCode': error_code,
+        'errorMessage': mask_text(error_message)
+    }
+
+
+def summarize(results):
+    """Counts of sent and unsent recipients."""
+    sent = sum(1 for result in results if result['ok'])
+    return {
+        'total': len(results),
+        'sent': sent,
+        'queued': sum(1 for result in results if result.get('errorCode') == 'QUEUED_FOR_RETRY'),
+        'failed': len(results) - sent
+    }
+
+
+class RecipientSender:
+    """Runs one send per recipient on a bounded, reusable thread pool."""
+    
+    def __init__(self, max_workers=DEFAULT_CONCURRENCY):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='sms-recipient')
+    
+    def send_all(self, checked, send):
+        """
+        Send to every deliverable recipient concurrently.
+        
+        Args:
+            checked: Output of parse_recipients
+            send: send(phone, country) -> per-recipient result dict
+        
+        Returns:
+            One result per recipient, in request order
+        """
+        def attempt(item):
+            phone, country = item
+            try:
+                return send(phone, country)
+            except Exception as e:
+                return failure(phone, 'INTERNAL_ERROR', str(e), country)
+        
+        deliverable = [(phone, country) for phone, country, rejection in checked if rejection is None]
+        # A single recipient is sent inline; map() yields results in submission order
+        sent = iter(map(attempt, deliverable) if len(deliverable) <= 1 else self._pool.map(attempt, deliverable))
+        return [rejection or next(sent) for _, _, rejection in checked]
@@ -0,0 +1,145 @@
+"""
+Gemini handler cold-start benchmark and import-time report
+Original work created for Google Gemini 3 Hackathon 2026
+
+Each sample starts a fresh interpreter, imports gemini_handler and
+serves one request, timing the module import and the first response
+separately (what a Lambda cold start pays on top of the runtime). SSM
+is left without credentials so /analyze falls back after loading the
+SDK, which keeps the numbers free of network time.
+
+With --report, a `python -X importtime` run of the /health and /analyze
+paths is summarized by top-level package and written to the given file.
+
+Usage:
+    python benchmarks/bench_gemini_cold_start.py --site /path/to/sdk-site-packages
+    python benchmarks/bench_gemini_cold_start.py --site ... --handler-dir /path/to/older/handler
+    python benchmarks/bench_gemini_cold_start.py --site ... --report deployment/lambda/importtime-report.txt
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+HANDLER_DIR = PROJECT_ROOT / "deployment" / "lambda"
+# warmup.py, packaged next to the handler
+WARMUP_DIR = PROJECT_ROOT / "src" / "aws"
+
+EVENTS = {
+    "health": {"requestContext": {"http": {"method": "GET", "path": "/health"}}},
+    "options": {"requestContext": {"http": {"method": "OPTIONS", "path": "/analyze"}}},
+    "analyze": {
+        "requestContext": {"http": {"method": "POST", "path": "/analyze"}},
+        "body": json.dumps({"transcript": "help me, someone is following me", "location": "Bogota"}),
+    },
+}
+
+SAMPLE = """
+import time
+start = time.perf_counter()
+import gemini_handler
+imported = time.perf_counter()
+response = gemini_handler.lambda_handler({event}, None)
+done = time.perf_counter()
+import json, sys
+print(json.dumps({{
+    "status": response["statusCode"],
+    "import_ms": (imported - start) * 1000,
+    "request_ms": (done - imported) * 1000,
+    "modules": len(sys.modules),
+}}))
+"""
+
+
+def child_env(handler_dir, site):
+    env = {key: value for key, value in os.environ.items() if not key.startswith("AWS_")}
+    env.update({
+        "PYTHONPATH": os.pathsep.join(str(path) for path in [handler_dir, WARMUP_DIR, site] if path),
+        "AWS_DEFAULT_REGION": "us-east-1",
+        "AWS_EC2_METADATA_DISABLED": "true",
+        "AWS_SHARED_CREDENTIALS_FILE": os.devnull,
+        "AWS_CONFIG_FILE": os.devnull,
+    })
+    return env
+
+
+def cold_start(handler_dir, site, path, runs):
+    """Import and first-request timings over fresh interpreters."""
+    code = SAMPLE.format(event=repr(EVENTS[path]))
+    env = child_env(handler_dir, site)
+    # One unmeasured run so every sample sees compiled bytecode
+    subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, check=True)
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+        samples.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    return {
+        "status": samples[0]["status"],
+        "modules": samples[0]["modules"],
+        "import_ms": round(statistics.median(s["import_ms"] for s in samples), 1),
+        "request_ms": round(statistics.median(s["request_ms"] for s in samples), 1),
+        "total_ms": round(statistics.median(s["import_ms"] + s["request_ms"] for s in samples), 1),
+    }
+
+
+def import_times(handler_dir, site, path):
+    """Cumulative self import time (us) per top-level package for one cold request."""
+    code = SAMPLE.format(event=repr(EVENTS[path]))
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", code], env=child_env(handler_dir, site),
+                            capture_output=True, text=True, check=True)
+    packages = defaultdict(int)
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        packages[name.strip().split(".")[0]] += int(self_us)
+    return dict(packages)
+
+
+def write_report(handler_dir, site, report_path, top=15):
+    lines = [
+        "# gemini_handler import-time report",
+        "# Generated by benchmarks/bench_gemini_cold_start.py --report (python -X importtime)",
+        "# Self import time summed per top-level package for the first request of a fresh interpreter.",
+        "# Includes interpreter startup, and optional packages the SDK imports when present in the",
+        "# measuring environment (e.g. IPython) that a Lambda image would not ship.",
+        "",
+    ]
+    for path in ("health", "analyze"):
+        packages = import_times(handler_dir, site, path)
+        total = sum(packages.values())
+        lines.append(f"## first request: {path}  (total {total / 1000:.1f} ms, {len(packages)} top-level packages)")
+        for name, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+            lines.append(f"{self_us / 1000:>10.1f} ms  {name}")
+        lines.append("")
+    Path(report_path).write_text("\n".join(lines))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--handler-dir", default=str(HANDLER_DIR), help="Directory containing gemini_handler.py")
+    parser.add_argument("--site", help="Directory with google-generativeai and boto3 installed")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--report", help="Write an import-time report to this file")
+    args = parser.parse_args()
+    
+    print(f"handler: {Path(args.handler_dir) / 'gemini_handler.py'}  runs: {args.runs}")
+    for path in EVENTS:
+        stats = cold_start(args.handler_dir, args.site, path, args.runs)
+        print(f"  {path:<8} HTTP {stats['status']}  import {stats['import_ms']:>7.1f} ms  "
+              f"first request {stats['request_ms']:>7.1f} ms  total {stats['total_ms']:>7.1f} ms  "
+              f"modules {stats['modules']}")
+    
+    if args.report:
+        write_report(args.handler_dir, args.site, args.report)
+        print(f"import-time report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+SMS handler microbenchmark - per-invocation CPU time
+Original work created for Google Gemini 3 Hackathon 2026
+
+Measures process CPU time per call of backend/sms lambda_function
+for a CORS preflight, a first-time send and a replayed duplicate. SNS
+is replaced with an in-process client so only handler work is timed;
+log output goes to /dev/null but is still formatted.
+
+Usage:
+    PYTHONPATH=deployment/lambda-package python benchmarks/bench_sms_handler.py
+    python benchmarks/bench_sms_handler.py --handler-dir /path/to/older/handler
+"""
+
+import argparse
+import contextlib
+import importlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SMS_PATH = PROJECT_ROOT / "backend" / "sms"
+
+
+class LocalSNS:
+    """Stand-in SNS client that returns a MessageId without a network call."""
+    
+    def __init__(self):
+        self.count = 0
+    
+    def publish(self, **kwargs):
+        self.count += 1
+        return {"MessageId": f"bench-{self.count}", "ResponseMetadata": {"HTTPStatusCode": 200}}
+
+
+class Context:
+    aws_request_id = "bench-request"
+
+
+def function_url_event(method, body=None):
+    return {
+        "version": "2.0",
+        "rawPath": "/",
+        "headers": {"origin": "https://dfc8ght8abwqc.cloudfront.net", "content-type": "application/json"},
+        "requestContext": {"http": {"method": method, "path": "/"}, "requestId": "bench"},
+        "body": json.dumps(body) if body is not None else None,
+        "isBase64Encoded": False,
+    }
+
+
+def load_handler(handler_dir):
+    """Import lambda_function from handler_dir, with the sms_* helpers importable."""
+    for path in (str(SMS_PATH), str(handler_dir)):
+        if path in sys.path:
+            sys.path.remove(path)
+        sys.path.insert(0, path)
+    sys.modules.pop("lambda_function", None)
+    module = importlib.import_module("lambda_function")
+    module.sns = LocalSNS()
+    return module
+
+
+def cpu_per_call(fn, iterations):
+    """Per-call CPU time samples in microseconds."""
+    samples = []
+    for i in range(iterations):
+        start = time.process_time()
+        fn(i)
+        samples.append((time.process_time() - start) * 1e6)
+    return samples
+
+
+def run(handler_dir, iterations):
+    module = load_handler(handler_dir)
+    context = Context()
+    preflight = function_url_event("OPTIONS")
+    duplicate = function_url_event("POST", {"to": "+573000000000", "message": "Emergency alert", "buildId": "bench"})
+    
+    def send(i):
+        body = {"to": f"+573{i:09d}", "message": f"Emergency alert {i}", "buildId": "bench"}
+        module.lambda_handler(function_url_event("POST", body), context)
+    
+    results = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        module.lambda_handler(duplicate, context)
+        for name, fn in [
+            ("options", lambda i: module.lambda_handler(preflight, context)),
+            ("send", send),
+            ("duplicate", lambda i: module.lambda_handler(duplicate, context)),
+        ]:
+            samples = cpu_per_call(fn, iterations)
+            results[name] = {
+                "mean_us": round(statistics.mean(samples), 1),
+                "p50_us": round(statistics.median(samples), 1),
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--handler-dir", default=str(SMS_PATH), help="Directory containing lambda_function.py")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+        os.environ["SMS_OUTBOX_PATH"] = os.path.join(tmp, "outbox.db")
+        # Effectively unlimited so rate limiting never defers a benchmark send
+        os.environ["SMS_RATE_LIMITS"] = json.dumps({
+            "countries": {"57": [1e9, 1e9]},
+            "default_identity": [1e9, 1e9],
+        })
+        results = run(Path(args.handler_dir), args.iterations)
+    
+    print(f"handler: {Path(args.handler_dir) / 'lambda_function.py'}  iterations: {args.iterations}")
+    for name, stats in results.items():
+        print(f"  {name:<10} mean {stats['mean_us']:>9.1f} us   p50 {stats['p50_us']:>9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+"""
+Slim Lambda package builder for the Gemini runtime
+Original work created for Google Gemini 3 Hackathon 2026
+
+Builds deployment/build/lambda-package and deployment/build/lambda-package.zip
+from deployment/lambda/requirements.txt, keeping only what gemini_handler uses:
+
+1. The requirements are pip installed for the Lambda target (manylinux
+   x86_64, CPython 3.11) into a staging directory, or --source is reused.
+2. A fresh interpreter runs gemini_handler against /health, OPTIONS and
+   /analyze (once through the SSM fallback, once through the Gemini SDK
+   with SSM and the API pointed at closed local ports) and records every
+   module imported and every file opened from the staging directory.
+3. Modules never imported, files never opened, distributions with no
+   used files and binaries for other platforms are dropped. Files read
+   from C code (CA bundles) are kept through DEFAULT_KEEP and --keep.
+4. Bytecode is compiled with unchecked-hash invalidation: /var/task is
+   read-only so Lambda cannot cache .pyc files, and timestamp-based ones
+   go stale when the zip rounds mtimes to two seconds.
+5. The slim tree is traced again and must answer every event the same
+   way, then the full and slim packages are compared by size, unzip
+   time and cold import time.
+
+Tracing executes the packages, so run the builder where the target
+runtime runs: Linux with Python 3.11, e.g. the SAM build image
+    docker run --rm -v "$PWD:/var/task" -w /var/task public.ecr.aws/sam/build-python3.11 \\
+        python deployment/build_lambda_package.py
+
+Usage:
+    python deployment/build_lambda_package.py
+    python deployment/build_lambda_package.py --source /path/to/pip-target --output /tmp/slim --zip /tmp/slim.zip
+    python deployment/build_lambda_package.py --report deployment/lambda-package-report.txt
+"""
+
+import argparse
+import compileall
+import csv
+import fnmatch
+import json
+import os
+import py_compile
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from collections import defaultdict
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+LAMBDA_DIR = PROJECT_ROOT / "deployment" / "lambda"
+REQUIREMENTS = LAMBDA_DIR / "requirements.txt"
+# Build output is untracked (.gitignore): --output is deleted and rewritten
+BUILD_DIR = PROJECT_ROOT / "deployment" / "build"
+OUTPUT_DIR = BUILD_DIR / "lambda-package"
+ZIP_PATH = BUILD_DIR / "lambda-package.zip"
+
+# Matches Runtime in gemini-runtime-cloudfront.yaml
+TARGET_PYTHON = (3, 11)
+TARGET_PLATFORM = "manylinux2014_x86_64"
+
+HANDLER = "gemini_handler"
+# rest_transport.py (GEMINI_TRANSPORT=rest) and warmup.py only need the standard library
+APP_FILES = [
+    LAMBDA_DIR / "gemini_handler.py",
+    LAMBDA_DIR / "parameter_cache.py",
+    PROJECT_ROOT / "src" / "gemini" / "rest_transport.py",
+    PROJECT_ROOT / "src" / "aws" / "warmup.py",
+]
+
+# Read by C code (OpenSSL, gRPC core), so the trace cannot see them
+DEFAULT_KEEP = [
+    "certifi/cacert.pem",
+    "botocore/cacert.pem",
+    "grpc/_cython/_credentials/roots.pem",
+]
+
+# Never usable on Lambda (Windows/macOS binaries, console scripts, .pth hooks)
+FOREIGN_SUFFIXES = (".pyd", ".dll", ".exe", ".dylib", ".pth")
+
+EVENTS = [
+    {"requestContext": {"http": {"method": "GET", "path": "/health"}}},
+    {"requestContext": {"http": {"method": "OPTIONS", "path": "/analyze"}}},
+    {
+        "requestContext": {"http": {"method": "POST", "path": "/analyze"}},
+        "body": json.dumps({"transcript": "help me, someone is following me", "location": "Bogota"}),
+    },
+]
+
+# After the events: take the SDK path too, with the API at a closed port.
+# generate_content retries UNAVAILABLE for minutes, so it runs on a
+# daemon thread and the trace only waits long enough for its imports.
+GEMINI_SDK_STEP = """
+import google.generativeai as genai
+configure = genai.configure
+genai.configure = lambda **kwargs: configure(client_options={"api_endpoint": "127.0.0.1:9"}, **kwargs)
+handler.get_api_key = lambda: "trace-key"
+call = threading.Thread(target=handler.lambda_handler, args=(EVENTS[-1], None), daemon=True)
+call.start()
+call.join(15)
+"""
+
+TRACE_SCRIPT = """
+import importlib, json, os, sys, threading
+STAGING = os.path.realpath({staging!r})
+EVENTS = {events!r}
+opened = set()
+
+def audit(event, args):
+    if event == "open" and isinstance(args[0], (str, os.PathLike)):
+        path = os.path.realpath(os.fspath(args[0]))
+        if path.startswith(STAGING + os.sep):
+            opened.add(path)
+
+sys.path.insert(0, STAGING)
+sys.addaudithook(audit)
+handler = importlib.import_module({handler!r})
+statuses = [handler.lambda_handler(event, None)["statusCode"] for event in EVENTS]
+{extra}
+modules = [getattr(module, "__file__", None) for module in list(sys.modules.values())]
+used = sorted({{os.path.realpath(path) for path in modules if path}} | opened)
+print(json.dumps({{"statuses": statuses, "used": [path[len(STAGING) + 1:] for path in used if path.startswith(STAGING + os.sep)]}}))
+sys.stdout.flush()
+os._exit(0)
+"""
+
+# Environment for traces and timings: dummy AWS credentials, SSM at a closed port
+TRACE_ENV = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "AWS_ACCESS_KEY_ID": "trace",
+    "AWS_SECRET_ACCESS_KEY": "trace",
+    "AWS_ENDPOINT_URL_SSM": "http://127.0.0.1:9",
+    "AWS_MAX_ATTEMPTS": "1",
+    "AWS_EC2_METADATA_DISABLED": "true",
+    "AWS_CONFIG_FILE": os.devnull,
+    "AWS_SHARED_CREDENTIALS_FILE": os.devnull,
+    # Lambda cannot write __pycache__ under /var/task
+    "PYTHONDONTWRITEBYTECODE": "1",
+}
+
+# What the first /analyze imports, timed for the report
+IMPORT_PROBE = "import time; start = time.perf_counter(); import boto3, google.generativeai; print((time.perf_counter() - start) * 1000)"
+
+
+def child_env(path):
+    env = {key: value for key, value in os.environ.items() if not key.startswith(("AWS_", "PYTHON"))}
+    env.update(TRACE_ENV)
+    env["PYTHONPATH"] = str(path)
+    return env
+
+
+def install_requirements(staging, requirements=REQUIREMENTS):
+    """pip install the requirements for the Lambda target into staging."""
+    subprocess.run([
+        sys.executable, "-m", "pip", "install", "--quiet", "--no-compile",
+        "--target", str(staging),
+        "--requirement", str(requirements),
+        "--platform", TARGET_PLATFORM,
+        "--implementation", "cp",
+        "--python-version", "%d.%d" % TARGET_PYTHON,
+        "--only-binary=:all:",
+    ], check=True)
+
+
+def trace(staging, handler=HANDLER, events=EVENTS, extra=GEMINI_SDK_STEP, timeout=120):
+    """
+    Run the handler in a fresh interpreter against each event.
+    
+    Returns:
+        (statuses, used) - the status code per event, and the set of
+        staging-relative paths that were imported or opened
+    """
+    code = TRACE_SCRIPT.format(staging=str(staging), events=events, handler=handler, extra=extra)
+    output = subprocess.run([sys.executable, "-c", code], env=child_env(staging), cwd=str(staging),
+                            capture_output=True, text=True, timeout=timeout)
+    if output.returncode != 0:
+        raise RuntimeError(f"Trace of {handler} failed:\n{output.stderr[-4000:]}")
+    result = json.loads(output.stdout.strip().splitlines()[-1])
+    return result["statuses"], {Path(path).as_posix() for path in result["used"]}
+
+
+def list_files(root):
+    """Staging-relative posix paths of every file, skipping bytecode caches."""
+    root = Path(root)
+    return {
+        path.relative_to(root).as_posix()
+        for path in root.rglob("*")
+        if path.is_file() and "__pycache__" not in path.parts
+    }
+
+
+def read_records(root):
+    """Map each dist-info directory to the files its RECORD lists."""
+    records = {}
+    for record in Path(root).glob("*.dist-info/RECORD"):
+        with open(record, newline="") as f:
+            records[record.parent.name] = {row[0] for row in csv.reader(f) if row}
+    return records
+
+
+def plan(files, used, records, app_files=(), keep=DEFAULT_KEEP):
+    """
+    Decide which staged files go into the slim package.
+    
+    Args:
+        files: Every staged file (relative posix paths)
+        used: Files the trace imported or opened
+        records: Output of read_records
+        app_files: Handler files, always kept
+        keep: Extra glob patterns to keep
+    
+    Returns:
+        Set of files to keep
+    """
+    kept = {
+        path for path in files
+        if not path.endswith(FOREIGN_SUFFIXES)
+        and (path in used or path in app_files or any(fnmatch.fnmatch(path, pattern) for pattern in keep))
+    }
+    # A distribution stays if any of its files does: keep its metadata and
+    # the shared libraries auditwheel vendors next to it (<name>.libs/)
+    for dist_info, record in records.items():
+        if kept & record:
+            kept.update(
+                path for path in files
+                if path.startswith(dist_info + "/")
+                or (path in record and path.split("/")[0].endswith(".libs"))
+            )
+    return kept
+
+
+def copy_files(staging, output, files):
+    if Path(output).exists():
+        shutil.rmtree(output)
+    for path in sorted(files):
+        target = Path(output) / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(Path(staging) / path, target)
+
+
+def compile_bytecode(root):
+    """Compile every module with hashes the runtime never re-checks against sources."""
+    if not compileall.compile_dir(str(root), quiet=1, workers=0,
+                                  invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH):
+        raise RuntimeError(f"Bytecode compilation failed under {root}")
+
+
+def write_zip(root, zip_path):
+    """Deterministic zip: sorted entries, fixed timestamps and permissions."""
+    root = Path(root)
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+        for path in sorted(p for p in root.rglob("*") if p.is_file()):
+            info = zipfile.ZipInfo(path.relative_to(root).as_posix(), date_time=(1980, 1, 1, 0, 0, 0))
+            info.external_attr = (0o755 if os.access(path, os.X_OK) else 0o644) << 16
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, path.read_bytes(), compresslevel=9)
+
+
+def extract(zip_path, target):
+    """Unzip keeping the archived mtimes, as Lambda does."""
+    with zipfile.ZipFile(zip_path) as archive:
+        for info in archive.infolist():
+            archive.extract(info, target)
+            mtime = time.mktime(info.date_time + (0, 0, -1))
+            os.utime(os.path.join(target, info.filename), (mtime, mtime))
+
+
+def measure(zip_path, runs=5):
+    """Size, median unzip time and median cold import time of a package zip."""
+    stats = {"zip_mb": os.path.getsize(zip_path) / 1e6}
+    with zipfile.ZipFile(zip_path) as archive:
+        stats["files"] = len(archive.infolist())
+        stats["unzipped_mb"] = sum(info.file_size for info in archive.infolist()) / 1e6
+    
+    unzip_ms, import_ms = [], []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            extract(zip_path, tmp)
+            unzip_ms.append((time.perf_counter() - start) * 1000)
+            output = subprocess.run([sys.executable, "-c", IMPORT_PROBE], env=child_env(tmp), cwd=tmp,
+                                    capture_output=True, text=True, check=True)
+            import_ms.append(float(output.stdout.strip().splitlines()[-1]))
+    stats["unzip_ms"] = statistics.median(unzip_ms)
+    stats["import_ms"] = statistics.median(import_ms)
+    return stats
+
+
+def dropped_by_top_level(staging, files, kept):
+    """Bytes dropped per top-level entry, largest first."""
+    dropped = defaultdict(int)
+    for path in files - kept:
+        dropped[path.split("/")[0]] += (Path(staging) / path).stat().st_size
+    return sorted(dropped.items(), key=lambda item: -item[1])
+
+
+def report_lines(full, slim, dropped, distributions, top=15):
+    lines = ["# Gemini Lambda package: full vs slim (deployment/build_lambda_package.py)", ""]
+    for label, key, unit in [
+        ("files", "files", ""),
+        ("unzipped size", "unzipped_mb", " MB"),
+        ("zip size", "zip_mb", " MB"),
+        ("unzip time", "unzip_ms", " ms"),
+        ("import boto3 + google.generativeai", "import_ms", " ms"),
+    ]:
+        lines.append(f"{label:<36} {full[key]:>10.1f}{unit:<4} -> {slim[key]:>10.1f}{unit}")
+    lines += ["", f"Largest dropped entries (top {top}):"]
+    lines += [f"{size / 1e6:>10.1f} MB  {name}" for name, size in dropped[:top]]
+    lines += ["", "Distributions in the slim package:"]
+    lines += [f"  {name}" for name in distributions]
+    return lines
+
+
+def build(staging, output, zip_path, handler=HANDLER, events=EVENTS, extra=GEMINI_SDK_STEP,
+          app_files=APP_FILES, keep=DEFAULT_KEEP):
+    """
+    Trace, prune, compile and zip one staged package.
+    
+    Returns:
+        Dict with the kept files, the dropped-bytes breakdown and the
+        kept distributions
+    
+    Raises:
+        RuntimeError: If the slim package answers any event differently
+    """
+    for app_file in app_files:
+        shutil.copy2(app_file, Path(staging) / Path(app_file).name)
+    
+    statuses, used = trace(staging, handler, events, extra)
+    files = list_files(staging)
+    records = read_records(staging)
+    kept = plan(files, used, records, {Path(f).name for f in app_files}, keep)
+    copy_files(staging, output, kept)
+    
+    slim_statuses, slim_used = trace(output, handler, events, extra)
+    missing = sorted(path for path in used - slim_used if not path.endswith(".pyc"))
+    if slim_statuses != statuses or missing:
+        raise RuntimeError(f"Slim package differs: statuses {statuses} -> {slim_statuses}, missing {missing[:10]}")
+    
+    compile_bytecode(output)
+    write_zip(output, zip_path)
+    return {
+        "kept": kept,
+        "dropped": dropped_by_top_level(staging, files, kept),
+        "distributions": sorted(name[:-len(".dist-info")] for name in records if kept & records[name]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", help="Existing pip --target directory to reuse instead of installing")
+    parser.add_argument("--requirements", default=str(REQUIREMENTS))
+    parser.add_argument("--output", default=str(OUTPUT_DIR), help="Slim package directory (replaced)")
+    parser.add_argument("--zip", default=str(ZIP_PATH), help="Slim package zip")
+    parser.add_argument("--keep", action="append", default=[], help="Extra glob pattern to keep (repeatable)")
+    parser.add_argument("--runs", type=int, default=5, help="Timing runs per package")
+    parser.add_argument("--report", help="Also write the comparison report to this file")
+    args = parser.parse_args()
+    
+    if sys.version_info[:2] != TARGET_PYTHON:
+        parser.error("run with Python %d.%d, the Lambda runtime: tracing and bytecode are version-specific" % TARGET_PYTHON)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        staging = Path(tmp) / "staging"
+        if args.source:
+            shutil.copytree(args.source, staging, ignore=shutil.ignore_patterns("__pycache__"))
+        else:
+            print(f"Installing {args.requirements} for {TARGET_PLATFORM} / CPython %d.%d..." % TARGET_PYTHON)
+            install_requirements(staging, args.requirements)
+        
+        print("Tracing gemini_handler and pruning...")
+        result = build(staging, args.output, args.zip, keep=DEFAULT_KEEP + args.keep)
+        
+        # Baseline: everything, with the timestamp .pyc files pip writes by default
+        compileall.compile_dir(str(staging), quiet=1, workers=0)
+        full_zip = Path(tmp) / "full.zip"
+        shutil.make_archive(str(full_zip.with_suffix("")), "zip", staging)
+        print("Measuring full and slim packages...")
+        full = measure(full_zip, args.runs)
+        slim = measure(args.zip, args.runs)
+    
+    lines = report_lines(full, slim, result["dropped"], result["distributions"])
+    print("\n".join(lines))
+    if args.report:
+        Path(args.report).write_text("\n".join(lines) + "\n")
+    print(f"Slim package: {args.output} ({args.zip})")
+
+
+if __name__ == "__main__":
+    main()
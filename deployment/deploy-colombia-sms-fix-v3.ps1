@@ -25,7 +25,7 @@ $ErrorActionPreference = "Stop"
 # Configuration
 $BUILD_ID = "GEMINI3-COLOMBIA-SMS-FIX-20260129-v3"
 $FRONTEND_HTML = "Gemini3_AllSensesAI/deployment/ui/index.html"
-$BACKEND_HANDLER = "Gemini3_AllSensesAI/backend/sms/lambda_function_url_handler_v4.py"
+$BACKEND_HANDLER = "Gemini3_AllSensesAI/backend/sms/lambda_function.py"
 $REGION = "us-east-1"
 
 Write-Host "========================================" -ForegroundColor Cyan
@@ -146,8 +146,9 @@ if (Test-Path $tempDir) {
 }
 New-Item -ItemType Directory -Path $tempDir | Out-Null
 
-# Copy handler to package directory
+# Copy handler and its helper modules to package directory
 Copy-Item -Path $BACKEND_HANDLER -Destination "$tempDir/lambda_function.py"
+Copy-Item -Path "Gemini3_AllSensesAI/backend/sms/sms_*.py" -Destination $tempDir
 
 # Create ZIP
 $zipPath = "Gemini3_AllSensesAI/backend/sms/lambda-v4.zip"
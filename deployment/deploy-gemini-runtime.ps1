@@ -4,7 +4,8 @@
 param(
     [string]$StackName = "allsensesai-gemini-runtime",
     [string]$Region = "us-east-1",
-    [switch]$SkipApiKeySetup
+    [switch]$SkipApiKeySetup,
+    [switch]$FullPackage
 )
 
 $ErrorActionPreference = "Stop"
@@ -77,34 +78,53 @@ Write-Host ""
 Write-Host "[3/8] Packaging Lambda function..." -ForegroundColor Yellow
 
 $lambdaDir = "deployment/lambda"
-$packageDir = "deployment/lambda-package"
-$zipFile = "deployment/lambda-package.zip"
-
-# Create package directory
-if (Test-Path $packageDir) {
-    Remove-Item -Recurse -Force $packageDir
-}
-New-Item -ItemType Directory -Path $packageDir | Out-Null
-
-# Copy Lambda handler
-Copy-Item "$lambdaDir/gemini_handler.py" "$packageDir/"
-
-# Copy Gemini client
-Copy-Item "src/gemini/client.py" "$packageDir/"
+$packageDir = "deployment/build/lambda-package"
+$zipFile = "deployment/build/lambda-package.zip"
+
+$docker = Get-Command docker -ErrorAction SilentlyContinue
+
+if ($docker -and -not $FullPackage) {
+    # Slim package: traced, pruned and precompiled inside the Lambda build image
+    # (see deployment/build_lambda_package.py)
+    Write-Host "  Building slim package in public.ecr.aws/sam/build-python3.11..." -ForegroundColor Cyan
+    docker run --rm -v "${PWD}:/var/task" -w /var/task public.ecr.aws/sam/build-python3.11 `
+        python deployment/build_lambda_package.py --report deployment/lambda-package-report.txt
+    if ($LASTEXITCODE -ne 0) {
+        Write-Host "  ERROR: Slim package build failed (rerun with -FullPackage to skip pruning)" -ForegroundColor Red
+        exit 1
+    }
+} else {
+    if (-not $FullPackage) {
+        Write-Host "  WARNING: Docker not found, building the full (unpruned) package" -ForegroundColor Yellow
+    }
 
-# Install dependencies
-Write-Host "  Installing dependencies..." -ForegroundColor Cyan
-pip install --target $packageDir google-generativeai python-dotenv boto3 -q
+    # Create package directory
+    if (Test-Path $packageDir) {
+        Remove-Item -Recurse -Force $packageDir
+    }
+    New-Item -ItemType Directory -Path $packageDir | Out-Null
+
+    # Copy Lambda handler
+    Copy-Item "$lambdaDir/gemini_handler.py" "$packageDir/"
+    Copy-Item "$lambdaDir/parameter_cache.py" "$packageDir/"
+    Copy-Item "src/gemini/rest_transport.py" "$packageDir/"
+    Copy-Item "src/aws/warmup.py" "$packageDir/"
+
+    # Install Linux wheels for the Lambda runtime
+    Write-Host "  Installing dependencies..." -ForegroundColor Cyan
+    pip install --target $packageDir -r "$lambdaDir/requirements.txt" `
+        --platform manylinux2014_x86_64 --implementation cp --python-version 3.11 --only-binary=:all: -q
+
+    # Create zip file
+    Write-Host "  Creating deployment package..." -ForegroundColor Cyan
+    if (Test-Path $zipFile) {
+        Remove-Item $zipFile
+    }
 
-# Create zip file
-Write-Host "  Creating deployment package..." -ForegroundColor Cyan
-if (Test-Path $zipFile) {
-    Remove-Item $zipFile
+    # Use PowerShell compression
+    Compress-Archive -Path "$packageDir/*" -DestinationPath $zipFile -Force
 }
 
-# Use PowerShell compression
-Compress-Archive -Path "$packageDir/*" -DestinationPath $zipFile -Force
-
 $zipSize = (Get-Item $zipFile).Length / 1MB
 Write-Host "  OK Package created: $([math]::Round($zipSize, 2)) MB" -ForegroundColor Green
 
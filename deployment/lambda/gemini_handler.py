@@ -8,96 +8,245 @@ This handler provides:
 3. Gemini API integration
 4. Fallback handling
 5. CORS support
+
+Startup: only the standard library is imported at module load. boto3
+and the Gemini SDK (grpc, protobuf, pydantic and the generativelanguage
+stacks) are imported on the first /analyze request, so /health and
+OPTIONS are answered without loading them. With GEMINI_TRANSPORT=rest
+the SDK is never imported; rest_transport.py calls the REST API directly.
+
+Config: the API key (and GEMINI_MODEL_PARAMETER, if set) is read from
+Parameter Store with one GetParameters call and cached for
+PARAMETER_CACHE_TTL seconds (default 300). After that it is refreshed in
+the background, so a rotated key takes effect without a cold start.
+
+Warm-up: invoking the function with {"warmup": true} (or from an
+EventBridge schedule) runs the whole initialization above, connects to
+Gemini and returns the time per stage (see warm_up). Under provisioned
+concurrency this runs during init; under SnapStart it runs before the
+snapshot, and the connection is opened after restore.
 """
 
 import json
 import os
 import time
 import logging
-import boto3
 from typing import Dict, Any
 
+from parameter_cache import ParameterCache, ParameterUnavailable, ssm_fetcher
+from warmup import WarmupTimer, initialization_type, is_warmup_event, register_snapshot_hooks
+
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Initialize SSM client for parameter store
-ssm = boto3.client('ssm')
-
-# Global variables for caching
+# Global variables for caching (created on first use)
+SSM_CLIENT = None
 GEMINI_CLIENT = None
+GEMINI_CLIENT_CONFIG = None
 GEMINI_AVAILABLE = False
-API_KEY_CACHED = None
+GEMINI_INIT_ATTEMPTED = False
+GEMINI_SDK_MISSING = False
+
+API_KEY_PARAMETER = os.environ.get('GEMINI_API_KEY_PARAMETER', '/allsensesai/gemini/api-key')
+# Optional: read the model name from Parameter Store too (same GetParameters call)
+MODEL_PARAMETER = os.environ.get('GEMINI_MODEL_PARAMETER')
+
+# Seconds a warm-up waits for Gemini to answer its connection check
+WARMUP_CONNECT_TIMEOUT = float(os.environ.get('WARMUP_CONNECT_TIMEOUT', '5'))
+
+
+def get_ssm_client():
+    """
+    SSM client for Parameter Store, created on first use.
+    """
+    global SSM_CLIENT
+    
+    if SSM_CLIENT is None:
+        import boto3
+        SSM_CLIENT = boto3.client('ssm')
+    return SSM_CLIENT
+
+
+# All config parameters, fetched together on first use and refreshed in
+# the background once older than PARAMETER_CACHE_TTL seconds
+PARAMETERS = ParameterCache(
+    [name for name in (API_KEY_PARAMETER, MODEL_PARAMETER) if name],
+    ssm_fetcher(get_ssm_client),
+    ttl=float(os.environ.get('PARAMETER_CACHE_TTL', '300'))
+)
 
 
 def get_api_key() -> str:
     """
     Retrieve Gemini API key from SSM Parameter Store.
-    Caches the key for subsequent invocations.
+    Served from PARAMETERS, so a rotated key is picked up without a cold start.
     """
-    global API_KEY_CACHED
-    
-    if API_KEY_CACHED:
-        return API_KEY_CACHED
-    
-    try:
-        parameter_name = os.environ.get('GEMINI_API_KEY_PARAMETER', '/allsensesai/gemini/api-key')
-        response = ssm.get_parameter(Name=parameter_name, WithDecryption=True)
-        API_KEY_CACHED = response['Parameter']['Value']
-        logger.info("Retrieved API key from Parameter Store")
-        return API_KEY_CACHED
-    except Exception as e:
-        logger.error(f"Failed to retrieve API key: {str(e)}")
-        raise
+    return PARAMETERS.get(API_KEY_PARAMETER)
+
+
+def get_model_name() -> str:
+    """
+    Gemini model name: GEMINI_MODEL_PARAMETER if set and readable, else GEMINI_MODEL.
+    """
+    if MODEL_PARAMETER:
+        try:
+            return PARAMETERS.get(MODEL_PARAMETER)
+        except ParameterUnavailable as e:
+            logger.warning(f"Model parameter unavailable, using GEMINI_MODEL: {str(e)}")
+    return os.environ.get('GEMINI_MODEL', 'gemini-1.5-pro')
+
+
+def use_rest_transport() -> bool:
+    """
+    GEMINI_TRANSPORT=rest: call Gemini through rest_transport.py instead of the SDK.
+    """
+    return os.environ.get('GEMINI_TRANSPORT', 'sdk') == 'rest'
 
 
 def initialize_gemini():
     """
     Initialize Gemini client.
-    Called once per Lambda container lifecycle.
+    Called on every /analyze request. The key and model come from the
+    parameter cache, and the client is rebuilt only when they change
+    (e.g. after a key rotation). A missing SDK is not retried. An
+    unavailable key is retried once the cache's backoff has passed,
+    and requests use the fallback until then.
     """
-    global GEMINI_CLIENT, GEMINI_AVAILABLE
+    global GEMINI_CLIENT, GEMINI_CLIENT_CONFIG, GEMINI_AVAILABLE, GEMINI_INIT_ATTEMPTED, GEMINI_SDK_MISSING
     
-    if GEMINI_CLIENT is not None:
+    GEMINI_INIT_ATTEMPTED = True
+    if GEMINI_SDK_MISSING:
         return
     
     try:
-        # Import Gemini SDK
-        import google.generativeai as genai
-        
-        # Get API key
-        api_key = get_api_key()
-        
-        # Configure Gemini
-        genai.configure(api_key=api_key)
-        
-        # Get model name from environment
-        model_name = os.environ.get('GEMINI_MODEL', 'gemini-1.5-pro')
-        
-        # Initialize model
-        GEMINI_CLIENT = genai.GenerativeModel(model_name)
+        config = (get_api_key(), get_model_name())
+    except Exception as e:
+        logger.error(f"Failed to retrieve API key: {str(e)}")
+        GEMINI_AVAILABLE = False
+        return
+    if GEMINI_CLIENT is not None and config == GEMINI_CLIENT_CONFIG:
+        return
+    api_key, model_name = config
+    
+    try:
+        if use_rest_transport():
+            # REST transport (packaged next to this handler): no grpc/protobuf
+            from rest_transport import GeminiRestTransport, RestGenerativeModel
+            GEMINI_CLIENT = RestGenerativeModel(model_name, GeminiRestTransport(api_key))
+        else:
+            # Import Gemini SDK
+            import google.generativeai as genai
+            
+            # Configure Gemini
+            genai.configure(api_key=api_key)
+            
+            # Initialize model
+            GEMINI_CLIENT = genai.GenerativeModel(model_name)
+        GEMINI_CLIENT_CONFIG = config
         GEMINI_AVAILABLE = True
         
         logger.info(f"Gemini client initialized: {model_name}")
         
     except ImportError:
         logger.error("google-generativeai SDK not available")
+        GEMINI_SDK_MISSING = True
         GEMINI_AVAILABLE = False
     except Exception as e:
         logger.error(f"Failed to initialize Gemini: {str(e)}")
         GEMINI_AVAILABLE = False
 
 
+def is_auth_error(error: Exception) -> bool:
+    """
+    True if Gemini rejected the API key (SDK or REST transport).
+    """
+    message = str(error)
+    return getattr(error, 'status', None) in (401, 403) or 'API_KEY_INVALID' in message or 'API key not valid' in message
+
+
+def warm_up(connect: bool = True, refresh_parameters: bool = False) -> Dict[str, Any]:
+    """
+    Run the initialization the first /analyze would otherwise pay for.
+    
+    Stages: ssm_client (boto3 import and client), parameters
+    (GetParameters), sdk_import (Gemini SDK, or rest_transport), client
+    (configure and model) and, with connect, connection (TLS handshake to
+    Gemini through a countTokens call, which is free).
+    
+    Args:
+        connect: Open the Gemini connection (False before a snapshot)
+        refresh_parameters: Fetch the parameters even if cached (after a restore)
+    
+    Returns:
+        Warm-up report with milliseconds per stage
+    """
+    timer = WarmupTimer()
+    
+    def fetch_parameters():
+        if refresh_parameters:
+            PARAMETERS.expire()
+            PARAMETERS.refresh()
+        return get_api_key(), get_model_name()
+    
+    def import_transport():
+        if use_rest_transport():
+            import rest_transport
+        else:
+            import google.generativeai
+    
+    def create_client():
+        initialize_gemini()
+        if not GEMINI_AVAILABLE:
+            raise RuntimeError("Gemini client unavailable; /analyze will use the fallback")
+    
+    def open_connection():
+        if use_rest_transport():
+            GEMINI_CLIENT.count_tokens('warm-up')
+        else:
+            # Without retries: the SDK would retry an unreachable endpoint for a minute
+            GEMINI_CLIENT.count_tokens('warm-up', request_options={'timeout': WARMUP_CONNECT_TIMEOUT, 'retry': None})
+    
+    timer.run('ssm_client', get_ssm_client)
+    timer.run('parameters', fetch_parameters)
+    timer.run('sdk_import', import_transport)
+    timer.run('client', create_client, requires=['parameters', 'sdk_import'])
+    if connect:
+        timer.run('connection', open_connection, requires=['client'])
+    
+    report = timer.report()
+    logger.info(f"Warm-up: {json.dumps(report)}")
+    return report
+
+
+def before_snapshot():
+    """
+    SnapStart hook: initialize before the snapshot is taken.
+    Connections are left to after_restore, since they would be dead in
+    the restored container.
+    """
+    warm_up(connect=False)
+
+
+def after_restore():
+    """
+    SnapStart hook: re-read the parameters (the key may have rotated since
+    the snapshot was taken) and connect to Gemini.
+    """
+    warm_up(refresh_parameters=True)
+
+
 def lambda_handler(event, context):
     """
     Main Lambda handler.
     Routes requests to appropriate endpoints.
     """
-    # Initialize Gemini on cold start
-    initialize_gemini()
-    
     # Parse request
     try:
+        # Warm-up invocation (direct invoke or EventBridge schedule)
+        if is_warmup_event(event):
+            return cors_response(200, warm_up())
+        
         # Handle both API Gateway and Function URL formats
         if 'requestContext' in event and 'http' in event['requestContext']:
             # Function URL format
@@ -129,13 +278,23 @@ def handle_health_check() -> Dict[str, Any]:
     """
     Health check endpoint.
     Returns current system status.
+    
+    Before the first /analyze the SDK is not loaded, so gemini_available
+    is false and mode is NOT_LOADED, which is not a fallback.
+    gemini_configured reports whether the last fetch of the API key
+    succeeded: null until the key is first fetched, false after a failed
+    fetch, a missing key or a missing SDK.
     """
+    key_loaded = PARAMETERS.loaded(API_KEY_PARAMETER)
     return cors_response(200, {
         'status': 'healthy',
         'gemini_available': GEMINI_AVAILABLE,
+        'gemini_configured': False if GEMINI_SDK_MISSING else key_loaded,
         'sdk_loaded': GEMINI_CLIENT is not None,
-        'model_name': os.environ.get('GEMINI_MODEL', 'gemini-1.5-pro'),
-        'mode': 'LIVE' if GEMINI_AVAILABLE else 'FALLBACK',
+        'model_name': GEMINI_CLIENT_CONFIG[1] if GEMINI_CLIENT_CONFIG else os.environ.get('GEMINI_MODEL', 'gemini-1.5-pro'),
+        # NOT_LOADED until the first /analyze loads the SDK
+        'mode': 'LIVE' if GEMINI_AVAILABLE else ('FALLBACK' if GEMINI_INIT_ATTEMPTED else 'NOT_LOADED'),
+        'parameter_cache': PARAMETERS.status(),
         'timestamp': time.time()
     })
 
@@ -157,6 +316,9 @@ def handle_analyze(event: Dict[str, Any]) -> Dict[str, Any]:
         
         logger.info(f"Analysis request: {len(transcript)} chars")
         
+        # Load the SDK on first use; rebuilds the client after a key rotation
+        initialize_gemini()
+        
         # Build prompt
         prompt = build_emergency_prompt(transcript, location, name, contact)
         
@@ -268,6 +430,9 @@ def call_gemini(prompt: str) -> Dict[str, Any]:
         
     except Exception as e:
         logger.error(f"Gemini API error: {str(e)}")
+        if is_auth_error(e):
+            # Likely a rotated key: refresh the parameters in the background
+            PARAMETERS.expire()
         return {
             'risk_level': 'MEDIUM',
             'confidence': 0.0,
@@ -379,3 +544,10 @@ def cors_response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
         },
         'body': json.dumps(body)
     }
+
+
+# Container pre-initialization: SnapStart hooks (on runtimes that support
+# them), and a full warm-up during init under provisioned concurrency
+register_snapshot_hooks(before_snapshot, after_restore)
+if initialization_type() == 'provisioned-concurrency':
+    warm_up()
@@ -0,0 +1,208 @@
+"""
+Parameter Cache
+SSM Parameter Store values cached per Lambda container
+
+All configured parameters are fetched together with one GetParameters
+call and cached for a TTL:
+
+1. Fresh values are returned without touching SSM.
+2. Stale values are still returned, while a background thread refreshes
+   the whole set (stale-while-revalidate), so a rotated key is picked up
+   without a cold start and no request waits on SSM after warm-up.
+3. A failed fetch is retried with exponential backoff; until then, stale
+   values keep being served, or ParameterUnavailable is raised at once
+   when there are none, instead of every request paying an SSM timeout.
+
+Only the standard library is imported; the SSM client is supplied by the
+caller through a fetch function.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger()
+
+# GetParameters accepts at most 10 names per call
+GET_PARAMETERS_BATCH = 10
+
+
+class ParameterUnavailable(Exception):
+    """Parameter has no cached value and cannot be fetched right now."""
+
+
+def ssm_fetcher(get_client: Callable[[], object]) -> Callable[[List[str]], Dict[str, str]]:
+    """
+    Fetch function for ParameterCache backed by SSM GetParameters.
+    
+    Args:
+        get_client: Returns a boto3 SSM client (called on each fetch, so it can be created lazily)
+    
+    Returns:
+        fetch(names) -> {name: decrypted value}; names SSM does not know are left out
+    """
+    def fetch(names: List[str]) -> Dict[str, str]:
+        values = {}
+        for start in range(0, len(names), GET_PARAMETERS_BATCH):
+            response = get_client().get_parameters(Names=names[start:start + GET_PARAMETERS_BATCH], WithDecryption=True)
+            values.update({parameter['Name']: parameter['Value'] for parameter in response['Parameters']})
+            for name in response.get('InvalidParameters', []):
+                logger.error(f"SSM parameter not found: {name}")
+        return values
+    return fetch
+
+
+class ParameterCache:
+    """
+    TTL cache for a fixed set of parameters, refreshed in bulk.
+    
+    Safe to use from several threads; at most one fetch runs at a time.
+    """
+    
+    def __init__(
+        self,
+        names: Iterable[str],
+        fetch: Callable[[List[str]], Dict[str, str]],
+        ttl: float = 300.0,
+        min_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize parameter cache.
+        
+        Args:
+            names: Parameter names fetched together
+            fetch: fetch(names) -> {name: value}, e.g. ssm_fetcher(...)
+            ttl: Seconds a fetched set is fresh
+            min_backoff: First retry delay after a failed fetch, in seconds
+            max_backoff: Largest retry delay, in seconds
+            clock: Monotonic time source
+        """
+        self.names = list(dict.fromkeys(names))
+        self.fetch = fetch
+        self.ttl = ttl
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+        
+        self._values: Dict[str, str] = {}
+        self._fetched_at: Optional[float] = None
+        self._retry_at = 0.0
+        self._backoff = 0.0
+        self._last_error: Optional[str] = None
+        self._last_fetch_ok: Optional[bool] = None
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._refreshing = False
+    
+    def get(self, name: str) -> str:
+        """
+        Cached value of a parameter.
+        
+        Fetches synchronously only when nothing is cached yet; a stale
+        value is returned and refreshed in the background.
+        
+        Raises:
+            ParameterUnavailable: If there is no value and fetching failed
+                or is backing off after a failure
+        """
+        now = self.clock()
+        with self._lock:
+            fetched = self._fetched_at is not None
+            stale = fetched and now - self._fetched_at >= self.ttl
+            value = self._values.get(name)
+            start_refresh = value is not None and stale and not self._refreshing and now >= self._retry_at
+            if start_refresh:
+                self._refreshing = True
+        if start_refresh:
+            threading.Thread(target=self._refresh_in_background, name='parameter-refresh', daemon=True).start()
+        if value is not None:
+            return value
+        
+        # SSM did not return it in a fetch that is still fresh
+        if fetched and not stale:
+            raise ParameterUnavailable(f"{name} not found")
+        if now < self._retry_at:
+            raise ParameterUnavailable(f"{name} unavailable (retrying after backoff): {self._last_error}")
+        self.refresh()
+        with self._lock:
+            if name in self._values:
+                return self._values[name]
+        raise ParameterUnavailable(f"{name} unavailable: {self._last_error or 'not found'}")
+    
+    def refresh(self) -> bool:
+        """
+        Fetch every parameter now (joining a fetch already in progress).
+        
+        Returns:
+            True if the fetch succeeded
+        """
+        started = self.clock()
+        with self._fetch_lock:
+            # Another thread finished a fetch while this one waited
+            if self._fetched_at is not None and self._fetched_at >= started:
+                return True
+            try:
+                values = self.fetch(self.names)
+            except Exception as e:
+                with self._lock:
+                    self._backoff = min(self.max_backoff, max(self.min_backoff, self._backoff * 2))
+                    self._retry_at = self.clock() + self._backoff
+                    self._last_error = str(e)
+                    self._last_fetch_ok = False
+                logger.error(f"Parameter fetch failed (next attempt in {self._backoff:.0f}s): {str(e)}")
+                return False
+            with self._lock:
+                self._values = values
+                self._fetched_at = self.clock()
+                self._backoff = 0.0
+                self._retry_at = 0.0
+                self._last_error = None if len(values) == len(self.names) else 'not found'
+                self._last_fetch_ok = True
+            logger.info(f"Fetched {len(values)} of {len(self.names)} parameters")
+            return True
+    
+    def expire(self):
+        """
+        Mark the cached set stale, e.g. after the API rejected a key.
+        
+        The next get() still returns the cached value and starts a
+        background refresh, so a rotated key is in use from the request
+        after that.
+        """
+        with self._lock:
+            if self._fetched_at is not None:
+                self._fetched_at = min(self._fetched_at, self.clock() - self.ttl)
+    
+    def loaded(self, name: str) -> Optional[bool]:
+        """
+        Whether the most recent fetch succeeded and returned a parameter.
+        
+        Returns:
+            None before the first fetch, else True or False
+        """
+        with self._lock:
+            if self._last_fetch_ok is None:
+                return None
+            return self._last_fetch_ok and name in self._values
+    
+    def status(self) -> Dict[str, object]:
+        """Cache state for health checks (no values)."""
+        now = self.clock()
+        with self._lock:
+            if self._fetched_at is None:
+                state = 'ERROR' if self._last_error else 'EMPTY'
+                age = None
+            else:
+                state = 'FRESH' if now - self._fetched_at < self.ttl else 'STALE'
+                age = round(now - self._fetched_at, 1)
+            return {'state': state, 'age_seconds': age, 'refreshing': self._refreshing}
+    
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
@@ -0,0 +1,100 @@
+"""
+Durable Retry Queue for Undelivered Alerts
+Original work created for Google Gemini 3 Hackathon 2026
+
+An alert still queued or running when the Lambda invocation has to
+return would otherwise sit in a frozen container and may never be
+delivered. Such alerts are sent to an SQS queue, which invokes the
+handler again to deliver them (see lambda_handler.process_alert_retries).
+When no queue is configured, or SQS is unreachable, they are appended to
+a local spill file instead.
+"""
+
+import json
+import logging
+import os
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AlertRetryQueue:
+    """
+    Hands undelivered alerts to SQS, falling back to a local spill file.
+    """
+    
+    def __init__(
+        self,
+        queue_url: Optional[str] = None,
+        client: Any = None,
+        endpoint_url: Optional[str] = None,
+        spill_path: str = "/tmp/kiro-alert-spill.jsonl"
+    ):
+        """
+        Initialize alert retry queue.
+        
+        Args:
+            queue_url: SQS queue URL (spill file only if None)
+            client: SQS client or compatible stand-in (created with boto3 if None)
+            endpoint_url: Endpoint override, e.g. a local SQS emulator
+            spill_path: JSON Lines file for alerts SQS did not accept
+        """
+        if queue_url and client is None:
+            import boto3
+            client = boto3.client('sqs', endpoint_url=endpoint_url)
+        
+        self.queue_url = queue_url
+        self.client = client
+        self.spill_path = spill_path
+        self.stats = {"queued": 0, "spilled": 0, "dropped": 0}
+        logger.info(f"Initialized AlertRetryQueue ({queue_url or 'spill file only'})")
+    
+    def enqueue(self, alert: Dict[str, Any]) -> Optional[str]:
+        """
+        Store an alert for a later delivery attempt.
+        
+        Args:
+            alert: JSON-serializable alert (lane, channels,
+                gemini_response, context)
+        
+        Returns:
+            "sqs" or "spill" for where the alert went, None if both failed
+        """
+        body = json.dumps(alert, default=str)
+        
+        if self.queue_url:
+            try:
+                self.client.send_message(QueueUrl=self.queue_url, MessageBody=body)
+                self.stats["queued"] += 1
+                logger.info(f"Queued {alert.get('lane')} alert for retry")
+                return "sqs"
+            except Exception as e:
+                logger.error(f"Failed to queue alert for retry: {str(e)}")
+        
+        try:
+            with open(self.spill_path, 'a', encoding='utf-8') as f:
+                f.write(body + "\n")
+            self.stats["spilled"] += 1
+            logger.warning(f"Spilled {alert.get('lane')} alert to {self.spill_path}")
+            return "spill"
+        except OSError as e:
+            self.stats["dropped"] += 1
+            logger.error(f"Failed to spill alert: {str(e)}")
+            return None
+
+
+def create_retry_queue(queue_url: Optional[str] = None) -> AlertRetryQueue:
+    """
+    Factory function to create the alert retry queue from the environment.
+    
+    Args:
+        queue_url: SQS queue URL (defaults to ALERT_RETRY_QUEUE_URL)
+    
+    Returns:
+        Initialized AlertRetryQueue instance
+    """
+    return AlertRetryQueue(
+        queue_url=queue_url or os.environ.get('ALERT_RETRY_QUEUE_URL'),
+        endpoint_url=os.environ.get('SQS_ENDPOINT_URL'),
+        spill_path=os.environ.get('ALERT_SPILL_PATH', '/tmp/kiro-alert-spill.jsonl')
+    )
@@ -0,0 +1,280 @@
+"""
+Alert Dispatch Scheduler with Priority Lanes
+Original work created for Google Gemini 3 Hackathon 2026
+
+Alerts are queued into IMMEDIATE, URGENT and STANDARD lanes. Every lane
+has its own worker threads, so a backlog in a lower lane can never
+occupy the workers of a higher one. Lower lanes are admission-controlled
+by a token bucket and a depth cap and shed work under overload; the
+IMMEDIATE lane never sheds.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Dict, Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+LANES = ("IMMEDIATE", "URGENT", "STANDARD")
+
+# Routing priorities from the KIRO rules map onto dispatch lanes
+PRIORITY_LANES = {
+    "CRITICAL": "IMMEDIATE",
+    "HIGH": "URGENT",
+    "MEDIUM": "STANDARD",
+    "LOW": "STANDARD"
+}
+
+DEFAULT_LANE_CONFIG = {
+    "IMMEDIATE": {"workers": 4},
+    "URGENT": {"workers": 2, "rate": 20.0, "burst": 40, "max_depth": 200},
+    "STANDARD": {"workers": 1, "rate": 5.0, "burst": 10, "max_depth": 100}
+}
+
+DWELL_SAMPLES = 1024
+
+
+def lane_for(priority: Optional[str]) -> str:
+    """
+    Map a routing priority or lane name to a dispatch lane.
+    
+    Args:
+        priority: KIRO routing priority (CRITICAL/HIGH/MEDIUM) or lane name
+    
+    Returns:
+        Lane name, STANDARD if unknown
+    """
+    if priority in LANES:
+        return priority
+    return PRIORITY_LANES.get(priority, "STANDARD")
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a fixed rate."""
+    
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def try_acquire(self, now: Optional[float] = None) -> bool:
+        """Take one token if available."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return True
+            return False
+
+
+class _Lane:
+    """Queue, workers and counters for one priority lane."""
+    
+    def __init__(self, name: str, workers: int, rate: Optional[float], burst: Optional[float], max_depth: Optional[int]):
+        self.name = name
+        self.queue: "queue.Queue" = queue.Queue()
+        self.bucket = TokenBucket(rate, burst or rate) if rate else None
+        self.max_depth = max_depth
+        self.workers = max(1, workers)
+        self.in_flight = 0
+        self.counts = {"submitted": 0, "completed": 0, "failed": 0, "shed": 0}
+        self.dwell = deque(maxlen=DWELL_SAMPLES)
+        self.lock = threading.Lock()
+        # Signalled whenever a job finishes
+        self.idle = threading.Condition(self.lock)
+
+
+class AlertDispatcher:
+    """
+    Priority-lane scheduler for alert delivery.
+    """
+    
+    def __init__(self, lane_config: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Initialize dispatcher and start lane workers.
+        
+        Args:
+            lane_config: Lane name -> {"workers", "rate", "burst", "max_depth"}.
+                rate/burst configure the shedding token bucket (requests per
+                second); max_depth caps queued work. Omitted keys disable
+                that limit. Defaults to DEFAULT_LANE_CONFIG.
+        """
+        config = {name: dict(spec) for name, spec in DEFAULT_LANE_CONFIG.items()}
+        for name, spec in (lane_config or {}).items():
+            if name not in LANES:
+                raise ValueError(f"Unknown dispatch lane: {name}")
+            config[name] = dict(spec)
+        
+        self.lanes = {
+            name: _Lane(
+                name,
+                workers=spec.get("workers", 1),
+                rate=spec.get("rate"),
+                burst=spec.get("burst"),
+                max_depth=spec.get("max_depth")
+            )
+            for name, spec in config.items()
+        }
+        self._stopped = False
+        self._threads = []
+        for lane in self.lanes.values():
+            for i in range(lane.workers):
+                thread = threading.Thread(
+                    target=self._work, args=(lane,), name=f"dispatch-{lane.name.lower()}-{i}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+        
+        logger.info(
+            "Initialized AlertDispatcher with lanes: "
+            + ", ".join(f"{lane.name}x{lane.workers}" for lane in self.lanes.values())
+        )
+    
+    def submit(self, priority: Optional[str], fn: Callable[..., Any], *args, **kwargs) -> Optional[Future]:
+        """
+        Queue a delivery job.
+        
+        Args:
+            priority: Lane name or routing priority
+            fn: Callable performing the delivery
+            *args, **kwargs: Arguments for fn
+        
+        Returns:
+            Future for fn's result, or None if the job was shed
+        """
+        if self._stopped:
+            raise RuntimeError("Dispatcher is shut down")
+        
+        lane = self.lanes[lane_for(priority)]
+        with lane.lock:
+            overloaded = (
+                (lane.max_depth is not None and lane.queue.qsize() >= lane.max_depth)
+                or (lane.bucket is not None and not lane.bucket.try_acquire())
+            )
+            if overloaded:
+                lane.counts["shed"] += 1
+                logger.warning(f"Shedding {lane.name} alert under load")
+                return None
+            lane.counts["submitted"] += 1
+        
+        future: Future = Future()
+        lane.queue.put((time.monotonic(), future, fn, args, kwargs))
+        return future
+    
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Snapshot of per-lane queue depth, counters and dwell time.
+        
+        Returns:
+            Lane name -> metrics; dwell times are in milliseconds
+        """
+        snapshot = {}
+        for name, lane in self.lanes.items():
+            with lane.lock:
+                dwell = sorted(lane.dwell)
+                counts = dict(lane.counts)
+                in_flight = lane.in_flight
+            snapshot[name] = {
+                "depth": lane.queue.qsize(),
+                "in_flight": in_flight,
+                **counts,
+                "dwell_p50_ms": round(dwell[len(dwell) // 2] * 1000, 3) if dwell else 0.0,
+                "dwell_p95_ms": round(dwell[min(len(dwell) - 1, int(len(dwell) * 0.95))] * 1000, 3) if dwell else 0.0,
+                "dwell_max_ms": round(dwell[-1] * 1000, 3) if dwell else 0.0
+            }
+        return snapshot
+    
+    def drain(self, priority: Optional[str], timeout: Optional[float] = None) -> bool:
+        """
+        Run a lane's queued jobs on the caller's thread, then wait for its
+        in-flight jobs to finish.
+        
+        Used before a Lambda invocation returns, since queued work in a
+        frozen container does not run until the next invocation.
+        
+        Args:
+            priority: Lane name or routing priority
+            timeout: Upper bound on the whole drain, in seconds; no new
+                job is started once it has passed
+        
+        Returns:
+            True if the lane is empty and idle
+        """
+        lane = self.lanes[lane_for(priority)]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while deadline is None or time.monotonic() < deadline:
+            try:
+                job = lane.queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                # Shutdown sentinel belongs to a worker
+                lane.queue.put(None)
+                break
+            self._run(lane, job)
+        
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        with lane.idle:
+            return lane.idle.wait_for(lambda: lane.in_flight == 0 and lane.queue.empty(), remaining)
+    
+    def shutdown(self, timeout: float = 5.0):
+        """Finish queued jobs and stop all workers."""
+        self._stopped = True
+        for lane in self.lanes.values():
+            for _ in range(lane.workers):
+                lane.queue.put(None)
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+    
+    def _work(self, lane: _Lane):
+        """Worker loop for one lane."""
+        while True:
+            job = lane.queue.get()
+            if job is None:
+                return
+            self._run(lane, job)
+    
+    def _run(self, lane: _Lane, job):
+        """Run one queued job and resolve its future."""
+        enqueued, future, fn, args, kwargs = job
+        if not future.set_running_or_notify_cancel():
+            return
+        
+        with lane.lock:
+            lane.dwell.append(time.monotonic() - enqueued)
+            lane.in_flight += 1
+        result, error = None, None
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"{lane.name} dispatch job failed: {str(e)}")
+            error = e
+        
+        # Counters are final before the caller sees the outcome
+        with lane.lock:
+            lane.in_flight -= 1
+            lane.counts["failed" if error else "completed"] += 1
+            lane.idle.notify_all()
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+
+def create_dispatcher(lane_config: Optional[Dict[str, Dict[str, Any]]] = None) -> AlertDispatcher:
+    """
+    Factory function to create alert dispatcher.
+    
+    Returns:
+        Initialized AlertDispatcher instance
+    """
+    return AlertDispatcher(lane_config)
@@ -0,0 +1,272 @@
+"""
+AWS DynamoDB Audit Trail for KIRO Decisions
+Original work created for Google Gemini 3 Hackathon 2026
+"""
+
+import json
+import logging
+import math
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# DynamoDB BatchWriteItem accepts at most 25 put requests per call
+MAX_BATCH_ITEMS = 25
+
+
+def to_attribute_value(value: Any) -> Dict[str, Any]:
+    """
+    Convert a Python value to DynamoDB's low-level attribute format.
+    
+    DynamoDB numbers cannot be NaN or infinite, so those floats are
+    written as strings ("nan", "inf", "-inf").
+    
+    Args:
+        value: str, bool, int, float, None, list or dict
+    
+    Returns:
+        Attribute value dictionary (e.g. {"S": "..."})
+    """
+    if value is None:
+        return {"NULL": True}
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if isinstance(value, float) and not math.isfinite(value):
+        return {"S": repr(value)}
+    if isinstance(value, (int, float)):
+        return {"N": repr(value)}
+    if isinstance(value, str):
+        return {"S": value}
+    if isinstance(value, (list, tuple)):
+        return {"L": [to_attribute_value(v) for v in value]}
+    if isinstance(value, dict):
+        return {"M": {str(k): to_attribute_value(v) for k, v in value.items()}}
+    return {"S": str(value)}
+
+
+class AuditLogWriter:
+    """
+    Buffers KIRO decision records and writes them to DynamoDB in batches.
+    
+    record() only enqueues, so the request path never waits on DynamoDB.
+    A background thread flushes when batch_size records are waiting or
+    flush_interval seconds have passed, retries unprocessed items with
+    backoff, and appends items that still fail to a local spill file.
+    flush() only wakes that thread and waits a bounded time; while a
+    flush is waiting, retries that would outlast it are spilled instead.
+    """
+    
+    def __init__(
+        self,
+        table_name: str,
+        client: Any = None,
+        endpoint_url: Optional[str] = None,
+        batch_size: int = MAX_BATCH_ITEMS,
+        flush_interval: float = 1.0,
+        max_buffer: int = 10000,
+        max_retries: int = 3,
+        spill_path: str = "/tmp/kiro-audit-spill.jsonl"
+    ):
+        """
+        Initialize audit log writer.
+        
+        Args:
+            table_name: DynamoDB table (partition key "decision_id")
+            client: DynamoDB client or compatible stand-in (created with boto3 if None)
+            endpoint_url: Endpoint override, e.g. DynamoDB Local
+            batch_size: Records per BatchWriteItem call (max 25)
+            flush_interval: Maximum seconds a record waits in the buffer
+            max_buffer: Records held in memory before new ones are dropped
+            max_retries: Retries for unprocessed items before spilling
+            spill_path: JSON Lines file for items that could not be written
+        """
+        if client is None:
+            import boto3
+            client = boto3.client('dynamodb', endpoint_url=endpoint_url)
+        
+        self.table_name = table_name
+        self.client = client
+        self.batch_size = max(1, min(batch_size, MAX_BATCH_ITEMS))
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.spill_path = spill_path
+        
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_buffer)
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        # Records queued but not yet written or spilled; _idle is set
+        # exactly when it is zero, both updated under _lock
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._idle = threading.Event()
+        self._idle.set()
+        self._flush_deadline: Optional[float] = None
+        self.stats = {"recorded": 0, "written": 0, "spilled": 0, "dropped": 0, "batches": 0}
+        
+        self._thread = threading.Thread(target=self._run, name="kiro-audit", daemon=True)
+        self._thread.start()
+        logger.info(f"Initialized AuditLogWriter for table {table_name}")
+    
+    def record(self, decision: Dict[str, Any]):
+        """
+        Queue a decision for the audit trail without blocking.
+        
+        Args:
+            decision: Decision returned by KIROOrchestrator.process_assessment
+        """
+        item = self._build_item(decision)
+        with self._lock:
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                self.stats["dropped"] += 1
+                logger.warning("Audit buffer full, dropping decision record")
+                return
+            
+            self.stats["recorded"] += 1
+            self._pending += 1
+            self._idle.clear()
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until every queued record has been written or spilled.
+        
+        The writes happen on the background thread; the caller only
+        waits, and retries are cut short so the wait can end in time.
+        
+        Args:
+            timeout: Maximum seconds to wait
+        
+        Returns:
+            True if the buffer drained within the timeout
+        """
+        with self._lock:
+            self._flush_deadline = time.monotonic() + timeout
+        self._wake.set()
+        try:
+            return self._idle.wait(timeout)
+        finally:
+            with self._lock:
+                self._flush_deadline = None
+    
+    def close(self, timeout: float = 5.0):
+        """Flush remaining records and stop the background thread."""
+        self._stopped.set()
+        self._wake.set()
+        self._thread.join(timeout)
+    
+    def _run(self):
+        """Background loop: drain the buffer in batches."""
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    break
+                self._write_batch(batch)
+                with self._lock:
+                    self._pending -= len(batch)
+                    if self._pending == 0:
+                        self._idle.set()
+            
+            if self._stopped.is_set():
+                return
+    
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        """Pop up to batch_size records from the buffer."""
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+    
+    def _write_batch(self, items: List[Dict[str, Any]]):
+        """Write one batch, retrying unprocessed items, spilling the rest."""
+        requests = [{"PutRequest": {"Item": item}} for item in items]
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.client.batch_write_item(RequestItems={self.table_name: requests})
+                self.stats["batches"] += 1
+            except Exception as e:
+                logger.error(f"Audit batch write failed: {str(e)}")
+                response = {"UnprocessedItems": {self.table_name: requests}}
+            
+            unprocessed = response.get("UnprocessedItems", {}).get(self.table_name, [])
+            self.stats["written"] += len(requests) - len(unprocessed)
+            requests = unprocessed
+            if not requests:
+                return
+            
+            if attempt < self.max_retries:
+                delay = min(2.0, 0.05 * (2 ** attempt)) * random.uniform(0.5, 1.5)
+                deadline = self._flush_deadline
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    # A flush is waiting: spill now rather than outlast it
+                    break
+                time.sleep(delay)
+        
+        self._spill([r["PutRequest"]["Item"] for r in requests])
+    
+    def _spill(self, items: List[Dict[str, Any]]):
+        """Append items that could not be written to the local spill file."""
+        try:
+            with open(self.spill_path, 'a', encoding='utf-8') as f:
+                for item in items:
+                    f.write(json.dumps({"table": self.table_name, "item": item}) + "\n")
+            self.stats["spilled"] += len(items)
+            logger.warning(f"Spilled {len(items)} audit records to {self.spill_path}")
+        except OSError as e:
+            self.stats["dropped"] += len(items)
+            logger.error(f"Failed to spill audit records: {str(e)}")
+    
+    def _build_item(self, decision: Dict[str, Any]) -> Dict[str, Any]:
+        """Select the audited fields of a decision."""
+        assessment = decision.get("gemini_assessment", {})
+        session = decision.get("session") or {}
+        record = {
+            "decision_id": str(uuid.uuid4()),
+            "timestamp": decision.get("timestamp"),
+            "risk_level": assessment.get("risk_level"),
+            "confidence": assessment.get("confidence"),
+            "indicators": assessment.get("indicators", []),
+            "should_alert": decision.get("should_alert", False),
+            "routing": decision.get("routing", {}),
+            "rule_id": decision.get("rule_id"),
+            "rules_version": decision.get("rules_version"),
+            "escalated": decision.get("escalated", False),
+            "session_id": session.get("session_id")
+        }
+        return {k: to_attribute_value(v) for k, v in record.items()}
+
+
+def create_audit_writer(table_name: Optional[str] = None) -> Optional[AuditLogWriter]:
+    """
+    Factory function to create the audit writer from the environment.
+    
+    Args:
+        table_name: Table name (defaults to AUDIT_TABLE_NAME)
+    
+    Returns:
+        AuditLogWriter, or None when no table is configured
+    """
+    table_name = table_name or os.environ.get('AUDIT_TABLE_NAME')
+    if not table_name:
+        return None
+    return AuditLogWriter(
+        table_name=table_name,
+        endpoint_url=os.environ.get('DYNAMODB_ENDPOINT_URL'),
+        spill_path=os.environ.get('AUDIT_SPILL_PATH', '/tmp/kiro-audit-spill.jsonl')
+    )
@@ -0,0 +1,207 @@
+"""
+Parallel Multi-Channel Alert Fan-Out
+Original work created for Google Gemini 3 Hackathon 2026
+
+Every channel of a routing decision, and every contact of a per-contact
+channel, is delivered concurrently with its own timeout and retries.
+fan_out() returns as soon as the first delivery succeeds; deliveries
+still in flight keep filling in the same result, and FanoutResult.wait()
+waits for them. An attempt that times out is not retried, because it
+may still be delivering and a retry could send the alert twice.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, Callable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Channels delivered once per emergency contact rather than once per alert
+PER_CONTACT_CHANNELS = {"sms"}
+
+Sender = Callable[[Optional[str], str], Any]
+
+
+class FanoutResult:
+    """
+    Per-channel delivery results of one alert, filled in as deliveries finish.
+    """
+    
+    def __init__(self, deliveries: List[Dict[str, Any]]):
+        self.deliveries = deliveries
+        self.first_success: Optional[Dict[str, Any]] = None
+        self.started = time.monotonic()
+        self._pending = sum(1 for d in deliveries if d["status"] == "PENDING")
+        self._cond = threading.Condition()
+    
+    @property
+    def complete(self) -> bool:
+        """True once every delivery has finished."""
+        return self._pending == 0
+    
+    def wait_first(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the first success or for every delivery to finish.
+        
+        Returns:
+            True if a delivery succeeded
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self.first_success is not None or self._pending == 0, timeout)
+            return self.first_success is not None
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for every delivery to finish.
+        
+        Returns:
+            True if all deliveries finished within the timeout
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending == 0, timeout)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Snapshot grouped by channel."""
+        with self._cond:
+            channels: Dict[str, List[Dict[str, Any]]] = {}
+            for delivery in self.deliveries:
+                entry = {k: v for k, v in delivery.items() if k != "channel"}
+                channels.setdefault(delivery["channel"], []).append(entry)
+            return {
+                "status": "SUCCESS" if self.first_success else ("FAILED" if self._pending == 0 else "PENDING"),
+                "first_success": dict(self.first_success) if self.first_success else None,
+                "complete": self._pending == 0,
+                "channels": channels
+            }
+    
+    def _finish(self, delivery: Dict[str, Any], **fields):
+        """Record a delivery outcome and wake waiters."""
+        with self._cond:
+            delivery.update(fields)
+            delivery["latency_ms"] = round((time.monotonic() - self.started) * 1000, 2)
+            if delivery["status"] == "SUCCESS" and self.first_success is None:
+                self.first_success = {
+                    "channel": delivery["channel"],
+                    "target": delivery["target"],
+                    "latency_ms": delivery["latency_ms"]
+                }
+            self._pending -= 1
+            self._cond.notify_all()
+
+
+class FanoutExecutor:
+    """
+    Delivers an alert on all channels at once.
+    """
+    
+    def __init__(
+        self,
+        senders: Dict[str, Sender],
+        timeouts: Optional[Dict[str, float]] = None,
+        default_timeout: float = 5.0,
+        max_retries: int = 1,
+        retry_backoff: float = 0.2,
+        max_workers: int = 16
+    ):
+        """
+        Initialize fan-out executor.
+        
+        Args:
+            senders: Channel name -> sender(target, message) returning a message id.
+                Channels without a sender are reported as SKIPPED.
+            timeouts: Per-attempt timeout in seconds by channel
+            default_timeout: Per-attempt timeout for unlisted channels
+            max_retries: Retries after a failed attempt (a timed-out attempt
+                may still deliver, so it is never retried)
+            retry_backoff: Base delay between attempts, doubled per retry
+            max_workers: Threads available for delivery attempts
+        """
+        self.senders = senders
+        self.timeouts = timeouts or {}
+        self.default_timeout = default_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        
+        # Drivers enforce timeouts around attempts, so they need their own pool
+        self._drivers = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fanout-driver")
+        self._attempts = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fanout-send")
+        logger.info(f"Initialized FanoutExecutor for channels: {sorted(senders)}")
+    
+    def fan_out(
+        self,
+        channels: Sequence[str],
+        message: str,
+        contacts: Sequence[str] = (),
+        wait_timeout: Optional[float] = None
+    ) -> FanoutResult:
+        """
+        Deliver a message on every channel concurrently.
+        
+        Args:
+            channels: Channels from the routing decision
+            message: Alert message
+            contacts: Phone numbers for per-contact channels
+            wait_timeout: Upper bound on waiting for the first success
+        
+        Returns:
+            FanoutResult, returned once the first delivery succeeds (or all fail)
+        """
+        deliveries = []
+        for channel in channels:
+            targets = list(contacts) if channel in PER_CONTACT_CHANNELS else [None]
+            if channel in PER_CONTACT_CHANNELS and not targets:
+                deliveries.append({"channel": channel, "target": None, "status": "SKIPPED", "error": "no contacts"})
+            for target in targets:
+                status = "PENDING" if channel in self.senders else "SKIPPED"
+                delivery = {"channel": channel, "target": target, "status": status, "attempts": 0}
+                if status == "SKIPPED":
+                    delivery["error"] = "no sender configured"
+                deliveries.append(delivery)
+        
+        result = FanoutResult(deliveries)
+        for delivery in deliveries:
+            if delivery["status"] == "PENDING":
+                self._drivers.submit(self._deliver, result, delivery, message)
+        
+        result.wait_first(wait_timeout)
+        if result.first_success:
+            logger.info(
+                f"First alert delivery via {result.first_success['channel']} "
+                f"after {result.first_success['latency_ms']}ms"
+            )
+        return result
+    
+    def shutdown(self):
+        """Stop accepting deliveries; in-flight attempts finish in the background."""
+        self._drivers.shutdown(wait=False)
+        self._attempts.shutdown(wait=False)
+    
+    def _deliver(self, result: FanoutResult, delivery: Dict[str, Any], message: str):
+        """Run attempts for one delivery until success or retries run out."""
+        channel = delivery["channel"]
+        sender = self.senders[channel]
+        timeout = self.timeouts.get(channel, self.default_timeout)
+        status, error = "FAILED", None
+        
+        for attempt in range(self.max_retries + 1):
+            delivery["attempts"] = attempt + 1
+            future = self._attempts.submit(sender, delivery["target"], message)
+            try:
+                message_id = future.result(timeout=timeout)
+                result._finish(delivery, status="SUCCESS", message_id=message_id)
+                return
+            except FutureTimeoutError:
+                # The send may still go through; retrying could deliver it twice
+                status, error = "TIMEOUT", f"no response within {timeout}s"
+                logger.warning(f"Alert delivery via {channel} attempt {attempt + 1} timed out, not retrying")
+                break
+            except Exception as e:
+                status, error = "FAILED", str(e)
+            
+            logger.warning(f"Alert delivery via {channel} attempt {attempt + 1} failed: {error}")
+            if attempt < self.max_retries:
+                time.sleep(self.retry_backoff * (2 ** attempt))
+        
+        result._finish(delivery, status=status, error=error)
@@ -1,12 +1,24 @@
 """
 AWS Lambda Handler for AllSensesAI
 Original work created for Google Gemini 3 Hackathon 2026
+
+Alerts that cannot be delivered before an invocation returns are handed
+to the SQS retry queue (ALERT_RETRY_QUEUE_URL), whose messages invoke this
+handler again (see process_alert_retries).
+
+A warm-up event ({"warmup": true}, or an EventBridge schedule) runs the
+full initialization, including the Gemini and SNS connections, and
+returns the time per stage (see warm_up). Under provisioned concurrency
+this runs during init; under SnapStart it runs before the snapshot, and
+the connections are opened after restore.
 """
 
 import json
 import logging
 import os
-from typing import Dict, Any
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Dict, Any, List, Optional
 
 # Import our modules
 import sys
@@ -16,7 +28,13 @@ from gemini.client import GeminiClient
 from gemini.multimodal import MultimodalInputHandler
 from gemini.prompts import PromptManager
 from kiro.orchestrator import KIROOrchestrator
+from kiro.rules import DEFAULT_RULES_PATH
 from aws.sns_client import SNSClient
+from aws.dynamodb_client import create_audit_writer
+from aws.alert_retry import create_retry_queue
+from aws.dispatch import AlertDispatcher, lane_for
+from aws.fanout import FanoutExecutor
+from aws.warmup import WarmupTimer, initialization_type, is_warmup_event, register_snapshot_hooks
 
 # Configure logging
 logger = logging.getLogger()
@@ -28,11 +46,25 @@ multimodal_handler = None
 prompt_manager = None
 kiro_orchestrator = None
 sns_client = None
+alert_dispatcher = None
+alert_fanout = None
+alert_retry = None
+
+# Seconds the request waits for its alert before reporting it as queued
+ALERT_WAIT_SECONDS = float(os.environ.get('ALERT_WAIT_SECONDS', '10'))
+# An alert's lane is drained before the handler returns, leaving this much
+# of the invocation's remaining time for the response
+DRAIN_RESERVE_SECONDS = 1.0
+# Longest wait for buffered audit records to reach DynamoDB before returning
+AUDIT_FLUSH_SECONDS = float(os.environ.get('AUDIT_FLUSH_SECONDS', '2'))
+# How long execute_alert waits for every channel once one has succeeded;
+# below ALERT_WAIT_SECONDS so the whole fan-out finishes inside the invocation
+ALERT_DELIVERY_TIMEOUT_SECONDS = float(os.environ.get('ALERT_DELIVERY_TIMEOUT_SECONDS', '8'))
 
 
 def initialize_clients():
     """Initialize all service clients."""
-    global gemini_client, multimodal_handler, prompt_manager, kiro_orchestrator, sns_client
+    global gemini_client, multimodal_handler, prompt_manager, kiro_orchestrator, sns_client, alert_dispatcher, alert_fanout, alert_retry
     
     if gemini_client is None:
         # Get Gemini API key from environment
@@ -46,21 +78,73 @@ def initialize_clients():
         multimodal_handler = MultimodalInputHandler()
         prompt_manager = PromptManager(prompts_dir='/opt/prompts')
         
-        # KIRO orchestrator needs config
+        # KIRO routing comes from the declarative rules file (hot-reloaded)
         kiro_config = {
-            "thresholds": {
-                "CRITICAL": 0.8,
-                "HIGH": 0.7,
-                "MEDIUM": 0.5,
-                "LOW": 0.3
-            }
+            "rules_path": os.environ.get('KIRO_RULES_PATH', str(DEFAULT_RULES_PATH))
         }
-        kiro_orchestrator = KIROOrchestrator(config=kiro_config)
-        sns_client = SNSClient()
+        # Decisions are audited to DynamoDB in the background when AUDIT_TABLE_NAME is set
+        kiro_orchestrator = KIROOrchestrator(config=kiro_config, audit_sink=create_audit_writer())
+        sns_client = SNSClient(endpoint_url=os.environ.get('SNS_ENDPOINT_URL'))
+        alert_dispatcher = AlertDispatcher()
+        alert_fanout = FanoutExecutor(
+            senders=build_alert_senders(),
+            timeouts={"911": 3.0, "emergency_contacts": 5.0, "sms": 5.0}
+        )
+        alert_retry = create_retry_queue()
         
         logger.info("All clients initialized successfully")
 
 
+def warm_up(connect: bool = True) -> Dict[str, Any]:
+    """
+    Run the initialization the first emergency would otherwise pay for.
+    
+    Stages: sdk_import (Gemini SDK, or the REST transport), clients
+    (initialize_clients: Gemini configure, prompt templates, KIRO rules,
+    SNS and audit clients), prompt (formats the multimodal template, so a
+    missing template fails here instead of on an emergency) and, with
+    connect, gemini_connection and sns_connection.
+    
+    Args:
+        connect: Open the Gemini and SNS connections (False before a snapshot)
+        
+    Returns:
+        Warm-up report with milliseconds per stage
+    """
+    timer = WarmupTimer()
+    
+    def import_gemini_transport():
+        if os.environ.get('GEMINI_TRANSPORT', 'sdk').lower() == 'rest':
+            import gemini.rest_transport
+        else:
+            import google.generativeai
+    
+    def format_prompt():
+        input_data = multimodal_handler.prepare_input(text="warm-up")
+        prompt_manager.format_emergency_prompt(input_data=input_data, template_name='multimodal')
+    
+    timer.run('sdk_import', import_gemini_transport)
+    timer.run('clients', initialize_clients)
+    timer.run('prompt', format_prompt, requires=['clients'])
+    if connect:
+        timer.run('gemini_connection', lambda: gemini_client.open_connection(), requires=['clients'])
+        timer.run('sns_connection', lambda: sns_client.open_connection(), requires=['clients'])
+    
+    report = timer.report()
+    logger.info(f"Warm-up: {json.dumps(report)}")
+    return report
+
+
+def before_snapshot():
+    """SnapStart hook: initialize before the snapshot, without connections."""
+    warm_up(connect=False)
+
+
+def after_restore():
+    """SnapStart hook: open the connections the restored container needs."""
+    warm_up()
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     AWS Lambda handler for emergency detection.
@@ -73,9 +157,17 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         Response dictionary with status and results
     """
     try:
+        # Warm-up invocation (direct invoke or EventBridge schedule)
+        if is_warmup_event(event):
+            return success_response(warm_up())
+        
         # Initialize clients
         initialize_clients()
         
+        # Alerts handed to the retry queue by an earlier invocation
+        if is_retry_event(event):
+            return process_alert_retries(event)
+        
         # Parse input
         body = json.loads(event.get('body', '{}'))
         
@@ -123,9 +215,12 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         # Execute action if needed
         if action_decision.get('should_alert'):
             logger.info("Executing emergency alert")
-            alert_result = execute_alert(
+            alert_result = dispatch_alert(
+                priority=action_decision['routing'].get('priority'),
+                channels=action_decision['routing'].get('channels', []),
                 gemini_response=gemini_response,
-                context=context_data
+                context=context_data,
+                drain_timeout=remaining_seconds(context)
             )
             action_decision['alert_result'] = alert_result
         
@@ -139,41 +234,216 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"Lambda handler error: {str(e)}", exc_info=True)
         return error_response(str(e), 500)
+    
+    finally:
+        flush_audit_log(context)
+        log_dispatch_metrics()
+
+
+def remaining_seconds(context: Any) -> Optional[float]:
+    """Invocation time left after DRAIN_RESERVE_SECONDS, or None outside Lambda."""
+    get_remaining = getattr(context, 'get_remaining_time_in_millis', None)
+    if get_remaining is None:
+        return None
+    return max(0.0, get_remaining() / 1000.0 - DRAIN_RESERVE_SECONDS)
+
+
+def flush_audit_log(context: Any = None):
+    """
+    Write buffered KIRO audit records before the container freezes.
+    
+    The audit writer batches in a background thread, which does not run
+    while the container is frozen between invocations.
+    """
+    audit_sink = kiro_orchestrator.audit_sink if kiro_orchestrator is not None else None
+    if audit_sink is None:
+        return
+    remaining = remaining_seconds(context)
+    timeout = AUDIT_FLUSH_SECONDS if remaining is None else min(AUDIT_FLUSH_SECONDS, remaining)
+    if not audit_sink.flush(timeout=timeout):
+        logger.warning(f"Audit records still buffered after {timeout:.1f}s")
+
+
+def log_dispatch_metrics():
+    """Log per-lane dispatch metrics once per invocation."""
+    if alert_dispatcher is not None:
+        logger.info(f"Dispatch lane metrics: {json.dumps(alert_dispatcher.metrics())}")
+
+
+def dispatch_alert(
+    priority: str,
+    channels: List[str],
+    gemini_response: Dict[str, Any],
+    context: Dict[str, Any],
+    drain_timeout: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Run execute_alert in the dispatch lane for the decision's priority.
+    
+    An alert still waiting after ALERT_WAIT_SECONDS is not left in the
+    queue: its lane is drained on this thread, since the container
+    freezes once the handler returns. An alert that was shed, did not
+    finish within drain_timeout or failed on every channel is handed to
+    the retry queue.
+    
+    Args:
+        priority: Routing priority from the KIRO decision
+        channels: Routing channels from the KIRO decision
+        gemini_response: Risk assessment from Gemini 3
+        context: Contextual information
+        drain_timeout: Longest wait for the lane to drain
+            (the invocation's remaining time; None waits until done)
+        
+    Returns:
+        Alert execution result, or a SHED/RETRY_QUEUED status, with
+        "retry" naming where an undelivered alert went
+    """
+    lane = lane_for(priority)
+    alert = {'lane': lane, 'channels': channels, 'gemini_response': gemini_response, 'context': context}
+    future = alert_dispatcher.submit(lane, execute_alert, gemini_response, context, channels)
+    if future is None:
+        return {'status': 'SHED', 'lane': lane, 'retry': retry_alert(alert)}
+    
+    try:
+        result = future.result(timeout=ALERT_WAIT_SECONDS)
+    except FutureTimeoutError:
+        logger.warning(f"{lane} alert still pending after {ALERT_WAIT_SECONDS}s, draining the lane")
+        alert_dispatcher.drain(lane, timeout=drain_timeout)
+        if not future.done():
+            # A job that already started may still deliver, so the retry
+            # can duplicate it; one that had not is cancelled here
+            in_flight = not future.cancel()
+            logger.warning(f"{lane} alert not delivered within the invocation, queueing for retry")
+            return {'status': 'RETRY_QUEUED', 'lane': lane, 'in_flight': in_flight, 'retry': retry_alert(alert)}
+        result = future.result()
+    
+    if result.get('status') == 'FAILED':
+        result['retry'] = retry_alert(alert)
+    result['lane'] = lane
+    return result
+
+
+def retry_alert(alert: Dict[str, Any]) -> Optional[str]:
+    """Hand an undelivered alert to the retry queue; returns where it went."""
+    if alert_retry is None:
+        logger.error(f"No retry queue, {alert['lane']} alert is lost")
+        return None
+    return alert_retry.enqueue(alert)
 
 
-def execute_alert(gemini_response: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+def is_retry_event(event: Dict[str, Any]) -> bool:
+    """True for an SQS batch from the alert retry queue."""
+    records = event.get('Records') or []
+    return bool(records) and all(r.get('eventSource') == 'aws:sqs' for r in records)
+
+
+def process_alert_retries(event: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Execute emergency alert via SNS.
+    Deliver alerts from the retry queue.
+    
+    Args:
+        event: SQS event whose message bodies were written by dispatch_alert
+        
+    Returns:
+        SQS partial batch response, so only alerts that failed again
+        are redelivered
+    """
+    failures = []
+    for record in event['Records']:
+        try:
+            alert = json.loads(record['body'])
+            result = execute_alert(alert['gemini_response'], alert['context'], alert.get('channels'))
+            delivered = result.get('status') == 'SUCCESS'
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error(f"Unreadable retry message {record.get('messageId')}: {str(e)}")
+            delivered = False
+        if not delivered:
+            failures.append({'itemIdentifier': record['messageId']})
+    
+    logger.info(f"Retried {len(event['Records'])} alerts, {len(failures)} failed again")
+    return {'batchItemFailures': failures}
+
+
+def build_alert_senders() -> Dict[str, Any]:
+    """
+    Build per-channel senders for the fan-out executor.
+    
+    Channels whose destination is not configured get no sender and are
+    reported as SKIPPED.
+    
+    Returns:
+        Channel name -> sender(target, message)
+    """
+    def log_alert(_, message):
+        logger.info(f"Alert logged: {message}")
+        return "logged"
+    
+    senders = {
+        "sms": lambda phone, message: sns_client.send_sms(phone_number=phone, message=message),
+        "log": log_alert
+    }
+    
+    topics = {
+        "emergency_contacts": os.environ.get('EMERGENCY_TOPIC_ARN'),
+        "911": os.environ.get('DISPATCH_911_TOPIC_ARN')
+    }
+    for channel, topic_arn in topics.items():
+        if topic_arn:
+            senders[channel] = lambda _, message, topic_arn=topic_arn: sns_client.publish_alert(
+                topic_arn=topic_arn,
+                message=message,
+                subject="EMERGENCY ALERT"
+            )
+    
+    return senders
+
+
+def execute_alert(
+    gemini_response: Dict[str, Any],
+    context: Dict[str, Any],
+    channels: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Execute emergency alert on every routed channel concurrently.
+    
+    Returns once every delivery has finished, or after
+    ALERT_DELIVERY_TIMEOUT_SECONDS, so no send is left running in a
+    container that freezes when the invocation ends.
     
     Args:
         gemini_response: Risk assessment from Gemini 3
         context: Contextual information
+        channels: Routing channels (defaults to emergency_contacts)
         
     Returns:
-        Alert execution result
+        Alert execution result with per-channel delivery results
     """
     try:
         # Format alert message
         alert_message = format_alert_message(gemini_response, context)
         
-        # Send via SNS
-        topic_arn = os.environ.get('EMERGENCY_TOPIC_ARN')
-        if not topic_arn:
-            raise ValueError("EMERGENCY_TOPIC_ARN not configured")
+        contacts = [
+            c.get('phone') if isinstance(c, dict) else c
+            for c in context.get('user_profile', {}).get('emergency_contacts', [])
+        ]
         
-        message_id = sns_client.publish_alert(
-            topic_arn=topic_arn,
+        fanout = alert_fanout.fan_out(
+            channels=channels or ["emergency_contacts"],
             message=alert_message,
-            subject=f"EMERGENCY ALERT - {gemini_response['risk_level']}"
+            contacts=[c for c in contacts if c],
+            wait_timeout=ALERT_DELIVERY_TIMEOUT_SECONDS
         )
+        if not fanout.wait(timeout=max(0.0, ALERT_DELIVERY_TIMEOUT_SECONDS - (time.monotonic() - fanout.started))):
+            logger.warning(f"Alert deliveries still running after {ALERT_DELIVERY_TIMEOUT_SECONDS}s")
+        result = fanout.to_dict()
         
-        logger.info(f"Alert sent successfully: {message_id}")
+        if result['status'] == 'SUCCESS':
+            logger.info(f"Alert sent successfully via {result['first_success']['channel']}")
+        else:
+            logger.error("Alert delivery failed on every channel")
         
-        return {
-            'status': 'SUCCESS',
-            'message_id': message_id,
-            'timestamp': context.get('timestamp')
-        }
+        result['timestamp'] = context.get('timestamp')
+        return result
         
     except Exception as e:
         logger.error(f"Alert execution failed: {str(e)}")
@@ -241,3 +511,10 @@ def error_response(message: str, status_code: int = 400) -> Dict[str, Any]:
             'error': message
         })
     }
+
+
+# Container pre-initialization: SnapStart hooks (on runtimes that support
+# them), and a full warm-up during init under provisioned concurrency
+register_snapshot_hooks(before_snapshot, after_restore)
+if initialization_type() == 'provisioned-concurrency':
+    warm_up()
@@ -4,24 +4,74 @@ Original work created for Google Gemini 3 Hackathon 2026
 """
 
 import logging
-from typing import Dict, Any, Optional
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional, Union
 
-# TODO: Import boto3 when deploying to AWS
-# import boto3
+try:
+    import boto3
+    from botocore.config import Config
+    BOTO3_AVAILABLE = True
+except ImportError:
+    BOTO3_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# SNS PublishBatch accepts at most 10 entries per call
+MAX_BATCH_ENTRIES = 10
+
+LATENCY_SAMPLES = 512
+
 
 class SNSClient:
     """
     Client for sending emergency notifications via AWS SNS.
+    
+    The underlying boto3 client is created once with a tuned connection
+    pool, TCP keep-alive and adaptive retries, and is safe to share
+    across threads. Every call records its latency per operation.
     """
     
-    def __init__(self):
-        """Initialize SNS client."""
-        # TODO: Initialize boto3 SNS client
-        # self.sns = boto3.client('sns')
-        self.sns = None
+    def __init__(
+        self,
+        client: Any = None,
+        region_name: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+        max_pool_connections: int = 50,
+        connect_timeout: float = 2.0,
+        read_timeout: float = 5.0,
+        max_attempts: int = 3
+    ):
+        """
+        Initialize SNS client.
+        
+        Args:
+            client: Pre-built SNS client or compatible stand-in (created with boto3 if None)
+            region_name: AWS region (defaults to the environment's region)
+            endpoint_url: Endpoint override, e.g. a local SNS emulator
+            max_pool_connections: HTTP connections kept in the pool
+            connect_timeout: Seconds to establish a connection
+            read_timeout: Seconds to wait for a response
+            max_attempts: Total attempts per call under adaptive retry mode
+        """
+        if client is None:
+            if not BOTO3_AVAILABLE:
+                raise ImportError("boto3 is required for SNSClient. Install with: pip install boto3")
+            
+            config = Config(
+                max_pool_connections=max_pool_connections,
+                tcp_keepalive=True,
+                connect_timeout=connect_timeout,
+                read_timeout=read_timeout,
+                retries={"total_max_attempts": max_attempts, "mode": "adaptive"}
+            )
+            client = boto3.client('sns', region_name=region_name, endpoint_url=endpoint_url, config=config)
+        
+        self.sns = client
+        self._latencies: Dict[str, deque] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
         logger.info("Initialized SNSClient")
     
     def publish_alert(
@@ -39,34 +89,85 @@ class SNSClient:
             message: Alert message content
             subject: Message subject (for email)
             attributes: Message attributes
-            
+        
         Returns:
             Message ID from SNS
         """
         try:
-            # TODO: Actual SNS publish call
-            # response = self.sns.publish(
-            #     TopicArn=topic_arn,
-            #     Message=message,
-            #     Subject=subject or "Emergency Alert",
-            #     MessageAttributes=self._format_attributes(attributes)
-            # )
-            # message_id = response['MessageId']
-            
-            # Placeholder for development
-            message_id = "mock-message-id-12345"
+            response = self._call(
+                "publish",
+                TopicArn=topic_arn,
+                Message=message,
+                Subject=subject or "Emergency Alert",
+                MessageAttributes=self._format_attributes(attributes)
+            )
+            message_id = response['MessageId']
             
             logger.info(f"Published alert to {topic_arn}: {message_id}")
             return message_id
-            
+        
         except Exception as e:
             logger.error(f"Failed to publish alert: {str(e)}")
             raise
     
+    def publish_batch(
+        self,
+        topic_arn: str,
+        messages: List[Union[str, Dict[str, Any]]],
+        subject: Optional[str] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Publish many messages to a topic with PublishBatch.
+        
+        Messages are sent in chunks of 10 entries per call.
+        
+        Args:
+            topic_arn: ARN of SNS topic
+            messages: Message strings, or dicts with "message" and optional
+                "subject" and "attributes"
+            subject: Default subject for entries without one
+        
+        Returns:
+            {"successful": [{"index", "message_id"}], "failed": [{"index", "error"}]}
+        """
+        successful, failed = [], []
+        
+        for start in range(0, len(messages), MAX_BATCH_ENTRIES):
+            entries = []
+            for index in range(start, min(start + MAX_BATCH_ENTRIES, len(messages))):
+                item = messages[index]
+                if isinstance(item, str):
+                    item = {"message": item}
+                entries.append({
+                    "Id": str(index),
+                    "Message": item["message"],
+                    "Subject": item.get("subject") or subject or "Emergency Alert",
+                    "MessageAttributes": self._format_attributes(item.get("attributes"))
+                })
+            
+            try:
+                response = self._call("publish_batch", TopicArn=topic_arn, PublishBatchRequestEntries=entries)
+            except Exception as e:
+                logger.error(f"PublishBatch failed for {len(entries)} entries: {str(e)}")
+                failed.extend({"index": int(entry["Id"]), "error": str(e)} for entry in entries)
+                continue
+            
+            for entry in response.get('Successful', []):
+                successful.append({"index": int(entry['Id']), "message_id": entry['MessageId']})
+            for entry in response.get('Failed', []):
+                failed.append({
+                    "index": int(entry['Id']),
+                    "error": entry.get('Message') or entry.get('Code', 'Unknown error')
+                })
+        
+        logger.info(f"Published batch to {topic_arn}: {len(successful)} sent, {len(failed)} failed")
+        return {"successful": successful, "failed": failed}
+    
     def send_sms(
         self,
         phone_number: str,
-        message: str
+        message: str,
+        sms_type: str = "Transactional"
     ) -> str:
         """
         Send SMS alert to phone number.
@@ -74,28 +175,82 @@ class SNSClient:
         Args:
             phone_number: E.164 format phone number
             message: SMS message content
-            
+            sms_type: Transactional (emergency priority) or Promotional
+        
         Returns:
             Message ID from SNS
         """
         try:
-            # TODO: Actual SNS SMS publish
-            # response = self.sns.publish(
-            #     PhoneNumber=phone_number,
-            #     Message=message
-            # )
-            # message_id = response['MessageId']
-            
-            # Placeholder for development
-            message_id = "mock-sms-id-67890"
+            response = self._call(
+                "publish",
+                PhoneNumber=phone_number,
+                Message=message,
+                MessageAttributes={
+                    'AWS.SNS.SMS.SMSType': {'DataType': 'String', 'StringValue': sms_type}
+                }
+            )
+            message_id = response['MessageId']
             
             logger.info(f"Sent SMS to {phone_number}: {message_id}")
             return message_id
-            
+        
         except Exception as e:
             logger.error(f"Failed to send SMS: {str(e)}")
             raise
     
+    def open_connection(self):
+        """
+        Open a pooled connection ahead of the first alert (container warm-up).
+        
+        Sends GetSMSAttributes, which is read-only. A service error such as
+        AccessDenied still arrived over the new connection, so only
+        connection failures are raised.
+        """
+        try:
+            self.sns.get_sms_attributes(attributes=['DefaultSMSType'])
+        except Exception as e:
+            # botocore ClientError: the service answered
+            if not hasattr(e, 'response'):
+                raise
+            logger.info(f"SNS connection open (GetSMSAttributes: {str(e)})")
+    
+    def latency_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-operation call counts and latency percentiles.
+        
+        Returns:
+            Operation -> {"calls", "errors", "p50_ms", "p95_ms", "max_ms"}
+        """
+        metrics = {}
+        with self._lock:
+            for operation, samples in self._latencies.items():
+                ordered = sorted(samples)
+                metrics[operation] = {
+                    **self._counts[operation],
+                    "p50_ms": round(ordered[len(ordered) // 2], 2) if ordered else 0.0,
+                    "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2) if ordered else 0.0,
+                    "max_ms": round(ordered[-1], 2) if ordered else 0.0
+                }
+        return metrics
+    
+    def _call(self, operation: str, **kwargs) -> Dict[str, Any]:
+        """Invoke an SNS operation and record its latency."""
+        started = time.perf_counter()
+        error = False
+        try:
+            return getattr(self.sns, operation)(**kwargs)
+        except Exception:
+            error = True
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                samples = self._latencies.setdefault(operation, deque(maxlen=LATENCY_SAMPLES))
+                counts = self._counts.setdefault(operation, {"calls": 0, "errors": 0})
+                samples.append(elapsed_ms)
+                counts["calls"] += 1
+                counts["errors"] += error
+    
     def _format_attributes(
         self,
         attributes: Optional[Dict[str, Any]]
@@ -105,7 +260,7 @@ class SNSClient:
         
         Args:
             attributes: Raw attributes dictionary
-            
+        
         Returns:
             SNS-formatted attributes
         """
@@ -122,11 +277,14 @@ class SNSClient:
         return formatted
 
 
-def create_client() -> SNSClient:
+def create_client(**kwargs) -> SNSClient:
     """
     Factory function to create SNS client.
     
+    Args:
+        **kwargs: Options passed to SNSClient
+    
     Returns:
         Initialized SNSClient instance
     """
-    return SNSClient()
+    return SNSClient(**kwargs)
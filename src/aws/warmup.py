@@ -0,0 +1,130 @@
+"""
+Lambda Container Warm-up
+Original work created for Google Gemini 3 Hackathon 2026
+
+Pre-initialization shared by aws.lambda_handler and the Gemini Lambda
+handler (deployment/lambda/gemini_handler.py, which ships this module
+next to itself):
+
+1. A warm-up event ({"warmup": true}, or an EventBridge scheduled event)
+   makes the handler run its whole initialization, including opening
+   connections, and answer with the time each stage took.
+2. With provisioned concurrency, the same warm-up runs during init,
+   before the container receives traffic.
+3. With SnapStart, initialization runs before the snapshot is taken, and
+   connections are opened by an after-restore hook, since sockets and
+   fetched secrets do not survive a restore.
+
+Only the standard library is imported.
+"""
+
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+WARMUP_KEY = "warmup"
+
+
+def is_warmup_event(event: Any) -> bool:
+    """
+    True for {"warmup": true} and EventBridge scheduled events.
+    
+    HTTP events (API Gateway, Function URLs) carry their payload in "body",
+    so a request body can never turn into a warm-up.
+    """
+    if not isinstance(event, dict):
+        return False
+    if event.get(WARMUP_KEY):
+        return True
+    return event.get("source") == "aws.events" and event.get("detail-type") == "Scheduled Event"
+
+
+def initialization_type() -> str:
+    """
+    How Lambda initialized this container: on-demand, provisioned-concurrency
+    or snap-start (AWS_LAMBDA_INITIALIZATION_TYPE).
+    """
+    return os.environ.get("AWS_LAMBDA_INITIALIZATION_TYPE", "on-demand")
+
+
+class WarmupTimer:
+    """
+    Runs initialization stages in order and times each one.
+    
+    A failed stage is recorded and the remaining stages still run, so one
+    warm-up reports every problem; a stage that requires a failed one is
+    skipped and reported as such.
+    """
+    
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.stages: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self._started = clock()
+    
+    def run(self, name: str, stage: Callable[[], Any], requires: Iterable[str] = ()) -> Any:
+        """
+        Run one stage, recording its duration and any error.
+        
+        Args:
+            name: Stage name in the report
+            stage: Called with no arguments
+            requires: Earlier stages this one needs
+        
+        Returns:
+            The stage's result, or None if it raised or was skipped
+        """
+        failed = [required for required in requires if required in self.errors]
+        if failed:
+            self.errors[name] = f"skipped: {', '.join(failed)} failed"
+            return None
+        
+        started = self.clock()
+        try:
+            return stage()
+        except Exception as e:
+            logger.warning(f"Warm-up stage {name} failed: {str(e)}")
+            self.errors[name] = str(e)
+            return None
+        finally:
+            self.stages[name] = round((self.clock() - started) * 1000, 1)
+    
+    def report(self) -> Dict[str, Any]:
+        """Warm-up result: ready, per-stage milliseconds and errors."""
+        return {
+            "warmup": True,
+            "ready": not self.errors,
+            "initialization_type": initialization_type(),
+            "stages_ms": dict(self.stages),
+            "total_ms": round((self.clock() - self._started) * 1000, 1),
+            "errors": dict(self.errors)
+        }
+
+
+def register_snapshot_hooks(
+    before_snapshot: Optional[Callable[[], Any]] = None,
+    after_restore: Optional[Callable[[], Any]] = None
+) -> bool:
+    """
+    Register SnapStart runtime hooks.
+    
+    snapshot_restore_py is provided by the Lambda Python runtimes that
+    support SnapStart (3.12 and later); elsewhere nothing is registered
+    and the hooks never run.
+    
+    Returns:
+        True if the hooks were registered
+    """
+    try:
+        from snapshot_restore_py import register_after_restore, register_before_snapshot
+    except ImportError:
+        return False
+    
+    if before_snapshot:
+        register_before_snapshot(before_snapshot)
+    if after_restore:
+        register_after_restore(after_restore)
+    return True
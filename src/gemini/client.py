@@ -2,9 +2,12 @@
 Gemini API Client
 Original work created for Google Gemini Hackathon 2026
 
-Uses Google AI Studio with gemini-1.5-pro model
+Uses Google AI Studio with gemini-1.5-pro model, through the
+google-generativeai SDK or the lightweight REST transport
+(GEMINI_TRANSPORT=rest, see rest_transport.py)
 """
 
+import importlib.util
 import json
 import os
 from typing import Dict, Any, Optional
@@ -14,14 +17,16 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-# Import Gemini SDK
+# Check for the Gemini SDK; it is imported only when the SDK transport is used
 try:
-    import google.generativeai as genai
-    GENAI_AVAILABLE = True
+    GENAI_AVAILABLE = importlib.util.find_spec("google.generativeai") is not None
 except ImportError:
     GENAI_AVAILABLE = False
+if not GENAI_AVAILABLE:
     logging.warning("google-generativeai not installed. Install with: pip install google-generativeai")
 
+TRANSPORTS = ("sdk", "rest")
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,13 +38,20 @@ class GeminiClient:
     All emergency detection reasoning flows through Gemini.
     """
     
-    def __init__(self, api_key: Optional[str] = None, model_name: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model_name: Optional[str] = None,
+        transport: Optional[str] = None
+    ):
         """
         Initialize Gemini client.
         
         Args:
             api_key: Google Gemini API key (from Google AI Studio)
             model_name: Gemini model version (gemini-1.5-pro or gemini-1.5-flash)
+            transport: "sdk" (google-generativeai) or "rest" (no grpc/protobuf);
+                       defaults to GEMINI_TRANSPORT or "sdk"
         """
         # Get API key from parameter or environment
         self.api_key = api_key or os.getenv("GOOGLE_GEMINI_API_KEY")
@@ -60,8 +72,17 @@ class GeminiClient:
                 f"Proceeding anyway, but this may fail."
             )
         
+        self.transport = (transport or os.getenv("GEMINI_TRANSPORT", "sdk")).lower()
+        if self.transport not in TRANSPORTS:
+            raise ValueError(f"Unknown Gemini transport '{self.transport}', expected one of {TRANSPORTS}")
+        
         # Initialize Gemini
-        if GENAI_AVAILABLE:
+        if self.transport == "rest":
+            from gemini.rest_transport import GeminiRestTransport, RestGenerativeModel
+            self.model = RestGenerativeModel(self.model_name, GeminiRestTransport(self.api_key))
+            logger.info(f"Initialized GeminiClient with model: {self.model_name} (REST transport)")
+        elif GENAI_AVAILABLE:
+            import google.generativeai as genai
             genai.configure(api_key=self.api_key)
             self.model = genai.GenerativeModel(self.model_name)
             logger.info(f"Initialized GeminiClient with model: {self.model_name}")
@@ -69,6 +90,26 @@ class GeminiClient:
             self.model = None
             logger.error("google-generativeai SDK not available")
     
+    def open_connection(self, timeout: float = 5.0):
+        """
+        Connect to Gemini ahead of the first analysis (container warm-up).
+        
+        countTokens is free and goes over the same connection (REST pool
+        or SDK gRPC channel) as generateContent.
+        
+        Args:
+            timeout: Seconds the SDK waits, without retries (it otherwise
+                retries an unreachable endpoint for a minute); the REST
+                transport keeps its own socket timeout
+        """
+        if not self.model:
+            raise RuntimeError("Gemini model not initialized")
+        
+        if self.transport == "rest":
+            self.model.count_tokens("warm-up")
+        else:
+            self.model.count_tokens("warm-up", request_options={"timeout": timeout, "retry": None})
+    
     def analyze_emergency(
         self,
         input_data: Dict[str, Any],
@@ -206,15 +247,20 @@ class GeminiClient:
             return False
 
 
-def initialize_client(api_key: Optional[str] = None, model_name: Optional[str] = None) -> GeminiClient:
+def initialize_client(
+    api_key: Optional[str] = None,
+    model_name: Optional[str] = None,
+    transport: Optional[str] = None
+) -> GeminiClient:
     """
     Factory function to create Gemini client.
     
     Args:
         api_key: Google Gemini API key (optional, reads from env)
         model_name: Gemini model version (optional, reads from env)
+        transport: "sdk" or "rest" (optional, reads from env)
         
     Returns:
         Initialized GeminiClient instance
     """
-    return GeminiClient(api_key=api_key, model_name=model_name)
+    return GeminiClient(api_key=api_key, model_name=model_name, transport=transport)
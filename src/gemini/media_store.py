@@ -0,0 +1,201 @@
+"""
+Content-Addressed Media Store for Multimodal Inputs
+Original work created for Google Gemini 3 Hackathon 2026
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class MediaStore:
+    """
+    Caches encoded media keyed by the SHA-256 of the raw file bytes.
+    
+    Clients retry uploads, so the same frame or clip often arrives
+    several times in one incident. Entries live in an in-memory LRU
+    bounded by bytes; entries evicted from memory spill to an optional
+    local disk tier that is itself bounded by bytes.
+    """
+    
+    def __init__(
+        self,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        disk_dir: Optional[str] = None,
+        max_disk_bytes: int = 512 * 1024 * 1024
+    ):
+        """
+        Initialize media store.
+        
+        Args:
+            max_memory_bytes: Byte budget for the in-memory tier
+            disk_dir: Directory for the disk tier (None disables it)
+            max_disk_bytes: Byte budget for the disk tier
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._memory_sizes: Dict[str, int] = {}
+        self._memory_bytes = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            self._load_disk_index()
+        
+        logger.info("Initialized MediaStore")
+    
+    @staticmethod
+    def digest(data: bytes) -> str:
+        """Return the hex SHA-256 digest used as the content key."""
+        return hashlib.sha256(data).hexdigest()
+    
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a previously encoded entry.
+        
+        Args:
+            digest: SHA-256 hex digest of the raw media bytes
+            
+        Returns:
+            Copy of the cached entry, or None on miss
+        """
+        with self._lock:
+            entry = self._memory.get(digest)
+            if entry is not None:
+                self._memory.move_to_end(digest)
+                self.hits += 1
+                return dict(entry)
+            
+            if digest in self._disk:
+                entry = self._read_disk(digest)
+                if entry is not None:
+                    self._disk.move_to_end(digest)
+                    self._insert_memory(digest, entry)
+                    self.hits += 1
+                    return dict(entry)
+            
+            self.misses += 1
+            return None
+    
+    def put(self, digest: str, entry: Dict[str, Any]):
+        """
+        Store an encoded entry.
+        
+        Args:
+            digest: SHA-256 hex digest of the raw media bytes
+            entry: Encoded modality dictionary
+        """
+        with self._lock:
+            if digest in self._memory:
+                self._memory.move_to_end(digest)
+                return
+            self._insert_memory(digest, dict(entry))
+    
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and tier occupancy."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes
+            }
+    
+    def _insert_memory(self, digest: str, entry: Dict[str, Any]):
+        """Insert into the memory tier, evicting least recently used entries."""
+        size = self._entry_size(entry)
+        self._memory[digest] = entry
+        self._memory_sizes[digest] = size
+        self._memory_bytes += size
+        
+        while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+            old_digest, old_entry = self._memory.popitem(last=False)
+            self._memory_bytes -= self._memory_sizes.pop(old_digest)
+            self._spill(old_digest, old_entry)
+    
+    def _spill(self, digest: str, entry: Dict[str, Any]):
+        """Write an evicted entry to the disk tier."""
+        if not self.disk_dir or digest in self._disk:
+            return
+        
+        path = self._disk_path(digest)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            payload = json.dumps(entry).encode('utf-8')
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to spill media {digest[:12]}: {str(e)}")
+            return
+        
+        self._disk[digest] = len(payload)
+        self._disk_bytes += len(payload)
+        
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            old_digest, old_size = self._disk.popitem(last=False)
+            self._disk_bytes -= old_size
+            try:
+                self._disk_path(old_digest).unlink()
+            except OSError:
+                pass
+    
+    def _read_disk(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Read an entry from the disk tier, dropping it if unreadable."""
+        try:
+            with open(self._disk_path(digest), 'rb') as f:
+                return json.loads(f.read())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dropping unreadable media {digest[:12]}: {str(e)}")
+            self._disk_bytes -= self._disk.pop(digest, 0)
+            return None
+    
+    def _load_disk_index(self):
+        """Rebuild the disk index from existing files, oldest first."""
+        files = sorted(self.disk_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for path in files:
+            size = path.stat().st_size
+            self._disk[path.stem] = size
+            self._disk_bytes += size
+    
+    def _disk_path(self, digest: str) -> Path:
+        """Path of the disk tier file for a digest."""
+        return self.disk_dir / f"{digest}.json"
+    
+    @staticmethod
+    def _entry_size(entry: Dict[str, Any]) -> int:
+        """Approximate in-memory size of an entry in bytes."""
+        return sum(len(v) for v in entry.values() if isinstance(v, str))
+
+
+def create_store(
+    max_memory_bytes: int = 64 * 1024 * 1024,
+    disk_dir: Optional[str] = None
+) -> MediaStore:
+    """
+    Factory function to create media store.
+    
+    Args:
+        max_memory_bytes: Byte budget for the in-memory tier
+        disk_dir: Directory for the disk tier (optional)
+        
+    Returns:
+        Initialized MediaStore instance
+    """
+    return MediaStore(max_memory_bytes=max_memory_bytes, disk_dir=disk_dir)
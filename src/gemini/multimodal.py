@@ -5,9 +5,12 @@ Original work created for Google Gemini 3 Hackathon 2026
 
 import base64
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 from pathlib import Path
 
+from gemini.media_store import MediaStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -16,13 +19,28 @@ class MultimodalInputHandler:
     Prepares multimodal inputs for Gemini 3 API.
     
     Handles text, audio, and image inputs, formatting them
-    according to Gemini 3 API requirements.
+    according to Gemini 3 API requirements. File-backed modalities
+    are read and encoded concurrently on a bounded thread pool.
+    When a media store is attached, previously seen files are
+    recognized by content hash and their encoding is reused.
     """
     
-    def __init__(self):
-        """Initialize multimodal input handler."""
+    def __init__(self, max_workers: int = 2, media_store: Optional[MediaStore] = None):
+        """
+        Initialize multimodal input handler.
+        
+        Args:
+            max_workers: Maximum number of file modalities prepared in parallel
+            media_store: Content-addressed cache of encoded media (optional)
+        """
         self.supported_audio_formats = ['.mp3', '.wav', '.m4a', '.ogg']
         self.supported_image_formats = ['.jpg', '.jpeg', '.png', '.webp']
+        self.max_workers = max(1, max_workers)
+        self.media_store = media_store
+        self._executor: Optional[ThreadPoolExecutor] = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="multimodal"
+        )
         logger.info("Initialized MultimodalInputHandler")
     
     def prepare_input(
@@ -42,7 +60,11 @@ class MultimodalInputHandler:
             context: Additional context (location, time, user profile)
             
         Returns:
-            Formatted input dictionary for Gemini 3
+            Formatted input dictionary for Gemini 3. Modalities that
+            failed to load are reported under "errors", keyed by type.
+            
+        Raises:
+            ValueError: If no modality could be prepared
         """
         input_data = {
             "modalities": [],
@@ -57,93 +79,130 @@ class MultimodalInputHandler:
             })
             logger.debug(f"Added text modality: {len(text)} characters")
         
-        # Add audio modality
+        # File modalities, in the order they appear in the output
+        jobs = []
         if audio_path:
-            audio_data = self._prepare_audio(audio_path)
-            if audio_data:
-                input_data["modalities"].append(audio_data)
-                logger.debug(f"Added audio modality: {audio_path}")
-        
-        # Add image modality
+            jobs.append(("audio", audio_path, self._encode_audio))
         if image_path:
-            image_data = self._prepare_image(image_path)
-            if image_data:
-                input_data["modalities"].append(image_data)
-                logger.debug(f"Added image modality: {image_path}")
+            jobs.append(("image", image_path, self._encode_image))
+        
+        errors = {}
+        for modality, path, result in self._run_jobs(jobs):
+            if isinstance(result, Exception):
+                errors[modality] = str(result)
+                logger.error(f"Failed to prepare {modality}: {str(result)}")
+            else:
+                input_data["modalities"].append(result)
+                logger.debug(f"Added {modality} modality: {path}")
+        
+        if errors:
+            input_data["errors"] = errors
         
         # Validate input
         if not input_data["modalities"]:
+            if errors:
+                details = "; ".join(f"{k}: {v}" for k, v in errors.items())
+                raise ValueError(f"No modality could be prepared ({details})")
             raise ValueError("At least one modality (text, audio, or image) required")
         
         return input_data
     
-    def _prepare_audio(self, audio_path: str) -> Optional[Dict[str, Any]]:
+    def _run_jobs(self, jobs: List[tuple]) -> List[tuple]:
         """
-        Prepare audio file for Gemini 3.
+        Run file preparation jobs, concurrently when there is more than one.
         
         Args:
-            audio_path: Path to audio file
+            jobs: List of (modality, path, encoder) tuples
             
         Returns:
-            Audio modality dictionary or None if error
+            List of (modality, path, result_or_exception) in job order
         """
+        if len(jobs) <= 1 or self._executor is None:
+            return [(m, p, self._call(fn, p)) for m, p, fn in jobs]
+        
+        futures = [(m, p, self._executor.submit(self._call, fn, p)) for m, p, fn in jobs]
+        return [(m, p, f.result()) for m, p, f in futures]
+    
+    @staticmethod
+    def _call(fn, path: str) -> Any:
+        """Invoke an encoder, returning the exception instead of raising."""
         try:
-            path = Path(audio_path)
-            
-            # Validate format
-            if path.suffix.lower() not in self.supported_audio_formats:
-                logger.warning(f"Unsupported audio format: {path.suffix}")
-                return None
-            
-            # Read and encode audio
-            with open(path, 'rb') as f:
-                audio_bytes = f.read()
-            
-            audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
-            
-            return {
-                "type": "audio",
-                "mime_type": self._get_audio_mime_type(path.suffix),
-                "data": audio_base64
-            }
-            
+            return fn(path)
         except Exception as e:
-            logger.error(f"Failed to prepare audio: {str(e)}")
-            return None
+            return e
     
-    def _prepare_image(self, image_path: str) -> Optional[Dict[str, Any]]:
+    def close(self):
+        """Shut down the preparation thread pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+    
+    def _encode_audio(self, audio_path: str) -> Dict[str, Any]:
+        """
+        Read and base64-encode an audio file.
+        
+        Raises:
+            ValueError: If the audio format is not supported
+            OSError: If the file cannot be read
         """
-        Prepare image file for Gemini 3.
+        path = Path(audio_path)
+        
+        # Validate format
+        if path.suffix.lower() not in self.supported_audio_formats:
+            raise ValueError(f"Unsupported audio format: {path.suffix}")
+        
+        return self._encode_file(path, "audio", self._get_audio_mime_type(path.suffix))
+    
+    def _encode_image(self, image_path: str) -> Dict[str, Any]:
+        """
+        Read and base64-encode an image file.
+        
+        Raises:
+            ValueError: If the image format is not supported
+            OSError: If the file cannot be read
+        """
+        path = Path(image_path)
+        
+        # Validate format
+        if path.suffix.lower() not in self.supported_image_formats:
+            raise ValueError(f"Unsupported image format: {path.suffix}")
+        
+        return self._encode_file(path, "image", self._get_image_mime_type(path.suffix))
+    
+    def _encode_file(self, path: Path, modality: str, mime_type: str) -> Dict[str, Any]:
+        """
+        Read a media file and encode it, reusing cached output when seen before.
         
         Args:
-            image_path: Path to image file
+            path: Path to media file
+            modality: Modality type ("audio" or "image")
+            mime_type: MIME type of the file
             
         Returns:
-            Image modality dictionary or None if error
+            Modality dictionary
         """
-        try:
-            path = Path(image_path)
-            
-            # Validate format
-            if path.suffix.lower() not in self.supported_image_formats:
-                logger.warning(f"Unsupported image format: {path.suffix}")
-                return None
-            
-            # Read and encode image
-            with open(path, 'rb') as f:
-                image_bytes = f.read()
-            
-            image_base64 = base64.b64encode(image_bytes).decode('utf-8')
-            
-            return {
-                "type": "image",
-                "mime_type": self._get_image_mime_type(path.suffix),
-                "data": image_base64
-            }
-            
-        except Exception as e:
-            logger.error(f"Failed to prepare image: {str(e)}")
-            return None
+        with open(path, 'rb') as f:
+            raw_bytes = f.read()
+        
+        digest = None
+        if self.media_store is not None:
+            digest = self.media_store.digest(raw_bytes)
+            cached = self.media_store.get(digest)
+            if cached is not None and cached.get("type") == modality:
+                logger.debug(f"Reusing cached {modality} encoding: {digest[:12]}")
+                cached["mime_type"] = mime_type
+                return cached
+        
+        entry = {
+            "type": modality,
+            "mime_type": mime_type,
+            "data": base64.b64encode(raw_bytes).decode('utf-8')
+        }
+        
+        if digest is not None:
+            self.media_store.put(digest, entry)
+        
+        return entry
     
     def _get_audio_mime_type(self, extension: str) -> str:
         """Get MIME type for audio file."""
@@ -0,0 +1,398 @@
+"""
+Gemini REST Transport
+Original work created for Google Gemini 3 Hackathon 2026
+
+Calls generateContent, streamGenerateContent and countTokens on the
+Generative Language REST API over pooled keep-alive connections from the
+standard library, so text generation does not import grpc, protobuf,
+proto-plus or googleapiclient. RestGenerativeModel exposes the subset of
+genai.GenerativeModel that GeminiClient and the Lambda handler use.
+
+The module only imports the standard library, so the Lambda package can
+ship it as a top-level module next to the handler.
+"""
+
+import http.client
+import json
+import logging
+import os
+import queue
+from typing import Dict, Any, Iterator, List, Optional, Union
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com"
+DEFAULT_API_VERSION = "v1beta"
+
+# Raised when the server has already closed an idle keep-alive connection
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    ConnectionResetError,
+    BrokenPipeError
+)
+
+
+class GeminiRestError(RuntimeError):
+    """Non-200 response from the Gemini REST API."""
+    
+    def __init__(self, status: int, message: str, reason: Optional[str] = None):
+        super().__init__(f"Gemini API error {status}{f' {reason}' if reason else ''}: {message}")
+        self.status = status
+        self.message = message
+        self.reason = reason
+
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP(S) connections to one host.
+    
+    Idle connections are reused most-recent first (the likeliest to still
+    be open); at most max_idle are kept, and concurrent requests beyond
+    that open short-lived extra connections instead of waiting.
+    """
+    
+    def __init__(self, base_url: str, max_idle: int = 4, timeout: float = 30.0):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported base URL: {base_url}")
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path.rstrip("/")
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.created = 0
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+    
+    def acquire(self):
+        """
+        Get a connection.
+        
+        Returns:
+            (connection, reused) - reused is True for a pooled connection
+        """
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            self.created += 1
+            return connection_class(self.host, self.port, timeout=self.timeout), False
+    
+    def release(self, connection: http.client.HTTPConnection):
+        """Return a connection whose response has been fully read."""
+        if self._idle.qsize() < self.max_idle:
+            self._idle.put(connection)
+        else:
+            connection.close()
+    
+    def close(self):
+        """Close every idle connection."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def build_contents(contents: Union[str, List[Any], Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Normalize a prompt to the REST `contents` list.
+    
+    A string is one user turn; a list of strings is one user turn with
+    one part each; dicts are passed through as Content objects.
+    """
+    if isinstance(contents, str):
+        return [{"role": "user", "parts": [{"text": contents}]}]
+    if isinstance(contents, dict):
+        return [contents]
+    if all(isinstance(item, str) for item in contents):
+        return [{"role": "user", "parts": [{"text": item} for item in contents]}]
+    return list(contents)
+
+
+def camel_case(name: str) -> str:
+    """max_output_tokens -> maxOutputTokens (keys already in camelCase are unchanged)."""
+    first, *rest = name.split("_")
+    return first + "".join(word.title() for word in rest)
+
+
+def build_request(
+    contents: Union[str, List[Any], Dict[str, Any]],
+    generation_config: Optional[Dict[str, Any]] = None,
+    system_instruction: Optional[str] = None,
+    safety_settings: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """
+    Build a GenerateContentRequest body.
+    
+    Args:
+        contents: Prompt (see build_contents)
+        generation_config: SDK-style config, e.g. {"temperature": 0.7, "max_output_tokens": 2048}
+        system_instruction: Optional system instruction text
+        safety_settings: Optional list of {"category": ..., "threshold": ...}
+    
+    Returns:
+        JSON-serializable request body
+    """
+    body: Dict[str, Any] = {"contents": build_contents(contents)}
+    if generation_config:
+        body["generationConfig"] = {camel_case(key): value for key, value in generation_config.items()}
+    if system_instruction:
+        body["systemInstruction"] = {"parts": [{"text": system_instruction}]}
+    if safety_settings:
+        body["safetySettings"] = safety_settings
+    return body
+
+
+def candidate_text(response: Dict[str, Any]) -> str:
+    """Concatenated text parts of the first candidate ("" if there is none)."""
+    candidates = response.get("candidates") or []
+    if not candidates:
+        return ""
+    parts = (candidates[0].get("content") or {}).get("parts") or []
+    return "".join(part.get("text", "") for part in parts)
+
+
+def response_text(response: Dict[str, Any]) -> str:
+    """
+    Text of a GenerateContentResponse, as the SDK's `response.text`.
+    
+    Raises:
+        ValueError: If the prompt was blocked or no candidate has text
+    """
+    if not response.get("candidates"):
+        block_reason = (response.get("promptFeedback") or {}).get("blockReason")
+        raise ValueError(f"Response has no candidates (block reason: {block_reason or 'unknown'})")
+    return candidate_text(response)
+
+
+class GeminiRestTransport:
+    """
+    Generative Language REST client over a keep-alive connection pool.
+    
+    Safe to share across threads; create one per process and reuse it so
+    warm invocations skip the TCP and TLS handshakes.
+    """
+    
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        api_version: str = DEFAULT_API_VERSION,
+        timeout: float = 30.0,
+        max_idle: int = 4
+    ):
+        """
+        Initialize transport.
+        
+        Args:
+            api_key: Google AI Studio API key
+            base_url: API root (default GEMINI_API_BASE_URL or the public endpoint)
+            api_version: REST API version path segment
+            timeout: Socket timeout per connection, in seconds
+            max_idle: Most idle keep-alive connections kept
+        """
+        self.api_key = api_key
+        self.api_version = api_version
+        self.pool = ConnectionPool(
+            base_url or os.getenv("GEMINI_API_BASE_URL", DEFAULT_BASE_URL),
+            max_idle=max_idle,
+            timeout=timeout
+        )
+    
+    def generate_content(self, model: str, contents: Any, **options) -> Dict[str, Any]:
+        """
+        Call models/{model}:generateContent.
+        
+        Args:
+            model: Model name, e.g. gemini-1.5-pro
+            contents: Prompt (see build_contents)
+            **options: generation_config, system_instruction, safety_settings
+        
+        Returns:
+            Parsed GenerateContentResponse
+        """
+        connection, response = self._send(self._path(model, "generateContent"), build_request(contents, **options))
+        data = response.read()
+        self._finish(connection, response)
+        return json.loads(data)
+    
+    def stream_generate_content(self, model: str, contents: Any, **options) -> Iterator[Dict[str, Any]]:
+        """
+        Call models/{model}:streamGenerateContent and yield each chunk as it arrives.
+        
+        Chunks are parsed from the server-sent events stream (alt=sse).
+        The request is sent on the first next(), so API errors surface
+        there. Abandoning the iterator early closes its connection instead of
+        returning it to the pool.
+        """
+        connection, response = self._send(
+            self._path(model, "streamGenerateContent") + "?alt=sse",
+            build_request(contents, **options)
+        )
+        complete = False
+        try:
+            data_lines = []
+            for line in response:
+                line = line.decode("utf-8").rstrip("\r\n")
+                if line.startswith("data:"):
+                    data_lines.append(line[5:].lstrip())
+                elif not line and data_lines:
+                    yield json.loads("\n".join(data_lines))
+                    data_lines = []
+            if data_lines:
+                yield json.loads("\n".join(data_lines))
+            complete = True
+        finally:
+            if complete:
+                self._finish(connection, response)
+            else:
+                connection.close()
+    
+    def count_tokens(self, model: str, contents: Any) -> Dict[str, Any]:
+        """
+        Call models/{model}:countTokens.
+        
+        Free of charge, so it is also how a warm-up opens a pooled
+        connection before the first generateContent.
+        
+        Returns:
+            Parsed CountTokensResponse, e.g. {"totalTokens": 3}
+        """
+        connection, response = self._send(self._path(model, "countTokens"), {"contents": build_contents(contents)})
+        data = response.read()
+        self._finish(connection, response)
+        return json.loads(data)
+    
+    def close(self):
+        """Close pooled connections."""
+        self.pool.close()
+    
+    def _path(self, model: str, method: str) -> str:
+        if not model.startswith(("models/", "tunedModels/")):
+            model = f"models/{model}"
+        return f"{self.pool.base_path}/{self.api_version}/{model}:{method}"
+    
+    def _send(self, path: str, body: Dict[str, Any]):
+        """
+        POST body and return (connection, response) once the status is 200.
+        
+        A pooled connection the server already closed is retried once on a
+        new connection; nothing was processed since no response arrived.
+        """
+        payload = json.dumps(body).encode("utf-8")
+        headers = {"Content-Type": "application/json", "x-goog-api-key": self.api_key}
+        while True:
+            connection, reused = self.pool.acquire()
+            try:
+                connection.request("POST", path, body=payload, headers=headers)
+                response = connection.getresponse()
+                break
+            except STALE_CONNECTION_ERRORS:
+                connection.close()
+                if not reused:
+                    raise
+                logger.info("Pooled Gemini connection was closed by the server; reconnecting")
+            except Exception:
+                connection.close()
+                raise
+        
+        if response.status != 200:
+            data = response.read()
+            self._finish(connection, response)
+            raise self._error(response.status, data)
+        return connection, response
+    
+    def _finish(self, connection, response):
+        """Pool the connection unless the server asked to close it."""
+        if response.will_close:
+            connection.close()
+        else:
+            self.pool.release(connection)
+    
+    @staticmethod
+    def _error(status: int, data: bytes) -> GeminiRestError:
+        try:
+            error = json.loads(data)["error"]
+            return GeminiRestError(status, error.get("message", ""), error.get("status"))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return GeminiRestError(status, data.decode("utf-8", "replace")[:500])
+
+
+class RestResponse:
+    """GenerateContentResponse with the SDK's `.text` accessor."""
+    
+    def __init__(self, raw: Dict[str, Any]):
+        self.raw = raw
+    
+    @property
+    def text(self) -> str:
+        return response_text(self.raw)
+    
+    @property
+    def candidates(self) -> List[Dict[str, Any]]:
+        return self.raw.get("candidates") or []
+    
+    @property
+    def usage_metadata(self) -> Optional[Dict[str, Any]]:
+        return self.raw.get("usageMetadata")
+
+
+class RestStreamResponse:
+    """Streamed response: iterate for chunks as they arrive, or read `.text` for all of it."""
+    
+    def __init__(self, chunks: Iterator[Dict[str, Any]]):
+        self._chunks = chunks
+        self.chunks: List[RestResponse] = []
+    
+    def __iter__(self) -> Iterator[RestResponse]:
+        for raw in self._chunks:
+            chunk = RestResponse(raw)
+            self.chunks.append(chunk)
+            yield chunk
+    
+    def resolve(self):
+        """Read the rest of the stream."""
+        for _ in self:
+            pass
+    
+    @property
+    def text(self) -> str:
+        self.resolve()
+        return "".join(candidate_text(chunk.raw) for chunk in self.chunks)
+
+
+class RestGenerativeModel:
+    """
+    Stand-in for genai.GenerativeModel backed by GeminiRestTransport.
+    
+    Supports generate_content(contents, generation_config=..., stream=...)
+    and returns objects with `.text`, which is all GeminiClient and the
+    Lambda handler use, plus count_tokens(contents) for warm-ups.
+    """
+    
+    def __init__(self, model_name: str, transport: GeminiRestTransport, system_instruction: Optional[str] = None):
+        self.model_name = model_name
+        self.transport = transport
+        self.system_instruction = system_instruction
+    
+    def generate_content(
+        self,
+        contents: Any,
+        generation_config: Optional[Dict[str, Any]] = None,
+        safety_settings: Optional[List[Dict[str, Any]]] = None,
+        stream: bool = False
+    ) -> Union[RestResponse, RestStreamResponse]:
+        options = {
+            "generation_config": generation_config,
+            "system_instruction": self.system_instruction,
+            "safety_settings": safety_settings
+        }
+        if stream:
+            return RestStreamResponse(self.transport.stream_generate_content(self.model_name, contents, **options))
+        return RestResponse(self.transport.generate_content(self.model_name, contents, **options))
+    
+    def count_tokens(self, contents: Any) -> Dict[str, Any]:
+        return self.transport.count_tokens(self.model_name, contents)
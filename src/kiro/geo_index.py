@@ -0,0 +1,404 @@
+"""
+KIRO Geospatial Risk Index
+Point lookup of high-risk zones for the location context multiplier
+
+Original work created for Google Gemini 3 Hackathon 2026
+
+Zones are bucketed into a fixed lat/lng grid. Each bucket lists the
+zones that touch it, flagged when the zone covers the whole cell so
+polygon refinement can be skipped. The compiled index is a single
+little-endian binary file that is memory-mapped at load time.
+
+Usage:
+    PYTHONPATH=src python -m kiro.geo_index build zones.geojson -o risk_zones.kgi
+    PYTHONPATH=src python -m kiro.geo_index lookup risk_zones.kgi 4.7110 -74.0721
+"""
+
+import argparse
+import bisect
+import csv
+import json
+import logging
+import math
+import mmap
+import struct
+import sys
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"KRGI"
+FORMAT_VERSION = 1
+
+# magic, version, cell_deg, n_cells, n_refs, n_zones, n_vertices
+HEADER = struct.Struct("<4sI d I I I I")
+
+FULL_CELL = 0x80000000
+
+Polygon = List[Tuple[float, float]]
+
+
+def _columns(cell_deg: float) -> int:
+    """Number of grid columns around the globe."""
+    return int(math.ceil(360.0 / cell_deg))
+
+
+def _cell_coords(lat: float, lng: float, cell_deg: float) -> Tuple[int, int]:
+    """Grid row and column containing a point."""
+    # lng = 180.0 is the antimeridian: keep it in the last column rather
+    # than spilling into column 0 of the next row
+    col = min(int((lng + 180.0) // cell_deg), _columns(cell_deg) - 1)
+    return int((lat + 90.0) // cell_deg), col
+
+
+def _cell_key(row: int, col: int, cell_deg: float) -> int:
+    """Flatten a grid cell into a sortable integer key."""
+    return row * _columns(cell_deg) + col
+
+
+def _point_in_polygon(lat: float, lng: float, vertices) -> bool:
+    """Ray casting test; vertices is a flat (lat, lng, lat, lng, ...) sequence."""
+    inside = False
+    n = len(vertices) // 2
+    j = n - 1
+    for i in range(n):
+        lat_i, lng_i = vertices[2 * i], vertices[2 * i + 1]
+        lat_j, lng_j = vertices[2 * j], vertices[2 * j + 1]
+        if (lat_i > lat) != (lat_j > lat):
+            if lng < (lng_j - lng_i) * (lat - lat_i) / (lat_j - lat_i) + lng_i:
+                inside = not inside
+        j = i
+    return inside
+
+
+def _segment_hits_box(a: Tuple[float, float], b: Tuple[float, float], box: Tuple[float, float, float, float]) -> bool:
+    """Liang-Barsky test of segment a-b against (min_lat, min_lng, max_lat, max_lng)."""
+    t0, t1 = 0.0, 1.0
+    d_lat, d_lng = b[0] - a[0], b[1] - a[1]
+    for p, q in (
+        (-d_lat, a[0] - box[0]), (d_lat, box[2] - a[0]),
+        (-d_lng, a[1] - box[1]), (d_lng, box[3] - a[1])
+    ):
+        if p == 0:
+            if q < 0:
+                return False
+            continue
+        t = q / p
+        if p < 0:
+            t0 = max(t0, t)
+        else:
+            t1 = min(t1, t)
+        if t0 > t1:
+            return False
+    return True
+
+
+class GeoRiskIndex:
+    """
+    Memory-mapped risk-zone index.
+    
+    lookup() hashes the point to its grid cell, binary-searches the
+    sorted cell keys, and only runs point-in-polygon for zones that
+    partially cover the cell.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open a compiled index file.
+        
+        Args:
+            path: Path to a file produced by build_index
+        
+        Raises:
+            ValueError: If the file is not a valid index
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, version, cell_deg, n_cells, n_refs, n_zones, n_vertices = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Not a geo risk index (version {FORMAT_VERSION}): {path}")
+        
+        self.cell_deg = cell_deg
+        view = self._view = memoryview(self._mmap)
+        offset = HEADER.size
+        
+        def section(fmt: str, count: int, item_size: int):
+            nonlocal offset
+            data = view[offset:offset + count * item_size].cast(fmt)
+            offset += _padded(count * item_size)
+            return data
+        
+        self._keys = section('Q', n_cells, 8)
+        self._spans = section('I', 2 * n_cells, 4)
+        self._refs = section('I', n_refs, 4)
+        self._zone_values = section('d', 5 * n_zones, 8)
+        self._zone_spans = section('I', 2 * n_zones, 4)
+        self._vertices = section('d', 2 * n_vertices, 8)
+        
+        logger.info(f"Loaded geo risk index: {n_zones} zones in {n_cells} cells")
+    
+    def lookup(self, lat: float, lng: float) -> float:
+        """
+        Risk multiplier at a point.
+        
+        Args:
+            lat: Latitude in degrees
+            lng: Longitude in degrees
+        
+        Returns:
+            Highest multiplier of the zones containing the point, or 1.0
+        """
+        row, col = _cell_coords(lat, lng, self.cell_deg)
+        i = self._find_cell(_cell_key(row, col, self.cell_deg))
+        return 1.0 if i is None else self._cell_multiplier(i, lat, lng)
+    
+    def lookup_many(self, lats: Sequence[float], lngs: Sequence[float]) -> List[float]:
+        """
+        Risk multipliers for many points.
+        
+        Each distinct grid cell is searched for once. A NaN or None
+        coordinate means no location and gets 1.0.
+        
+        Args:
+            lats: Latitudes in degrees
+            lngs: Longitudes in degrees
+        
+        Returns:
+            One multiplier per point
+        """
+        cells: Dict[int, Optional[int]] = {}
+        results = []
+        for lat, lng in zip(lats, lngs):
+            if lat is None or lng is None or math.isnan(lat) or math.isnan(lng):
+                results.append(1.0)
+                continue
+            lat, lng = float(lat), float(lng)
+            row, col = _cell_coords(lat, lng, self.cell_deg)
+            key = _cell_key(row, col, self.cell_deg)
+            if key not in cells:
+                cells[key] = self._find_cell(key)
+            i = cells[key]
+            results.append(1.0 if i is None else self._cell_multiplier(i, lat, lng))
+        return results
+    
+    def _find_cell(self, key: int) -> Optional[int]:
+        """Position of a cell key in the sorted key section, or None."""
+        i = bisect.bisect_left(self._keys, key)
+        if i == len(self._keys) or self._keys[i] != key:
+            return None
+        return i
+    
+    def _cell_multiplier(self, i: int, lat: float, lng: float) -> float:
+        """Highest multiplier of the zones in cell i that contain the point."""
+        first, count = self._spans[2 * i], self._spans[2 * i + 1]
+        best = None
+        for ref in self._refs[first:first + count]:
+            zone = ref & ~FULL_CELL
+            values = self._zone_values[5 * zone:5 * zone + 5]
+            if best is not None and values[0] <= best:
+                continue
+            if not ref & FULL_CELL:
+                if not (values[1] <= lat <= values[3] and values[2] <= lng <= values[4]):
+                    continue
+                start, length = self._zone_spans[2 * zone], self._zone_spans[2 * zone + 1]
+                if not _point_in_polygon(lat, lng, self._vertices[2 * start:2 * (start + length)]):
+                    continue
+            best = values[0]
+        
+        return best if best is not None else 1.0
+    
+    def close(self):
+        """Release the memory map."""
+        for name in ("_keys", "_spans", "_refs", "_zone_values", "_zone_spans", "_vertices"):
+            getattr(self, name).release()
+        self._view.release()
+        self._mmap.close()
+
+
+def _padded(size: int) -> int:
+    """Round a section size up to 8-byte alignment."""
+    return (size + 7) & ~7
+
+
+def build_index(zones: List[Dict[str, Any]], output_path: str, cell_deg: float = 0.01) -> Dict[str, int]:
+    """
+    Compile risk zones into the binary index format.
+    
+    Args:
+        zones: Zones with "polygon" (list of (lat, lng)) and "multiplier"
+        output_path: Destination file
+        cell_deg: Grid cell size in degrees (0.01 is roughly 1 km)
+    
+    Returns:
+        Summary counts of the compiled index
+    """
+    cells: Dict[int, List[int]] = {}
+    vertices: List[float] = []
+    zone_values: List[float] = []
+    zone_spans: List[int] = []
+    
+    for zone_id, zone in enumerate(zones):
+        polygon = [(float(lat), float(lng)) for lat, lng in zone["polygon"]]
+        if len(polygon) > 1 and polygon[0] == polygon[-1]:
+            polygon = polygon[:-1]
+        if len(polygon) < 3:
+            raise ValueError(f"Zone {zone.get('name', zone_id)} needs at least 3 vertices")
+        
+        lats = [p[0] for p in polygon]
+        lngs = [p[1] for p in polygon]
+        zone_values.extend([float(zone["multiplier"]), min(lats), min(lngs), max(lats), max(lngs)])
+        zone_spans.extend([len(vertices) // 2, len(polygon)])
+        flat = [c for p in polygon for c in p]
+        vertices.extend(flat)
+        edges = list(zip(polygon, polygon[1:] + polygon[:1]))
+        
+        row0, col0 = _cell_coords(min(lats), min(lngs), cell_deg)
+        row1, col1 = _cell_coords(max(lats), max(lngs), cell_deg)
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                box = (
+                    row * cell_deg - 90.0, col * cell_deg - 180.0,
+                    (row + 1) * cell_deg - 90.0, (col + 1) * cell_deg - 180.0
+                )
+                if any(_segment_hits_box(a, b, box) for a, b in edges):
+                    ref = zone_id
+                elif _point_in_polygon((box[0] + box[2]) / 2, (box[1] + box[3]) / 2, flat):
+                    ref = zone_id | FULL_CELL
+                else:
+                    continue
+                cells.setdefault(_cell_key(row, col, cell_deg), []).append(ref)
+    
+    keys = sorted(cells)
+    spans: List[int] = []
+    refs: List[int] = []
+    for key in keys:
+        spans.extend([len(refs), len(cells[key])])
+        refs.extend(cells[key])
+    
+    def pack(fmt: str, values: List) -> bytes:
+        data = struct.pack(f"<{len(values)}{fmt}", *values)
+        return data + b"\0" * (_padded(len(data)) - len(data))
+    
+    with open(output_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, cell_deg, len(keys), len(refs), len(zones), len(vertices) // 2))
+        f.write(pack('Q', keys))
+        f.write(pack('I', spans))
+        f.write(pack('I', refs))
+        f.write(pack('d', zone_values))
+        f.write(pack('I', zone_spans))
+        f.write(pack('d', vertices))
+    
+    summary = {"zones": len(zones), "cells": len(keys), "refs": len(refs), "vertices": len(vertices) // 2}
+    logger.info(f"Built geo risk index {output_path}: {summary}")
+    return summary
+
+
+def load_zones(path: str, default_multiplier: float = 1.3) -> List[Dict[str, Any]]:
+    """
+    Read risk zones from GeoJSON or CSV.
+    
+    GeoJSON: Polygon/MultiPolygon features; the multiplier is read from
+    properties.risk_multiplier. Only exterior rings are used.
+    CSV: columns lat, lng, radius_m and optional multiplier, name; each
+    row becomes a 24-sided polygon approximating the circle.
+    
+    Args:
+        path: Source file (.geojson/.json or .csv)
+        default_multiplier: Multiplier when a zone does not specify one
+    
+    Returns:
+        Zones suitable for build_index
+    """
+    zones = []
+    if Path(path).suffix.lower() == '.csv':
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                zones.append({
+                    "name": row.get("name", ""),
+                    "multiplier": float(row.get("multiplier") or default_multiplier),
+                    "polygon": _circle(float(row["lat"]), float(row["lng"]), float(row["radius_m"]))
+                })
+        return zones
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        document = json.load(f)
+    
+    for feature in document.get("features", []):
+        geometry = feature.get("geometry") or {}
+        properties = feature.get("properties") or {}
+        if geometry.get("type") == "Polygon":
+            polygons = [geometry["coordinates"]]
+        elif geometry.get("type") == "MultiPolygon":
+            polygons = geometry["coordinates"]
+        else:
+            continue
+        for rings in polygons:
+            zones.append({
+                "name": properties.get("name", ""),
+                "multiplier": float(properties.get("risk_multiplier", default_multiplier)),
+                # GeoJSON positions are (lng, lat)
+                "polygon": [(lat, lng) for lng, lat in (p[:2] for p in rings[0])]
+            })
+    return zones
+
+
+def _circle(lat: float, lng: float, radius_m: float, sides: int = 24) -> Polygon:
+    """Approximate a circle around a point as a polygon."""
+    d_lat = radius_m / 111320.0
+    d_lng = d_lat / max(math.cos(math.radians(lat)), 1e-6)
+    return [
+        (lat + d_lat * math.sin(2 * math.pi * i / sides), lng + d_lng * math.cos(2 * math.pi * i / sides))
+        for i in range(sides)
+    ]
+
+
+def load_index(path: Optional[str]) -> Optional[GeoRiskIndex]:
+    """
+    Open an index if a path is given and the file exists.
+    
+    Args:
+        path: Path to compiled index (optional)
+    
+    Returns:
+        GeoRiskIndex or None
+    """
+    if not path or not Path(path).exists():
+        return None
+    return GeoRiskIndex(path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Build and query the KIRO geospatial risk index")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    build = commands.add_parser("build", help="Compile GeoJSON/CSV zones into an index file")
+    build.add_argument("sources", nargs="+", help="GeoJSON or CSV zone files")
+    build.add_argument("-o", "--output", required=True, help="Output index path")
+    build.add_argument("--cell-deg", type=float, default=0.01, help="Grid cell size in degrees")
+    build.add_argument("--default-multiplier", type=float, default=1.3, help="Multiplier for zones without one")
+    
+    lookup = commands.add_parser("lookup", help="Query the multiplier at a point")
+    lookup.add_argument("index", help="Index path")
+    lookup.add_argument("lat", type=float)
+    lookup.add_argument("lng", type=float)
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == "build":
+        zones = []
+        for source in args.sources:
+            zones.extend(load_zones(source, args.default_multiplier))
+        print(json.dumps(build_index(zones, args.output, args.cell_deg)))
+    else:
+        index = GeoRiskIndex(args.index)
+        print(index.lookup(args.lat, args.lng))
+        index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,9 +5,12 @@ Decision logic and workflow management for AllSensesAI
 Original work created for Google Gemini 3 Hackathon 2026
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
 
+from kiro.rules import RuleEngine, RuleTable, rules_from_thresholds
+from kiro.session_state import SessionStateEngine
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,117 +26,160 @@ class KIROOrchestrator:
     - Log audit trail
     """
     
-    def __init__(self, config: Dict[str, Any]):
+    DEFAULT_THRESHOLDS = {
+        "CRITICAL": 0.8,
+        "HIGH": 0.7,
+        "MEDIUM": 0.5,
+        "LOW": 0.3
+    }
+    
+    ESCALATION_LEVELS = {
+        "NONE": "LOW",
+        "LOW": "MEDIUM",
+        "MEDIUM": "HIGH",
+        "HIGH": "CRITICAL",
+        "CRITICAL": "CRITICAL"
+    }
+    
+    PRIORITY_RANK = {"CRITICAL": 3, "HIGH": 2, "MEDIUM": 1}
+    
+    # Streams of these levels are never escalated into an alert
+    NON_ESCALATING_LEVELS = {"NONE", "LOW"}
+    
+    def __init__(self, config: Dict[str, Any], audit_sink: Optional[Any] = None):
         """
         Initialize KIRO orchestrator.
         
         Args:
-            config: Configuration including thresholds and routing rules
+            config: Configuration including either "rules_path" (declarative
+                routing rules, hot-reloaded) or "thresholds" (per-level
+                confidence thresholds compiled into equivalent rules),
+                and "sessions" (SessionStateEngine options, or False to
+                judge every assessment on its own)
+            audit_sink: Optional non-blocking sink with a record(decision)
+                method, e.g. aws.dynamodb_client.AuditLogWriter
         """
         self.config = config
-        self.thresholds = config.get("thresholds", {
-            "CRITICAL": 0.8,
-            "HIGH": 0.7,
-            "MEDIUM": 0.5,
-            "LOW": 0.3
-        })
+        self.audit_sink = audit_sink
+        self.thresholds = config.get("thresholds", dict(self.DEFAULT_THRESHOLDS))
+        
+        if config.get("rules_path"):
+            self.rules = RuleEngine(
+                rules_path=config["rules_path"],
+                check_interval=config.get("rules_check_interval", 5.0)
+            )
+        else:
+            self.rules = RuleTable(rules_from_thresholds(self.thresholds))
+        
+        session_config = config.get("sessions", {})
+        self.sessions = None
+        if session_config is not False:
+            self.sessions = SessionStateEngine(**(session_config or {}))
         
         logger.info("Initialized KIRO Orchestrator")
     
     def process_assessment(
         self,
         gemini_assessment: Dict[str, Any],
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        now: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Process Gemini 3 risk assessment and make routing decision.
         
+        Assessments that share a session_id (or user_profile.user_id)
+        feed a per-session escalation state, so a sequence of moderate
+        assessments can escalate beyond what each warrants on its own.
+        
         Args:
             gemini_assessment: Risk assessment from Gemini 3
             context: Additional context (user profile, location, history)
+            now: Monotonic timestamp for session state, e.g. a replayed
+                event time (defaults to time.monotonic())
             
         Returns:
             Decision with routing instructions
         """
-        # TODO: Implement decision logic
-        
         risk_level = gemini_assessment.get("risk_level")
         confidence = gemini_assessment.get("confidence")
         
-        # Apply threshold logic
-        should_alert = self._should_trigger_alert(risk_level, confidence)
+        # Single lookup in the compiled decision table
+        outcome = self.rules.decide(risk_level, confidence, context)
         
-        # Determine routing
-        routing = self._determine_routing(risk_level, should_alert)
+        session = None
+        session_id = context.get("session_id") or (context.get("user_profile") or {}).get("user_id")
+        if self.sessions is not None and session_id:
+            session = self.sessions.observe(str(session_id), risk_level, confidence, now)
+            if session["escalate"]:
+                outcome = self._escalate(outcome, risk_level, confidence, session, context)
         
         # Build decision
         decision = {
-            "should_alert": should_alert,
-            "routing": routing,
+            "should_alert": outcome["should_alert"],
+            "routing": outcome["routing"],
+            "rule_id": outcome["rule_id"],
+            "rules_version": outcome["rules_version"],
+            "escalated": outcome.get("escalated", False),
+            "session": session,
             "gemini_assessment": gemini_assessment,
             "context": context,
             "timestamp": self._get_timestamp()
         }
         
-        logger.info(f"KIRO decision: {decision['routing']}")
+        logger.info(f"KIRO decision: {decision['routing']} (rule {decision['rule_id']})")
+        
+        if self.audit_sink is not None:
+            try:
+                self.audit_sink.record(decision)
+            except Exception as e:
+                logger.error(f"Failed to record audit entry: {str(e)}")
+        
         return decision
     
-    def _should_trigger_alert(self, risk_level: str, confidence: float) -> bool:
+    def _escalate(
+        self,
+        outcome: Dict[str, Any],
+        risk_level: str,
+        confidence: float,
+        session: Dict[str, Any],
+        context: Dict[str, Any]
+    ) -> Dict[str, Any]:
         """
-        Determine if alert should be triggered based on risk and confidence.
+        Re-route an assessment using accumulated session risk.
+        
+        The session risk stands in for confidence, first at the next
+        risk level up and then at the reported level. The first result
+        that routes with a higher priority than the original wins. LOW
+        and NONE assessments are never escalated.
         
         Args:
+            outcome: Decision for the assessment on its own
             risk_level: Risk level from Gemini 3
             confidence: Confidence score from Gemini 3
+            session: Session summary from SessionStateEngine.observe
+            context: Request context
             
         Returns:
-            True if alert should be triggered
+            Escalated decision, or the original if nothing ranks higher
         """
-        # TODO: Implement threshold logic
-        
-        if risk_level == "CRITICAL":
-            return confidence >= self.thresholds["CRITICAL"]
-        elif risk_level == "HIGH":
-            return confidence >= self.thresholds["HIGH"]
-        elif risk_level == "MEDIUM":
-            return confidence >= self.thresholds["MEDIUM"]
-        else:
-            return False
-    
-    def _determine_routing(self, risk_level: str, should_alert: bool) -> Dict[str, Any]:
-        """
-        Determine alert routing based on risk level.
+        if risk_level in self.NON_ESCALATING_LEVELS:
+            return outcome
         
-        Args:
-            risk_level: Risk level from Gemini 3
-            should_alert: Whether alert should be triggered
-            
-        Returns:
-            Routing configuration
-        """
-        # TODO: Implement routing logic
-        
-        if not should_alert:
-            return {"action": "LOG_ONLY"}
-        
-        if risk_level == "CRITICAL":
-            return {
-                "action": "IMMEDIATE_ALERT",
-                "channels": ["911", "emergency_contacts", "sms"],
-                "priority": "CRITICAL"
-            }
-        elif risk_level == "HIGH":
-            return {
-                "action": "ALERT",
-                "channels": ["emergency_contacts", "sms"],
-                "priority": "HIGH"
-            }
-        else:
-            return {
-                "action": "MONITOR",
-                "channels": ["log"],
-                "priority": "MEDIUM"
-            }
+        boosted = min(1.0, max(confidence or 0.0, session["session_risk"]))
+        current_rank = self.PRIORITY_RANK.get(outcome["routing"].get("priority"), 0)
+        
+        for level in (self.ESCALATION_LEVELS.get(risk_level, "MEDIUM"), risk_level):
+            candidate = self.rules.decide(level, boosted, context)
+            rank = self.PRIORITY_RANK.get(candidate["routing"].get("priority"), 0)
+            if candidate["should_alert"] and rank > current_rank:
+                candidate["escalated"] = True
+                logger.info(
+                    f"Session {session['session_id']} escalated to {candidate['routing']['action']} "
+                    f"({session['reason']}, session_risk={session['session_risk']:.2f})"
+                )
+                return candidate
+        
+        return outcome
     
     def _get_timestamp(self) -> str:
         """Get current timestamp."""
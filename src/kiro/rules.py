@@ -0,0 +1,291 @@
+"""
+KIRO Decision Rules
+Declarative routing rules compiled into a constant-time lookup table
+
+Original work created for Google Gemini 3 Hackathon 2026
+"""
+
+import bisect
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RULES_PATH = Path(__file__).with_name("routing_rules.json")
+
+RISK_LEVELS = ["CRITICAL", "HIGH", "MEDIUM", "LOW", "NONE"]
+ANY_LEVEL = "*"
+
+def _profile(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    """User profile from the request context; {} when missing or null."""
+    profile = ctx.get("user_profile")
+    return profile if isinstance(profile, dict) else {}
+
+
+def _is_minor(ctx: Dict[str, Any]) -> bool:
+    """True only for a numeric age under 18; unknown ages are not minors."""
+    age = _profile(ctx).get("age")
+    return isinstance(age, (int, float)) and not isinstance(age, bool) and age < 18
+
+
+# Context flags a rule may condition on, derived from the request context
+CONTEXT_FLAGS: Dict[str, Callable[[Dict[str, Any]], bool]] = {
+    "minor": _is_minor,
+    "vulnerable": lambda ctx: bool(_profile(ctx).get("vulnerable", False)),
+    "has_location": lambda ctx: "location" in ctx,
+}
+
+
+class RuleTable:
+    """
+    Immutable decision table compiled from a rules document.
+    
+    Rules are matched first-to-last at compile time against every
+    combination of risk level, confidence band and context flags, so
+    a decision at request time is a single dictionary lookup.
+    
+    Rules document format:
+        {
+            "version": "...",
+            "actions": {
+                "ALERT": {"alert": true, "channels": [...], "priority": "HIGH"},
+                "LOG_ONLY": {"alert": false}
+            },
+            "rules": [
+                {"id": "high-confident", "risk_level": "HIGH",
+                 "min_confidence": 0.7, "when": {"vulnerable": true},
+                 "action": "ALERT"},
+                {"id": "default", "action": "LOG_ONLY"}
+            ]
+        }
+    """
+    
+    def __init__(self, document: Dict[str, Any]):
+        """
+        Compile rules document.
+        
+        Args:
+            document: Parsed rules document
+        
+        Raises:
+            ValueError: If the document is invalid or has no catch-all rule
+        """
+        self.version = str(document.get("version", "unversioned"))
+        self.actions = document.get("actions", {})
+        rules = document.get("rules", [])
+        if not rules:
+            raise ValueError("Rules document has no rules")
+        
+        self._validate(rules)
+        
+        # Referenced flags, in a fixed order that defines the bitmask
+        self.flags = sorted({f for rule in rules for f in rule.get("when", {})})
+        
+        # Band edges from every confidence bound used by any rule
+        edges = set()
+        for rule in rules:
+            for bound in ("min_confidence", "max_confidence"):
+                if bound in rule:
+                    edges.add(float(rule[bound]))
+        self.edges = sorted(edges)
+        
+        self._table: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+        levels = RISK_LEVELS + [ANY_LEVEL]
+        for level, band, mask in itertools.product(
+            levels, range(len(self.edges) + 1), range(1 << len(self.flags))
+        ):
+            rule = self._first_match(rules, level, band, mask)
+            if rule is None:
+                raise ValueError(
+                    f"No rule matches risk_level={level}, band={band}, flags={mask}; "
+                    f"add a catch-all rule"
+                )
+            self._table[(level, band, mask)] = self._build_decision(rule)
+        
+        logger.info(
+            f"Compiled {len(rules)} rules (version {self.version}) "
+            f"into {len(self._table)} table entries"
+        )
+    
+    def decide(self, risk_level: Optional[str], confidence: Optional[float], context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Look up the decision for an assessment.
+        
+        Args:
+            risk_level: Risk level from Gemini 3
+            confidence: Confidence score from Gemini 3
+            context: Request context used for flag evaluation
+        
+        Returns:
+            Decision with should_alert, routing, rule_id and rules_version
+        """
+        level = risk_level if risk_level in RISK_LEVELS else ANY_LEVEL
+        band = bisect.bisect_right(self.edges, confidence or 0.0)
+        
+        mask = 0
+        for bit, flag in enumerate(self.flags):
+            if CONTEXT_FLAGS[flag](context):
+                mask |= 1 << bit
+        
+        decision = self._table[(level, band, mask)]
+        return {
+            "should_alert": decision["should_alert"],
+            "routing": dict(decision["routing"]),
+            "rule_id": decision["rule_id"],
+            "rules_version": self.version
+        }
+    
+    def _validate(self, rules: List[Dict[str, Any]]):
+        """Check rule references before compiling."""
+        for index, rule in enumerate(rules):
+            rule_id = rule.get("id", f"#{index}")
+            if rule.get("action") not in self.actions:
+                raise ValueError(f"Rule {rule_id} references unknown action: {rule.get('action')}")
+            for flag in rule.get("when", {}):
+                if flag not in CONTEXT_FLAGS:
+                    raise ValueError(f"Rule {rule_id} references unknown context flag: {flag}")
+    
+    def _first_match(
+        self,
+        rules: List[Dict[str, Any]],
+        level: str,
+        band: int,
+        mask: int
+    ) -> Optional[Dict[str, Any]]:
+        """Return the first rule covering a table cell."""
+        # Any confidence inside the band behaves identically for every rule
+        low = self.edges[band - 1] if band > 0 else 0.0
+        
+        for rule in rules:
+            levels = rule.get("risk_level", ANY_LEVEL)
+            if isinstance(levels, str):
+                levels = [levels]
+            if ANY_LEVEL not in levels and level not in levels:
+                continue
+            if "min_confidence" in rule and low < float(rule["min_confidence"]):
+                continue
+            if "max_confidence" in rule and low >= float(rule["max_confidence"]):
+                continue
+            if any(
+                bool(mask & (1 << self.flags.index(flag))) != bool(expected)
+                for flag, expected in rule.get("when", {}).items()
+            ):
+                continue
+            return rule
+        return None
+    
+    def _build_decision(self, rule: Dict[str, Any]) -> Dict[str, Any]:
+        """Resolve a rule's action into a routing decision."""
+        name = rule["action"]
+        action = self.actions[name]
+        routing = {"action": name}
+        if "channels" in action:
+            routing["channels"] = list(action["channels"])
+        if "priority" in action:
+            routing["priority"] = action["priority"]
+        return {
+            "should_alert": bool(action.get("alert", False)),
+            "routing": routing,
+            "rule_id": rule.get("id", name)
+        }
+
+
+class RuleEngine:
+    """
+    Holds the active RuleTable and hot-reloads it when the rules file changes.
+    
+    The file's modification time is checked at most once per
+    check_interval seconds; a new table is compiled off to the side and
+    swapped in only if it compiles cleanly.
+    """
+    
+    def __init__(self, rules_path: Optional[str] = None, check_interval: float = 5.0):
+        """
+        Initialize rule engine.
+        
+        Args:
+            rules_path: Path to rules JSON file (defaults to bundled rules)
+            check_interval: Minimum seconds between file change checks
+        """
+        self.rules_path = Path(rules_path) if rules_path else DEFAULT_RULES_PATH
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtime = self._stat()
+        self._next_check = time.monotonic() + check_interval
+        self.table = self._load()
+        logger.info(f"Initialized RuleEngine from {self.rules_path}")
+    
+    def decide(self, risk_level: Optional[str], confidence: Optional[float], context: Dict[str, Any]) -> Dict[str, Any]:
+        """Reload if due, then decide using the active table."""
+        if time.monotonic() >= self._next_check:
+            self.reload_if_changed()
+        return self.table.decide(risk_level, confidence, context)
+    
+    def reload_if_changed(self) -> bool:
+        """
+        Recompile the table if the rules file changed.
+        
+        Returns:
+            True if a new table was swapped in
+        """
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            mtime = self._stat()
+            if mtime == self._mtime:
+                return False
+            try:
+                table = self._load()
+            except (OSError, ValueError) as e:
+                logger.error(f"Keeping previous rules, reload failed: {str(e)}")
+                return False
+            self._mtime = mtime
+            self.table = table
+            logger.info(f"Reloaded rules version {table.version}")
+            return True
+    
+    def _load(self) -> RuleTable:
+        """Read and compile the rules file."""
+        with open(self.rules_path, 'r', encoding='utf-8') as f:
+            return RuleTable(json.load(f))
+    
+    def _stat(self) -> Optional[float]:
+        """Modification time of the rules file, or None if missing."""
+        try:
+            return os.stat(self.rules_path).st_mtime
+        except OSError:
+            return None
+
+
+def rules_from_thresholds(thresholds: Dict[str, float]) -> Dict[str, Any]:
+    """
+    Build a rules document equivalent to per-level confidence thresholds.
+    
+    Args:
+        thresholds: Risk level -> minimum confidence to alert
+    
+    Returns:
+        Rules document using the bundled actions
+    """
+    with open(DEFAULT_RULES_PATH, 'r', encoding='utf-8') as f:
+        actions = json.load(f)["actions"]
+    
+    level_actions = [("CRITICAL", "IMMEDIATE_ALERT"), ("HIGH", "ALERT"), ("MEDIUM", "MONITOR")]
+    rules = [
+        {
+            "id": f"{level.lower()}-threshold",
+            "risk_level": level,
+            "min_confidence": thresholds[level],
+            "action": action
+        }
+        for level, action in level_actions
+        if level in thresholds
+    ]
+    rules.append({"id": "default", "action": "LOG_ONLY"})
+    
+    return {"version": "thresholds", "actions": actions, "rules": rules}
@@ -4,7 +4,17 @@ Original work created for Google Gemini 3 Hackathon 2026
 """
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Mapping, Optional, Sequence
+
+from kiro.geo_index import GeoRiskIndex, load_index
+from kiro.time_risk import TimeRiskTable, context_region
+
+# NumPy is only needed for batch scoring
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -17,14 +27,34 @@ class RiskScorer:
     actionable scores and thresholds.
     """
     
-    def __init__(self):
-        """Initialize risk scorer with thresholds."""
+    LEVEL_SCORES = {
+        'CRITICAL': 1.0,
+        'HIGH': 0.8,
+        'MEDIUM': 0.5,
+        'LOW': 0.2,
+        'NONE': 0.0
+    }
+    
+    def __init__(
+        self,
+        geo_index: Optional[GeoRiskIndex] = None,
+        time_table: Optional[TimeRiskTable] = None
+    ):
+        """
+        Initialize risk scorer with thresholds.
+        
+        Args:
+            geo_index: Risk-zone index for the location multiplier (optional)
+            time_table: Time-of-day/calendar table for the timestamp multiplier (optional)
+        """
         self.thresholds = {
             'CRITICAL': 0.90,
             'HIGH': 0.75,
             'MEDIUM': 0.50,
             'LOW': 0.25
         }
+        self.geo_index = geo_index
+        self.time_table = time_table
         logger.info("Initialized RiskScorer")
     
     def calculate_score(
@@ -56,20 +86,16 @@ class RiskScorer:
         # Clamp to [0.0, 1.0]
         final_score = max(0.0, min(1.0, final_score))
         
-        logger.info(f"Risk score: {final_score:.3f} (base={base_score:.3f}, confidence={confidence:.3f}, context={context_multiplier:.3f})")
+        logger.debug(
+            "Risk score: %.3f (base=%.3f, confidence=%.3f, context=%.3f)",
+            final_score, base_score, confidence, context_multiplier
+        )
         
         return final_score
     
     def _risk_level_to_score(self, risk_level: str) -> float:
         """Convert risk level to numerical score."""
-        level_scores = {
-            'CRITICAL': 1.0,
-            'HIGH': 0.8,
-            'MEDIUM': 0.5,
-            'LOW': 0.2,
-            'NONE': 0.0
-        }
-        return level_scores.get(risk_level, 0.5)
+        return self.LEVEL_SCORES.get(risk_level, 0.5)
     
     def _calculate_context_multiplier(self, context: Dict[str, Any]) -> float:
         """
@@ -83,15 +109,16 @@ class RiskScorer:
         """
         multiplier = 1.0
         
-        # Time-based adjustment
-        if 'timestamp' in context:
-            # TODO: Check if late night (higher risk)
-            pass
+        # Time-based adjustment (late night, weekends, holidays)
+        if 'timestamp' in context and self.time_table is not None:
+            multiplier *= self.time_table.lookup(context['timestamp'], context_region(context))
         
         # Location-based adjustment
-        if 'location' in context:
-            # TODO: Check if high-risk area
-            pass
+        location = context.get('location')
+        if location and self.geo_index is not None:
+            lat, lng = location.get('lat'), location.get('lng')
+            if lat is not None and lng is not None:
+                multiplier *= self.geo_index.lookup(float(lat), float(lng))
         
         # User profile adjustment
         if 'user_profile' in context:
@@ -150,12 +177,115 @@ class RiskScorer:
         else:
             return 'STANDARD'
 
+    def calculate_scores(
+        self,
+        batch: Mapping[str, Sequence],
+        thresholds: Optional[Dict[str, float]] = None
+    ) -> Dict[str, Any]:
+        """
+        Score a batch of assessments in one vectorized pass.
+        
+        Produces the same scores, priorities and alert flags as calling
+        calculate_score, get_alert_priority and should_alert per row.
+        
+        Args:
+            batch: Columnar input with keys:
+                - risk_level: Gemini 3 risk levels (required)
+                - confidence: Confidence scores (required)
+                - lat, lng: Event location, NaN when unknown; looked up
+                  in the geo index (optional)
+                - age: User ages, NaN when unknown (optional)
+                - vulnerable: Known-vulnerable flags (optional)
+                - epoch_seconds: UTC event times for the time table (optional)
+                - region: Region code applied to the whole batch (optional)
+                - context_multiplier: Precomputed multipliers, overrides
+                  every other context column when given (optional)
+            thresholds: Threshold overrides (defaults to self.thresholds)
+            
+        Returns:
+            Dictionary of NumPy arrays: score, priority, should_alert
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("numpy is required for batch scoring. Install with: pip install numpy")
+        
+        thresholds = thresholds or self.thresholds
+        
+        risk_levels = np.asarray(batch['risk_level'])
+        confidence = np.asarray(batch['confidence'], dtype=np.float64)
+        if risk_levels.shape != confidence.shape:
+            raise ValueError("risk_level and confidence must have the same length")
+        
+        # Map risk levels to base scores through the unique values only
+        unique_levels, level_index = np.unique(risk_levels, return_inverse=True)
+        level_table = np.array([self._risk_level_to_score(str(level)) for level in unique_levels])
+        base_score = level_table[level_index] if len(unique_levels) else np.zeros(0)
+        
+        is_critical = risk_levels == 'CRITICAL'
+        is_high = risk_levels == 'HIGH'
+        is_medium = risk_levels == 'MEDIUM'
+        
+        multiplier = self._context_multipliers(batch, len(confidence))
+        score = np.clip(base_score * confidence * multiplier, 0.0, 1.0)
+        
+        should_alert = (
+            is_critical
+            | (is_high & (score >= thresholds['HIGH']))
+            | (is_medium & (score >= thresholds['CRITICAL']))
+        )
+        
+        priority = np.where(
+            is_critical | (score >= 0.95),
+            'IMMEDIATE',
+            np.where(is_high | (score >= 0.75), 'URGENT', 'STANDARD')
+        )
+        
+        return {
+            'score': score,
+            'priority': priority,
+            'should_alert': should_alert
+        }
+    
+    def _context_multipliers(self, batch: Mapping[str, Sequence], size: int) -> "np.ndarray":
+        """Vectorized counterpart of _calculate_context_multiplier."""
+        if 'context_multiplier' in batch:
+            return np.clip(np.asarray(batch['context_multiplier'], dtype=np.float64), 0.5, 1.5)
+        
+        multiplier = np.ones(size)
+        
+        if 'epoch_seconds' in batch and self.time_table is not None:
+            multiplier *= np.asarray(
+                self.time_table.lookup_many(batch['epoch_seconds'], batch.get('region'))
+            )
+        
+        if 'lat' in batch and 'lng' in batch and self.geo_index is not None:
+            lats = np.asarray(batch['lat'], dtype=np.float64)
+            lngs = np.asarray(batch['lng'], dtype=np.float64)
+            multiplier *= np.asarray(self.geo_index.lookup_many(lats.tolist(), lngs.tolist()))
+        
+        if 'age' in batch:
+            age = np.asarray(batch['age'], dtype=np.float64)
+            multiplier = np.where(age < 18, multiplier * 1.2, multiplier)
+        
+        if 'vulnerable' in batch:
+            vulnerable = np.asarray(batch['vulnerable'], dtype=bool)
+            multiplier = np.where(vulnerable, multiplier * 1.3, multiplier)
+        
+        return np.clip(multiplier, 0.5, 1.5)
 
-def create_scorer() -> RiskScorer:
+
+def create_scorer(
+    geo_index_path: Optional[str] = None,
+    time_config_path: Optional[str] = None
+) -> RiskScorer:
     """
     Factory function to create risk scorer.
     
+    Args:
+        geo_index_path: Path to compiled geo risk index (optional)
+        time_config_path: Path to time risk region config (optional)
+        
     Returns:
         Initialized RiskScorer instance
     """
-    return RiskScorer()
+    time_table = TimeRiskTable.from_config(time_config_path) if time_config_path else None
+    return RiskScorer(geo_index=load_index(geo_index_path), time_table=time_table)
@@ -0,0 +1,215 @@
+"""
+KIRO Session State Engine
+Streaming escalation across the assessments of one voice session
+
+Original work created for Google Gemini 3 Hackathon 2026
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+from kiro.scoring import RiskScorer
+
+logger = logging.getLogger(__name__)
+
+# Assessments at these levels add no pressure (their trend still counts)
+NO_PRESSURE_LEVELS = {"NONE", "LOW"}
+
+# Caps one assessment's evidence so a confidence of 1.0 stays finite in log space
+MAX_EVIDENCE = 0.999
+
+
+class SessionState:
+    """
+    Rolling risk state for a single session.
+    
+    Holds a fixed-size ring buffer of recent event scores together with
+    running sums, so the decayed risk and least-squares trend over the
+    window are both updated in constant time per event.
+    
+    Session pressure is the time-decayed noisy-OR of the assessment
+    confidences: the chance that at least one recent assessment is right.
+    Each new assessment raises it, so a rising MEDIUM -> HIGH stream can
+    clear a threshold no single assessment does, yet it never exceeds 1
+    and can stand in for a confidence.
+    """
+    
+    __slots__ = ("scores", "head", "count", "sum_y", "sum_xy", "log_clear", "last_seen", "events")
+    
+    def __init__(self, window: int, now: float):
+        self.scores = [0.0] * window
+        self.head = 0
+        self.count = 0
+        self.sum_y = 0.0
+        self.sum_xy = 0.0
+        # Decayed sum of log(1 - confidence); pressure is 1 - exp(log_clear)
+        self.log_clear = 0.0
+        self.last_seen = now
+        self.events = 0
+    
+    def push(self, score: float, evidence: float, decay: float, now: float):
+        """
+        Add an event, decaying accumulated pressure first.
+        
+        Args:
+            score: Event score (level score x confidence) for the trend
+            evidence: Confidence the event adds to pressure, 0 for none
+            decay: Weight left on earlier evidence
+            now: Event timestamp
+        """
+        window = len(self.scores)
+        if self.count < window:
+            self.sum_xy += self.count * score
+            self.sum_y += score
+            self.count += 1
+        else:
+            # Drop the oldest score and shift every position down by one
+            oldest = self.scores[self.head]
+            self.sum_xy += (window - 1) * score - (self.sum_y - oldest)
+            self.sum_y += score - oldest
+        self.scores[self.head] = score
+        self.head = (self.head + 1) % window
+        
+        self.log_clear = self.log_clear * decay + math.log1p(-min(evidence, MAX_EVIDENCE))
+        self.last_seen = now
+        self.events += 1
+    
+    @property
+    def pressure(self) -> float:
+        """Decayed noisy-OR of the evidence seen, between 0 and 1."""
+        return -math.expm1(self.log_clear)
+    
+    def trend(self) -> float:
+        """Least-squares slope of the scores in the window, per event."""
+        n = self.count
+        if n < 2:
+            return 0.0
+        sum_x = n * (n - 1) / 2
+        sum_xx = (n - 1) * n * (2 * n - 1) / 6
+        return (n * self.sum_xy - sum_x * self.sum_y) / (n * sum_xx - sum_x * sum_x)
+    
+    def recent(self) -> List[float]:
+        """Scores in the window, oldest first."""
+        window = len(self.scores)
+        start = (self.head - self.count) % window
+        return [self.scores[(start + i) % window] for i in range(self.count)]
+
+
+class SessionStateEngine:
+    """
+    Tracks escalation state for many concurrent sessions.
+    
+    Each event costs O(1): one dictionary lookup, a constant-size ring
+    buffer update and amortized eviction of expired sessions from the
+    front of an LRU-ordered map. Memory is bounded by max_sessions.
+    """
+    
+    def __init__(
+        self,
+        window: int = 8,
+        half_life_seconds: float = 120.0,
+        escalation_threshold: float = 0.75,
+        trend_threshold: float = 0.15,
+        min_trend_score: float = 0.3,
+        ttl_seconds: float = 1800.0,
+        max_sessions: int = 50000
+    ):
+        """
+        Initialize session state engine.
+        
+        Args:
+            window: Number of recent scores kept per session
+            half_life_seconds: Half-life of an event's weight in session pressure
+            escalation_threshold: Pressure (decayed noisy-OR of confidences) at which a session escalates
+            trend_threshold: Per-event slope that signals escalation
+            min_trend_score: Minimum latest score for trend escalation
+            ttl_seconds: Idle time after which a session is evicted
+            max_sessions: Upper bound on tracked sessions
+        """
+        self.window = max(2, window)
+        self.half_life_seconds = half_life_seconds
+        self.escalation_threshold = escalation_threshold
+        self.trend_threshold = trend_threshold
+        self.min_trend_score = min_trend_score
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        
+        self._sessions: "OrderedDict[str, SessionState]" = OrderedDict()
+        self._lock = threading.Lock()
+        logger.info("Initialized SessionStateEngine")
+    
+    def observe(
+        self,
+        session_id: str,
+        risk_level: Optional[str],
+        confidence: Optional[float],
+        now: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Record an assessment and evaluate session escalation.
+        
+        Args:
+            session_id: Session or user identifier
+            risk_level: Risk level from Gemini 3
+            confidence: Confidence score from Gemini 3
+            now: Monotonic timestamp in seconds (defaults to time.monotonic())
+        
+        Returns:
+            Session summary with session_risk, trend, events and escalate
+        """
+        now = time.monotonic() if now is None else now
+        score = RiskScorer.LEVEL_SCORES.get(risk_level, 0.5) * (confidence or 0.0)
+        evidence = 0.0 if risk_level in NO_PRESSURE_LEVELS else min(1.0, max(0.0, confidence or 0.0))
+        
+        with self._lock:
+            self._evict(now)
+            
+            state = self._sessions.get(session_id)
+            if state is None:
+                state = SessionState(self.window, now)
+                self._sessions[session_id] = state
+            else:
+                self._sessions.move_to_end(session_id)
+            
+            elapsed = max(0.0, now - state.last_seen)
+            decay = math.pow(0.5, elapsed / self.half_life_seconds) if self.half_life_seconds > 0 else 0.0
+            state.push(score, evidence, decay, now)
+            
+            trend = state.trend()
+            reason = None
+            if state.events >= 2 and state.pressure >= self.escalation_threshold:
+                reason = "SUSTAINED_RISK"
+            elif state.count >= 3 and trend >= self.trend_threshold and score >= self.min_trend_score:
+                reason = "RISING_TREND"
+            
+            return {
+                "session_id": session_id,
+                "events": state.events,
+                "score": round(score, 4),
+                "session_risk": round(state.pressure, 4),
+                "trend": round(trend, 4),
+                "escalate": reason is not None,
+                "reason": reason
+            }
+    
+    def get(self, session_id: str) -> Optional[SessionState]:
+        """Return a session's state without recording an event."""
+        with self._lock:
+            return self._sessions.get(session_id)
+    
+    def __len__(self) -> int:
+        return len(self._sessions)
+    
+    def _evict(self, now: float):
+        """Drop expired sessions and enforce the session cap, oldest first."""
+        cutoff = now - self.ttl_seconds
+        sessions = self._sessions
+        while sessions:
+            oldest_id = next(iter(sessions))
+            if sessions[oldest_id].last_seen >= cutoff and len(sessions) < self.max_sessions:
+                break
+            del sessions[oldest_id]
@@ -0,0 +1,281 @@
+"""
+KIRO Threshold Simulator
+What-if evaluation of alert thresholds over historical assessments
+
+Original work created for Google Gemini 3 Hackathon 2026
+
+Usage:
+    PYTHONPATH=src python -m kiro.simulator corpus.jsonl \\
+        --model orchestrator \\
+        --grid CRITICAL=0.7:0.95:0.05 --grid HIGH=0.6:0.9:0.05
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence
+
+from kiro.geo_index import load_index
+from kiro.orchestrator import KIROOrchestrator
+from kiro.scoring import RiskScorer, NUMPY_AVAILABLE
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MODELS = ("scorer", "orchestrator")
+
+
+def load_corpus(path: str) -> List[Dict[str, Any]]:
+    """
+    Load historical assessments from a JSON or JSON Lines file.
+    
+    Each record needs risk_level, confidence and outcome (True when the
+    incident was a real emergency). Optional fields are incident_id
+    (rows sharing it form one incident), offset_seconds (time since the
+    incident started) and context (same shape as the live request).
+    
+    Args:
+        path: Path to .json (array) or .jsonl file
+    
+    Returns:
+        List of assessment records
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if Path(path).suffix.lower() == '.json':
+            return json.load(f)
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def threshold_grid(ranges: Dict[str, Sequence[float]]) -> List[Dict[str, float]]:
+    """
+    Expand per-level threshold values into the full cartesian grid.
+    
+    Args:
+        ranges: Risk level -> candidate threshold values
+    
+    Returns:
+        List of threshold configurations
+    """
+    keys = list(ranges)
+    return [dict(zip(keys, values)) for values in itertools.product(*(ranges[k] for k in keys))]
+
+
+class ThresholdSimulator:
+    """
+    Replays a corpus of Gemini assessments against many threshold
+    configurations at once.
+    
+    Two decision models are supported:
+    - scorer: RiskScorer.should_alert on the context-weighted score
+    - orchestrator: KIROOrchestrator.process_assessment, i.e. the
+      compiled routing rules plus session escalation, with each
+      incident replayed as one session
+    """
+    
+    def __init__(self, records: List[Dict[str, Any]], scorer: Optional[RiskScorer] = None):
+        """
+        Initialize simulator.
+        
+        Args:
+            records: Historical assessments (see load_corpus)
+            scorer: Scorer used for context weighting, e.g. with a geo
+                index for the location multiplier (optional)
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("numpy is required for simulation. Install with: pip install numpy")
+        if not records:
+            raise ValueError("Corpus is empty")
+        
+        self.scorer = scorer or RiskScorer()
+        
+        incident_ids = [str(r.get('incident_id', i)) for i, r in enumerate(records)]
+        offsets = np.array([float(r.get('offset_seconds', 0.0)) for r in records])
+        
+        # Sort rows by incident, then time, so incidents are contiguous
+        _, incident_index = np.unique(np.array(incident_ids), return_inverse=True)
+        order = np.lexsort((offsets, incident_index))
+        records = [records[i] for i in order]
+        self.incident_index = incident_index[order]
+        self.offsets = offsets[order]
+        self.incident_ids = [incident_ids[i] for i in order]
+        
+        self.risk_levels = np.array([r['risk_level'] for r in records])
+        self.confidence = np.array([float(r['confidence']) for r in records])
+        self.outcomes = np.array([bool(r.get('outcome', False)) for r in records])
+        
+        self.contexts = [r.get('context', {}) for r in records]
+        profiles = [c.get('user_profile', {}) for c in self.contexts]
+        locations = [c.get('location') or {} for c in self.contexts]
+        batch = {
+            'risk_level': self.risk_levels,
+            'confidence': self.confidence,
+            'lat': [np.nan if l.get('lat') is None else float(l['lat']) for l in locations],
+            'lng': [np.nan if l.get('lng') is None else float(l['lng']) for l in locations],
+            'age': [p.get('age', np.nan) for p in profiles],
+            'vulnerable': [bool(p.get('vulnerable', False)) for p in profiles]
+        }
+        self.scores = self.scorer.calculate_scores(batch)['score']
+        
+        # First row of each incident, and the incident's ground truth
+        self.incident_starts = np.flatnonzero(
+            np.r_[True, self.incident_index[1:] != self.incident_index[:-1]]
+        )
+        self.incident_outcomes = np.logical_or.reduceat(self.outcomes, self.incident_starts)
+        self.incident_start_offsets = self.offsets[self.incident_starts]
+        
+        logger.info(
+            f"Loaded {len(records)} assessments across {len(self.incident_starts)} incidents"
+        )
+    
+    def evaluate(
+        self,
+        configs: List[Dict[str, float]],
+        model: str = "scorer"
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate threshold configurations.
+        
+        The scorer model is evaluated in one vectorized pass; the
+        orchestrator model replays rows in order, since session
+        escalation depends on each incident's history.
+        
+        Args:
+            configs: Threshold configurations (risk level -> threshold)
+            model: Decision model, "scorer" or "orchestrator"
+        
+        Returns:
+            One report per configuration with alert volume,
+            incident-level precision/recall and latency-to-alert
+        """
+        if model not in MODELS:
+            raise ValueError(f"Unknown model: {model}. Expected one of {MODELS}")
+        if not configs:
+            return []
+        
+        alerts = self._alert_matrix(configs, model)
+        
+        # Earliest alerting offset per incident (inf when never alerted)
+        alert_offsets = np.where(alerts, self.offsets, np.inf)
+        first_alert = np.minimum.reduceat(alert_offsets, self.incident_starts, axis=1)
+        alerted = np.isfinite(first_alert)
+        
+        positives = self.incident_outcomes
+        true_pos = (alerted & positives).sum(axis=1)
+        false_pos = (alerted & ~positives).sum(axis=1)
+        total_pos = int(positives.sum())
+        latency = first_alert - self.incident_start_offsets
+        
+        reports = []
+        for k, config in enumerate(configs):
+            detected = latency[k][alerted[k] & positives]
+            flagged = true_pos[k] + false_pos[k]
+            reports.append({
+                "model": model,
+                "thresholds": dict(config),
+                "alert_volume": int(alerts[k].sum()),
+                "alert_rate": float(alerts[k].mean()),
+                "incidents_alerted": int(flagged),
+                "true_positives": int(true_pos[k]),
+                "false_positives": int(false_pos[k]),
+                "precision": float(true_pos[k] / flagged) if flagged else 0.0,
+                "recall": float(true_pos[k] / total_pos) if total_pos else 0.0,
+                "latency_p50": float(np.median(detected)) if detected.size else None,
+                "latency_p95": float(np.percentile(detected, 95)) if detected.size else None
+            })
+        
+        return reports
+    
+    def default_thresholds(self, model: str = "scorer") -> Dict[str, float]:
+        """Thresholds the given decision model uses when not overridden."""
+        if model == "orchestrator":
+            return dict(KIROOrchestrator.DEFAULT_THRESHOLDS)
+        return dict(self.scorer.thresholds)
+    
+    def _alert_matrix(self, configs: List[Dict[str, float]], model: str) -> "np.ndarray":
+        """Return a (configs x rows) boolean matrix of alert decisions."""
+        defaults = self.default_thresholds(model)
+        if model == "scorer":
+            masks = {level: self.risk_levels == level for level in ('CRITICAL', 'HIGH', 'MEDIUM')}
+            high = np.array([c.get('HIGH', defaults['HIGH']) for c in configs])[:, None]
+            critical = np.array([c.get('CRITICAL', defaults['CRITICAL']) for c in configs])[:, None]
+            return (
+                masks['CRITICAL'][None, :]
+                | (masks['HIGH'] & (self.scores >= high))
+                | (masks['MEDIUM'] & (self.scores >= critical))
+            )
+        
+        # Orchestrator: the production decision path, one session per
+        # incident, with offsets standing in for the monotonic clock
+        alerts = np.zeros((len(configs), len(self.confidence)), dtype=bool)
+        for k, config in enumerate(configs):
+            orchestrator = KIROOrchestrator({"thresholds": dict(defaults, **config)})
+            for i, context in enumerate(self.contexts):
+                decision = orchestrator.process_assessment(
+                    {"risk_level": str(self.risk_levels[i]), "confidence": float(self.confidence[i])},
+                    dict(context, session_id=self.incident_ids[i]),
+                    now=float(self.offsets[i])
+                )
+                alerts[k, i] = decision["should_alert"]
+        return alerts
+
+
+def _parse_range(spec: str) -> List[float]:
+    """Parse "start:stop:step" (inclusive) or a comma-separated list."""
+    if ':' in spec:
+        start, stop, step = (float(x) for x in spec.split(':'))
+        if step <= 0:
+            raise ValueError(f"step must be positive in {spec!r}")
+        if stop < start:
+            raise ValueError(f"stop is below start in {spec!r}")
+        count = int(round((stop - start) / step)) + 1
+        return [round(start + i * step, 6) for i in range(count)]
+    return [float(x) for x in spec.split(',')]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Sweep KIRO alert thresholds over historical assessments")
+    parser.add_argument("corpus", help="JSON or JSON Lines file of past assessments with outcomes")
+    parser.add_argument("--model", choices=MODELS, default="scorer", help="Decision model to simulate")
+    parser.add_argument(
+        "--grid", action="append", default=[], metavar="LEVEL=SPEC",
+        help="Threshold values per level, e.g. HIGH=0.6:0.9:0.05 or CRITICAL=0.8,0.9"
+    )
+    parser.add_argument("--geo-index", help="Compiled risk-zone index for the location multiplier")
+    parser.add_argument("--top", type=int, default=20, help="Number of configurations to print")
+    parser.add_argument("--json", action="store_true", help="Emit full reports as JSON")
+    args = parser.parse_args(argv)
+    
+    ranges = {}
+    for item in args.grid:
+        level, _, spec = item.partition('=')
+        try:
+            ranges[level.strip().upper()] = _parse_range(spec)
+        except ValueError as e:
+            parser.error(f"--grid {item}: {e}")
+    
+    simulator = ThresholdSimulator(load_corpus(args.corpus), RiskScorer(geo_index=load_index(args.geo_index)))
+    configs = threshold_grid(ranges) if ranges else [simulator.default_thresholds(args.model)]
+    reports = simulator.evaluate(configs, model=args.model)
+    reports.sort(key=lambda r: (-r["recall"], -r["precision"], r["alert_volume"]))
+    
+    if args.json:
+        print(json.dumps(reports, indent=2))
+        return 0
+    
+    print(f"{'thresholds':<48} {'alerts':>8} {'prec':>6} {'recall':>6} {'p50 s':>7} {'p95 s':>7}")
+    for r in reports[:args.top]:
+        label = ", ".join(f"{k}={v:.2f}" for k, v in r["thresholds"].items())
+        p50 = f"{r['latency_p50']:.1f}" if r["latency_p50"] is not None else "-"
+        p95 = f"{r['latency_p95']:.1f}" if r["latency_p95"] is not None else "-"
+        print(f"{label:<48} {r['alert_volume']:>8} {r['precision']:>6.2f} {r['recall']:>6.2f} {p50:>7} {p95:>7}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+"""
+KIRO Time-of-Day Risk Tables
+Calendar-aware context multipliers for late-night and holiday risk
+
+Original work created for Google Gemini 3 Hackathon 2026
+
+Each region owns a precomputed table of 2 x 7 x 24 multipliers
+indexed by (holiday, weekday, local hour). Timestamps are converted to
+a bucket with integer arithmetic instead of datetime parsing, and UTC
+offsets come from a precomputed transition list, so a lookup is a
+string slice, a bisect and one list index.
+"""
+
+import bisect
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:
+    from zoneinfo import ZoneInfo
+    ZONEINFO_AVAILABLE = True
+except ImportError:
+    ZONEINFO_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Late night is the riskiest window; daytime is neutral
+DEFAULT_HOURLY = [
+    1.25, 1.3, 1.3, 1.25, 1.2, 1.1,   # 00-05
+    1.0, 1.0, 1.0, 1.0, 1.0, 1.0,     # 06-11
+    1.0, 1.0, 1.0, 1.0, 1.0, 1.0,     # 12-17
+    1.0, 1.05, 1.1, 1.15, 1.2, 1.2    # 18-23
+]
+
+# Friday/Saturday late evening and the early hours after them
+WEEKEND_NIGHT_FACTOR = 1.1
+HOLIDAY_FACTOR = 1.1
+
+TRANSITION_YEARS = (2024, 2036)
+
+Timestamp = Union[str, int, float]
+
+
+def days_from_civil(year: int, month: int, day: int) -> int:
+    """Days since 1970-01-01 for a proleptic Gregorian date."""
+    year -= month <= 2
+    era = (year if year >= 0 else year - 399) // 400
+    yoe = year - era * 400
+    doy = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def _field(text: str, start: int, end: int, low: int, high: int) -> int:
+    """Fixed-width ASCII decimal field, ValueError if malformed or out of [low, high]."""
+    digits = text[start:end]
+    if len(digits) != end - start or not (digits.isascii() and digits.isdigit()):
+        raise ValueError
+    value = int(digits)
+    if not low <= value <= high:
+        raise ValueError
+    return value
+
+
+def days_in_month(year: int, month: int) -> int:
+    """Number of days in a proleptic Gregorian month."""
+    if month == 2:
+        return 29 if year % 4 == 0 and (year % 100 != 0 or year % 400 == 0) else 28
+    return 30 if month in (4, 6, 9, 11) else 31
+
+
+def parse_epoch(timestamp: Timestamp) -> int:
+    """
+    Convert an ISO 8601 timestamp (or epoch seconds) to UTC epoch seconds.
+    
+    The common "YYYY-MM-DDTHH:MM[:SS[.fff]][Z|+HH:MM]" shape is decoded by
+    fixed-position slicing, with every field range-checked; anything
+    else, including out-of-range fields, falls back to datetime.
+    
+    Args:
+        timestamp: ISO 8601 string or epoch seconds
+    
+    Returns:
+        UTC epoch seconds
+    
+    Raises:
+        ValueError: If the timestamp cannot be parsed
+    """
+    if isinstance(timestamp, (int, float)):
+        return int(timestamp)
+    
+    ts = timestamp.strip()
+    try:
+        if len(ts) < 16 or ts[4] != '-' or ts[7] != '-' or ts[10] not in 'T ' or ts[13] != ':':
+            raise ValueError
+        year = _field(ts, 0, 4, 1, 9999)
+        month = _field(ts, 5, 7, 1, 12)
+        day = _field(ts, 8, 10, 1, days_in_month(year, month))
+        seconds = days_from_civil(year, month, day) * 86400
+        seconds += _field(ts, 11, 13, 0, 23) * 3600 + _field(ts, 14, 16, 0, 59) * 60
+        rest = ts[16:]
+        if rest[:1] == ':':
+            seconds += _field(rest, 1, 3, 0, 59)
+            rest = rest[3:]
+        if rest[:1] == '.':
+            i = 1
+            while i < len(rest) and rest[i].isascii() and rest[i].isdigit():
+                i += 1
+            if i == 1:
+                raise ValueError
+            rest = rest[i:]
+        if rest in ('', 'Z', 'z'):
+            return seconds
+        if rest[0] in '+-' and len(rest) in (3, 5, 6):
+            if len(rest) == 6 and rest[3] != ':':
+                raise ValueError
+            sign = 1 if rest[0] == '+' else -1
+            digits = rest[1:].replace(':', '')
+            offset = _field(digits, 0, 2, 0, 23) * 3600
+            if len(digits) == 4:
+                offset += _field(digits, 2, 4, 0, 59) * 60
+            return seconds - sign * offset
+        raise ValueError
+    except (ValueError, IndexError):
+        parsed = datetime.fromisoformat(ts.replace('Z', '+00:00'))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return int(parsed.timestamp())
+
+
+class RegionCalendar:
+    """
+    Precomputed time risk table for one region.
+    
+    Holds the 336-entry multiplier table, the region's UTC offset
+    transitions and its holidays as local day numbers.
+    """
+    
+    def __init__(
+        self,
+        tz_name: str = "UTC",
+        holidays: Iterable[str] = (),
+        hourly: Optional[Sequence[float]] = None,
+        weekend_night_factor: float = WEEKEND_NIGHT_FACTOR,
+        holiday_factor: float = HOLIDAY_FACTOR,
+        utc_offset_minutes: Optional[int] = None
+    ):
+        """
+        Initialize region calendar.
+        
+        Args:
+            tz_name: IANA timezone name
+            holidays: Local holiday dates (YYYY-MM-DD)
+            hourly: 24 multipliers by local hour (defaults to DEFAULT_HOURLY)
+            weekend_night_factor: Extra factor for Friday/Saturday nights
+            holiday_factor: Extra factor on holidays
+            utc_offset_minutes: Fixed offset, used when tz data is unavailable
+        """
+        hourly = list(hourly or DEFAULT_HOURLY)
+        if len(hourly) != 24:
+            raise ValueError("hourly profile needs 24 values")
+        
+        self.tz_name = tz_name
+        self.table = self._build_table(hourly, weekend_night_factor, holiday_factor)
+        self.holidays = {days_from_civil(*(int(p) for p in d.split('-'))) for d in holidays}
+        self.transitions, self.offsets = self._build_transitions(tz_name, utc_offset_minutes)
+    
+    def bucket(self, epoch_seconds: int) -> Tuple[int, int, int]:
+        """Return (holiday, weekday, hour) for a UTC instant; Monday is 0."""
+        i = bisect.bisect_right(self.transitions, epoch_seconds) - 1
+        local = epoch_seconds + self.offsets[max(i, 0)]
+        day, second = divmod(local, 86400)
+        return int(day in self.holidays), (day + 3) % 7, second // 3600
+    
+    def lookup(self, timestamp: Timestamp) -> float:
+        """Multiplier for a timestamp."""
+        holiday, weekday, hour = self.bucket(parse_epoch(timestamp))
+        return self.table[(holiday * 7 + weekday) * 24 + hour]
+    
+    @staticmethod
+    def _build_table(hourly: List[float], weekend_night_factor: float, holiday_factor: float) -> List[float]:
+        """Expand the hourly profile into the (holiday, weekday, hour) table."""
+        table = []
+        for holiday in (0, 1):
+            for weekday in range(7):
+                for hour in range(24):
+                    value = hourly[hour]
+                    friday_or_saturday_night = (weekday in (4, 5) and hour >= 20) or (weekday in (5, 6) and hour < 5)
+                    if friday_or_saturday_night:
+                        value *= weekend_night_factor
+                    if holiday:
+                        value *= holiday_factor
+                    table.append(value)
+        return table
+    
+    @staticmethod
+    def _build_transitions(tz_name: str, utc_offset_minutes: Optional[int]) -> Tuple[List[int], List[int]]:
+        """
+        Precompute UTC offset changes for the supported year range.
+        
+        Offsets are sampled daily and each change is refined to the hour,
+        which covers every real-world DST rule.
+        """
+        if utc_offset_minutes is not None or not ZONEINFO_AVAILABLE:
+            return [0], [(utc_offset_minutes or 0) * 60]
+        
+        try:
+            tz = ZoneInfo(tz_name)
+        except Exception as e:
+            logger.warning(f"Unknown timezone {tz_name}, using UTC: {str(e)}")
+            return [0], [0]
+        
+        def offset_at(instant: datetime) -> int:
+            return int(instant.astimezone(tz).utcoffset().total_seconds())
+        
+        start = datetime(TRANSITION_YEARS[0], 1, 1, tzinfo=timezone.utc)
+        end = datetime(TRANSITION_YEARS[1], 1, 1, tzinfo=timezone.utc)
+        transitions = [0]
+        offsets = [offset_at(start)]
+        
+        day = start
+        while day < end:
+            next_day = day + timedelta(days=1)
+            if offset_at(next_day) != offsets[-1]:
+                hour = day
+                while offset_at(hour) == offsets[-1]:
+                    hour += timedelta(hours=1)
+                transitions.append(int(hour.timestamp()))
+                offsets.append(offset_at(hour))
+            day = next_day
+        
+        return transitions, offsets
+
+
+class TimeRiskTable:
+    """
+    Time-of-day and calendar multipliers for all configured regions.
+    """
+    
+    def __init__(self, regions: Optional[Dict[str, RegionCalendar]] = None, default_region: str = "UTC"):
+        """
+        Initialize time risk table.
+        
+        Args:
+            regions: Region code -> calendar
+            default_region: Region used when the context names none
+        """
+        self.regions = regions or {}
+        self.default_region = default_region
+        if default_region not in self.regions:
+            self.regions[default_region] = RegionCalendar()
+        logger.info(f"Initialized TimeRiskTable with regions: {sorted(self.regions)}")
+    
+    @classmethod
+    def from_config(cls, path: str) -> "TimeRiskTable":
+        """
+        Load regions from a JSON file:
+            {"default_region": "US",
+             "regions": {"US": {"timezone": "America/New_York", "holidays": [...]}}}
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        
+        regions = {
+            code: RegionCalendar(
+                tz_name=spec.get("timezone", "UTC"),
+                holidays=spec.get("holidays", []),
+                hourly=spec.get("hourly"),
+                weekend_night_factor=spec.get("weekend_night_factor", WEEKEND_NIGHT_FACTOR),
+                holiday_factor=spec.get("holiday_factor", HOLIDAY_FACTOR),
+                utc_offset_minutes=spec.get("utc_offset_minutes")
+            )
+            for code, spec in config.get("regions", {}).items()
+        }
+        return cls(regions, default_region=config.get("default_region", "UTC"))
+    
+    def lookup(self, timestamp: Timestamp, region: Optional[str] = None) -> float:
+        """
+        Multiplier for a timestamp in a region.
+        
+        Args:
+            timestamp: ISO 8601 string or epoch seconds
+            region: Region code (defaults to default_region)
+        
+        Returns:
+            Context multiplier, 1.0 if the timestamp is unparseable
+        """
+        calendar = self.regions.get(region or self.default_region) or self.regions[self.default_region]
+        try:
+            return calendar.lookup(timestamp)
+        except (ValueError, TypeError):
+            logger.warning(f"Unparseable timestamp: {timestamp!r}")
+            return 1.0
+    
+    def lookup_many(self, epoch_seconds: Sequence[int], region: Optional[str] = None) -> List[float]:
+        """Multipliers for many UTC epoch instants in one region."""
+        calendar = self.regions.get(region or self.default_region) or self.regions[self.default_region]
+        table = calendar.table
+        results = []
+        for epoch in epoch_seconds:
+            holiday, weekday, hour = calendar.bucket(int(epoch))
+            results.append(table[(holiday * 7 + weekday) * 24 + hour])
+        return results
+
+
+def context_region(context: Dict[str, Any]) -> Optional[str]:
+    """Region code from a request context, if any."""
+    return context.get("region") or context.get("user_profile", {}).get("region")
@@ -0,0 +1,58 @@
+"""
+Tests for the durable alert retry queue
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src/ to PYTHONPATH so `aws` package is discoverable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_PATH = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_PATH))
+
+from aws.alert_retry import AlertRetryQueue
+
+
+class FailingSQS:
+
+    def send_message(self, QueueUrl, MessageBody):
+        raise ConnectionError("SQS unreachable")
+
+
+class TestAlertRetryQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.spill_path = os.path.join(self.tmp.name, "alerts.jsonl")
+        self.alert = {"lane": "URGENT", "channels": ["sms"], "gemini_response": {"risk_level": "HIGH"}, "context": {}}
+
+    def read_spill(self):
+        with open(self.spill_path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_spills_when_sqs_fails(self):
+        retry = AlertRetryQueue("https://sqs.local/alerts", client=FailingSQS(), spill_path=self.spill_path)
+        self.assertEqual(retry.enqueue(self.alert), "spill")
+        self.assertEqual(self.read_spill(), [self.alert])
+        self.assertEqual(retry.stats, {"queued": 0, "spilled": 1, "dropped": 0})
+
+    def test_spills_without_queue(self):
+        retry = AlertRetryQueue(spill_path=self.spill_path)
+        self.assertEqual(retry.enqueue(self.alert), "spill")
+        self.assertEqual(retry.enqueue(self.alert), "spill")
+        self.assertEqual(len(self.read_spill()), 2)
+
+    def test_dropped_when_spill_fails(self):
+        retry = AlertRetryQueue(spill_path=os.path.join(self.tmp.name, "missing", "alerts.jsonl"))
+        self.assertIsNone(retry.enqueue(self.alert))
+        self.assertEqual(retry.stats["dropped"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Tests for the DynamoDB audit log writer
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import json
+import os
+import tempfile
+import threading
+import time
+import sys
+from pathlib import Path
+
+# Add src/ to PYTHONPATH so `aws` and `kiro` packages are discoverable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_PATH = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_PATH))
+
+from aws.dynamodb_client import AuditLogWriter, to_attribute_value
+from kiro.orchestrator import KIROOrchestrator
+
+
+class LocalDynamoDB:
+    """In-process stand-in for the DynamoDB BatchWriteItem API."""
+
+    def __init__(self, throttle_first=0, fail=False, delay=None):
+        self.items = []
+        self.calls = 0
+        self.throttle_first = throttle_first
+        self.fail = fail
+        self.delay = delay
+
+    def batch_write_item(self, RequestItems):
+        self.calls += 1
+        if self.delay is not None:
+            self.delay.wait(5)
+        if self.fail:
+            raise ConnectionError("endpoint unavailable")
+        unprocessed = {}
+        for table, requests in RequestItems.items():
+            assert len(requests) <= 25
+            if self.throttle_first > 0:
+                self.throttle_first -= 1
+                self.items.extend(r["PutRequest"]["Item"] for r in requests[1:])
+                unprocessed[table] = requests[:1]
+            else:
+                self.items.extend(r["PutRequest"]["Item"] for r in requests)
+        return {"UnprocessedItems": unprocessed}
+
+
+class TestAuditLogWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.spill_path = os.path.join(self.tmp.name, "spill.jsonl")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_writer(self, client, **kwargs):
+        writer = AuditLogWriter(
+            "kiro-audit", client=client, spill_path=self.spill_path, flush_interval=0.05, **kwargs
+        )
+        self.addCleanup(writer.close)
+        return writer
+
+    def test_attribute_values(self):
+        self.assertEqual(to_attribute_value(0.85), {"N": "0.85"})
+        self.assertEqual(to_attribute_value(True), {"BOOL": True})
+        self.assertEqual(to_attribute_value(None), {"NULL": True})
+        self.assertEqual(
+            to_attribute_value({"channels": ["sms"]}),
+            {"M": {"channels": {"L": [{"S": "sms"}]}}}
+        )
+        # DynamoDB rejects NaN and infinity as numbers
+        self.assertEqual(to_attribute_value(float("nan")), {"S": "nan"})
+        self.assertEqual(to_attribute_value(float("-inf")), {"S": "-inf"})
+
+    def test_batches_and_retries_unprocessed(self):
+        client = LocalDynamoDB(throttle_first=1)
+        writer = self.make_writer(client, max_retries=2)
+        for _ in range(60):
+            writer.record({"gemini_assessment": {"risk_level": "HIGH", "confidence": 0.9}})
+
+        self.assertTrue(writer.flush(timeout=5))
+        self.assertEqual(len(client.items), 60)
+        self.assertEqual(writer.stats["written"], 60)
+        self.assertEqual(client.items[0]["risk_level"], {"S": "HIGH"})
+        self.assertFalse(os.path.exists(self.spill_path))
+
+    def test_failed_items_spill_to_file(self):
+        writer = self.make_writer(LocalDynamoDB(fail=True), max_retries=0)
+        writer.record({"gemini_assessment": {"risk_level": "CRITICAL"}})
+        writer.record({"gemini_assessment": {"risk_level": "LOW"}})
+
+        self.assertTrue(writer.flush(timeout=5))
+        with open(self.spill_path) as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(lines[0]["table"], "kiro-audit")
+        self.assertEqual(writer.stats["spilled"], 2)
+
+    def test_flush_is_not_held_up_by_retries(self):
+        writer = self.make_writer(LocalDynamoDB(fail=True), max_retries=50)
+        writer.record({"gemini_assessment": {"risk_level": "CRITICAL"}})
+
+        started = time.monotonic()
+        self.assertTrue(writer.flush(timeout=0.5))
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(writer.stats["spilled"], 1)
+
+    def test_flush_tracks_concurrent_records(self):
+        client = LocalDynamoDB()
+        writer = self.make_writer(client, batch_size=1)
+
+        def record():
+            for _ in range(200):
+                writer.record({"gemini_assessment": {"risk_level": "HIGH", "confidence": 0.9}})
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(writer.flush(timeout=5))
+        self.assertEqual(len(client.items), 800)
+
+    def test_record_does_not_wait_for_writes(self):
+        release = threading.Event()
+        client = LocalDynamoDB(delay=release)
+        writer = self.make_writer(client, max_buffer=2, batch_size=1)
+        orchestrator = KIROOrchestrator(config={}, audit_sink=writer)
+
+        # The first write is stuck in the fake endpoint; decisions keep flowing
+        for _ in range(10):
+            orchestrator.process_assessment({"risk_level": "HIGH", "confidence": 0.9}, {})
+        self.assertGreater(writer.stats["dropped"], 0)
+
+        release.set()
+        self.assertTrue(writer.flush(timeout=5))
+        self.assertEqual(len(client.items), writer.stats["recorded"])
+
+
+if __name__ == '__main__':
+    unittest.main()
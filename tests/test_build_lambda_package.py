@@ -0,0 +1,124 @@
+"""
+Tests for the slim Lambda package builder
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import json
+import subprocess
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+# Add deployment/ to PYTHONPATH so the builder is importable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEPLOYMENT_PATH = PROJECT_ROOT / "deployment"
+sys.path.insert(0, str(DEPLOYMENT_PATH))
+
+from build_lambda_package import build, plan
+
+HANDLER_SOURCE = '''
+import json
+
+def lambda_handler(event, context):
+    if event.get("path") == "/data":
+        import used_pkg
+        return {"statusCode": 200, "body": used_pkg.load()}
+    return {"statusCode": 404, "body": "{}"}
+'''
+
+FILES = {
+    "used_pkg/__init__.py": (
+        "import os\n"
+        "def load():\n"
+        "    with open(os.path.join(os.path.dirname(__file__), 'data.json')) as f:\n"
+        "        return f.read()\n"
+    ),
+    "used_pkg/data.json": json.dumps({"ok": True}),
+    "used_pkg/unused_module.py": "VALUE = 1\n",
+    "used_pkg/ca.pem": "certificate\n",
+    "used_pkg-1.0.dist-info/METADATA": "Name: used-pkg\n",
+    "used_pkg-1.0.dist-info/RECORD": "used_pkg/__init__.py,,\nused_pkg/data.json,,\nused_pkg.libs/libnative.so,,\n",
+    "used_pkg.libs/libnative.so": "",
+    "unused_pkg/__init__.py": "",
+    "unused_pkg-2.0.dist-info/METADATA": "Name: unused-pkg\n",
+    "unused_pkg-2.0.dist-info/RECORD": "unused_pkg/__init__.py,,\n",
+    "_native.cp313-win_amd64.pyd": "",
+}
+
+EVENTS = [{"path": "/data"}, {"path": "/missing"}]
+
+
+class TestPlan(unittest.TestCase):
+
+    def test_keeps_used_files_and_their_distribution(self):
+        records = {
+            "used_pkg-1.0.dist-info": {"used_pkg/__init__.py", "used_pkg.libs/libnative.so"},
+            "unused_pkg-2.0.dist-info": {"unused_pkg/__init__.py"},
+        }
+        kept = plan(set(FILES) | {"handler.py"}, {"used_pkg/__init__.py"}, records, {"handler.py"}, ["*.pem"])
+        self.assertEqual(kept, {
+            "handler.py",
+            "used_pkg/__init__.py",
+            "used_pkg/ca.pem",
+            "used_pkg-1.0.dist-info/METADATA",
+            "used_pkg-1.0.dist-info/RECORD",
+            "used_pkg.libs/libnative.so",
+        })
+
+    def test_foreign_binaries_are_dropped_even_if_kept_by_pattern(self):
+        kept = plan({"_native.cp313-win_amd64.pyd"}, set(), {}, keep=["*"])
+        self.assertEqual(kept, set())
+
+
+class TestBuild(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.staging = self.root / "staging"
+        for path, content in FILES.items():
+            (self.staging / path).parent.mkdir(parents=True, exist_ok=True)
+            (self.staging / path).write_text(content)
+        self.handler = self.root / "app_handler.py"
+        self.handler.write_text(HANDLER_SOURCE)
+
+    def build(self):
+        return build(self.staging, self.root / "slim", self.root / "slim.zip", handler="app_handler",
+                     events=EVENTS, extra="", app_files=[self.handler], keep=["used_pkg/*.pem"])
+
+    def test_slim_package_contents(self):
+        result = self.build()
+        self.assertIn("used_pkg/data.json", result["kept"])
+        self.assertNotIn("used_pkg/unused_module.py", result["kept"])
+        self.assertNotIn("unused_pkg/__init__.py", result["kept"])
+        self.assertNotIn("_native.cp313-win_amd64.pyd", result["kept"])
+        self.assertEqual(result["distributions"], ["used_pkg-1.0"])
+        self.assertEqual(result["dropped"][0][0], "unused_pkg-2.0.dist-info")
+
+        output = subprocess.run(
+            [sys.executable, "-c", "import app_handler; print(app_handler.lambda_handler({'path': '/data'}, None)['body'])"],
+            cwd=str(self.root / "slim"), capture_output=True, text=True, check=True
+        )
+        self.assertEqual(json.loads(output.stdout), {"ok": True})
+
+    def test_bytecode_is_unchecked_hash(self):
+        self.build()
+        pyc = next((self.root / "slim" / "used_pkg" / "__pycache__").glob("__init__.*.pyc"))
+        # PEP 552 flags: bit 0 hash-based, bit 1 check_source
+        self.assertEqual(int.from_bytes(pyc.read_bytes()[4:8], "little"), 0b01)
+
+    def test_zip_is_reproducible(self):
+        self.build()
+        first = (self.root / "slim.zip").read_bytes()
+        self.build()
+        self.assertEqual((self.root / "slim.zip").read_bytes(), first)
+        with zipfile.ZipFile(self.root / "slim.zip") as archive:
+            self.assertIn("app_handler.py", archive.namelist())
+            self.assertEqual({info.date_time for info in archive.infolist()}, {(1980, 1, 1, 0, 0, 0)})
+
+
+if __name__ == '__main__':
+    unittest.main()
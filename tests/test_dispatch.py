@@ -0,0 +1,99 @@
+"""
+Tests for the alert dispatch scheduler
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import threading
+import sys
+from pathlib import Path
+
+# Add src/ to PYTHONPATH so `aws` package is discoverable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_PATH = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_PATH))
+
+from aws.dispatch import AlertDispatcher, TokenBucket, lane_for
+
+
+class TestAlertDispatcher(unittest.TestCase):
+
+    def make_dispatcher(self, lane_config=None):
+        dispatcher = AlertDispatcher(lane_config)
+        self.addCleanup(dispatcher.shutdown)
+        return dispatcher
+
+    def test_lane_mapping(self):
+        self.assertEqual(lane_for("CRITICAL"), "IMMEDIATE")
+        self.assertEqual(lane_for("HIGH"), "URGENT")
+        self.assertEqual(lane_for("URGENT"), "URGENT")
+        self.assertEqual(lane_for(None), "STANDARD")
+
+    def test_immediate_not_delayed_by_standard_backlog(self):
+        release = threading.Event()
+        dispatcher = self.make_dispatcher({"STANDARD": {"workers": 1}})
+
+        backlog = [dispatcher.submit("STANDARD", release.wait, 5) for _ in range(20)]
+        immediate = dispatcher.submit("CRITICAL", lambda: "sent")
+
+        self.assertEqual(immediate.result(timeout=1), "sent")
+        self.assertFalse(backlog[-1].done())
+        self.assertGreater(dispatcher.metrics()["STANDARD"]["depth"], 0)
+
+        release.set()
+        for future in backlog:
+            future.result(timeout=5)
+        metrics = dispatcher.metrics()
+        self.assertEqual(metrics["STANDARD"]["completed"], 20)
+        self.assertEqual(metrics["IMMEDIATE"]["completed"], 1)
+        self.assertGreater(metrics["STANDARD"]["dwell_max_ms"], 0)
+
+    def test_lower_lanes_shed_under_overload(self):
+        release = threading.Event()
+        dispatcher = self.make_dispatcher({
+            "STANDARD": {"workers": 1, "rate": 0.001, "burst": 3},
+            "IMMEDIATE": {"workers": 1}
+        })
+
+        standard = [dispatcher.submit("MEDIUM", release.wait, 5) for _ in range(10)]
+        immediate = [dispatcher.submit("IMMEDIATE", lambda: None) for _ in range(10)]
+        release.set()
+
+        self.assertEqual(sum(f is None for f in standard), 7)
+        self.assertTrue(all(f is not None for f in immediate))
+        self.assertEqual(dispatcher.metrics()["STANDARD"]["shed"], 7)
+
+    def test_failures_propagate_through_future(self):
+        dispatcher = self.make_dispatcher()
+        future = dispatcher.submit("URGENT", lambda: 1 / 0)
+        with self.assertRaises(ZeroDivisionError):
+            future.result(timeout=1)
+
+    def test_drain_runs_queued_jobs_on_caller(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        dispatcher = self.make_dispatcher({"IMMEDIATE": {"workers": 1}})
+
+        started = threading.Event()
+        busy = dispatcher.submit("IMMEDIATE", lambda: started.set() or release.wait(5))
+        started.wait(5)
+        queued = dispatcher.submit("IMMEDIATE", lambda: threading.current_thread().name)
+
+        # The worker is still busy, so the in-flight job bounds the drain
+        self.assertFalse(dispatcher.drain("CRITICAL", timeout=0.05))
+        self.assertEqual(queued.result(timeout=0), threading.current_thread().name)
+
+        release.set()
+        self.assertTrue(dispatcher.drain("CRITICAL", timeout=5))
+        self.assertTrue(busy.result(timeout=0))
+        self.assertEqual(dispatcher.metrics()["IMMEDIATE"]["completed"], 2)
+
+    def test_token_bucket_refill(self):
+        bucket = TokenBucket(rate=2.0, burst=1)
+        self.assertTrue(bucket.try_acquire(now=bucket.updated))
+        self.assertFalse(bucket.try_acquire(now=bucket.updated))
+        self.assertTrue(bucket.try_acquire(now=bucket.updated + 0.5))
+
+
+if __name__ == '__main__':
+    unittest.main()
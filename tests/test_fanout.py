@@ -0,0 +1,105 @@
+"""
+Tests for parallel alert fan-out
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import threading
+import time
+import sys
+from pathlib import Path
+
+# Add src/ to PYTHONPATH so `aws` package is discoverable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_PATH = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_PATH))
+
+from aws.fanout import FanoutExecutor
+
+
+class TestFanoutExecutor(unittest.TestCase):
+
+    def make_executor(self, senders, **kwargs):
+        executor = FanoutExecutor(senders, retry_backoff=0.01, **kwargs)
+        self.addCleanup(executor.shutdown)
+        return executor
+
+    def test_returns_on_first_success(self):
+        release = threading.Event()
+
+        def slow_topic(_, message):
+            release.wait(5)
+            return "topic-1"
+
+        executor = self.make_executor({
+            "emergency_contacts": slow_topic,
+            "sms": lambda phone, message: f"sms-{phone}"
+        })
+
+        started = time.monotonic()
+        result = executor.fan_out(["emergency_contacts", "sms"], "help", contacts=["+15550001", "+15550002"])
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(result.first_success["channel"], "sms")
+        self.assertFalse(result.complete)
+
+        release.set()
+        self.assertTrue(result.wait(timeout=5))
+        summary = result.to_dict()
+        self.assertEqual(summary["status"], "SUCCESS")
+        self.assertEqual(summary["channels"]["emergency_contacts"][0]["message_id"], "topic-1")
+        self.assertEqual(
+            sorted(d["target"] for d in summary["channels"]["sms"]), ["+15550001", "+15550002"]
+        )
+
+    def test_channels_run_concurrently(self):
+        def sender(_, message):
+            time.sleep(0.2)
+            return "ok"
+
+        executor = self.make_executor({"911": sender, "emergency_contacts": sender, "log": sender})
+        started = time.monotonic()
+        result = executor.fan_out(["911", "emergency_contacts", "log"], "help")
+        result.wait(timeout=5)
+        self.assertLess(time.monotonic() - started, 0.5)
+
+    def test_retries_timeouts_and_skips(self):
+        calls = {"sms": 0}
+
+        def flaky_sms(phone, message):
+            calls["sms"] += 1
+            if calls["sms"] == 1:
+                raise ConnectionError("throttled")
+            return "sms-ok"
+
+        hang = threading.Event()
+        executor = self.make_executor(
+            {"sms": flaky_sms, "emergency_contacts": lambda _, m: hang.wait(5)},
+            timeouts={"emergency_contacts": 0.05},
+            max_retries=1
+        )
+        result = executor.fan_out(["sms", "emergency_contacts", "911"], "help", contacts=["+15550001"])
+        self.assertTrue(result.wait(timeout=5))
+        hang.set()
+
+        channels = result.to_dict()["channels"]
+        self.assertEqual(channels["sms"][0]["status"], "SUCCESS")
+        self.assertEqual(channels["sms"][0]["attempts"], 2)
+        self.assertEqual(channels["emergency_contacts"][0]["status"], "TIMEOUT")
+        # A timed-out send may still deliver, so it is not sent again
+        self.assertEqual(channels["emergency_contacts"][0]["attempts"], 1)
+        self.assertEqual(channels["911"][0]["status"], "SKIPPED")
+
+    def test_all_failures_reported(self):
+        def failing(_, message):
+            raise RuntimeError("down")
+
+        executor = self.make_executor({"emergency_contacts": failing}, max_retries=0)
+        result = executor.fan_out(["emergency_contacts"], "help")
+        self.assertTrue(result.complete)
+        summary = result.to_dict()
+        self.assertEqual(summary["status"], "FAILED")
+        self.assertEqual(summary["channels"]["emergency_contacts"][0]["error"], "down")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,246 @@
+"""
+Tests for the Gemini Lambda handler
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+HANDLER_PATH = PROJECT_ROOT / "deployment" / "lambda"
+REST_TRANSPORT_PATH = PROJECT_ROOT / "src" / "gemini"
+WARMUP_PATH = PROJECT_ROOT / "src" / "aws"
+sys.path.insert(0, str(HANDLER_PATH))
+sys.path.insert(0, str(REST_TRANSPORT_PATH))
+sys.path.insert(0, str(WARMUP_PATH))
+
+import gemini_handler
+from parameter_cache import ParameterCache
+
+
+def run_fresh(code, env=None):
+    """Run code in a fresh interpreter with the handler importable; returns its last stdout line as JSON."""
+    setup = f"import sys; sys.path[:0] = [{str(HANDLER_PATH)!r}, {str(WARMUP_PATH)!r}]"
+    output = subprocess.run(
+        [sys.executable, "-c", f"{setup}\n{code}"],
+        capture_output=True, text=True, check=True, timeout=60, env={**os.environ, **(env or {})}
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+class TestGeminiHandlerStartup(unittest.TestCase):
+
+    def test_health_and_options_do_not_load_sdk(self):
+        result = run_fresh(
+            "import json, gemini_handler\n"
+            "health = gemini_handler.lambda_handler({'requestContext': {'http': {'method': 'GET', 'path': '/health'}}}, None)\n"
+            "options = gemini_handler.lambda_handler({'httpMethod': 'OPTIONS', 'path': '/analyze'}, None)\n"
+            "heavy = sorted(m for m in sys.modules if m.split('.')[0] in ('boto3', 'botocore', 'google', 'grpc'))\n"
+            "print(json.dumps({'health': health['statusCode'], 'body': json.loads(health['body']),\n"
+            "                  'options': options['statusCode'], 'heavy': heavy}))"
+        )
+        self.assertEqual(result["health"], 200)
+        self.assertEqual(result["options"], 200)
+        self.assertEqual(result["heavy"], [])
+        self.assertEqual(result["body"]["mode"], "NOT_LOADED")
+        self.assertFalse(result["body"]["sdk_loaded"])
+        # Not loaded yet is not the same as unavailable: the key is unknown until fetched
+        self.assertIsNone(result["body"]["gemini_configured"])
+
+    def test_analyze_falls_back_without_retrying_ssm_every_request(self):
+        attempts = []
+
+        def unreachable(names):
+            attempts.append(names)
+            raise RuntimeError("SSM unreachable")
+
+        use_parameters(self, unreachable)
+        for _ in range(3):
+            body = json.loads(gemini_handler.lambda_handler(ANALYZE_EVENT, None)["body"])
+            self.assertEqual(body["mode"], "FALLBACK")
+        # One fetch, then the cache backs off instead of failing every request on SSM
+        self.assertEqual(attempts, [[gemini_handler.API_KEY_PARAMETER]])
+
+        health = json.loads(gemini_handler.handle_health_check()["body"])
+        self.assertEqual(health["mode"], "FALLBACK")
+        self.assertEqual(health["parameter_cache"]["state"], "ERROR")
+        self.assertFalse(health["gemini_configured"])
+
+    def test_health_reports_whether_the_key_was_fetched(self):
+        cache = use_parameters(self, lambda names: {gemini_handler.API_KEY_PARAMETER: "key"})
+        cache.refresh()
+        self.assertTrue(json.loads(gemini_handler.handle_health_check()["body"])["gemini_configured"])
+
+        use_parameters(self, lambda names: {}).refresh()
+        self.assertFalse(json.loads(gemini_handler.handle_health_check()["body"])["gemini_configured"])
+
+
+ANALYZE_EVENT = {
+    "requestContext": {"http": {"method": "POST", "path": "/analyze"}},
+    "body": json.dumps({"transcript": "help me, I'm scared"}),
+}
+
+HANDLER_STATE = ("PARAMETERS", "GEMINI_CLIENT", "GEMINI_CLIENT_CONFIG", "GEMINI_AVAILABLE",
+                 "GEMINI_INIT_ATTEMPTED", "GEMINI_SDK_MISSING")
+
+
+def use_parameters(test, fetch, clock=time.monotonic):
+    """Give the handler a fresh parameter cache for one test, restoring its state afterwards."""
+    saved = {name: getattr(gemini_handler, name) for name in HANDLER_STATE}
+    test.addCleanup(lambda: [setattr(gemini_handler, name, value) for name, value in saved.items()])
+    gemini_handler.GEMINI_CLIENT = gemini_handler.GEMINI_CLIENT_CONFIG = None
+    gemini_handler.PARAMETERS = ParameterCache([gemini_handler.API_KEY_PARAMETER], fetch, ttl=300, clock=clock)
+    return gemini_handler.PARAMETERS
+
+
+class FakeGemini(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        getattr(self.server, "keys", []).append(self.headers.get("x-goog-api-key"))
+        getattr(self.server, "paths", []).append(self.path)
+        text = json.dumps({
+            "risk_level": "HIGH",
+            "confidence": 0.9,
+            "reasoning": "Explicit help request",
+            "indicators": ["explicit_help_request"],
+            "recommended_action": "ALERT"
+        })
+        data = json.dumps({"candidates": [{"content": {"parts": [{"text": text}]}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestGeminiHandlerRestTransport(unittest.TestCase):
+
+    def test_analyze_over_rest_without_sdk(self):
+        server = HTTPServer(("127.0.0.1", 0), FakeGemini)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        result = run_fresh(
+            f"sys.path.insert(0, {str(REST_TRANSPORT_PATH)!r})\n"
+            "import json, gemini_handler\n"
+            "gemini_handler.get_api_key = lambda: 'test-key'\n"
+            "event = {'requestContext': {'http': {'method': 'POST', 'path': '/analyze'}}, 'body': json.dumps({'transcript': 'help'})}\n"
+            "body = json.loads(gemini_handler.lambda_handler(event, None)['body'])\n"
+            "heavy = sorted(m for m in sys.modules if m.split('.')[0] in ('google', 'grpc'))\n"
+            "print(json.dumps({'body': body, 'heavy': heavy}))",
+            env={"GEMINI_TRANSPORT": "rest", "GEMINI_API_BASE_URL": f"http://127.0.0.1:{server.server_address[1]}"}
+        )
+        self.assertEqual(result["body"]["mode"], "LIVE")
+        self.assertEqual(result["body"]["risk_level"], "HIGH")
+        self.assertEqual(result["heavy"], [])
+
+    def test_rotated_key_is_used_without_restart(self):
+        server = HTTPServer(("127.0.0.1", 0), FakeGemini)
+        server.keys = []
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        environment = patch.dict(os.environ, {
+            "GEMINI_TRANSPORT": "rest",
+            "GEMINI_API_BASE_URL": f"http://127.0.0.1:{server.server_address[1]}"
+        })
+        environment.start()
+        self.addCleanup(environment.stop)
+
+        now = [1000.0]
+        stored = {"key": "key-1"}
+        parameters = use_parameters(self, lambda names: {names[0]: stored["key"]}, clock=lambda: now[0])
+
+        gemini_handler.lambda_handler(ANALYZE_EVENT, None)
+        stored["key"] = "key-2"
+        now[0] += 301
+        # The stale key still serves this request while the refresh runs off the request path
+        gemini_handler.lambda_handler(ANALYZE_EVENT, None)
+        for _ in range(100):
+            if not parameters.status()["refreshing"]:
+                break
+            time.sleep(0.01)
+        body = json.loads(gemini_handler.lambda_handler(ANALYZE_EVENT, None)["body"])
+
+        self.assertEqual(body["mode"], "LIVE")
+        self.assertEqual(server.keys, ["key-1", "key-1", "key-2"])
+
+
+class TestGeminiHandlerWarmup(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGemini)
+        self.server.daemon_threads = True
+        self.server.keys = []
+        self.server.paths = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        for patcher in (
+            patch.dict(os.environ, {
+                "GEMINI_TRANSPORT": "rest",
+                "GEMINI_API_BASE_URL": f"http://127.0.0.1:{self.server.server_address[1]}"
+            }),
+            # The fake fetch needs no SSM client (and boto3 may not be installed)
+            patch.object(gemini_handler, "get_ssm_client", lambda: None)
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.stored = {"key": "key-1"}
+        use_parameters(self, lambda names: {names[0]: self.stored["key"]})
+
+    def test_warmup_event_connects_before_first_request(self):
+        report = json.loads(gemini_handler.lambda_handler({"warmup": True}, None)["body"])
+
+        self.assertTrue(report["ready"], report["errors"])
+        self.assertEqual(list(report["stages_ms"]), ["ssm_client", "parameters", "sdk_import", "client", "connection"])
+        self.assertEqual(self.server.paths, [f"/v1beta/models/{gemini_handler.get_model_name()}:countTokens"])
+
+        body = json.loads(gemini_handler.lambda_handler(ANALYZE_EVENT, None)["body"])
+        self.assertEqual(body["mode"], "LIVE")
+        # The first request reused the connection the warm-up opened
+        self.assertEqual(gemini_handler.GEMINI_CLIENT.transport.pool.created, 1)
+
+    def test_warmup_reports_failed_stages(self):
+        def unreachable(names):
+            raise RuntimeError("SSM unreachable")
+
+        use_parameters(self, unreachable)
+        report = json.loads(gemini_handler.lambda_handler({"warmup": True}, None)["body"])
+
+        self.assertFalse(report["ready"])
+        self.assertIn("SSM unreachable", report["errors"]["parameters"])
+        self.assertEqual(report["errors"]["client"], "skipped: parameters failed")
+        self.assertEqual(report["errors"]["connection"], "skipped: client failed")
+        self.assertEqual(self.server.paths, [])
+
+    def test_snapshot_hooks(self):
+        gemini_handler.before_snapshot()
+        # Nothing is connected before the snapshot
+        self.assertIsNotNone(gemini_handler.GEMINI_CLIENT)
+        self.assertEqual(self.server.paths, [])
+
+        # A key rotated while the snapshot was stored is picked up on restore
+        self.stored["key"] = "key-2"
+        gemini_handler.after_restore()
+        self.assertEqual(self.server.keys, ["key-2"])
+        self.assertEqual(gemini_handler.GEMINI_CLIENT.transport.pool.created, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
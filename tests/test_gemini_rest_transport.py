@@ -0,0 +1,185 @@
+"""
+Tests for Gemini REST Transport
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src/ to PYTHONPATH so `gemini` package is discoverable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_PATH = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_PATH))
+
+from gemini.client import GeminiClient
+from gemini.rest_transport import GeminiRestError, GeminiRestTransport, RestGenerativeModel, build_request
+
+
+def text_response(text):
+    return {
+        "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP"}],
+        "usageMetadata": {"promptTokenCount": 5, "candidatesTokenCount": 3}
+    }
+
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    """Generative Language API stand-in; HTTP/1.1 so connections stay open."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append({
+            "path": self.path,
+            "api_key": self.headers.get("x-goog-api-key"),
+            "body": body,
+            "client_port": self.client_address[1]
+        })
+        reply = self.server.reply
+        if self.path.endswith(":streamGenerateContent?alt=sse"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for piece in self.server.stream_pieces:
+                event = f"data: {json.dumps(text_response(piece))}\r\n\r\n".encode()
+                self.wfile.write(f"{len(event):x}\r\n".encode() + event + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        elif "/models/missing-model:" in self.path:
+            self._send_json(404, {"error": {"code": 404, "message": "models/missing-model is not found", "status": "NOT_FOUND"}})
+        else:
+            self._send_json(200, text_response(reply))
+        # Simulate the server timing out an idle keep-alive connection
+        if self.server.drop_after_response:
+            self.close_connection = True
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeGeminiServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGeminiHandler)
+        self.server.daemon_threads = True
+        self.server.requests = []
+        self.server.reply = "ok"
+        self.server.stream_pieces = []
+        self.server.drop_after_response = False
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.transport = GeminiRestTransport("test-key", base_url=self.base_url, timeout=5)
+        self.addCleanup(self.transport.close)
+
+
+class TestRestTransport(FakeGeminiServerTest):
+
+    def test_generate_content_request(self):
+        model = RestGenerativeModel("gemini-1.5-pro", self.transport)
+        response = model.generate_content("Analyze", generation_config={"temperature": 0.7, "max_output_tokens": 2048})
+
+        self.assertEqual(response.text, "ok")
+        self.assertEqual(response.usage_metadata["promptTokenCount"], 5)
+        request = self.server.requests[0]
+        self.assertEqual(request["path"], "/v1beta/models/gemini-1.5-pro:generateContent")
+        self.assertEqual(request["api_key"], "test-key")
+        self.assertEqual(request["body"], {
+            "contents": [{"role": "user", "parts": [{"text": "Analyze"}]}],
+            "generationConfig": {"temperature": 0.7, "maxOutputTokens": 2048}
+        })
+
+    def test_connection_is_kept_alive(self):
+        for _ in range(3):
+            self.transport.generate_content("gemini-1.5-pro", "ping")
+        self.assertEqual(self.transport.pool.created, 1)
+        self.assertEqual(len({r["client_port"] for r in self.server.requests}), 1)
+
+    def test_stale_connection_is_retried_once(self):
+        self.server.drop_after_response = True
+        self.transport.generate_content("gemini-1.5-pro", "first")
+        self.server.reply = "second"
+        self.assertEqual(self.transport.generate_content("gemini-1.5-pro", "second"), text_response("second"))
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(self.transport.pool.created, 2)
+
+    def test_streaming_yields_chunks_in_order(self):
+        self.server.stream_pieces = ["{\"risk", "_level\": ", "\"HIGH\"}"]
+        model = RestGenerativeModel("gemini-1.5-flash", self.transport)
+        stream = model.generate_content("Analyze", stream=True)
+
+        self.assertEqual([chunk.text for chunk in stream], self.server.stream_pieces)
+        self.assertEqual(json.loads(stream.text), {"risk_level": "HIGH"})
+        # The fully read stream leaves its connection in the pool
+        self.transport.generate_content("gemini-1.5-flash", "after")
+        self.assertEqual(self.transport.pool.created, 1)
+
+    def test_api_error(self):
+        with self.assertRaises(GeminiRestError) as raised:
+            self.transport.generate_content("missing-model", "hi")
+        self.assertEqual(raised.exception.status, 404)
+        self.assertEqual(raised.exception.reason, "NOT_FOUND")
+        # Error bodies are read in full, so the connection is still reusable
+        self.transport.generate_content("gemini-1.5-pro", "hi")
+        self.assertEqual(self.transport.pool.created, 1)
+
+    def test_blocked_prompt_has_no_text(self):
+        model = RestGenerativeModel("gemini-1.5-pro", self.transport)
+        with patch.object(self.transport, "generate_content", return_value={"promptFeedback": {"blockReason": "SAFETY"}}):
+            with self.assertRaisesRegex(ValueError, "SAFETY"):
+                model.generate_content("hi").text
+
+
+class TestBuildRequest(unittest.TestCase):
+
+    def test_list_of_strings_is_one_turn(self):
+        body = build_request(["a", "b"], system_instruction="Be brief")
+        self.assertEqual(body["contents"], [{"role": "user", "parts": [{"text": "a"}, {"text": "b"}]}])
+        self.assertEqual(body["systemInstruction"], {"parts": [{"text": "Be brief"}]})
+
+
+class TestGeminiClientRestTransport(FakeGeminiServerTest):
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch.dict(os.environ, {"GOOGLE_GEMINI_API_KEY": "test-key", "GEMINI_API_BASE_URL": self.base_url})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_analyze_emergency_over_rest(self):
+        self.server.reply = "```json\n" + json.dumps({
+            "risk_level": "HIGH",
+            "confidence": 0.9,
+            "reasoning": "Explicit help request",
+            "indicators": ["explicit_help_request"],
+            "recommended_action": "ALERT"
+        }) + "\n```"
+        client = GeminiClient(model_name="gemini-1.5-pro", transport="rest")
+        result = client.analyze_emergency({}, "Help me")
+
+        self.assertEqual(result["risk_level"], "HIGH")
+        self.assertEqual(self.server.requests[0]["body"]["generationConfig"]["topK"], 40)
+
+    def test_unknown_transport(self):
+        with self.assertRaises(ValueError):
+            GeminiClient(transport="carrier-pigeon")
+
+
+if __name__ == "__main__":
+    unittest.main()
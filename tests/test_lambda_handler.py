@@ -0,0 +1,300 @@
+"""
+Tests for the AllSensesAI Lambda handler warm-up
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import json
+import os
+import sys
+import threading
+import time
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src/ to PYTHONPATH so `aws` package is discoverable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_PATH = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_PATH))
+
+from aws import lambda_handler
+from aws.alert_retry import AlertRetryQueue
+from aws.dispatch import AlertDispatcher
+from aws.fanout import FanoutExecutor
+from aws.sns_client import SNSClient
+from gemini.prompts import PromptManager
+
+HANDLER_STATE = ("gemini_client", "multimodal_handler", "prompt_manager", "kiro_orchestrator",
+                 "sns_client", "alert_dispatcher", "alert_fanout", "alert_retry")
+
+
+class CountTokens(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.paths.append(self.path)
+        data = json.dumps({"totalTokens": 3}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LocalSNS:
+
+    def __init__(self):
+        self.calls = []
+
+    def get_sms_attributes(self, attributes):
+        self.calls.append(attributes)
+        return {"attributes": {}}
+
+
+class TestLambdaHandlerWarmup(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), CountTokens)
+        self.server.daemon_threads = True
+        self.server.paths = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.sns = LocalSNS()
+        for patcher in (
+            patch.dict(os.environ, {
+                "GOOGLE_GEMINI_API_KEY": "test-key",
+                "GEMINI_TRANSPORT": "rest",
+                "GEMINI_API_BASE_URL": f"http://127.0.0.1:{self.server.server_address[1]}"
+            }),
+            patch.object(lambda_handler, "SNSClient", lambda endpoint_url=None: SNSClient(client=self.sns))
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        saved = {name: getattr(lambda_handler, name) for name in HANDLER_STATE}
+        self.addCleanup(lambda: [setattr(lambda_handler, name, value) for name, value in saved.items()])
+        for name in HANDLER_STATE:
+            setattr(lambda_handler, name, None)
+
+    def warm_up(self):
+        response = lambda_handler.lambda_handler({"warmup": True}, None)
+        self.assertEqual(response["statusCode"], 200)
+        return json.loads(response["body"])
+
+    def test_warmup_initializes_and_connects(self):
+        prompts = patch.object(lambda_handler, "PromptManager", lambda prompts_dir: PromptManager(str(PROJECT_ROOT / "prompts")))
+        with prompts:
+            report = self.warm_up()
+
+        self.assertTrue(report["ready"], report["errors"])
+        self.assertEqual(list(report["stages_ms"]),
+                         ["sdk_import", "clients", "prompt", "gemini_connection", "sns_connection"])
+        self.assertEqual(self.server.paths, ["/v1beta/models/gemini-1.5-pro:countTokens"])
+        self.assertEqual(self.sns.calls, [["DefaultSMSType"]])
+
+    def test_missing_prompt_template_is_reported(self):
+        # /opt/prompts (the Lambda layer) does not exist here
+        report = self.warm_up()
+
+        self.assertFalse(report["ready"])
+        self.assertEqual(report["errors"], {"prompt": "Template not found: multimodal"})
+
+
+class TestExecuteAlert(unittest.TestCase):
+
+    def setUp(self):
+        saved = lambda_handler.alert_fanout
+        self.addCleanup(lambda: setattr(lambda_handler, "alert_fanout", saved))
+
+    def use_fanout(self, senders, **kwargs):
+        fanout = FanoutExecutor(senders, retry_backoff=0.01, **kwargs)
+        self.addCleanup(fanout.shutdown)
+        lambda_handler.alert_fanout = fanout
+
+    def execute(self):
+        assessment = {"risk_level": "HIGH", "confidence": 0.9, "reasoning": "help",
+                      "indicators": ["distress"], "recommended_action": "ALERT"}
+        context = {"user_profile": {"emergency_contacts": [{"phone": "+15550001"}]}}
+        return lambda_handler.execute_alert(assessment, context, ["sms", "emergency_contacts"])
+
+    def test_waits_for_every_delivery(self):
+        def slow_topic(_, message):
+            time.sleep(0.2)
+            return "topic-1"
+
+        self.use_fanout({"sms": lambda phone, message: "sms-1", "emergency_contacts": slow_topic})
+        result = self.execute()
+
+        self.assertEqual(result["status"], "SUCCESS")
+        self.assertTrue(result["complete"])
+        self.assertEqual(result["channels"]["emergency_contacts"][0]["message_id"], "topic-1")
+
+    def test_wait_is_bounded(self):
+        hang = threading.Event()
+        self.addCleanup(hang.set)
+        self.use_fanout({"sms": lambda phone, message: "sms-1", "emergency_contacts": lambda _, m: hang.wait(5)})
+
+        with patch.object(lambda_handler, "ALERT_DELIVERY_TIMEOUT_SECONDS", 0.1):
+            started = time.monotonic()
+            result = self.execute()
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(result["status"], "SUCCESS")
+        self.assertFalse(result["complete"])
+
+
+class RecordingSQS:
+
+    def __init__(self):
+        self.messages = []
+
+    def send_message(self, QueueUrl, MessageBody):
+        self.messages.append(json.loads(MessageBody))
+        return {"MessageId": f"sqs-{len(self.messages)}"}
+
+
+class TestDispatchAlert(unittest.TestCase):
+
+    def setUp(self):
+        saved = (lambda_handler.alert_dispatcher, lambda_handler.alert_retry)
+        self.addCleanup(lambda: setattr(lambda_handler, "alert_dispatcher", saved[0]))
+        self.addCleanup(lambda: setattr(lambda_handler, "alert_retry", saved[1]))
+        self.dispatcher = AlertDispatcher({"IMMEDIATE": {"workers": 1}})
+        self.addCleanup(self.dispatcher.shutdown)
+        lambda_handler.alert_dispatcher = self.dispatcher
+        self.sqs = RecordingSQS()
+        lambda_handler.alert_retry = AlertRetryQueue("https://sqs.local/alerts", client=self.sqs)
+
+        # Keep the only IMMEDIATE worker busy so the alert stays queued
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        self.occupy("IMMEDIATE")
+
+        patcher = patch.object(lambda_handler, "ALERT_WAIT_SECONDS", 0.05)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def occupy(self, lane):
+        started = threading.Event()
+        self.dispatcher.submit(lane, lambda: started.set() or self.release.wait(5))
+        started.wait(5)
+
+    def dispatch(self, priority, status="SUCCESS", drain_timeout=0.05):
+        alert = {"status": status}
+        with patch.object(lambda_handler, "execute_alert", lambda *args: dict(alert)):
+            return lambda_handler.dispatch_alert(priority, ["sms"], {"risk_level": "HIGH"}, {}, drain_timeout=drain_timeout)
+
+    def test_critical_alert_is_drained_before_returning(self):
+        result = self.dispatch("CRITICAL")
+        self.assertEqual(result, {"status": "SUCCESS", "lane": "IMMEDIATE"})
+
+    def test_lower_lanes_are_drained_before_returning(self):
+        self.dispatcher = AlertDispatcher({"URGENT": {"workers": 1}, "STANDARD": {"workers": 1}})
+        self.addCleanup(self.dispatcher.shutdown)
+        self.addCleanup(self.release.set)
+        lambda_handler.alert_dispatcher = self.dispatcher
+        self.occupy("URGENT")
+        self.occupy("STANDARD")
+
+        self.assertEqual(self.dispatch("HIGH"), {"status": "SUCCESS", "lane": "URGENT"})
+        self.assertEqual(self.dispatch("MEDIUM"), {"status": "SUCCESS", "lane": "STANDARD"})
+        self.assertEqual(self.sqs.messages, [])
+
+    def test_undrained_alert_is_queued_for_retry(self):
+        result = self.dispatch("CRITICAL", drain_timeout=0)
+        self.assertEqual(result, {"status": "RETRY_QUEUED", "lane": "IMMEDIATE", "in_flight": False, "retry": "sqs"})
+        self.assertEqual(self.sqs.messages, [{"lane": "IMMEDIATE", "channels": ["sms"],
+                                              "gemini_response": {"risk_level": "HIGH"}, "context": {}}])
+
+        # The cancelled job does not also run once the worker frees up
+        self.release.set()
+        self.assertTrue(self.dispatcher.drain("IMMEDIATE", timeout=5))
+        self.assertEqual(self.dispatcher.metrics()["IMMEDIATE"]["completed"], 1)
+
+    def test_failed_and_shed_alerts_are_queued_for_retry(self):
+        self.release.set()
+        self.assertEqual(self.dispatch("CRITICAL", status="FAILED")["retry"], "sqs")
+
+        self.dispatcher = AlertDispatcher({"STANDARD": {"workers": 1, "max_depth": 0}})
+        self.addCleanup(self.dispatcher.shutdown)
+        lambda_handler.alert_dispatcher = self.dispatcher
+        self.assertEqual(self.dispatch("MEDIUM"), {"status": "SHED", "lane": "STANDARD", "retry": "sqs"})
+        self.assertEqual([m["lane"] for m in self.sqs.messages], ["IMMEDIATE", "STANDARD"])
+
+    def test_retry_event_delivers_queued_alerts(self):
+        results = iter([{"status": "SUCCESS"}, {"status": "FAILED"}])
+        delivered = []
+
+        def execute_alert(gemini_response, context, channels):
+            delivered.append(channels)
+            return next(results)
+
+        event = {"Records": [
+            {"eventSource": "aws:sqs", "messageId": f"m{i}",
+             "body": json.dumps({"lane": "URGENT", "channels": ["sms"], "gemini_response": {}, "context": {}})}
+            for i in range(2)
+        ] + [{"eventSource": "aws:sqs", "messageId": "bad", "body": "not json"}]}
+        with patch.object(lambda_handler, "execute_alert", execute_alert):
+            response = lambda_handler.process_alert_retries(event)
+        self.assertTrue(lambda_handler.is_retry_event(event))
+        self.assertEqual(delivered, [["sms"], ["sms"]])
+        self.assertEqual(response, {"batchItemFailures": [{"itemIdentifier": "m1"}, {"itemIdentifier": "bad"}]})
+
+    def test_metrics_logged_each_invocation(self):
+        with self.assertLogs(lambda_handler.logger, "INFO") as logs:
+            lambda_handler.lambda_handler({"warmup": True}, None)
+        metrics = [line for line in logs.output if "Dispatch lane metrics" in line]
+        self.assertEqual(len(metrics), 1)
+        self.assertIn('"IMMEDIATE": {"depth": 0, "in_flight": 1', metrics[0])
+
+
+class RecordingAuditSink:
+
+    def __init__(self):
+        self.flushes = []
+
+    def record(self, decision):
+        pass
+
+    def flush(self, timeout=5.0):
+        self.flushes.append(timeout)
+        return True
+
+
+class LambdaContext:
+
+    request_id = "req-1"
+
+    def get_remaining_time_in_millis(self):
+        return 1500
+
+
+class TestAuditFlush(unittest.TestCase):
+
+    def setUp(self):
+        saved = lambda_handler.kiro_orchestrator
+        self.addCleanup(lambda: setattr(lambda_handler, "kiro_orchestrator", saved))
+        self.sink = RecordingAuditSink()
+        lambda_handler.kiro_orchestrator = types.SimpleNamespace(audit_sink=self.sink)
+
+    def test_flushed_before_returning(self):
+        with patch.object(lambda_handler, "warm_up", lambda: {}):
+            lambda_handler.lambda_handler({"warmup": True}, None)
+        self.assertEqual(self.sink.flushes, [lambda_handler.AUDIT_FLUSH_SECONDS])
+
+    def test_flush_bounded_by_remaining_time(self):
+        with patch.object(lambda_handler, "warm_up", lambda: {}):
+            lambda_handler.lambda_handler({"warmup": True}, LambdaContext())
+        self.assertEqual(self.sink.flushes, [0.5])
+
+
+if __name__ == '__main__':
+    unittest.main()
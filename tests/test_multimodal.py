@@ -0,0 +1,99 @@
+"""
+Tests for Multimodal Input Handler
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import tempfile
+import sys
+from pathlib import Path
+
+# Add src/ to PYTHONPATH so `gemini` package is discoverable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_PATH = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_PATH))
+
+from gemini.media_store import MediaStore
+from gemini.multimodal import MultimodalInputHandler
+
+
+class TestMultimodalInputHandler(unittest.TestCase):
+    """Unit tests for multimodal input preparation."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.audio = self.dir / "clip.wav"
+        self.audio.write_bytes(b"RIFF-audio")
+        self.image = self.dir / "frame.png"
+        self.image.write_bytes(b"PNG-image")
+        self.handler = MultimodalInputHandler()
+
+    def tearDown(self):
+        self.handler.close()
+        self.tmp.cleanup()
+
+    def test_modality_order_preserved(self):
+        data = self.handler.prepare_input(
+            text="Help",
+            audio_path=str(self.audio),
+            image_path=str(self.image)
+        )
+        types = [m["type"] for m in data["modalities"]]
+        self.assertEqual(types, ["text", "audio", "image"])
+        self.assertNotIn("errors", data)
+
+    def test_errors_aggregated_per_modality(self):
+        data = self.handler.prepare_input(
+            text="Help",
+            audio_path=str(self.dir / "missing.wav"),
+            image_path=str(self.dir / "frame.bmp")
+        )
+        self.assertEqual([m["type"] for m in data["modalities"]], ["text"])
+        self.assertEqual(set(data["errors"]), {"audio", "image"})
+
+    def test_all_modalities_failed(self):
+        with self.assertRaises(ValueError) as ctx:
+            self.handler.prepare_input(audio_path=str(self.dir / "missing.wav"))
+        self.assertIn("audio", str(ctx.exception))
+
+
+class TestMediaStore(unittest.TestCase):
+    """Unit tests for content-addressed media reuse."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_repeated_upload_hits_store(self):
+        store = MediaStore()
+        handler = MultimodalInputHandler(media_store=store)
+        first = self.dir / "a.png"
+        retry = self.dir / "retry.png"
+        first.write_bytes(b"same-frame")
+        retry.write_bytes(b"same-frame")
+
+        a = handler.prepare_input(image_path=str(first))
+        b = handler.prepare_input(image_path=str(retry))
+        handler.close()
+
+        self.assertEqual(a["modalities"], b["modalities"])
+        self.assertEqual(store.stats()["hits"], 1)
+        self.assertEqual(store.stats()["misses"], 1)
+
+    def test_lru_spills_to_disk(self):
+        store = MediaStore(max_memory_bytes=10, disk_dir=str(self.dir / "cache"))
+        store.put("a" * 64, {"type": "image", "data": "x" * 8})
+        store.put("b" * 64, {"type": "image", "data": "y" * 8})
+
+        stats = store.stats()
+        self.assertEqual(stats["memory_entries"], 1)
+        self.assertEqual(stats["disk_entries"], 1)
+        self.assertEqual(store.get("a" * 64)["data"], "x" * 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
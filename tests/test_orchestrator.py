@@ -0,0 +1,180 @@
+"""
+Tests for KIRO Orchestrator
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import json
+import os
+import tempfile
+import sys
+from pathlib import Path
+
+# Add src/ to PYTHONPATH so `kiro` package is discoverable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_PATH = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_PATH))
+
+from kiro.orchestrator import KIROOrchestrator
+from kiro.rules import DEFAULT_RULES_PATH, RuleEngine, RuleTable
+from kiro.session_state import SessionStateEngine
+
+
+class TestRuleTable(unittest.TestCase):
+    """Compiled routing decisions."""
+
+    def setUp(self):
+        self.orchestrator = KIROOrchestrator(config={})
+
+    def decide(self, level, confidence, context=None):
+        return self.orchestrator.process_assessment(
+            {"risk_level": level, "confidence": confidence}, context or {}
+        )
+
+    def test_threshold_routing(self):
+        critical = self.decide("CRITICAL", 0.85)
+        self.assertTrue(critical["should_alert"])
+        self.assertEqual(critical["routing"]["channels"], ["911", "emergency_contacts", "sms"])
+        self.assertEqual(critical["rule_id"], "critical-threshold")
+
+        self.assertEqual(self.decide("HIGH", 0.7)["routing"]["action"], "ALERT")
+        self.assertEqual(self.decide("HIGH", 0.69)["routing"], {"action": "LOG_ONLY"})
+        self.assertEqual(self.decide("MEDIUM", 0.6)["routing"]["action"], "MONITOR")
+        self.assertFalse(self.decide("LOW", 1.0)["should_alert"])
+        self.assertFalse(self.decide("BOGUS", None)["should_alert"])
+
+    def test_bundled_rules_match_thresholds(self):
+        bundled = RuleEngine(str(DEFAULT_RULES_PATH))
+        for level in ["CRITICAL", "HIGH", "MEDIUM", "LOW", "NONE"]:
+            for confidence in [0.0, 0.49, 0.5, 0.69, 0.7, 0.79, 0.8, 1.0]:
+                expected = self.decide(level, confidence)
+                actual = bundled.decide(level, confidence, {})
+                self.assertEqual(actual["routing"], expected["routing"])
+
+    def test_context_flags(self):
+        table = RuleTable({
+            "actions": {"ALERT": {"alert": True, "channels": ["sms"]}, "LOG_ONLY": {}},
+            "rules": [
+                {"id": "vulnerable-medium", "risk_level": "MEDIUM", "min_confidence": 0.3,
+                 "when": {"vulnerable": True}, "action": "ALERT"},
+                {"id": "default", "action": "LOG_ONLY"}
+            ]
+        })
+        context = {"user_profile": {"vulnerable": True}}
+        self.assertEqual(table.decide("MEDIUM", 0.4, context)["rule_id"], "vulnerable-medium")
+        self.assertEqual(table.decide("MEDIUM", 0.4, {})["rule_id"], "default")
+
+    def test_context_flags_tolerate_missing_profile_fields(self):
+        table = RuleTable({
+            "actions": {"ALERT": {"alert": True}, "LOG_ONLY": {}},
+            "rules": [
+                {"id": "minor", "when": {"minor": True}, "action": "ALERT"},
+                {"id": "vulnerable", "when": {"vulnerable": True}, "action": "ALERT"},
+                {"id": "default", "action": "LOG_ONLY"}
+            ]
+        })
+        for context in [{"user_profile": None}, {"user_profile": {"age": None}},
+                        {"user_profile": {"age": "12"}}, {"user_profile": "unknown"}]:
+            self.assertEqual(table.decide("HIGH", 0.9, context)["rule_id"], "default", context)
+        self.assertEqual(table.decide("HIGH", 0.9, {"user_profile": {"age": 12.5}})["rule_id"], "minor")
+
+        orchestrator = KIROOrchestrator({"thresholds": KIROOrchestrator.DEFAULT_THRESHOLDS})
+        decision = orchestrator.process_assessment({"risk_level": "HIGH", "confidence": 0.9}, {"user_profile": None})
+        self.assertTrue(decision["should_alert"])
+
+    def test_missing_catch_all(self):
+        with self.assertRaises(ValueError):
+            RuleTable({
+                "actions": {"ALERT": {"alert": True}},
+                "rules": [{"risk_level": "HIGH", "action": "ALERT"}]
+            })
+
+    def test_hot_reload(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "rules.json"
+            document = json.loads(DEFAULT_RULES_PATH.read_text())
+            path.write_text(json.dumps(document))
+            engine = RuleEngine(str(path), check_interval=0)
+            self.assertFalse(engine.decide("HIGH", 0.6, {})["should_alert"])
+
+            document["rules"][1]["min_confidence"] = 0.5
+            document["version"] = "relaxed"
+            path.write_text(json.dumps(document))
+            os.utime(path, (0, 1))
+
+            decision = engine.decide("HIGH", 0.6, {})
+            self.assertTrue(decision["should_alert"])
+            self.assertEqual(decision["rules_version"], "relaxed")
+
+
+class TestSessionEscalation(unittest.TestCase):
+    """Escalation across a stream of assessments in one session."""
+
+    def test_following_then_closer_escalates(self):
+        orchestrator = KIROOrchestrator(config={})
+        context = {"session_id": "voice-1"}
+
+        first = orchestrator.process_assessment({"risk_level": "MEDIUM", "confidence": 0.6}, context)
+        self.assertEqual(first["routing"]["action"], "MONITOR")
+        self.assertFalse(first["escalated"])
+
+        second = orchestrator.process_assessment({"risk_level": "HIGH", "confidence": 0.65}, context)
+        # Pressure 1 - 0.4 * 0.35 = 0.86 clears the CRITICAL confidence threshold
+        self.assertTrue(second["escalated"])
+        self.assertEqual(second["routing"]["action"], "IMMEDIATE_ALERT")
+        self.assertEqual(second["session"]["reason"], "SUSTAINED_RISK")
+        self.assertAlmostEqual(second["session"]["session_risk"], 0.86, places=3)
+
+        # Same assessment without session history stays below threshold
+        alone = orchestrator.process_assessment({"risk_level": "HIGH", "confidence": 0.65}, {})
+        self.assertEqual(alone["routing"], {"action": "LOG_ONLY"})
+
+    def test_medium_stream_escalates(self):
+        orchestrator = KIROOrchestrator(config={})
+        for _ in range(2):
+            decision = orchestrator.process_assessment({"risk_level": "MEDIUM", "confidence": 0.55}, {"session_id": "s"})
+        self.assertTrue(decision["escalated"])
+        self.assertEqual(decision["routing"]["action"], "ALERT")
+
+    def test_pressure_stays_normalized(self):
+        engine = SessionStateEngine()
+        for i in range(20):
+            state = engine.observe("s", "CRITICAL", 1.0, now=i)
+        self.assertLessEqual(state["session_risk"], 1.0)
+        self.assertGreater(state["session_risk"], 0.99)
+
+    def test_low_streams_never_alert(self):
+        orchestrator = KIROOrchestrator(config={"sessions": {"escalation_threshold": 0.1}})
+        for i in range(5):
+            decision = orchestrator.process_assessment({"risk_level": "LOW", "confidence": 0.9}, {"session_id": "s"})
+        self.assertEqual(decision["session"]["session_risk"], 0.0)
+        self.assertFalse(decision["should_alert"])
+        self.assertFalse(decision["escalated"])
+        self.assertEqual(decision["routing"], {"action": "LOG_ONLY"})
+
+    def test_pressure_decays(self):
+        engine = SessionStateEngine(half_life_seconds=10)
+        engine.observe("s", "HIGH", 0.6, now=0)
+        later = engine.observe("s", "HIGH", 0.6, now=100)
+        self.assertFalse(later["escalate"])
+        self.assertLess(later["session_risk"], 0.61)
+
+    def test_rising_trend(self):
+        engine = SessionStateEngine(window=4, half_life_seconds=1, escalation_threshold=10)
+        for i, confidence in enumerate([0.1, 0.3, 0.5, 0.7, 0.9]):
+            state = engine.observe("s", "HIGH", confidence, now=i * 60)
+        self.assertEqual(state["reason"], "RISING_TREND")
+        self.assertAlmostEqual(state["trend"], 0.16)
+        self.assertEqual([round(x, 2) for x in engine.get("s").recent()], [0.24, 0.4, 0.56, 0.72])
+
+    def test_ttl_and_capacity_bounds(self):
+        engine = SessionStateEngine(ttl_seconds=60, max_sessions=3)
+        for i in range(5):
+            engine.observe(f"s{i}", "LOW", 0.5, now=i)
+        self.assertEqual(len(engine), 3)
+        engine.observe("late", "LOW", 0.5, now=1000)
+        self.assertEqual(len(engine), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
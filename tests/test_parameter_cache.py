@@ -0,0 +1,135 @@
+"""
+Tests for the Gemini Lambda parameter cache
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import threading
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+HANDLER_PATH = PROJECT_ROOT / "deployment" / "lambda"
+sys.path.insert(0, str(HANDLER_PATH))
+
+from parameter_cache import ParameterCache, ParameterUnavailable, ssm_fetcher
+
+
+class FakeSSM:
+
+    def __init__(self, values):
+        self.values = values
+        self.calls = []
+
+    def get_parameters(self, Names, WithDecryption):
+        self.calls.append(list(Names))
+        return {
+            "Parameters": [{"Name": name, "Value": self.values[name]} for name in Names if name in self.values],
+            "InvalidParameters": [name for name in Names if name not in self.values],
+        }
+
+
+class ParameterCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        self.ssm = FakeSSM({"/app/key": "key-1", "/app/model": "gemini-1.5-flash"})
+        self.fail = None
+
+    def fetch(self, names):
+        if self.fail:
+            raise self.fail
+        return ssm_fetcher(lambda: self.ssm)(names)
+
+    def cache(self, names=("/app/key", "/app/model"), **kwargs):
+        return ParameterCache(names, self.fetch, ttl=300, clock=lambda: self.now, **kwargs)
+
+    def wait_for_refresh(self, cache):
+        for thread in threading.enumerate():
+            if thread.name == "parameter-refresh":
+                thread.join(5)
+        self.assertFalse(cache.status()["refreshing"])
+
+
+class TestParameterCache(ParameterCacheTest):
+
+    def test_one_bulk_fetch_for_all_names(self):
+        cache = self.cache()
+        self.assertEqual(cache.get("/app/key"), "key-1")
+        self.assertEqual(cache.get("/app/model"), "gemini-1.5-flash")
+        self.assertEqual(self.ssm.calls, [["/app/key", "/app/model"]])
+        self.assertEqual(cache.status(), {"state": "FRESH", "age_seconds": 0.0, "refreshing": False})
+
+    def test_batches_of_ten(self):
+        names = [f"/app/p{i}" for i in range(12)]
+        self.ssm.values.update({name: name for name in names})
+        cache = self.cache(names)
+        self.assertEqual(cache.get("/app/p11"), "/app/p11")
+        self.assertEqual([len(call) for call in self.ssm.calls], [10, 2])
+
+    def test_stale_value_served_while_refreshing_in_background(self):
+        cache = self.cache()
+        cache.get("/app/key")
+        self.ssm.values["/app/key"] = "key-2"
+        self.now += 301
+
+        self.assertEqual(cache.get("/app/key"), "key-1")
+        self.wait_for_refresh(cache)
+        self.assertEqual(cache.get("/app/key"), "key-2")
+        self.assertEqual(len(self.ssm.calls), 2)
+
+    def test_failed_fetch_backs_off(self):
+        self.fail = RuntimeError("throttled")
+        cache = self.cache(min_backoff=2, max_backoff=5)
+        for _ in range(3):
+            with self.assertRaises(ParameterUnavailable):
+                cache.get("/app/key")
+        self.assertEqual(self.ssm.calls, [])
+        self.assertEqual(cache.status()["state"], "ERROR")
+
+        self.now += 2
+        with self.assertRaises(ParameterUnavailable):
+            cache.get("/app/key")
+        # The second failure doubles the delay to 4 s
+        self.now += 3
+        self.fail = None
+        with self.assertRaises(ParameterUnavailable):
+            cache.get("/app/key")
+        self.now += 1
+        self.assertEqual(cache.get("/app/key"), "key-1")
+
+    def test_stale_value_survives_failed_refresh(self):
+        cache = self.cache()
+        cache.get("/app/key")
+        self.fail = RuntimeError("SSM unreachable")
+        self.now += 301
+        self.assertEqual(cache.get("/app/key"), "key-1")
+        self.wait_for_refresh(cache)
+        self.assertEqual(cache.get("/app/key"), "key-1")
+        self.assertEqual(cache.status()["state"], "STALE")
+        # Still served, but the last fetch did not succeed
+        self.assertFalse(cache.loaded("/app/key"))
+
+    def test_missing_parameter_is_not_refetched_while_fresh(self):
+        cache = self.cache(("/app/key", "/app/missing"))
+        self.assertIsNone(cache.loaded("/app/key"))
+        self.assertEqual(cache.get("/app/key"), "key-1")
+        self.assertTrue(cache.loaded("/app/key"))
+        self.assertFalse(cache.loaded("/app/missing"))
+        for _ in range(2):
+            with self.assertRaises(ParameterUnavailable):
+                cache.get("/app/missing")
+        self.assertEqual(len(self.ssm.calls), 1)
+
+    def test_expire_refreshes_in_background(self):
+        cache = self.cache()
+        cache.get("/app/key")
+        self.ssm.values["/app/key"] = "key-2"
+        cache.expire()
+        self.assertEqual(cache.get("/app/key"), "key-1")
+        self.wait_for_refresh(cache)
+        self.assertEqual(cache.get("/app/key"), "key-2")
+
+
+if __name__ == '__main__':
+    unittest.main()
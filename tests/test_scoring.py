@@ -0,0 +1,290 @@
+"""
+Tests for KIRO Risk Scoring
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import io
+import json
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src/ to PYTHONPATH so `kiro` package is discoverable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_PATH = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_PATH))
+
+from kiro.geo_index import GeoRiskIndex, build_index, load_zones
+from kiro.scoring import RiskScorer, NUMPY_AVAILABLE
+from kiro.time_risk import RegionCalendar, TimeRiskTable, parse_epoch
+from kiro.orchestrator import KIROOrchestrator
+from kiro.simulator import ThresholdSimulator, main as simulator_main, threshold_grid
+
+
+class TestGeoRiskIndex(unittest.TestCase):
+    """Risk-zone lookups feeding the location multiplier."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        source = Path(self.tmp.name) / "zones.geojson"
+        source.write_text(json.dumps({
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    # L-shaped zone; the notch at the top right is outside
+                    "type": "Feature",
+                    "properties": {"name": "district", "risk_multiplier": 1.2},
+                    "geometry": {"type": "Polygon", "coordinates": [[
+                        [-74.10, 4.60], [-74.00, 4.60], [-74.00, 4.65],
+                        [-74.05, 4.65], [-74.05, 4.70], [-74.10, 4.70], [-74.10, 4.60]
+                    ]]}
+                },
+                {
+                    "type": "Feature",
+                    "properties": {"name": "hotspot", "risk_multiplier": 1.4},
+                    "geometry": {"type": "Polygon", "coordinates": [[
+                        [-74.08, 4.62], [-74.07, 4.62], [-74.07, 4.63], [-74.08, 4.63]
+                    ]]}
+                }
+            ]
+        }))
+        self.path = str(Path(self.tmp.name) / "zones.kgi")
+        build_index(load_zones(str(source)), self.path, cell_deg=0.01)
+        self.index = GeoRiskIndex(self.path)
+
+    def tearDown(self):
+        self.index.close()
+        self.tmp.cleanup()
+
+    def test_point_lookup(self):
+        self.assertEqual(self.index.lookup(4.61, -74.09), 1.2)
+        self.assertEqual(self.index.lookup(4.625, -74.075), 1.4)
+        self.assertEqual(self.index.lookup(4.68, -74.02), 1.0)
+        self.assertEqual(self.index.lookup(-33.0, 151.0), 1.0)
+
+    def test_notch_edge_refinement(self):
+        self.assertEqual(self.index.lookup(4.6499, -74.0201), 1.2)
+        self.assertEqual(self.index.lookup(4.6501, -74.0201), 1.0)
+
+    def test_antimeridian_stays_in_its_row(self):
+        path = str(Path(self.tmp.name) / "dateline.kgi")
+        # Covers the whole cell at row 91 (lat 1..2), column 0 (lng -180..-179)
+        build_index([{"multiplier": 1.5, "polygon": [(0.9, -180.5), (0.9, -178.9), (2.1, -178.9), (2.1, -180.5)]}],
+                    path, cell_deg=1.0)
+        index = GeoRiskIndex(path)
+        self.addCleanup(index.close)
+        self.assertEqual(index.lookup(1.5, -179.5), 1.5)
+        # Row 90, lng 180 must not read row 91, column 0
+        self.assertEqual(index.lookup(0.5, 180.0), 1.0)
+
+    def test_lookup_many_matches_lookup(self):
+        points = [(4.61, -74.09), (4.625, -74.075), (4.6499, -74.0201), (4.6501, -74.0201), (-33.0, 151.0)]
+        lats, lngs = zip(*points)
+        self.assertEqual(self.index.lookup_many(lats, lngs), [self.index.lookup(*p) for p in points])
+        self.assertEqual(self.index.lookup_many([float("nan"), None], [1.0, 2.0]), [1.0, 1.0])
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "numpy not installed")
+    def test_batch_location_matches_scalar(self):
+        scorer = RiskScorer(geo_index=self.index)
+        rows = [("HIGH", 0.5, (4.625, -74.075)), ("HIGH", 0.9, (4.61, -74.09)), ("MEDIUM", 1.0, None)]
+        result = scorer.calculate_scores({
+            "risk_level": [r[0] for r in rows],
+            "confidence": [r[1] for r in rows],
+            "lat": [r[2][0] if r[2] else float("nan") for r in rows],
+            "lng": [r[2][1] if r[2] else float("nan") for r in rows],
+        })
+        for i, (level, confidence, point) in enumerate(rows):
+            context = {"location": {"lat": point[0], "lng": point[1]}} if point else {}
+            score = scorer.calculate_score({"risk_level": level, "confidence": confidence}, context)
+            self.assertAlmostEqual(result["score"][i], score)
+
+    def test_location_multiplier(self):
+        scorer = RiskScorer(geo_index=self.index)
+        assessment = {"risk_level": "HIGH", "confidence": 0.5}
+        inside = scorer.calculate_score(assessment, {"location": {"lat": 4.625, "lng": -74.075}})
+        outside = scorer.calculate_score(assessment, {"location": {"lat": 10.0, "lng": 10.0}})
+        self.assertAlmostEqual(inside, 0.56)
+        self.assertAlmostEqual(outside, 0.4)
+
+
+class TestTimeRiskTable(unittest.TestCase):
+    """Time-of-day and calendar multipliers."""
+
+    def test_parse_epoch_matches_datetime(self):
+        from datetime import datetime, timezone
+        for ts in [
+            "2026-01-31T23:15:00Z",
+            "2026-01-31T23:15:00.250-05:00",
+            "2026-01-31T23:15+0530",
+            "2026-02-28 04:00:09",
+        ]:
+            expected = datetime.fromisoformat(ts.replace("Z", "+00:00").replace("+0530", "+05:30"))
+            if expected.tzinfo is None:
+                expected = expected.replace(tzinfo=timezone.utc)
+            self.assertEqual(parse_epoch(ts), int(expected.timestamp()), ts)
+
+    def test_parse_epoch_rejects_out_of_range_fields(self):
+        for ts in [
+            "2026-13-45T25:99",
+            "2026-02-29T10:00:00Z",
+            "2026-04-31T10:00Z",
+            "2026-01-31T24:00Z",
+            "2026-01-31T23:60Z",
+            "2026-01-31T23:15:61Z",
+            "2026-01-31T23:15+25:00",
+            "2026-+1-31T23:15Z",
+        ]:
+            with self.assertRaises(ValueError, msg=ts):
+                parse_epoch(ts)
+        # datetime normalizes a 60-minute offset; the fast path defers to it
+        self.assertEqual(parse_epoch("2026-01-31T23:15+05:60"), parse_epoch("2026-01-31T23:15+06:00"))
+        # Valid edge values still take the fast path's result
+        self.assertEqual(parse_epoch("2028-02-29T23:59:59+23:59"), parse_epoch("2028-02-29T00:00:59Z"))
+
+    def test_utc_offset_lookup(self):
+        table = TimeRiskTable({"CO": RegionCalendar(utc_offset_minutes=-300, holidays=["2026-12-25"])})
+        # 08:00Z is 03:00 in Bogota on a Tuesday
+        self.assertEqual(table.lookup("2026-02-03T08:00:00Z", "CO"), 1.25)
+        self.assertEqual(table.lookup("2026-02-03T17:00:00Z", "CO"), 1.0)
+        self.assertAlmostEqual(table.lookup("2026-12-25T17:00:00Z", "CO"), 1.1)
+        self.assertEqual(table.lookup("not a time", "CO"), 1.0)
+
+    def test_timestamp_multiplier(self):
+        scorer = RiskScorer(time_table=TimeRiskTable())
+        assessment = {"risk_level": "HIGH", "confidence": 0.5}
+        night = scorer.calculate_score(assessment, {"timestamp": "2026-02-03T02:00:00Z"})
+        noon = scorer.calculate_score(assessment, {"timestamp": "2026-02-03T12:00:00Z"})
+        self.assertAlmostEqual(night, 0.52)
+        self.assertAlmostEqual(noon, 0.4)
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "numpy not installed")
+class TestBatchScoring(unittest.TestCase):
+    """Batch scoring must agree with the per-assessment path."""
+
+    def setUp(self):
+        self.scorer = RiskScorer()
+        self.rows = [
+            ("CRITICAL", 0.95, {}),
+            ("HIGH", 0.9, {"user_profile": {"age": 16}}),
+            ("HIGH", 0.5, {}),
+            ("MEDIUM", 1.0, {"user_profile": {"vulnerable": True, "age": 15}}),
+            ("LOW", 0.8, {}),
+            ("NONE", 1.0, {}),
+            ("UNKNOWN", 0.6, {}),
+        ]
+
+    def test_matches_scalar_scoring(self):
+        batch = {
+            "risk_level": [r[0] for r in self.rows],
+            "confidence": [r[1] for r in self.rows],
+            "age": [r[2].get("user_profile", {}).get("age", float("nan")) for r in self.rows],
+            "vulnerable": [r[2].get("user_profile", {}).get("vulnerable", False) for r in self.rows],
+        }
+        result = self.scorer.calculate_scores(batch)
+
+        for i, (level, confidence, context) in enumerate(self.rows):
+            score = self.scorer.calculate_score(
+                {"risk_level": level, "confidence": confidence}, context
+            )
+            self.assertAlmostEqual(result["score"][i], score)
+            self.assertEqual(result["should_alert"][i], self.scorer.should_alert(score, level))
+            self.assertEqual(result["priority"][i], self.scorer.get_alert_priority(level, score))
+
+    def test_threshold_override(self):
+        batch = {"risk_level": ["HIGH"], "confidence": [0.7]}
+        default = self.scorer.calculate_scores(batch)
+        relaxed = self.scorer.calculate_scores(batch, thresholds={"HIGH": 0.5, "CRITICAL": 0.9})
+        self.assertFalse(default["should_alert"][0])
+        self.assertTrue(relaxed["should_alert"][0])
+
+    def test_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            self.scorer.calculate_scores({"risk_level": ["HIGH"], "confidence": [0.5, 0.6]})
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "numpy not installed")
+class TestThresholdSimulator(unittest.TestCase):
+    """What-if threshold sweeps over a small labelled corpus."""
+
+    def setUp(self):
+        self.simulator = ThresholdSimulator([
+            # Real emergency that escalates over time
+            {"incident_id": "a", "offset_seconds": 0, "risk_level": "MEDIUM", "confidence": 0.6, "outcome": True},
+            {"incident_id": "a", "offset_seconds": 20, "risk_level": "HIGH", "confidence": 0.75, "outcome": True},
+            {"incident_id": "a", "offset_seconds": 45, "risk_level": "CRITICAL", "confidence": 0.9, "outcome": True},
+            # False alarm
+            {"incident_id": "b", "offset_seconds": 0, "risk_level": "HIGH", "confidence": 0.72, "outcome": False},
+            # Quiet session
+            {"incident_id": "c", "offset_seconds": 0, "risk_level": "LOW", "confidence": 0.9, "outcome": False},
+        ])
+
+    def test_orchestrator_sweep(self):
+        configs = threshold_grid({"HIGH": [0.7, 0.8], "MEDIUM": [0.5, 0.9]})
+        reports = self.simulator.evaluate(configs, model="orchestrator")
+        by_key = {(r["thresholds"]["HIGH"], r["thresholds"]["MEDIUM"]): r for r in reports}
+
+        loose = by_key[(0.7, 0.5)]
+        self.assertEqual(loose["alert_volume"], 4)
+        self.assertEqual(loose["precision"], 0.5)
+        self.assertEqual(loose["latency_p50"], 0.0)
+
+        # Incident a's session pressure escalates its HIGH row past the
+        # strict HIGH threshold; the lone false alarm has no history
+        strict = by_key[(0.8, 0.9)]
+        self.assertEqual(strict["alert_volume"], 2)
+        self.assertEqual(strict["precision"], 1.0)
+        self.assertEqual(strict["recall"], 1.0)
+        self.assertEqual(strict["latency_p50"], 20.0)
+
+    def test_orchestrator_matches_process_assessment(self):
+        config = {"CRITICAL": 0.95, "HIGH": 0.8, "MEDIUM": 0.9}
+        alerts = self.simulator._alert_matrix([config], "orchestrator")[0]
+
+        orchestrator = KIROOrchestrator({"thresholds": dict(KIROOrchestrator.DEFAULT_THRESHOLDS, **config)})
+        expected = [
+            orchestrator.process_assessment(
+                {"risk_level": str(level), "confidence": float(confidence)},
+                {"session_id": incident}, now=float(offset)
+            )["should_alert"]
+            for level, confidence, incident, offset in zip(
+                self.simulator.risk_levels, self.simulator.confidence,
+                self.simulator.incident_ids, self.simulator.offsets
+            )
+        ]
+        self.assertEqual(alerts.tolist(), expected)
+        self.assertTrue(any(expected))
+
+    def test_scorer_model(self):
+        reports = self.simulator.evaluate([{"HIGH": 0.5, "CRITICAL": 0.9}], model="scorer")
+        self.assertEqual(reports[0]["true_positives"], 1)
+        self.assertEqual(reports[0]["latency_p50"], 20.0)
+
+    def test_default_thresholds_follow_model(self):
+        self.assertEqual(self.simulator.default_thresholds("orchestrator"), KIROOrchestrator.DEFAULT_THRESHOLDS)
+        self.assertEqual(self.simulator.default_thresholds("scorer"), self.simulator.scorer.thresholds)
+
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as corpus:
+            json.dump([{"incident_id": "a", "risk_level": "HIGH", "confidence": 0.75, "outcome": True}], corpus)
+        self.addCleanup(Path(corpus.name).unlink)
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            simulator_main([corpus.name, "--model", "orchestrator", "--json"])
+        report = json.loads(stdout.getvalue())[0]
+        self.assertEqual(report["thresholds"], KIROOrchestrator.DEFAULT_THRESHOLDS)
+
+
+class TestSimulatorCli(unittest.TestCase):
+
+    def test_invalid_grid_ranges_rejected(self):
+        for spec in ["HIGH=0.6:0.9:0", "HIGH=0.9:0.6:0.05", "HIGH=0.6:x:0.05"]:
+            with patch("sys.stderr", new_callable=io.StringIO) as stderr:
+                with self.assertRaises(SystemExit) as exit:
+                    simulator_main(["corpus.json", "--grid", spec])
+            self.assertEqual(exit.exception.code, 2)
+            self.assertIn(f"--grid {spec}", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Tests for SMS Composer
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add backend/sms/ to PYTHONPATH so the Lambda modules are importable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SMS_PATH = PROJECT_ROOT / "backend" / "sms"
+sys.path.insert(0, str(SMS_PATH))
+
+from sms_composer import analyze, transliterate, optimize_message, compose_alert
+
+
+class TestSegmentCounting(unittest.TestCase):
+
+    def test_gsm_boundaries(self):
+        self.assertEqual(analyze("a" * 160), {"encoding": "GSM-7", "units": 160, "segments": 1, "characters": 160})
+        self.assertEqual(analyze("a" * 161)["segments"], 2)
+        self.assertEqual(analyze("a" * 306)["segments"], 2)
+        self.assertEqual(analyze("a" * 307)["segments"], 3)
+
+    def test_extended_characters_do_not_straddle_segments(self):
+        self.assertEqual(analyze("€" * 80)["units"], 160)
+        self.assertEqual(analyze("€" * 80)["segments"], 1)
+        # 152 septets + an escape pair cannot fit the 153-septet first segment
+        self.assertEqual(analyze("a" * 152 + "€" + "a" * 100)["segments"], 2)
+        self.assertEqual(analyze("a" * 152 + "€" + "a" * 152)["segments"], 3)
+
+    def test_ucs2_boundaries(self):
+        self.assertEqual(analyze("ж" * 70)["segments"], 1)
+        self.assertEqual(analyze("ж" * 71)["segments"], 2)
+        self.assertEqual(analyze("🚨" + "a" * 68)["units"], 70)
+        # Surrogate pair pushed into the next segment
+        self.assertEqual(analyze("a" * 66 + "🚨" + "a" * 67)["segments"], 3)
+
+
+class TestComposer(unittest.TestCase):
+
+    def test_transliteration(self):
+        self.assertEqual(transliterate("🚨 EMERGENCY ALERT"), "EMERGENCY ALERT")
+        self.assertEqual(transliterate("María “ayuda” — ya…"), 'Maria "ayuda" - ya...')
+        self.assertIsNone(transliterate("Помогите"))
+
+    def test_optimize_prefers_fewer_segments(self):
+        emoji = "🚨 EMERGENCY ALERT\n" + "Help needed at the north entrance. " * 3
+        self.assertEqual(analyze(emoji)["segments"], 2)
+        optimized = optimize_message(emoji)
+        self.assertTrue(optimized["transliterated"])
+        self.assertEqual(optimized["encoding"], "GSM-7")
+        self.assertEqual(optimized["segments"], 1)
+
+        # Same segment count: the original text is kept
+        accented = optimize_message("🚨 Ayuda en la entrada norte, María")
+        self.assertFalse(accented["transliterated"])
+        self.assertEqual(accented["text"], "🚨 Ayuda en la entrada norte, María")
+
+        cyrillic = optimize_message("Помогите")
+        self.assertFalse(cyrillic["transliterated"])
+        self.assertEqual(cyrillic["encoding"], "UCS-2")
+
+    def test_reasoning_truncated_to_budget(self):
+        fields = {
+            "victim": "José Pérez",
+            "risk": "CRITICAL",
+            "lat": 4.711,
+            "lng": -74.0721,
+            "location": "Bogotá",
+            "time": "22:14",
+            "reasoning": "Distress keywords and screaming detected. " * 30
+        }
+        composed = compose_alert(fields, max_segments=2)
+        self.assertTrue(composed["within_budget"])
+        self.assertTrue(composed["truncated"])
+        self.assertEqual(composed["encoding"], "GSM-7")
+        self.assertLessEqual(composed["segments"], 2)
+        self.assertIn("Victim: José Pérez", composed["text"])
+        self.assertIn("Map: https://maps.google.com/?q=4.711,-74.0721", composed["text"])
+        self.assertIn("Risk: CRITICAL", composed["text"])
+        self.assertTrue(composed["text"].split("Details: ")[1].split("\n")[0].endswith("..."))
+
+    def test_short_alert_kept_whole(self):
+        composed = compose_alert({"victim": "Ana", "risk": "HIGH", "map": "https://maps.google.com/?q=1,2",
+                                  "reasoning": "Scream detected"})
+        self.assertFalse(composed["truncated"])
+        self.assertEqual(composed["dropped"], [])
+        self.assertIn("Details: Scream detected", composed["text"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""
+Tests for SMS E.164 lookup
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add backend/sms/ to PYTHONPATH so the Lambda modules are importable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SMS_PATH = PROJECT_ROOT / "backend" / "sms"
+sys.path.insert(0, str(SMS_PATH))
+
+from sms_e164 import COUNTRIES, OTHER_CALLING_CODES, PRICE_TIERS, calling_code, lookup, max_price
+
+
+class TestE164Lookup(unittest.TestCase):
+
+    def test_valid_numbers(self):
+        for number, iso, national in [
+            ("+573001234567", "CO", "3001234567"),
+            ("+12025551234", "US", "2025551234"),
+            ("+525512345678", "MX", "5512345678"),
+            ("+584121234567", "VE", "4121234567"),
+            ("+353851234567", "IE", "851234567"),
+        ]:
+            result = lookup(number)
+            self.assertTrue(result["valid"], number)
+            self.assertIsNone(result["error"])
+            self.assertEqual(result["country"].iso, iso)
+            self.assertEqual(result["national"], national)
+
+    def test_national_length_checked_per_country(self):
+        short = lookup("+57300123456")
+        self.assertFalse(short["valid"])
+        self.assertEqual(short["country"].iso, "CO")
+        self.assertIn("10 digits", short["error"])
+
+        # Seven national digits is too short for NANP
+        self.assertFalse(lookup("+12025551")["valid"])
+
+    def test_malformed_numbers(self):
+        for number in ["573001234567", "+57 300 123 4567", "+", "+1234567890123456", None, "+٥٧٣٠٠١٢٣٤٥٦٧"]:
+            result = lookup(number)
+            self.assertFalse(result["valid"], number)
+            self.assertIsNone(result["country"])
+
+    def test_unknown_calling_code(self):
+        result = lookup("+999123456789")
+        self.assertFalse(result["valid"])
+        self.assertIn("Unknown", result["error"])
+
+    def test_longest_prefix_wins(self):
+        self.assertEqual(calling_code("+3531234567"), "353")
+        self.assertEqual(calling_code("+351912345678"), "351")
+        self.assertEqual(calling_code("+15550001"), "1")
+        self.assertIsNone(calling_code("+0000"))
+
+    def test_codes_without_metadata_are_accepted(self):
+        result = lookup("+37061234567")
+        self.assertTrue(result["valid"])
+        self.assertEqual(result["country"].code, "370")
+        self.assertEqual(result["country"].price_tier, "standard")
+
+    def test_every_itu_country_code_resolves(self):
+        for number, code in [
+            ("+94771234567", "94"),
+            ("+244923123456", "244"),
+            ("+2250701234567", "225"),
+            ("+93701234567", "93"),
+            ("+9512345678", "95"),
+            ("+237671234567", "237"),
+            ("+258841234567", "258"),
+            ("+590690123456", "590"),
+            ("+6797012345", "679"),
+        ]:
+            result = lookup(number)
+            self.assertTrue(result["valid"], number)
+            self.assertEqual(result["country"].code, code)
+            self.assertEqual(max_price(result["country"]), PRICE_TIERS["standard"])
+
+    def test_sms_capability_flag(self):
+        result = lookup("+5351234567")
+        self.assertTrue(result["valid"])
+        self.assertFalse(result["country"].sms)
+        self.assertTrue(lookup("+573001234567")["country"].sms)
+
+    def test_max_price_by_tier(self):
+        self.assertEqual(max_price(lookup("+12025551234")["country"]), PRICE_TIERS["low"])
+        self.assertEqual(max_price(lookup("+573001234567")["country"]), PRICE_TIERS["standard"])
+        self.assertEqual(max_price(None), PRICE_TIERS["standard"])
+
+    def test_metadata_is_consistent(self):
+        self.assertFalse(set(COUNTRIES) & OTHER_CALLING_CODES)
+        for code, (iso, name, low, high, sms, tier) in COUNTRIES.items():
+            self.assertLessEqual(low, high, code)
+            self.assertLessEqual(len(code) + high, 15, code)
+            self.assertIn(tier, PRICE_TIERS, code)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Tests for SMS Idempotency
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add backend/sms/ to PYTHONPATH so the Lambda modules are importable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SMS_PATH = PROJECT_ROOT / "backend" / "sms"
+sys.path.insert(0, str(SMS_PATH))
+
+from sms_idempotency import (
+    COMPLETED, PENDING, DynamoDBIdempotencyStore, IdempotencyGuard, MemoryIdempotencyStore, idempotency_key
+)
+
+
+class ConditionalCheckFailed(Exception):
+    response = {"Error": {"Code": "ConditionalCheckFailedException"}}
+
+
+class LocalDynamoDB:
+    """In-process stand-in for DynamoDB put/get/delete_item."""
+
+    def __init__(self):
+        self.items = {}
+
+    def put_item(self, TableName, Item, ConditionExpression=None, ExpressionAttributeValues=None):
+        key = Item["pk"]["S"]
+        existing = self.items.get(key)
+        if ConditionExpression and existing:
+            now = int(ExpressionAttributeValues[":now"]["N"])
+            if int(existing["expires_at"]["N"]) >= now:
+                raise ConditionalCheckFailed()
+        self.items[key] = Item
+
+    def get_item(self, TableName, Key, ConsistentRead=False):
+        item = self.items.get(Key["pk"]["S"])
+        return {"Item": item} if item else {}
+
+    def delete_item(self, TableName, Key):
+        self.items.pop(Key["pk"]["S"], None)
+
+
+class TestIdempotency(unittest.TestCase):
+
+    def test_key_derivation(self):
+        body = {"to": "+15550001", "message": "help", "buildId": "b1"}
+        self.assertEqual(idempotency_key(body), idempotency_key(dict(body)))
+        self.assertNotEqual(idempotency_key(body), idempotency_key(dict(body, message="help!")))
+        self.assertEqual(idempotency_key(body, {"idempotency-key": "abc"}), "key:abc")
+        self.assertEqual(idempotency_key(dict(body, idempotencyKey="xyz")), "key:xyz")
+
+    def test_meta_alerts_have_distinct_keys(self):
+        body = {"to": "+15550001", "buildId": "b1", "meta": {"victimName": "Ana", "lat": 1.0, "lng": 2.0}}
+        reordered = dict(body, meta={"lng": 2.0, "lat": 1.0, "victimName": "Ana"})
+        self.assertEqual(idempotency_key(body), idempotency_key(reordered))
+        self.assertNotEqual(idempotency_key(body), idempotency_key(dict(body, meta=dict(body["meta"], lat=1.5))))
+
+    def test_derived_keys_replay_for_shorter_window(self):
+        guard = IdempotencyGuard(ttl_seconds=3600, derived_ttl_seconds=-1)
+        for key in ("key:abc", "sha256:abc", "sha256:abc|+15550001"):
+            guard.claim(key)
+            guard.complete(key, {"messageId": "m1"})
+        self.assertEqual(guard.claim("key:abc")["status"], COMPLETED)
+        self.assertIsNone(guard.claim("sha256:abc"))
+        self.assertIsNone(guard.claim("sha256:abc|+15550001"))
+
+    def test_claim_complete_replay(self):
+        guard = IdempotencyGuard()
+        self.assertIsNone(guard.claim("k"))
+        self.assertEqual(guard.claim("k"), {"status": PENDING})
+
+        guard.complete("k", {"messageId": "m1"})
+        self.assertEqual(guard.claim("k"), {"status": COMPLETED, "response": {"messageId": "m1"}})
+
+    def test_release_allows_retry(self):
+        guard = IdempotencyGuard()
+        guard.claim("k")
+        guard.release("k")
+        self.assertIsNone(guard.claim("k"))
+
+    def test_expired_records_are_reclaimable(self):
+        guard = IdempotencyGuard(ttl_seconds=-1)
+        guard.claim("k")
+        guard.complete("k", {"messageId": "m1"})
+        self.assertIsNone(guard.claim("k"))
+
+    def test_memory_store_bounded(self):
+        store = MemoryIdempotencyStore(max_entries=2)
+        for key in "abc":
+            store.put(key, {"status": COMPLETED}, 60)
+        self.assertIsNone(store.get("a"))
+        self.assertIsNotNone(store.get("c"))
+
+    def test_shared_store_dedups_across_containers(self):
+        table = LocalDynamoDB()
+        first = IdempotencyGuard(shared=DynamoDBIdempotencyStore("idem", client=table))
+        second = IdempotencyGuard(shared=DynamoDBIdempotencyStore("idem", client=table))
+
+        self.assertIsNone(first.claim("k"))
+        self.assertEqual(second.claim("k")["status"], PENDING)
+
+        first.complete("k", {"messageId": "m1"})
+        self.assertEqual(second.claim("k")["response"], {"messageId": "m1"})
+        # Replayed response is now cached locally as well
+        self.assertEqual(second.local.get("k")["status"], COMPLETED)
+
+
+if __name__ == '__main__':
+    unittest.main()
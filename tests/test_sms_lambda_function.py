@@ -0,0 +1,193 @@
+"""
+Tests for the consolidated SMS Lambda handler
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import importlib.util
+import json
+import os
+import tempfile
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add backend/sms/ to PYTHONPATH so the Lambda modules are importable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SMS_PATH = PROJECT_ROOT / "backend" / "sms"
+sys.path.insert(0, str(SMS_PATH))
+
+BOTO3_AVAILABLE = importlib.util.find_spec("boto3") is not None
+
+from sms_idempotency import IdempotencyGuard
+from sms_outbox import DEAD, PENDING, create_outbox_worker
+from sms_rate_limit import SmsRateLimiter
+from sms_receipts import ReceiptIndex
+
+
+class SnsError(Exception):
+    """botocore ClientError shape."""
+
+    def __init__(self, code):
+        super().__init__(f"An error occurred ({code}) when calling the Publish operation")
+        self.response = {"Error": {"Code": code}}
+
+
+class StubSNS:
+    """SNS client that records publishes and raises queued errors first."""
+
+    def __init__(self):
+        self.published = []
+        self.errors = []
+
+    def publish(self, PhoneNumber, Message, MessageAttributes):
+        if self.errors:
+            raise self.errors.pop(0)
+        self.published.append({"to": PhoneNumber, "message": Message, "attributes": MessageAttributes})
+        return {"MessageId": f"msg-{len(self.published)}"}
+
+
+class Context:
+    aws_request_id = "req-1"
+
+
+def function_url_event(method, body=None, query=None, headers=None):
+    return {
+        "headers": dict({"origin": "https://dfc8ght8abwqc.cloudfront.net"}, **(headers or {})),
+        "requestContext": {"http": {"method": method, "path": "/"}},
+        "queryStringParameters": query,
+        "body": json.dumps(body) if body is not None else None
+    }
+
+
+@unittest.skipUnless(BOTO3_AVAILABLE, "boto3 not installed")
+class TestSmsLambdaFunction(unittest.TestCase):
+    """The handler end to end, with SNS replaced in-process."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        env = {
+            "AWS_DEFAULT_REGION": "us-east-1",
+            "SMS_OUTBOX_PATH": os.path.join(cls.tmp.name, "import-outbox.db"),
+            "SMS_RECEIPTS_PATH": os.path.join(cls.tmp.name, "import-receipts.db")
+        }
+        with patch.dict(os.environ, env):
+            import lambda_function
+        cls.handler = lambda_function
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def setUp(self):
+        self.sns = StubSNS()
+        limiter = SmsRateLimiter(country_rates={}, default_rate=(1e9, 1e9),
+                                 default_identity_rate=(1e9, 1e9), per_destination_per_second=1e9)
+        self.outbox_worker = create_outbox_worker(
+            self.handler.publish_sms, path=os.path.join(self.tmp.name, f"{self.id()}-outbox.db"), rate_limiter=limiter
+        )
+        self.addCleanup(self.outbox_worker.stop)
+        state = {
+            "sns": self.sns,
+            "outbox_worker": self.outbox_worker,
+            "idempotency": IdempotencyGuard(),
+            "receipts": ReceiptIndex(os.path.join(self.tmp.name, f"{self.id()}-receipts.db"))
+        }
+        for name, value in state.items():
+            patcher = patch.object(self.handler, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def invoke(self, method, body=None, **kwargs):
+        response = self.handler.lambda_handler(function_url_event(method, body, **kwargs), Context())
+        return response["statusCode"], json.loads(response["body"] or "null")
+
+    def test_preflight(self):
+        response = self.handler.lambda_handler(function_url_event("OPTIONS"), Context())
+        self.assertEqual(response["statusCode"], 200)
+        self.assertIn("Access-Control-Max-Age", response["headers"])
+
+    def test_validation(self):
+        for body, code in [
+            ({"message": "help"}, "MISSING_PHONE"),
+            ({"to": "+573001234567"}, "MISSING_MESSAGE"),
+            ({"to": "573001234567", "message": "help"}, "INVALID_PHONE_FORMAT"),
+            ({"to": "+5351234567", "message": "help"}, "UNSUPPORTED_COUNTRY"),
+            ({"to": "+573001234567", "message": "x" * 1601}, "MESSAGE_TOO_LONG"),
+        ]:
+            self.assertEqual(self.invoke("POST", body)[0], 400, body)
+            self.assertEqual(self.invoke("POST", body)[1]["errorCode"], code, body)
+        self.assertEqual(self.sns.published, [])
+
+        # 1600 characters is still accepted
+        status, _ = self.invoke("POST", {"to": "+573001234567", "message": "x" * 1600})
+        self.assertEqual(status, 200)
+
+    def test_send_and_idempotent_replay(self):
+        body = {"to": "+573001234567", "message": "Emergency alert", "buildId": "b1"}
+        status, sent = self.invoke("POST", body)
+        self.assertEqual(status, 200)
+        self.assertTrue(sent["ok"])
+        self.assertEqual(sent["messageId"], "msg-1")
+        self.assertEqual(sent["toMasked"], "+57***4567")
+        self.assertEqual(self.sns.published[0]["to"], "+573001234567")
+        self.assertEqual(self.sns.published[0]["attributes"]["AWS.SNS.SMS.SMSType"]["StringValue"], "Transactional")
+
+        status, replayed = self.invoke("POST", body)
+        self.assertEqual(status, 200)
+        self.assertTrue(replayed["duplicate"])
+        self.assertEqual(replayed["messageId"], "msg-1")
+        self.assertEqual(len(self.sns.published), 1)
+
+        # A client-supplied key separates otherwise identical requests
+        self.invoke("POST", body, headers={"idempotency-key": "second"})
+        self.assertEqual(len(self.sns.published), 2)
+
+    def test_recipients(self):
+        body = {"recipients": ["+573001234567", "+12025551234", "12345"], "message": "Emergency alert"}
+        status, result = self.invoke("POST", body)
+        self.assertEqual(status, 207)
+        self.assertEqual((result["total"], result["sent"], result["failed"]), (3, 2, 1))
+        self.assertEqual(sorted(p["to"] for p in self.sns.published), ["+12025551234", "+573001234567"])
+
+        # A retry replays both sends instead of texting again
+        self.invoke("POST", body)
+        self.assertEqual(len(self.sns.published), 2)
+
+    def test_failed_publish_is_queued_in_outbox(self):
+        self.sns.errors.append(SnsError("Throttling"))
+        body = {"to": "+573001234567", "message": "Emergency alert"}
+        status, result = self.invoke("POST", body)
+        self.assertEqual(status, 202)
+        self.assertEqual(result["errorCode"], "QUEUED_FOR_RETRY")
+        self.assertEqual(self.outbox_worker.outbox.counts(), {PENDING: 1})
+
+        # The outbox delivers it; a client retry then replays the sent row
+        self.outbox_worker.stop()
+        self.assertEqual(self.outbox_worker.send_now(1)["message_id"], "msg-1")
+        status, retried = self.invoke("POST", body)
+        self.assertEqual(status, 200)
+        self.assertEqual(retried["messageId"], "msg-1")
+        self.assertEqual(len(self.sns.published), 1)
+
+    def test_rejected_publish_is_not_retried(self):
+        self.sns.errors.append(SnsError("InvalidParameter"))
+        status, result = self.invoke("POST", {"to": "+573001234567", "message": "Emergency alert"})
+        self.assertEqual(status, 400)
+        self.assertEqual(result["errorCode"], "SMS_REJECTED")
+        self.assertEqual(self.outbox_worker.outbox.counts(), {DEAD: 1})
+        self.assertEqual(len(self.sns.published), 0)
+
+    def test_receipt_lookup(self):
+        status, result = self.invoke("GET", query={"messageId": "msg-9"})
+        self.assertEqual(status, 200)
+        self.assertEqual(result["status"], "PENDING")
+
+        status, result = self.invoke("GET", query={"to": "+573001234567"})
+        self.assertEqual(status, 400)
+        self.assertEqual(result["errorCode"], "MISSING_QUERY")
+
+
+if __name__ == '__main__':
+    unittest.main()
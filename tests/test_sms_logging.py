@@ -0,0 +1,104 @@
+"""
+Tests for SMS Logging
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Add backend/sms/ to PYTHONPATH so the Lambda modules are importable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SMS_PATH = PROJECT_ROOT / "backend" / "sms"
+sys.path.insert(0, str(SMS_PATH))
+
+from sms_logging import SmsLogger, mask_phone, mask_text
+
+
+class Records(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(dict(json.loads(record.getMessage()), levelno=record.levelno))
+
+
+def capture(fn, name="SMS-TEST"):
+    handler = Records()
+    logger = logging.getLogger(name)
+    logger.addHandler(handler)
+    try:
+        fn()
+    finally:
+        logger.removeHandler(handler)
+    return handler.records
+
+
+class TestSmsLogger(unittest.TestCase):
+
+    def test_mask_phone(self):
+        self.assertEqual(mask_phone("+573001234567"), "+57***4567")
+        self.assertEqual(mask_phone(None), "N/A")
+        self.assertEqual(mask_phone("+1234"), "+1234")
+
+    def test_mask_text(self):
+        self.assertEqual(mask_text("Invalid parameter: +573001234567 rejected"), "Invalid parameter: +57***4567 rejected")
+        self.assertEqual(mask_text("risk +5 points"), "risk +5 points")
+        self.assertEqual(mask_text("call +1 555 123 4567 now"), "call +15***4567 now")
+        self.assertEqual(mask_text("+1 (555) 123-4567, +44 20.7946.0958."), "+15***4567, +44***0958.")
+
+    def test_records_are_json_with_masked_phones(self):
+        log = SmsLogger("SMS-TEST", level="INFO")
+        records = capture(lambda: log.info("Sent to +573001234567", to="+573001234567",
+                                           error="PhoneNumber +15551234567 opted out", segments=2))
+        self.assertEqual(len(records), 1)
+        record = records[0]
+        self.assertEqual(record["logger"], "SMS-TEST")
+        self.assertEqual(record["level"], "INFO")
+        self.assertEqual(record["msg"], "Sent to +57***4567")
+        self.assertEqual(record["to"], "+57***4567")
+        self.assertEqual(record["error"], "PhoneNumber +15***4567 opted out")
+        self.assertEqual(record["segments"], 2)
+        self.assertEqual(record["levelno"], logging.INFO)
+
+        records = capture(lambda: log.warning("Retrying", phone="+1 555 123 4567"))
+        self.assertEqual(records[0]["phone"], "+15***4567")
+
+    def test_wraps_standard_logger(self):
+        log = SmsLogger("SMS-TEST", level="WARNING")
+        self.assertIs(log.logger, logging.getLogger("SMS-TEST"))
+        self.assertEqual(log.logger.level, logging.WARNING)
+
+    def test_level_gating(self):
+        log = SmsLogger("SMS-TEST", level="WARNING")
+        records = capture(lambda: (log.debug("d"), log.info("i"), log.warning("w"), log.error("e")))
+        self.assertEqual([r["level"] for r in records], ["WARNING", "ERROR"])
+
+    def test_level_from_environment(self):
+        os.environ["SMS_LOG_LEVEL"] = "debug"
+        self.addCleanup(os.environ.pop, "SMS_LOG_LEVEL")
+        records = capture(lambda: SmsLogger("SMS-TEST").debug("d"))
+        self.assertEqual(records[0]["level"], "DEBUG")
+
+    def test_exception_includes_traceback(self):
+        log = SmsLogger("SMS-TEST")
+
+        def fail():
+            try:
+                raise ValueError("boom for +573001234567")
+            except ValueError as e:
+                log.exception("Unexpected error", error=str(e))
+
+        record = capture(fail)[0]
+        self.assertEqual(record["level"], "ERROR")
+        self.assertEqual(record["error"], "boom for +57***4567")
+        self.assertIn("ValueError", record["traceback"])
+
+
+if __name__ == '__main__':
+    unittest.main()
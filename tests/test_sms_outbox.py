@@ -0,0 +1,167 @@
+"""
+Tests for SMS Outbox
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import os
+import tempfile
+import threading
+import time
+import sys
+from pathlib import Path
+
+# Add backend/sms/ to PYTHONPATH so the Lambda modules are importable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SMS_PATH = PROJECT_ROOT / "backend" / "sms"
+sys.path.insert(0, str(SMS_PATH))
+
+from sms_outbox import DEAD, PENDING, SENT, DestinationRateLimiter, OutboxWorker, SmsOutbox
+
+
+class ThrottlingSNS:
+    """SNS stand-in that throttles the first few publishes."""
+
+    def __init__(self, throttle_first=0):
+        self.throttle_first = throttle_first
+        self.sent = []
+        self.lock = threading.Lock()
+
+    def publish(self, phone, message, attributes):
+        with self.lock:
+            if self.throttle_first > 0:
+                self.throttle_first -= 1
+                raise RuntimeError("Throttling: Rate exceeded")
+            self.sent.append((phone, message))
+            return f"msg-{len(self.sent)}"
+
+
+class InvalidParameter(Exception):
+    """botocore ClientError shape for a number SNS will never accept."""
+
+    def __init__(self):
+        super().__init__("An error occurred (InvalidParameter) when calling the Publish operation: "
+                         "Invalid parameter: PhoneNumber")
+        self.response = {"Error": {"Code": "InvalidParameter"}}
+
+
+class TestSmsOutbox(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.outbox = SmsOutbox(os.path.join(self.tmp.name, "outbox.db"))
+
+    def make_worker(self, sns, **kwargs):
+        kwargs.setdefault("rate_limiter", DestinationRateLimiter(per_destination_per_second=1000))
+        worker = OutboxWorker(self.outbox, sns.publish, base_delay=0.01, max_delay=0.05,
+                              poll_interval=0.01, **kwargs)
+        self.addCleanup(worker.stop)
+        return worker
+
+    def test_dedup_key(self):
+        first, created = self.outbox.enqueue("+15550001", "help", dedup_key="k1")
+        again, created_again = self.outbox.enqueue("+15550001", "help", dedup_key="k1")
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertEqual(first["id"], again["id"])
+
+    def test_dedup_key_expires_after_send(self):
+        self.outbox.dedup_ttl_seconds = 0
+        worker = self.make_worker(ThrottlingSNS())
+        first, _ = self.outbox.enqueue("+15550001", "help", dedup_key="k1")
+        # Unsent rows keep deduplicating however old they are
+        self.assertFalse(self.outbox.enqueue("+15550001", "help", dedup_key="k1")[1])
+
+        worker.send_now(first["id"])
+        again, created = self.outbox.enqueue("+15550001", "help", dedup_key="k1")
+        self.assertTrue(created)
+        self.assertNotEqual(again["id"], first["id"])
+        self.assertIsNone(self.outbox.get(first["id"])["dedup_key"])
+
+    def test_send_now_success(self):
+        sns = ThrottlingSNS()
+        worker = self.make_worker(sns)
+        row, _ = self.outbox.enqueue("+15550001", "help")
+        result = worker.send_now(row["id"])
+        self.assertEqual(result["status"], SENT)
+        self.assertEqual(result["message_id"], "msg-1")
+        # A sent row cannot be claimed again
+        self.assertIsNone(self.outbox.claim(row["id"]))
+
+    def test_failed_send_survives_and_retries(self):
+        sns = ThrottlingSNS(throttle_first=3)
+        worker = self.make_worker(sns)
+        row, _ = self.outbox.enqueue("+15550001", "help")
+
+        result = worker.send_now(row["id"])
+        self.assertEqual(result["status"], PENDING)
+        self.assertIn("Throttling", result["last_error"])
+
+        worker.start()
+        deadline = time.time() + 5
+        while self.outbox.get(row["id"])["status"] != SENT and time.time() < deadline:
+            time.sleep(0.01)
+        final = self.outbox.get(row["id"])
+        self.assertEqual(final["status"], SENT)
+        self.assertEqual(final["attempts"], 4)
+        self.assertEqual(len(sns.sent), 1)
+
+    def test_dead_after_max_attempts_then_revived(self):
+        sns = ThrottlingSNS(throttle_first=100)
+        worker = self.make_worker(sns, max_attempts=2)
+        row, _ = self.outbox.enqueue("+15550001", "help", dedup_key="k1")
+        worker.send_now(row["id"])
+        time.sleep(0.06)
+        worker.drain()
+        self.assertEqual(self.outbox.get(row["id"])["status"], DEAD)
+
+        revived, _ = self.outbox.enqueue("+15550001", "help", dedup_key="k1")
+        self.assertEqual(revived["status"], PENDING)
+        self.assertEqual(revived["attempts"], 0)
+
+    def test_permanent_errors_are_not_retried(self):
+        calls = []
+
+        def publish(phone, message, attributes):
+            calls.append(phone)
+            raise InvalidParameter()
+
+        worker = OutboxWorker(self.outbox, publish,
+                              rate_limiter=DestinationRateLimiter(per_destination_per_second=1000))
+        row, _ = self.outbox.enqueue("+15550001", "help")
+        result = worker.send_now(row["id"])
+        self.assertEqual(result["status"], DEAD)
+        self.assertEqual(result["attempts"], 1)
+        self.assertIn("InvalidParameter", result["last_error"])
+        self.assertEqual(worker.drain(), 0)
+        self.assertEqual(calls, ["+15550001"])
+
+    def test_rate_limited_rows_are_deferred_not_failed(self):
+        sns = ThrottlingSNS()
+        worker = self.make_worker(sns, rate_limiter=DestinationRateLimiter(per_destination_per_second=1))
+        first, _ = self.outbox.enqueue("+15550001", "one")
+        second, _ = self.outbox.enqueue("+15550001", "two")
+
+        self.assertEqual(worker.send_now(first["id"])["status"], SENT)
+        deferred = worker.send_now(second["id"])
+        self.assertEqual(deferred["status"], PENDING)
+        self.assertEqual(deferred["attempts"], 0)
+        self.assertGreater(deferred["next_attempt_at"], time.time())
+
+    def test_backlog_drains_under_throttling(self):
+        sns = ThrottlingSNS(throttle_first=10)
+        worker = self.make_worker(sns, workers=4)
+        for i in range(20):
+            self.outbox.enqueue(f"+1555000{i:02d}", "help")
+
+        worker.start()
+        deadline = time.time() + 10
+        while self.outbox.counts().get(SENT, 0) < 20 and time.time() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(self.outbox.counts(), {SENT: 20})
+        self.assertEqual(len(sns.sent), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+Tests for SMS Rate Limiter
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import os
+import tempfile
+import sys
+from pathlib import Path
+
+# Add backend/sms/ to PYTHONPATH so the Lambda modules are importable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SMS_PATH = PROJECT_ROOT / "backend" / "sms"
+sys.path.insert(0, str(SMS_PATH))
+
+from sms_outbox import PENDING, SENT, OutboxWorker, SmsOutbox
+from sms_rate_limit import ORIGINATION_ATTRIBUTE, SmsRateLimiter, calling_code
+
+
+class TestSmsRateLimiter(unittest.TestCase):
+
+    def make_limiter(self, **kwargs):
+        kwargs.setdefault("per_destination_per_second", 1000)
+        return SmsRateLimiter(**kwargs)
+
+    def test_calling_code_longest_prefix(self):
+        self.assertEqual(calling_code("+15550001"), "1")
+        self.assertEqual(calling_code("+573001234567"), "57")
+        self.assertEqual(calling_code("+3531234567"), "353")
+        self.assertEqual(calling_code("+351912345678"), "351")
+        self.assertIsNone(calling_code("+0000"))
+
+    def test_country_bucket_defers_when_empty(self):
+        limiter = self.make_limiter(country_rates={"57": (2.0, 2)})
+        self.assertEqual(limiter.acquire("+573000000001", now=0.0), 0.0)
+        self.assertEqual(limiter.acquire("+573000000002", now=0.0), 0.0)
+        self.assertAlmostEqual(limiter.acquire("+573000000003", now=0.0), 0.5)
+        # Refills at the country's rate
+        self.assertEqual(limiter.acquire("+573000000003", now=0.5), 0.0)
+
+    def test_countries_are_independent(self):
+        limiter = self.make_limiter(country_rates={"57": (1.0, 1), "1": (1.0, 1)})
+        self.assertEqual(limiter.acquire("+573000000001", now=0.0), 0.0)
+        self.assertGreater(limiter.acquire("+573000000002", now=0.0), 0)
+        self.assertEqual(limiter.acquire("+15550001", now=0.0), 0.0)
+
+    def test_unlisted_country_uses_default(self):
+        limiter = self.make_limiter(country_rates={}, default_rate=(1.0, 1))
+        self.assertEqual(limiter.acquire("+447700900001", now=0.0), 0.0)
+        self.assertGreater(limiter.acquire("+447700900002", now=0.0), 0)
+
+    def test_identity_bucket(self):
+        limiter = self.make_limiter(identity_rates={"+18885550100": (1.0, 1)})
+        self.assertEqual(limiter.acquire("+15550001", identity="+18885550100", now=0.0), 0.0)
+        self.assertAlmostEqual(limiter.acquire("+15550002", identity="+18885550100", now=0.0), 1.0)
+        # Another origination number has its own capacity
+        self.assertEqual(limiter.acquire("+15550002", identity="+18885550199", now=0.0), 0.0)
+
+    def test_deferral_does_not_consume(self):
+        limiter = self.make_limiter(country_rates={"57": (10.0, 10)}, identity_rates={"id": (1.0, 1)})
+        limiter.acquire("+573000000001", identity="id", now=0.0)
+        for _ in range(5):
+            self.assertGreater(limiter.acquire("+573000000002", identity="id", now=0.0), 0)
+        # Country tokens were not burned by the deferred attempts
+        self.assertAlmostEqual(limiter._countries["57"].tokens, 9.0)
+
+    def test_destination_spacing(self):
+        limiter = SmsRateLimiter(per_destination_per_second=1.0)
+        self.assertEqual(limiter.acquire("+15550001", now=0.0), 0.0)
+        self.assertAlmostEqual(limiter.acquire("+15550001", now=0.25), 0.75)
+        self.assertEqual(limiter.acquire("+15550002", now=0.25), 0.0)
+
+    def test_from_env(self):
+        os.environ["SMS_RATE_LIMITS"] = '{"countries": {"58": [1, 2]}, "identities": {"id": [3, 3]}}'
+        self.addCleanup(os.environ.pop, "SMS_RATE_LIMITS")
+        limiter = SmsRateLimiter.from_env()
+        self.assertEqual(limiter.country_rates["58"], (1, 2))
+        self.assertEqual(limiter.country_rates["57"], (10.0, 10))
+        self.assertEqual(limiter.identity_rates["id"], (3, 3))
+
+
+class TestOutboxWithCountryLimits(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.outbox = SmsOutbox(os.path.join(self.tmp.name, "outbox.db"))
+        self.sent = []
+
+    def publish(self, phone, message, attributes):
+        self.sent.append(phone)
+        return f"msg-{len(self.sent)}"
+
+    def test_over_rate_sends_are_deferred(self):
+        limiter = SmsRateLimiter(country_rates={"57": (1.0, 1)}, per_destination_per_second=1000)
+        worker = OutboxWorker(self.outbox, self.publish, rate_limiter=limiter)
+        first, _ = self.outbox.enqueue("+573000000001", "one")
+        second, _ = self.outbox.enqueue("+573000000002", "two")
+
+        self.assertEqual(worker.send_now(first["id"])["status"], SENT)
+        deferred = worker.send_now(second["id"])
+        self.assertEqual(deferred["status"], PENDING)
+        self.assertEqual(deferred["attempts"], 0)
+
+    def test_short_waits_are_absorbed_inline(self):
+        limiter = SmsRateLimiter(country_rates={"57": (20.0, 1)}, per_destination_per_second=1000)
+        worker = OutboxWorker(self.outbox, self.publish, rate_limiter=limiter)
+        first, _ = self.outbox.enqueue("+573000000001", "one")
+        second, _ = self.outbox.enqueue("+573000000002", "two")
+
+        worker.send_now(first["id"])
+        self.assertEqual(worker.send_now(second["id"], max_wait=0.5)["status"], SENT)
+
+    def test_origination_identity_from_attributes(self):
+        limiter = SmsRateLimiter(identity_rates={"+18885550100": (1.0, 1)}, per_destination_per_second=1000)
+        worker = OutboxWorker(self.outbox, self.publish, rate_limiter=limiter)
+        attributes = {ORIGINATION_ATTRIBUTE: {"DataType": "String", "StringValue": "+18885550100"}}
+        first, _ = self.outbox.enqueue("+15550001", "one", attributes=attributes)
+        second, _ = self.outbox.enqueue("+15550002", "two", attributes=attributes)
+        other, _ = self.outbox.enqueue("+15550003", "three")
+
+        self.assertEqual(worker.send_now(first["id"])["status"], SENT)
+        self.assertEqual(worker.send_now(second["id"])["status"], PENDING)
+        self.assertEqual(worker.send_now(other["id"])["status"], SENT)
+
+
+if __name__ == '__main__':
+    unittest.main()
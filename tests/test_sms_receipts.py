@@ -0,0 +1,133 @@
+"""
+Tests for SMS Receipts
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import base64
+import gzip
+import json
+import os
+import sqlite3
+import tempfile
+import sys
+from pathlib import Path
+
+# Add backend/sms/ to PYTHONPATH so the Lambda modules are importable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SMS_PATH = PROJECT_ROOT / "backend" / "sms"
+sys.path.insert(0, str(SMS_PATH))
+
+from sms_receipts import (
+    DELIVERED, FAILED, DynamoDBReceiptIndex, ReceiptIndex, decode_cloudwatch_event, parse_delivery_status, public_receipt
+)
+
+
+def delivery_record(message_id, destination="+573001234567", status="SUCCESS", response="Message has been accepted by phone carrier"):
+    return {
+        "notification": {"messageId": message_id, "timestamp": "2026-01-29 10:00:00.000"},
+        "delivery": {
+            "destination": destination,
+            "providerResponse": response,
+            "phoneCarrier": "Claro",
+            "priceInUSD": 0.02,
+            "dwellTimeMs": 600,
+            "dwellTimeMsUntilDeviceAck": 1300,
+        },
+        "status": status,
+    }
+
+
+class TestDeliveryStatusParsing(unittest.TestCase):
+
+    def test_parse_success_and_failure(self):
+        receipt = parse_delivery_status(delivery_record("m1"))
+        self.assertEqual(receipt["status"], DELIVERED)
+        self.assertEqual(receipt["to_masked"], "+57***4567")
+        self.assertEqual(receipt["dwell_ms"], 1300)
+
+        failed = parse_delivery_status(delivery_record("m2", status="FAILURE", response="Phone carrier has blocked this message"))
+        self.assertEqual(failed["status"], FAILED)
+        self.assertIsNone(parse_delivery_status({"status": "SUCCESS"}))
+
+    def test_decode_cloudwatch_event(self):
+        payload = {"logEvents": [
+            {"id": "1", "timestamp": 0, "message": json.dumps(delivery_record("m1"))},
+            {"id": "2", "timestamp": 0, "message": "not json"},
+        ]}
+        event = {"awslogs": {"data": base64.b64encode(gzip.compress(json.dumps(payload).encode())).decode()}}
+        records = decode_cloudwatch_event(event)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["notification"]["messageId"], "m1")
+
+
+class TestReceiptIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "receipts.db")
+        self.index = ReceiptIndex(self.path)
+
+    def test_lookup_by_message_id(self):
+        self.assertEqual(self.index.ingest([delivery_record("m1"), {"status": "SUCCESS"}]), 1)
+        receipt = public_receipt(self.index.get("m1"))
+        self.assertEqual(receipt["status"], DELIVERED)
+        self.assertEqual(receipt["carrier"], "Claro")
+        self.assertIsNone(self.index.get("missing"))
+
+    def test_later_record_replaces_earlier(self):
+        self.index.ingest([delivery_record("m1", status="FAILURE")])
+        self.index.ingest([delivery_record("m1")])
+        self.assertEqual(self.index.get("m1")["status"], DELIVERED)
+
+    def test_raw_numbers_not_stored(self):
+        self.index.ingest([delivery_record("m1")])
+        with sqlite3.connect(self.path) as db:
+            dump = "\n".join(db.iterdump())
+        self.assertNotIn("3001234567", dump)
+
+    def test_ingest_lines_feed(self):
+        lines = [json.dumps(delivery_record("m1")), "", "garbage", json.dumps(delivery_record("m2"))]
+        self.assertEqual(self.index.ingest_lines(lines), 2)
+
+
+class LocalDynamoDB:
+    """In-process stand-in for DynamoDB put/get_item."""
+
+    def __init__(self):
+        self.items = {}
+
+    def put_item(self, TableName, Item):
+        self.items[Item["pk"]["S"]] = Item
+
+    def get_item(self, TableName, Key, ConsistentRead=False):
+        item = self.items.get(Key["pk"]["S"])
+        return {"Item": item} if item else {}
+
+
+class TestDynamoDBReceiptIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.table = LocalDynamoDB()
+
+    def index(self):
+        return DynamoDBReceiptIndex("receipts", client=self.table)
+
+    def test_receipts_shared_across_containers(self):
+        self.assertEqual(self.index().ingest([delivery_record("m1", status="FAILURE"), {"status": "SUCCESS"}]), 1)
+        self.index().ingest([delivery_record("m1")])
+
+        receipt = self.index().get("m1")
+        self.assertEqual(public_receipt(receipt)["status"], DELIVERED)
+        self.assertEqual(receipt["to_masked"], "+57***4567")
+        self.assertIsNone(self.index().get("missing"))
+        self.assertIn("expires_at", self.table.items["m1"])
+
+    def test_raw_numbers_not_stored(self):
+        self.index().ingest_lines([json.dumps(delivery_record("m1")), "garbage"])
+        self.assertNotIn("3001234567", json.dumps(self.table.items))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Tests for SMS Recipients
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import threading
+import time
+import sys
+from pathlib import Path
+
+# Add backend/sms/ to PYTHONPATH so the Lambda modules are importable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SMS_PATH = PROJECT_ROOT / "backend" / "sms"
+sys.path.insert(0, str(SMS_PATH))
+
+from sms_recipients import RecipientSender, failure, parse_recipients, success, summarize
+
+
+class TestParseRecipients(unittest.TestCase):
+
+    def test_validates_in_request_order_and_dedups(self):
+        checked = parse_recipients(["+573001234567", "bad", "+573001234567", "+5351234567", "+12025551234"])
+        self.assertEqual([phone for phone, _, _ in checked], ["+573001234567", "bad", "+5351234567", "+12025551234"])
+        codes = [rejection and rejection["errorCode"] for _, _, rejection in checked]
+        self.assertEqual(codes, [None, "INVALID_PHONE_FORMAT", "UNSUPPORTED_COUNTRY", None])
+        self.assertEqual(checked[0][1].iso, "CO")
+
+    def test_non_string_recipient_rejected(self):
+        checked = parse_recipients([{"to": "+573001234567"}])
+        self.assertEqual(checked[0][2]["errorCode"], "INVALID_PHONE_FORMAT")
+
+    def test_list_shape_and_limit(self):
+        for recipients in [[], "+573001234567", None]:
+            with self.assertRaises(ValueError):
+                parse_recipients(recipients)
+        with self.assertRaises(ValueError):
+            parse_recipients([f"+1202555{i:04d}" for i in range(4)], max_recipients=3)
+
+
+class TestRecipientSender(unittest.TestCase):
+
+    def setUp(self):
+        self.sender = RecipientSender(max_workers=4)
+
+    def test_sends_concurrently_with_bounded_parallelism(self):
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def send(phone, country):
+            with lock:
+                active.append(phone)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.remove(phone)
+            return success(phone, country, f"m-{phone[-4:]}")
+
+        checked = parse_recipients([f"+1202555{i:04d}" for i in range(8)])
+        start = time.monotonic()
+        results = self.sender.send_all(checked, send)
+        elapsed = time.monotonic() - start
+
+        self.assertEqual([r["messageId"] for r in results], [f"m-{i:04d}" for i in range(8)])
+        self.assertLessEqual(max(peak), 4)
+        self.assertLess(elapsed, 0.35)
+
+    def test_results_keep_request_order_with_rejections(self):
+        checked = parse_recipients(["bad", "+573001234567", "+5351234567"])
+        results = self.sender.send_all(checked, lambda phone, country: success(phone, country, "m1"))
+        self.assertEqual([r["ok"] for r in results], [False, True, False])
+        self.assertEqual(results[1]["toMasked"], "+57***4567")
+
+    def test_send_errors_become_results(self):
+        def send(phone, country):
+            raise RuntimeError(f"Invalid parameter: PhoneNumber {phone}")
+
+        results = self.sender.send_all(parse_recipients(["+573001234567", "+12025551234"]), send)
+        self.assertEqual([r["errorCode"] for r in results], ["INTERNAL_ERROR", "INTERNAL_ERROR"])
+        self.assertNotIn("+573001234567", results[0]["errorMessage"])
+
+    def test_summarize(self):
+        colombia = parse_recipients(["+573001234567"])[0][1]
+        results = [
+            success("+573001234567", colombia, "m1"),
+            failure("+12025551234", "QUEUED_FOR_RETRY", "throttled"),
+            failure("bad", "INVALID_PHONE_FORMAT", "Number must start with +"),
+        ]
+        self.assertEqual(summarize(results), {"total": 3, "sent": 1, "queued": 1, "failed": 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Tests for SNS Client
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add src/ to PYTHONPATH so `aws` package is discoverable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_PATH = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_PATH))
+
+from aws.sns_client import SNSClient
+
+
+class AuthorizationError(Exception):
+    """Service error shaped like botocore's ClientError."""
+
+    def __init__(self, operation):
+        super().__init__(f"An error occurred (AuthorizationError) when calling the {operation} operation")
+        self.response = {"Error": {"Code": "AuthorizationError"}}
+
+
+class LocalSNS:
+    """In-process stand-in for the SNS Publish and PublishBatch APIs."""
+
+    def __init__(self, reject_ids=(), fail_publish=False):
+        self.published = []
+        self.batch_sizes = []
+        self.reject_ids = set(reject_ids)
+        self.fail_publish = fail_publish
+
+    def publish(self, **kwargs):
+        if self.fail_publish:
+            raise ConnectionError("endpoint unavailable")
+        self.published.append(kwargs)
+        return {"MessageId": f"msg-{len(self.published)}"}
+
+    def publish_batch(self, TopicArn, PublishBatchRequestEntries):
+        assert len(PublishBatchRequestEntries) <= 10
+        self.batch_sizes.append(len(PublishBatchRequestEntries))
+        successful, failed = [], []
+        for entry in PublishBatchRequestEntries:
+            if entry["Id"] in self.reject_ids:
+                failed.append({"Id": entry["Id"], "Code": "InvalidParameter", "Message": "rejected"})
+            else:
+                self.published.append(entry)
+                successful.append({"Id": entry["Id"], "MessageId": f"batch-{entry['Id']}"})
+        return {"Successful": successful, "Failed": failed}
+
+    def get_sms_attributes(self, attributes):
+        if self.fail_publish:
+            raise ConnectionError("endpoint unavailable")
+        raise AuthorizationError("GetSMSAttributes")
+
+
+class TestSNSClient(unittest.TestCase):
+
+    def test_publish_alert_and_sms(self):
+        local = LocalSNS()
+        client = SNSClient(client=local)
+
+        self.assertEqual(client.publish_alert("arn:topic", "help", attributes={"risk": "HIGH"}), "msg-1")
+        self.assertEqual(local.published[0]["MessageAttributes"]["risk"]["StringValue"], "HIGH")
+
+        client.send_sms("+15550001", "help")
+        sms = local.published[1]
+        self.assertEqual(sms["PhoneNumber"], "+15550001")
+        self.assertEqual(sms["MessageAttributes"]["AWS.SNS.SMS.SMSType"]["StringValue"], "Transactional")
+
+    def test_publish_batch_chunks_of_ten(self):
+        local = LocalSNS(reject_ids={"12"})
+        client = SNSClient(client=local)
+
+        result = client.publish_batch("arn:topic", [f"alert {i}" for i in range(23)])
+        self.assertEqual(local.batch_sizes, [10, 10, 3])
+        self.assertEqual(len(result["successful"]), 22)
+        self.assertEqual(result["failed"], [{"index": 12, "error": "rejected"}])
+
+    def test_latency_metrics(self):
+        client = SNSClient(client=LocalSNS(fail_publish=True))
+        with self.assertRaises(ConnectionError):
+            client.send_sms("+15550001", "help")
+
+        metrics = client.latency_metrics()["publish"]
+        self.assertEqual(metrics["calls"], 1)
+        self.assertEqual(metrics["errors"], 1)
+        self.assertGreaterEqual(metrics["max_ms"], metrics["p50_ms"])
+
+    def test_open_connection(self):
+        # Without sns:GetSMSAttributes the service still answered over the connection
+        SNSClient(client=LocalSNS()).open_connection()
+        with self.assertRaises(ConnectionError):
+            SNSClient(client=LocalSNS(fail_publish=True)).open_connection()
+
+
+if __name__ == '__main__':
+    unittest.main()
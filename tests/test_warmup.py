@@ -0,0 +1,102 @@
+"""
+Tests for Lambda container warm-up
+Original work created for Google Gemini Hackathon 2026
+"""
+
+import unittest
+import os
+import sys
+import types
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src/ to PYTHONPATH so `aws` package is discoverable
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SRC_PATH = PROJECT_ROOT / "src"
+sys.path.insert(0, str(SRC_PATH))
+
+from aws.warmup import WarmupTimer, is_warmup_event, register_snapshot_hooks
+
+
+class TestWarmupEvent(unittest.TestCase):
+
+    def test_warmup_events(self):
+        self.assertTrue(is_warmup_event({"warmup": True}))
+        self.assertTrue(is_warmup_event({"source": "aws.events", "detail-type": "Scheduled Event", "detail": {}}))
+
+    def test_other_events(self):
+        self.assertFalse(is_warmup_event({"warmup": False}))
+        self.assertFalse(is_warmup_event({"source": "aws.events", "detail-type": "EC2 Instance State-change Notification"}))
+        # A request body asking for a warm-up is still a request
+        self.assertFalse(is_warmup_event({"requestContext": {"http": {"method": "POST"}}, "body": '{"warmup": true}'}))
+        self.assertFalse(is_warmup_event(None))
+
+
+class TestWarmupTimer(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.timer = WarmupTimer(clock=lambda: self.now)
+
+    def stage(self, seconds, error=None):
+        def run():
+            self.now += seconds
+            if error:
+                raise error
+            return "done"
+        return run
+
+    def test_stages_are_timed(self):
+        self.assertEqual(self.timer.run("imports", self.stage(0.25)), "done")
+        self.timer.run("client", self.stage(0.0125))
+
+        with patch.dict(os.environ, {"AWS_LAMBDA_INITIALIZATION_TYPE": "provisioned-concurrency"}):
+            report = self.timer.report()
+        self.assertEqual(report, {
+            "warmup": True,
+            "ready": True,
+            "initialization_type": "provisioned-concurrency",
+            "stages_ms": {"imports": 250.0, "client": 12.5},
+            "total_ms": 262.5,
+            "errors": {}
+        })
+
+    def test_failure_is_recorded_and_dependents_skipped(self):
+        self.assertIsNone(self.timer.run("parameters", self.stage(0.1, RuntimeError("SSM unreachable"))))
+        self.timer.run("sdk_import", self.stage(0.5))
+        self.timer.run("client", self.stage(1.0), requires=["parameters", "sdk_import"])
+
+        report = self.timer.report()
+        self.assertFalse(report["ready"])
+        self.assertEqual(report["stages_ms"], {"parameters": 100.0, "sdk_import": 500.0})
+        self.assertEqual(report["errors"], {
+            "parameters": "SSM unreachable",
+            "client": "skipped: parameters failed"
+        })
+
+
+class TestSnapshotHooks(unittest.TestCase):
+
+    def test_not_registered_without_snapstart_runtime(self):
+        with patch.dict(sys.modules, {"snapshot_restore_py": None}):
+            self.assertFalse(register_snapshot_hooks(lambda: None, lambda: None))
+
+    def test_registered_with_snapstart_runtime(self):
+        registered = {}
+        runtime = types.ModuleType("snapshot_restore_py")
+        runtime.register_before_snapshot = lambda hook: registered.setdefault("before", hook)
+        runtime.register_after_restore = lambda hook: registered.setdefault("after", hook)
+
+        def before():
+            pass
+
+        def after():
+            pass
+
+        with patch.dict(sys.modules, {"snapshot_restore_py": runtime}):
+            self.assertTrue(register_snapshot_hooks(before, after))
+        self.assertEqual(registered, {"before": before, "after": after})
+
+
+if __name__ == '__main__':
+    unittest.main()